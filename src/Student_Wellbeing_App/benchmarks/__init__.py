@@ -0,0 +1,4 @@
+"""
+Micro-benchmarks for the data access layer.
+Each module runs against a throw-away database, never the bundled one.
+"""
@@ -0,0 +1,57 @@
+"""
+One record_attendance call per student vs a single record_session_register.
+
+Run:  python -m src.Student_Wellbeing_App.benchmarks.bench_attendance_register
+"""
+
+import argparse
+from datetime import date, timedelta
+from itertools import count
+
+from src.Student_Wellbeing_App.benchmarks.common import temp_database, measure, print_table
+from src.Student_Wellbeing_App.core.models.AttendanceStatus import AttendanceStatus
+from src.Student_Wellbeing_App.core.services.AttendanceService import AttendanceService
+
+STATUSES = list(AttendanceStatus)
+
+
+def run(n_students: int, repeat: int) -> list:
+    with temp_database(n_students=n_students, weeks=1):
+        service = AttendanceService()
+        student_ids = [f"STU{i:04d}" for i in range(1, n_students + 1)]
+        register = {sid: STATUSES[i % len(STATUSES)] for i, sid in enumerate(student_ids)}
+        # a fresh session date per run so every run inserts rather than updates
+        days = count()
+
+        def per_student():
+            day = date(2026, 1, 1) + timedelta(days=next(days))
+            for sid, status in register.items():
+                service.record_attendance(sid, day, "BENCH", status, performed_by="BENCH")
+
+        def whole_register():
+            day = date(2026, 1, 1) + timedelta(days=next(days))
+            service.record_session_register("BENCH", day, register, performed_by="BENCH")
+
+        single = measure(per_student, repeat)
+        bulk = measure(whole_register, repeat)
+
+    return [{
+        "students": n_students,
+        "per_student_ms": single["median_ms"],
+        "register_ms": bulk["median_ms"],
+        "register_best_ms": bulk["best_ms"],
+        "speedup": single["median_ms"] / bulk["median_ms"],
+    }]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print_table("Session register: per-student upserts vs one transaction", run(args.students, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+LIMIT/OFFSET vs keyset pages of the audit log at increasing depth.
+
+Run:  python -m src.Student_Wellbeing_App.benchmarks.bench_audit_paging
+"""
+
+import argparse
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from io import StringIO
+
+from src.Student_Wellbeing_App.benchmarks.common import temp_database, measure, print_table
+from src.Student_Wellbeing_App.core.database.connection import get_db_pool
+from src.Student_Wellbeing_App.core.repositories.AuditRepository import AuditRepository
+
+PAGE = 100
+
+
+def run(n_logs: int, repeat: int) -> list:
+    rows = []
+    with temp_database(n_students=10, weeks=1):
+        repo = AuditRepository()
+        start = datetime(2024, 1, 1)
+        with redirect_stdout(StringIO()):
+            for chunk in range(0, n_logs, 50000):
+                repo.log_actions([
+                    (f"EMP{i % 5:04d}", "UPDATE", f"entry {i}", (start + timedelta(seconds=i)).isoformat(sep=" "))
+                    for i in range(chunk, min(chunk + 50000, n_logs))
+                ])
+
+        conn = get_db_pool()
+        for depth in (0, n_logs // 10, n_logs // 2, n_logs - PAGE):
+            # the keyset cursor of the row just above this depth
+            after = None
+            if depth:
+                r = conn.execute(
+                    "SELECT timestamp, log_id FROM audit_log ORDER BY timestamp DESC, log_id DESC LIMIT 1 OFFSET ?",
+                    (depth - 1,)
+                ).fetchone()
+                after = (r[0], r[1])
+
+            offset = measure(lambda: conn.execute(
+                "SELECT log_id, user_id, action, details, timestamp FROM audit_log "
+                "ORDER BY timestamp DESC, log_id DESC LIMIT ? OFFSET ?", (PAGE, depth)).fetchall(), repeat)
+            keyset = measure(lambda: repo.query_logs(after=after, limit=PAGE), repeat)
+            rows.append({
+                "rows": n_logs,
+                "page_depth": depth,
+                "offset_ms": offset["median_ms"],
+                "keyset_ms": keyset["median_ms"],
+                "speedup": offset["median_ms"] / keyset["median_ms"],
+            })
+        conn.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logs", type=int, default=500000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print_table("audit log page of 100: OFFSET vs keyset", run(args.logs, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
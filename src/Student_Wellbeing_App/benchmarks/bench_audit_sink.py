@@ -0,0 +1,61 @@
+"""
+Synchronous audit writes vs the buffered AuditSink on a stream of audited actions.
+
+Run:  python -m src.Student_Wellbeing_App.benchmarks.bench_audit_sink
+"""
+
+import argparse
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+from src.Student_Wellbeing_App.benchmarks.common import temp_database, measure, print_table
+from src.Student_Wellbeing_App.core.services.AuditService import AuditService
+from src.Student_Wellbeing_App.core.services.AuditSink import start_audit_sink, stop_audit_sink
+
+
+def run(actions: int, repeat: int) -> list:
+    rows = []
+    with temp_database(n_students=10, weeks=1), redirect_stdout(StringIO()):
+        service = AuditService()
+
+        def burst():
+            for i in range(actions):
+                service.log("BENCH", "BENCH_ACTION", f"action {i}")
+
+        direct = measure(burst, repeat)
+
+        sink = start_audit_sink()
+        try:
+            buffered = measure(burst, repeat)
+            t0 = time.perf_counter()
+            sink.flush()
+            drain_ms = (time.perf_counter() - t0) * 1000
+            stats = sink.stats()
+        finally:
+            stop_audit_sink()
+
+    rows.append({
+        "actions": actions,
+        "direct_ms": direct["median_ms"],
+        "buffered_ms": buffered["median_ms"],
+        "us/action direct": direct["median_ms"] * 1000 / actions,
+        "us/action buffered": buffered["median_ms"] * 1000 / actions,
+        "final_drain_ms": drain_ms,
+        "batches": stats["batches"],
+        "dropped": stats["dropped"],
+    })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--actions", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print_table("audit.log: direct insert+commit vs queued batch writer", run(args.actions, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
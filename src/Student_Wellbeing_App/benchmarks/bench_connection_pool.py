@@ -0,0 +1,65 @@
+"""
+Per-call sqlite3.connect vs pooled checkout on the repositories' get_by_student paths.
+
+Run:  python -m src.Student_Wellbeing_App.benchmarks.bench_connection_pool
+"""
+
+import argparse
+
+from src.Student_Wellbeing_App.benchmarks.common import temp_database, measure, print_table
+from src.Student_Wellbeing_App.core.database import connection
+from src.Student_Wellbeing_App.core.repositories import AttendanceRepository as attendance_mod
+from src.Student_Wellbeing_App.core.repositories import SubmissionRepository as submission_mod
+from src.Student_Wellbeing_App.core.repositories import WellbeingRepository as wellbeing_mod
+
+REPO_MODULES = {
+    "AttendanceRepository": (attendance_mod, attendance_mod.AttendanceRepository),
+    "WellbeingRepository": (wellbeing_mod, wellbeing_mod.WellbeingRepository),
+    "SubmissionRepository": (submission_mod, submission_mod.SubmissionRepository),
+}
+
+STRATEGIES = {
+    "connect-per-call": connection.get_db_connection,
+    "pooled": connection.get_db_pool,
+}
+
+
+def run(n_students: int, lookups: int, repeat: int) -> list:
+    rows = []
+    with temp_database(n_students=n_students):
+        student_ids = [f"STU{i:04d}" for i in range(1, lookups + 1)]
+        for repo_name, (module, repo_cls) in REPO_MODULES.items():
+            repo = repo_cls()
+            results = {}
+            for label, factory in STRATEGIES.items():
+                module.get_db_pool = factory
+                try:
+                    results[label] = measure(lambda: [repo.get_by_student(s) for s in student_ids], repeat)
+                finally:
+                    module.get_db_pool = connection.get_db_pool
+            base, pooled = results["connect-per-call"], results["pooled"]
+            rows.append({
+                "repository": repo_name,
+                "lookups": lookups,
+                "connect_ms": base["median_ms"],
+                "pooled_ms": pooled["median_ms"],
+                "us/call connect": base["median_ms"] * 1000 / lookups,
+                "us/call pooled": pooled["median_ms"] * 1000 / lookups,
+                "speedup": base["median_ms"] / pooled["median_ms"],
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = run(args.students, min(args.lookups, args.students), args.repeat)
+    print_table("get_by_student: connect-per-call vs pooled checkout", rows)
+
+
+if __name__ == "__main__":
+    main()
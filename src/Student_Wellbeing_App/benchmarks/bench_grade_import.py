@@ -0,0 +1,65 @@
+"""
+One submit_grade call per student vs a single import_grades batch.
+
+Run:  python -m src.Student_Wellbeing_App.benchmarks.bench_grade_import
+"""
+
+import argparse
+import io
+import random
+from datetime import date
+
+import pandas as pd
+
+from src.Student_Wellbeing_App.benchmarks.common import temp_database, measure, print_table
+from src.Student_Wellbeing_App.core.services.DashboardService import DashboardService
+
+
+def run(n_grades: int, repeat: int) -> list:
+    rnd = random.Random(7)
+    with temp_database(n_students=n_grades, weeks=1):
+        service = DashboardService()
+        df = pd.DataFrame({
+            "student_id": [f"STU{i:04d}" for i in range(1, n_grades + 1)],
+            "mark": [rnd.randint(0, 100) for _ in range(n_grades)],
+        })
+        csv_text = df.to_csv(index=False)
+
+        def new_assessment():
+            return service.create_assessment("CS101", "Bench", date(2026, 1, 1), 10, performed_by="BENCH")
+
+        def per_student():
+            aid = new_assessment()
+            for sid, mark in zip(df["student_id"], df["mark"]):
+                service.submit_grade(sid, aid, float(mark), performed_by="BENCH")
+
+        def from_dataframe():
+            service.import_grades(new_assessment(), df, performed_by="BENCH")
+
+        def from_csv():
+            service.import_grades(new_assessment(), io.StringIO(csv_text), performed_by="BENCH")
+
+        single = measure(per_student, repeat)
+        frame = measure(from_dataframe, repeat)
+        csv = measure(from_csv, repeat)
+
+    return [
+        {"path": "submit_grade loop", "grades": n_grades, "median_ms": single["median_ms"], "speedup": 1.0},
+        {"path": "import_grades (DataFrame)", "grades": n_grades, "median_ms": frame["median_ms"],
+         "speedup": single["median_ms"] / frame["median_ms"]},
+        {"path": "import_grades (CSV)", "grades": n_grades, "median_ms": csv["median_ms"],
+         "speedup": single["median_ms"] / csv["median_ms"]},
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--grades", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print_table("Grade import: per-student vs batch", run(args.grades, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Login storm: 1k concurrent authenticate_any calls with and without the login cache.
+
+A class logging in at the start of a session: each student signs in a
+few times (page reloads, a second tab), a few mistype their password.
+
+Run:  python -m src.Student_Wellbeing_App.benchmarks.bench_login_storm
+"""
+
+import argparse
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.Student_Wellbeing_App.benchmarks.common import QueryCounter, temp_database, print_table
+from src.Student_Wellbeing_App.core.database import connection
+from src.Student_Wellbeing_App.core.repositories.EntityCache import configure_entity_caches, entity_caches_enabled
+from src.Student_Wellbeing_App.core.services.AuthenticationService import AuthenticationService
+from src.Student_Wellbeing_App.core.security.PasswordHasher import get_hasher, hash_password, make_hasher, set_hasher
+
+PASSWORD = "password123"
+
+
+def storm_plan(n_logins: int, n_principals: int, wrong_rate: float, seed: int = 7) -> list:
+    rnd = random.Random(seed)
+    plan = []
+    for _ in range(n_logins):
+        sid = f"STU{rnd.randint(1, n_principals):04d}"
+        plan.append((sid, "wrong" if rnd.random() < wrong_rate else PASSWORD))
+    return plan
+
+
+def storm(plan: list, workers: int) -> dict:
+    service = AuthenticationService()
+
+    def login(item):
+        t0 = time.perf_counter()
+        ok = service.authenticate_any(*item) is not None
+        return ok, (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(login, plan))
+    wall_ms = (time.perf_counter() - t0) * 1000
+    latencies = sorted(ms for _, ms in results)
+    return {
+        "ok": sum(ok for ok, _ in results),
+        "wall_ms": wall_ms,
+        "logins/s": len(plan) / (wall_ms / 1000),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "median_ms": statistics.median(latencies),
+    }
+
+
+def run(n_students: int, n_logins: int, n_principals: int, workers: int, wrong_rate: float) -> list:
+    rows = []
+    plan = storm_plan(n_logins, min(n_principals, n_students), wrong_rate)
+    was_enabled = entity_caches_enabled()
+    with temp_database(n_students=n_students, weeks=1):
+        conn = connection.get_db_pool()
+        # one hash (made by the active hasher) shared by every account, so no login re-hashes
+        conn.execute("UPDATE student SET password = ?", (hash_password(PASSWORD),))
+        conn.commit()
+        conn.close()
+        try:
+            for label, enabled in (("no cache", False), ("login cache", True)):
+                configure_entity_caches(enabled=enabled)
+                with QueryCounter() as counter:
+                    result = storm(plan, workers)
+                rows.append({"mode": label, "hasher": repr(get_hasher()), "logins": n_logins, "workers": workers,
+                             "queries": counter.queries, **result})
+        finally:
+            configure_entity_caches(enabled=was_enabled)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--logins", type=int, default=1000)
+    parser.add_argument("--principals", type=int, default=200, help="distinct students signing in")
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--wrong-rate", type=float, default=0.05)
+    parser.add_argument("--hasher", default=None, help="scrypt or pbkdf2_sha256 (default: the configured one)")
+    parser.add_argument("--cost", default="", help='e.g. "n=4096" or "auto"; empty keeps the defaults')
+    args = parser.parse_args()
+
+    if args.hasher or args.cost:
+        set_hasher(make_hasher(args.hasher or get_hasher().algorithm, args.cost))
+
+    print_table("Login storm", run(args.students, args.logins, args.principals, args.workers, args.wrong_rate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Full-frame export (load_full_export_data + to_csv) vs the chunked streaming exporter:
+wall time and peak traced memory as the student count grows.
+
+Run:  python -m src.Student_Wellbeing_App.benchmarks.bench_report_export
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from src.Student_Wellbeing_App.benchmarks.common import temp_database, print_table
+from src.Student_Wellbeing_App.core.database import connection
+from src.Student_Wellbeing_App.core.streamlit_UI import data_loader
+from src.Student_Wellbeing_App.core.streamlit_UI import report_export
+
+
+class _Discard:
+    """Binary sink that keeps nothing, so only the exporter's working memory is measured."""
+
+    def write(self, data):
+        return len(data)
+
+
+def _profile(fn) -> tuple:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fn()
+    elapsed = (time.perf_counter() - t0) * 1000
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+def run(sizes: list, weeks: int, chunk_size: int) -> list:
+    rows = []
+    for n in sizes:
+        with temp_database(n_students=n, weeks=weeks):
+            data_loader.DB_PATH = connection.DB_PATH
+
+            def full():
+                data_loader.load_full_export_data().to_csv(index=False).encode("utf-8")
+
+            def streamed():
+                report_export.write_csv(_Discard(), chunk_size=chunk_size)
+
+            def spooled():
+                fh, _ = report_export.export_report("csv", chunk_size=chunk_size)
+                fh.close()
+
+            full_ms, full_mb = _profile(full)
+            stream_ms, stream_mb = _profile(streamed)
+            _, spool_mb = _profile(spooled)
+        rows.append({
+            "students": n,
+            "full_ms": full_ms,
+            "stream_ms": stream_ms,
+            "full_peak_MB": full_mb,
+            "stream_peak_MB": stream_mb,
+            # includes the output itself while it fits in the in-memory spool
+            "spooled_peak_MB": spool_mb,
+        })
+    data_loader.DB_PATH = connection.DB_PATH
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 20000, 50000])
+    parser.add_argument("--weeks", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=report_export.DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    print_table("student risk report export: full frame vs chunked stream",
+                run(args.sizes, args.weeks, args.chunk_size))
+
+
+if __name__ == "__main__":
+    main()
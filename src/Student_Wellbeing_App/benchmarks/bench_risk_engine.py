@@ -0,0 +1,70 @@
+"""
+Per-student AcademicService loops vs the set-based RiskEngine: queries,
+connection checkouts and wall time.
+
+Run:  python -m src.Student_Wellbeing_App.benchmarks.bench_risk_engine
+"""
+
+import argparse
+
+from src.Student_Wellbeing_App.benchmarks.common import QueryCounter, temp_database, measure, print_table
+from src.Student_Wellbeing_App.core.database import connection
+from src.Student_Wellbeing_App.core.services.AcademicService import AcademicService
+from src.Student_Wellbeing_App.core.services.AttendanceService import AttendanceService
+from src.Student_Wellbeing_App.core.services.StudentService import StudentService
+from src.Student_Wellbeing_App.core.services.SubmissionService import SubmissionService
+
+
+def loop_low_attendance(students, threshold=75.0):
+    """What get_low_attendance_students did before the RiskEngine."""
+    attendance = AttendanceService()
+    return [(s, p) for s in students if (p := attendance.get_attendance_percentage(s.student_id)) < threshold]
+
+
+def loop_low_marks(students, threshold=50.0):
+    """What get_low_mark_students did before the RiskEngine."""
+    submissions = SubmissionService()
+    out = []
+    for s in students:
+        low = [x for x in submissions.get_submissions_for_student(s.student_id) if x.mark is not None and x.mark < threshold]
+        if low:
+            out.append((s, len(low)))
+    return out
+
+
+def run(n_students: int, repeat: int) -> list:
+    rows = []
+    with temp_database(n_students=n_students, weeks=4):
+        students = StudentService().list_students()
+        service = AcademicService()
+        paths = {
+            "per-student loops": lambda: (loop_low_attendance(students), loop_low_marks(students)),
+            "RiskEngine": lambda: (service.get_low_attendance_students(students), service.get_low_mark_students(students)),
+        }
+        for label, fn in paths.items():
+            with QueryCounter() as counter:
+                pool = connection.get_pool()
+                fn()
+                queries, checkouts = counter.queries, pool.stats()["checkouts"]
+            timing = measure(fn, repeat)
+            rows.append({
+                "path": label,
+                "students": n_students,
+                "queries": queries,
+                "checkouts": checkouts,
+                "median_ms": timing["median_ms"],
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print_table("Low attendance + low marks for every student", run(args.students, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Risk_Status column: row-wise df.apply vs the vectorized identify_risk.
+
+Run:  python -m src.Student_Wellbeing_App.benchmarks.bench_risk_status
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from src.Student_Wellbeing_App.benchmarks.common import measure, print_table
+from src.Student_Wellbeing_App.core.streamlit_UI import data_loader
+
+
+def row_risk(row):
+    """The rules as a per-row function, the way the export used to apply them."""
+    flags = []
+    if row['avg_stress'] >= 4.0: flags.append("High Stress")
+    if row['avg_sleep'] < 6.0 and row['avg_sleep'] > 0: flags.append("Low Sleep")
+    if row['attendance_pct'] < 80.0: flags.append("Low Attendance")
+    if row['avg_grade'] < 50.0 and row['avg_grade'] > 0: flags.append("Low Grades")
+    if flags:
+        return f"⚠️ AT RISK: {', '.join(flags)}"
+    return "Normal"
+
+
+def make_frame(n: int, seed: int = 42) -> pd.DataFrame:
+    """Cleaned export-shaped metrics (rounded to 1dp like load_full_export_data)."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "student_id": [f"STU{i:06d}" for i in range(n)],
+        "avg_stress": rng.uniform(1, 5, n).round(1),
+        "avg_sleep": np.where(rng.random(n) < 0.05, 0.0, rng.uniform(4, 9, n)).round(1),
+        "attendance_pct": rng.uniform(50, 100, n).round(1),
+        "avg_grade": np.where(rng.random(n) < 0.05, 0.0, rng.uniform(20, 95, n)).round(1),
+    })
+
+
+def run(n_students: int, repeat: int) -> list:
+    df = make_frame(n_students)
+
+    expected = df.apply(row_risk, axis=1)
+    result = data_loader.identify_risk(df)
+    if not expected.equals(result) or expected.to_csv() != result.to_csv():
+        raise AssertionError("vectorized Risk_Status differs from the row-wise rules")
+
+    rowwise = measure(lambda: df.apply(row_risk, axis=1), repeat)
+    vectorized = measure(lambda: data_loader.identify_risk(df), repeat)
+    return [{
+        "students": n_students,
+        "apply_ms": rowwise["median_ms"],
+        "vectorized_ms": vectorized["median_ms"],
+        "speedup": rowwise["median_ms"] / vectorized["median_ms"],
+        "identical": True,
+    }]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print_table("Risk_Status: df.apply vs vectorized masks", run(args.students, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
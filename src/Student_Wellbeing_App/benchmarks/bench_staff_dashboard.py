@@ -0,0 +1,87 @@
+"""
+Staff dashboard wellbeing views (cohort overview, high-risk list, alerts):
+per-student service calls vs the set-based cohort_overview and
+scan_wellbeing_signals queries.
+
+Run:  python -m src.Student_Wellbeing_App.benchmarks.bench_staff_dashboard
+"""
+
+import argparse
+
+from src.Student_Wellbeing_App.benchmarks.common import QueryCounter, temp_database, measure, print_table
+from src.Student_Wellbeing_App.core.database import connection
+from src.Student_Wellbeing_App.core.services.StudentService import StudentService
+from src.Student_Wellbeing_App.core.services.WellbeingService import WellbeingService
+
+
+def loop_views(students, service):
+    """What the three views did before: repeated per-student record fetches."""
+    by_year = {}
+    for s in students:
+        records = service.get_records_for_student(s.student_id)
+        if records:
+            stats = by_year.setdefault(s.year, {"stress": [], "high": 0})
+            stats["stress"] += [r.stress_level for r in records]
+            stats["high"] += sum(1 for r in records if r.stress_level >= 4)
+
+    high_risk = [(s, len(w)) for s in students if (w := service.high_stress_weeks(s.student_id))]
+
+    alerts = 0
+    for s in students:
+        records = service.get_records_for_student(s.student_id)
+        weeks = service.high_stress_weeks(s.student_id)
+        alerts += bool(weeks)
+        if records:
+            recent = records[-5:]
+            alerts += sum(r.sleep_hours for r in recent) / len(recent) < 6
+    return by_year, high_risk, alerts
+
+
+def set_views(students, service):
+    """The same three views from two aggregate queries."""
+    by_year = service.cohort_overview(threshold=4)
+    signals = service.scan_wellbeing_signals(threshold=4, recent_window=5)
+    high_risk = [(s, sig["high_stress_weeks"]) for s in students
+                 if (sig := signals.get(s.student_id)) and sig["high_stress_weeks"]]
+    alerts = sum(bool(sig["high_stress_weeks"]) + (sig["recent_avg_sleep"] is not None and sig["recent_avg_sleep"] < 6)
+                 for sig in signals.values())
+    return by_year, high_risk, alerts
+
+
+def run(n_students: int, weeks: int, repeat: int) -> list:
+    rows = []
+    with temp_database(n_students=n_students, weeks=weeks):
+        students = StudentService().list_students()
+        service = WellbeingService()
+        paths = {
+            "per-student loops": lambda: loop_views(students, service),
+            "set-based": lambda: set_views(students, service),
+        }
+        for label, fn in paths.items():
+            with QueryCounter() as counter:
+                pool = connection.get_pool()
+                fn()
+                queries, checkouts = counter.queries, pool.stats()["checkouts"]
+            timing = measure(fn, repeat)
+            rows.append({
+                "path": label,
+                "students": n_students,
+                "queries": queries,
+                "checkouts": checkouts,
+                "median_ms": timing["median_ms"],
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--weeks", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print_table("Cohort overview + high-risk list + alerts", run(args.students, args.weeks, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Onboarding an intake: register_student + enroll per student vs import_students.
+
+Run:  python -m src.Student_Wellbeing_App.benchmarks.bench_student_import
+"""
+
+import argparse
+import io
+import itertools
+
+import pandas as pd
+
+from src.Student_Wellbeing_App.benchmarks.common import temp_database, measure, print_table
+from src.Student_Wellbeing_App.core.services.DashboardService import DashboardService
+from src.Student_Wellbeing_App.core.security.PasswordHasher import HASH_PROCESSES, get_hasher, make_hasher, set_hasher
+from src.Student_Wellbeing_App.core.services.StudentService import StudentService
+
+MODULES = ["CS101", "DS201"]
+
+
+def intake_csv(n: int, tag: str) -> str:
+    return pd.DataFrame({
+        "first_name": [f"First{i}" for i in range(n)],
+        "last_name": [f"Last{i}" for i in range(n)],
+        "email": [f"{tag}.{i}@uni.ac.uk" for i in range(n)],
+        "password": [f"pw{i}" for i in range(n)],
+        "cohort_year": [2025] * n,
+    }).to_csv(index=False)
+
+
+def run(n_students: int, repeat: int) -> list:
+    batch = itertools.count()
+    with temp_database(n_students=10, weeks=1):
+        students, dashboard = StudentService(), DashboardService()
+
+        def per_student():
+            df = pd.read_csv(io.StringIO(intake_csv(n_students, f"loop{next(batch)}")))
+            for r in df.itertuples():
+                sid = students.register_student(r.first_name, r.last_name, r.email, r.password, r.cohort_year)
+                for code in MODULES:
+                    dashboard.enroll_student_to_module(sid, code, performed_by="BENCH")
+
+        def pipeline(processes):
+            def go():
+                csv_text = intake_csv(n_students, f"import{next(batch)}")
+                result = students.import_students(io.StringIO(csv_text), enroll_modules=MODULES,
+                                                  performed_by="BENCH", processes=processes)
+                assert result["imported"] == n_students, result["rejected"][:3]
+            return go
+
+        single = measure(per_student, repeat)
+        rows = [("register_student loop", single), ("import_students (1 process)", measure(pipeline(1), repeat))]
+        if HASH_PROCESSES > 1:
+            rows.append((f"import_students ({HASH_PROCESSES} processes)", measure(pipeline(HASH_PROCESSES), repeat)))
+
+    return [
+        {"path": path, "students": n_students, "hasher": repr(get_hasher()), "median_ms": t["median_ms"],
+         "speedup": single["median_ms"] / t["median_ms"]}
+        for path, t in rows
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--hasher", default=None, help="scrypt or pbkdf2_sha256 (default: the configured one)")
+    parser.add_argument("--cost", default="n=1024", help='KDF cost, e.g. "n=16384"; empty keeps the defaults')
+    args = parser.parse_args()
+
+    if args.hasher or args.cost:
+        set_hasher(make_hasher(args.hasher or get_hasher().algorithm, args.cost))
+
+    print_table("Student import: per-student vs pipeline", run(args.students, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Student Search tab: loading every student and filtering in Python vs the
+FTS5 trigram index behind StudentService.search.
+
+Run:  python -m src.Student_Wellbeing_App.benchmarks.bench_student_search
+"""
+
+import argparse
+
+from src.Student_Wellbeing_App.benchmarks.common import temp_database, measure, print_table
+from src.Student_Wellbeing_App.core.services.StudentService import StudentService
+
+# (label, query): exact ID, name prefix, email fragment, typo (fuzzy path)
+QUERIES = [
+    ("id", "STU1234"),
+    ("name prefix", "First12"),
+    ("email part", "u4321@uni"),
+    ("typo", "Frist1234"),
+]
+
+
+def python_filter(service, q):
+    """What the tab did before: all rows, substring checks on id and first name."""
+    q = q.lower()
+    return [s for s in service.list_students() if q in s.student_id.lower() or q in s.first_name.lower()]
+
+
+def run(n_students: int, repeat: int) -> list:
+    rows = []
+    with temp_database(n_students=n_students, weeks=1):
+        service = StudentService()
+        for label, q in QUERIES:
+            before = measure(lambda: python_filter(service, q), repeat)
+            after = measure(lambda: service.search(q, limit=50), repeat)
+            rows.append({
+                "query": f"{label}: {q}",
+                "students": n_students,
+                "list+filter_ms": before["median_ms"],
+                "search_ms": after["median_ms"],
+                "hits_before": len(python_filter(service, q)),
+                "hits_search": len(service.search(q, limit=50)),
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print_table("Student search", run(args.students, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
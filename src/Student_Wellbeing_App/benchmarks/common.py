@@ -0,0 +1,145 @@
+"""
+Shared helpers for the benchmarks: a seeded temporary database, a query
+counter and timers.
+"""
+
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+
+from src.Student_Wellbeing_App.core.database import connection
+from src.Student_Wellbeing_App.core.database import migrations
+
+MODULE_CODES = ["CS101", "CS102", "DS201", "AI301", "ET101", "UX201"]
+
+
+@contextmanager
+def temp_database(n_students: int = 200, weeks: int = 12, seed: int = 42):
+    """
+    Point the app at a fresh, migrated and seeded database in a temp folder.
+    Restores the original DB path (and drops the temp pools) on exit.
+    """
+    original = (connection.DB_PATH, connection.DB_NAME, migrations.DB_NAME)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = Path(tmp) / "bench.sqlite3"
+        connection.DB_PATH = connection.DB_NAME = migrations.DB_NAME = db_file
+        try:
+            migrations.run_migrations()
+            seed_synthetic(db_file, n_students, weeks, seed)
+            yield db_file
+        finally:
+            connection.close_all_pools()
+            connection.DB_PATH, connection.DB_NAME, migrations.DB_NAME = original
+
+
+def seed_synthetic(db_file, n_students: int, weeks: int, seed: int = 42) -> None:
+    """Bulk-load students with attendance, wellbeing and grades."""
+    rnd = random.Random(seed)
+    start = date(2025, 1, 6)  # a Monday
+    conn = sqlite3.connect(db_file)
+
+    students = [f"STU{i:04d}" for i in range(1, n_students + 1)]
+    conn.executemany(
+        "INSERT INTO student VALUES (?, ?, ?, ?, ?, ?)",
+        [(sid, f"First{i}", f"Last{i}", f"{sid.lower()}@uni.ac.uk", "x", rnd.choice([2023, 2024, 2025]))
+         for i, sid in enumerate(students, 1)],
+    )
+    conn.executemany("INSERT INTO module VALUES (?, ?)", [(m, m) for m in MODULE_CODES])
+
+    assessments = []
+    for m in MODULE_CODES:
+        cur = conn.execute(
+            "INSERT INTO assessment (module_code, title, due_date, weight) VALUES (?, ?, ?, ?)",
+            (m, f"{m} Final", start + timedelta(weeks=weeks), 100),
+        )
+        assessments.append(cur.lastrowid)
+
+    enrol, attendance, wellbeing, submissions = [], [], [], []
+    for sid in students:
+        mods = rnd.sample(range(len(MODULE_CODES)), 2)
+        for idx in mods:
+            enrol.append((sid, MODULE_CODES[idx]))
+            submissions.append((sid, assessments[idx], start, "SUBMITTED", rnd.randint(20, 95)))
+        for w in range(weeks):
+            week = start + timedelta(weeks=w)
+            wellbeing.append((sid, week, rnd.randint(1, 5), round(rnd.uniform(4, 9), 1), "survey"))
+            for idx in mods:
+                for d in range(0, 5, 2):
+                    status = "ABSENT" if rnd.random() < 0.1 else "PRESENT"
+                    attendance.append((sid, week + timedelta(days=d), MODULE_CODES[idx], status))
+
+    conn.executemany("INSERT INTO enrollment (student_id, module_code) VALUES (?, ?)", enrol)
+    conn.executemany(
+        "INSERT INTO attendance (student_id, session_date, session_id, status) VALUES (?, ?, ?, ?)",
+        attendance,
+    )
+    conn.executemany(
+        "INSERT INTO wellbeing_record (student_id, week_start, stress_level, sleep_hours, source_type) "
+        "VALUES (?, ?, ?, ?, ?)",
+        wellbeing,
+    )
+    conn.executemany(
+        "INSERT INTO submission (student_id, assessment_id, submitted_at, status, mark) VALUES (?, ?, ?, ?, ?)",
+        submissions,
+    )
+    conn.execute(migrations.WELLBEING_WEEKLY_AGG_REBUILD)
+    conn.execute("DELETE FROM student_search")
+    conn.execute(migrations.STUDENT_SEARCH_REBUILD)
+    conn.commit()
+    conn.close()
+
+
+class QueryCounter:
+    """Counts statements run on pooled connections via sqlite's trace hook."""
+
+    def __init__(self):
+        self.queries = 0
+        self._original_init = connection._init_connection
+
+    def __enter__(self):
+        def init(conn):
+            self._original_init(conn)
+            conn.set_trace_callback(self._count)
+
+        connection.close_all_pools()   # new connections pick up the hook
+        connection._init_connection = init
+        return self
+
+    def __exit__(self, *exc):
+        connection._init_connection = self._original_init
+        connection.close_all_pools()
+
+    def _count(self, statement):
+        if not statement.startswith("PRAGMA"):
+            self.queries += 1
+
+
+def measure(fn, repeat: int = 5) -> dict:
+    """Run fn `repeat` times and return best/median wall time in ms."""
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return {"best_ms": min(timings), "median_ms": statistics.median(timings)}
+
+
+def print_table(title: str, rows: list) -> None:
+    """Print a list of dicts as an aligned table."""
+    print(f"\n=== {title} ===")
+    if not rows:
+        return
+    cols = list(rows[0].keys())
+    widths = {c: max(len(c), *(len(_fmt(r[c])) for r in rows)) for c in cols}
+    print("  ".join(c.ljust(widths[c]) for c in cols))
+    for r in rows:
+        print("  ".join(_fmt(r[c]).ljust(widths[c]) for c in cols))
+
+
+def _fmt(v) -> str:
+    return f"{v:.2f}" if isinstance(v, float) else str(v)
@@ -0,0 +1,49 @@
+import csv
+import sys
+import argparse
+
+from src.Student_Wellbeing_App.core.services.StudentService import IMPORT_CHUNK_SIZE, StudentService
+
+
+# Onboards an intake of students from a CSV file (see StudentService.import_students).
+def main():
+    parser = argparse.ArgumentParser(description="Import students from a CSV file.")
+    parser.add_argument("csv", help="CSV with first_name, last_name, email, password and cohort_year columns")
+    parser.add_argument("--enroll", default="", help="comma-separated module codes to enroll every student in")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="students written per transaction")
+    parser.add_argument("--processes", type=int, default=None, help="password hashing processes (default: one per CPU)")
+    parser.add_argument("--ids-out", help="write the created student_ids (row, student_id, email) to this CSV")
+    parser.add_argument("--performed-by", default="ADMIN", help="user id recorded in the audit log")
+    args = parser.parse_args()
+
+    try:
+        result = StudentService().import_students(
+            args.csv,
+            enroll_modules=args.enroll.split(","),
+            performed_by=args.performed_by,
+            chunk_size=args.chunk_size,
+            processes=args.processes,
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+
+    for r in result["rejected"]:
+        print(f"⚠ row {r['row']} ({r['email']}): {r['reason']}")
+    if args.ids_out:
+        with open(args.ids_out, "w", newline="") as fh:
+            writer = csv.DictWriter(fh, fieldnames=["row", "student_id", "email"])
+            writer.writeheader()
+            writer.writerows(result["created"])
+    if result["error"]:
+        # the students listed in --ids-out were committed; re-run with the remaining rows
+        print(f"❌ Import stopped after {result['imported']} of {result['total']} students: {result['error']}")
+        sys.exit(3)
+    print(f"✅ Imported {result['imported']} of {result['total']} students "
+          f"({result['enrolled']} enrollments, {len(result['rejected'])} rejected).")
+    if result["rejected"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import sys
+import argparse
+
+from src.Student_Wellbeing_App.core.repositories.WellbeingRepository import WellbeingRepository
+
+
+# Recomputes (or just verifies) the wellbeing_weekly_agg summary table.
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild or verify the weekly wellbeing aggregate.")
+    parser.add_argument("--check", action="store_true",
+                        help="only compare the aggregate with wellbeing_record; exit 1 on drift")
+    args = parser.parse_args()
+
+    repo = WellbeingRepository()
+    if not args.check:
+        groups = repo.rebuild_weekly_agg()
+        print(f"✅ wellbeing_weekly_agg rebuilt ({groups} week/cohort groups).")
+        return
+
+    problems = repo.check_weekly_agg()
+    for p in problems:
+        print(f"❌ {p['week_start']} cohort {p['cohort_year']}: expected {p['expected']}, found {p['actual']}")
+    if problems:
+        sys.exit(1)
+    print("✅ wellbeing_weekly_agg matches wellbeing_record.")
+
+
+if __name__ == "__main__":
+    main()
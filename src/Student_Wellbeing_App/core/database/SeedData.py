@@ -1,9 +1,14 @@
 import sqlite3
 import random
 import hashlib
+import uuid
 from datetime import date, timedelta, datetime, time
 from pathlib import Path
 
+from src.Student_Wellbeing_App.core.database.connection import apply_storage_profile
+from src.Student_Wellbeing_App.core.database.migrations import WELLBEING_WEEKLY_AGG_REBUILD, STUDENT_SEARCH_REBUILD
+from src.Student_Wellbeing_App.core.repositories.AuditArchiveRepository import ARCHIVE_DIRNAME, rotate_archive
+
 # --- Configuration ---
 DB_PATH = Path(__file__).resolve().parent / "student_wellbeing_db.sqlite3"
 MODULES = [
@@ -18,7 +23,10 @@ STAFF = [
 ]
 TEACHER_MAP = {"EMP0003": ["CS101", "CS102"], "EMP0004": ["DS201", "AI301"], "EMP0005": ["ET101", "UX201"]}
 
-def get_conn(): return sqlite3.connect(DB_PATH)
+def get_conn():
+    conn = sqlite3.connect(DB_PATH)
+    apply_storage_profile(conn, "bulk-load")  # thousands of inserts, one commit at the end
+    return conn
 def hash_pw(pw): return hashlib.sha256(pw.encode()).hexdigest()
 def rnd_time(day): return datetime.combine(day, time(random.randint(9, 17), random.randint(0, 59)))
 
@@ -32,10 +40,13 @@ def seed_data():
 
     # 1. Clean Slate (Delete data but keep schema)
     tables = ["audit_log", "submission", "attendance", "wellbeing_record", "alert", "enrollment", 
-              "teaching_assignment", "assessment", "student", "module", "user", "retention_rule"]
+              "teaching_assignment", "assessment", "student", "module", "user", "retention_rule", "wellbeing_weekly_agg"]
     for t in tables: 
         try: cur.execute(f"DELETE FROM {t}"); cur.execute("DELETE FROM sqlite_sequence WHERE name=?", (t,))
         except: pass
+    # audit_log ids start over: new database identity, old audit archive moved aside
+    cur.execute("INSERT OR REPLACE INTO db_meta (key, value) VALUES ('db_id', ?)", (uuid.uuid4().hex,))
+    rotate_archive(DB_PATH.parent / ARCHIVE_DIRNAME)
 
     # 2. Init Core Data (Modules & Staff)
     print("✨ Initializing Modules and Staff...")
@@ -154,6 +165,17 @@ def seed_data():
     print("⚙️ Setting Retention Rules...")
     cur.execute("INSERT OR IGNORE INTO retention_rule (rule_id, data_type, retention_months, is_active) VALUES (1, 'RESOLVED_ALERTS', 12, 1)")
     cur.execute("INSERT OR IGNORE INTO retention_rule (rule_id, data_type, retention_months, is_active) VALUES (2, 'GRADUATED_STUDENTS', 48, 1)")
+    cur.execute("INSERT OR IGNORE INTO retention_rule (rule_id, data_type, retention_months, is_active) VALUES (3, 'AUDIT_LOG', 12, 1)")
+
+    # 7. Weekly wellbeing aggregate (raw inserts above bypass the repository)
+    try: cur.execute(WELLBEING_WEEKLY_AGG_REBUILD)
+    except sqlite3.OperationalError: print("⚠ wellbeing_weekly_agg missing - run migrations first.")
+
+    # 8. Student search index
+    try:
+        cur.execute("DELETE FROM student_search")
+        cur.execute(STUDENT_SEARCH_REBUILD)
+    except sqlite3.OperationalError: print("⚠ student_search missing - run migrations first.")
 
     conn.commit()
     conn.close()
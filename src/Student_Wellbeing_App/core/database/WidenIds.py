@@ -0,0 +1,25 @@
+import sys
+import argparse
+
+from src.Student_Wellbeing_App.core.database.migrations import ID_SEQUENCES
+from src.Student_Wellbeing_App.core.repositories.IdSequence import IdSequenceError, set_id_width
+
+
+# Re-pads STUxxxx / EMPxxxx ids to more digits across every table (see IdSequence.widen_ids).
+# Stop the apps first when WELLBEING_ID_BLOCK_SIZE > 1: reserved blocks keep the old width.
+def main():
+    parser = argparse.ArgumentParser(description="Widen the student or staff ids, re-padding existing ones.")
+    parser.add_argument("sequence", choices=sorted(ID_SEQUENCES))
+    parser.add_argument("width", type=int, help="digits after the prefix, e.g. 6 for STU000001")
+    args = parser.parse_args()
+
+    try:
+        changed = set_id_width(args.sequence, args.width)
+    except IdSequenceError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ {args.sequence} ids are now {args.width} digits wide ({changed} rows re-padded).")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
+from datetime import datetime
 from pathlib import Path
 import sqlite3
 
 BASE_DIR = Path(__file__).resolve().parent
 DB_FILENAME = "student_wellbeing_db.sqlite3"
 DB_FILE = BASE_DIR / DB_FILENAME
+# Audit archive of this database (see AuditArchiveRepository); kept, but moved aside
+ARCHIVE_DIR = BASE_DIR / "audit_archive"
 
 # Removes the database file from disk.
 def wipe_database():
@@ -21,6 +24,12 @@ def wipe_database():
 
     print("✅ SQLite database file deleted.")
 
+    # a new database reuses log_ids, so its archive must start empty
+    if ARCHIVE_DIR.exists():
+        target = ARCHIVE_DIR.with_name(f"{ARCHIVE_DIR.name}-{datetime.now():%Y%m%d-%H%M%S}")
+        ARCHIVE_DIR.rename(target)
+        print(f"📦 Audit archive moved to {target.name}.")
+
 
 if __name__ == "__main__":
     wipe_database()
@@ -1,5 +1,14 @@
+"""
+Database connection helpers: the database path, storage profiles and the
+shared connection pools (migrations live in migrations.py).
+"""
+
 import sqlite3
 import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 from pathlib import Path
 
 # --- Absolute Path ---
@@ -10,14 +19,388 @@ DB_PATH = CURRENT_DIR / DB_FILENAME
 # Export a name other modules can print/log if they want
 DB_NAME = DB_PATH
 
+# --- Pool Settings ---
+# Max connections per database file (idle + checked out)
+POOL_MAX_SIZE = int(os.environ.get("WELLBEING_DB_POOL_SIZE", "8"))
+# Seconds a caller waits for a free connection before giving up
+POOL_TIMEOUT = float(os.environ.get("WELLBEING_DB_POOL_TIMEOUT", "5.0"))
+# Idle seconds after which a connection is pinged before being handed out
+POOL_HEALTH_CHECK_INTERVAL = 30.0
+
+# --- Storage Profiles ---
+# WAL lets many readers run alongside one writer; the profiles trade
+# durability of the last few commits against write speed.
+#   durable   - fsync on every commit (safest, slowest writes)
+#   balanced  - fsync at WAL checkpoints only; survives app crashes,
+#               may lose the last commits on power loss (default)
+#   bulk-load - no fsync, big cache; for seeding / imports only
+STORAGE_PROFILES = {
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -8000,        # negative = KiB, i.e. ~8 MB
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,       # ms to wait on a locked database
+    },
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "bulk-load": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 30000,
+    },
+}
+DEFAULT_STORAGE_PROFILE = "balanced"
+
+_active_profile = os.environ.get("WELLBEING_DB_PROFILE", DEFAULT_STORAGE_PROFILE)
+if _active_profile not in STORAGE_PROFILES:
+    raise ValueError(f"Unknown WELLBEING_DB_PROFILE: {_active_profile!r}")
+
+# PRAGMA values come back as numbers; map them to the names used above
+_SYNCHRONOUS_NAMES = {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"}
+_TEMP_STORE_NAMES = {0: "DEFAULT", 1: "FILE", 2: "MEMORY"}
+
 # Optional: Log the DB path for debugging
 print(f"✈️ [DB CONNECTION] Connecting to: 👉 {DB_PATH}")
 
-def get_db_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
+
+def apply_storage_profile(conn: sqlite3.Connection, name: str = None) -> None:
+    """Apply the PRAGMAs of a storage profile (default: the active one) to conn."""
+    name = name or _active_profile
+    try:
+        profile = STORAGE_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown storage profile: {name!r}") from None
+
+    # busy_timeout first so switching the journal mode can wait for other writers
+    conn.execute(f"PRAGMA busy_timeout = {int(profile['busy_timeout'])}")
+    try:
+        conn.execute(f"PRAGMA journal_mode = {profile['journal_mode']}")
+    except sqlite3.OperationalError:
+        # journal_mode is stored in the file; another process holding a lock
+        # just means we keep whatever mode the file already has
+        pass
+    conn.execute(f"PRAGMA synchronous = {profile['synchronous']}")
+    conn.execute(f"PRAGMA cache_size = {int(profile['cache_size'])}")
+    conn.execute(f"PRAGMA mmap_size = {int(profile['mmap_size'])}")
+    conn.execute(f"PRAGMA temp_store = {profile['temp_store']}")
+
+
+def get_storage_profile() -> str:
+    return _active_profile
+
+
+def set_storage_profile(name: str) -> None:
+    """
+    Switch the active profile. Pools are recycled so every connection
+    handed out afterwards uses the new settings.
+    """
+    global _active_profile
+    if name not in STORAGE_PROFILES:
+        raise ValueError(f"Unknown storage profile: {name!r}")
+    _active_profile = name
+    close_all_pools()
+
+
+def get_storage_settings(conn: sqlite3.Connection = None) -> dict:
+    """Report the settings actually in effect on conn (or a pooled connection)."""
+    own = conn is None
+    if own:
+        conn = get_db_pool()
+    try:
+        def pragma(key):
+            row = conn.execute(f"PRAGMA {key}").fetchone()
+            return row[0] if row is not None else None
+
+        return {
+            "profile": _active_profile,
+            "journal_mode": str(pragma("journal_mode")).upper(),
+            "synchronous": _SYNCHRONOUS_NAMES.get(pragma("synchronous")),
+            "cache_size": pragma("cache_size"),
+            "mmap_size": pragma("mmap_size"),
+            "temp_store": _TEMP_STORE_NAMES.get(pragma("temp_store")),
+            "busy_timeout": pragma("busy_timeout"),
+            "foreign_keys": bool(pragma("foreign_keys")),
+        }
+    finally:
+        if own:
+            conn.close()
+
+
+def _init_connection(conn: sqlite3.Connection) -> None:
+    # Per-connection settings every caller relies on
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON")
+    apply_storage_profile(conn)
+
+
+def get_db_connection() -> sqlite3.Connection:
+    conn = sqlite3.connect(DB_PATH)
+    _init_connection(conn)
 
     return conn
 
-get_db_pool = get_db_connection
+
+class PoolTimeoutError(sqlite3.OperationalError):
+    """Raised when no pooled connection became free within the timeout."""
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    sqlite3 connection owned by a ConnectionPool.
+    close() hands the connection back to its pool instead of closing it,
+    so repositories keep their usual open -> work -> close shape.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool = None
+        self._checked_out = False
+        self._last_used = time.monotonic()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.release(self)
+        else:
+            super().close()
+
+    def discard(self):
+        """Really close the underlying sqlite handle."""
+        self._pool = None
+        super().close()
+
+    def __del__(self):
+        # A checkout that was never closed must not shrink the pool forever
+        pool = getattr(self, "_pool", None)
+        if pool is not None and getattr(self, "_checked_out", False):
+            pool._forget()
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of sqlite3 connections to one database file.
+
+    - acquire() checks a connection out; close() / release() returns it.
+    - At most max_size connections exist at once; callers block up to
+      `timeout` seconds for a free one, then get PoolTimeoutError.
+    - Connections are opened with check_same_thread=False, because an idle
+      connection is handed to whichever thread asks next. That turns off
+      sqlite3's own thread check and the pool does not replace it: a
+      checked-out connection belongs to the caller until close(), and must
+      not be shared with other threads meanwhile.
+    - PRAGMAs and row_factory are applied once, when a connection is created.
+    - Connections idle for longer than health_check_interval are pinged on
+      checkout and replaced if the ping fails.
+    """
+
+    def __init__(
+            self,
+            db_path,
+            max_size: int = POOL_MAX_SIZE,
+            timeout: float = POOL_TIMEOUT,
+            health_check_interval: float = POOL_HEALTH_CHECK_INTERVAL,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.db_path = str(db_path)
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        # RLock: a leaked connection may be reclaimed by GC while the lock is held
+        self._cond = threading.Condition(threading.RLock())
+        self._idle = deque()   # LIFO: most recently used connection is reused first
+        self._size = 0         # connections alive (idle + checked out)
+        self._closed = False
+
+        # counters for stats()
+        self._created = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._health_failures = 0
+
+    # ---------- Checkout / Return ----------
+
+    def acquire(self, timeout: float = None) -> PooledConnection:
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("Connection pool is closed.")
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    conn = None
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(
+                        f"No free connection to {self.db_path} after {timeout}s "
+                        f"(max_size={self.max_size})"
+                    )
+                self._waits += 1
+                self._cond.wait(remaining)
+            self._checkouts += 1
+
+        # Connecting and pinging happen outside the lock
+        if conn is None:
+            conn = self._create()
+        elif time.monotonic() - conn._last_used > self.health_check_interval and not self._is_healthy(conn):
+            conn = self._replace(conn)
+
+        conn._checked_out = True
+        return conn
+
+    def release(self, conn: PooledConnection) -> None:
+        if not conn._checked_out:
+            return  # double close is harmless
+        conn._checked_out = False
+
+        try:
+            # Never hand uncommitted work to the next caller
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+        except sqlite3.Error:
+            self._drop(conn)
+            return
+
+        with self._cond:
+            if self._closed:
+                self._size -= 1
+                conn.discard()
+                return
+            conn._last_used = time.monotonic()
+            self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """`with pool.connection() as conn:` - checkout that always returns."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    # ---------- Lifecycle ----------
+
+    def close_all(self) -> None:
+        """Close idle connections and refuse new checkouts.
+        Checked-out connections are closed when they are returned."""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._idle.pop().discard()
+                self._size -= 1
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "db_path": self.db_path,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "created": self._created,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "health_failures": self._health_failures,
+            }
+
+    # ---------- Internals ----------
+
+    def _create(self) -> PooledConnection:
+        try:
+            conn = sqlite3.connect(self.db_path, factory=PooledConnection, check_same_thread=False)
+            _init_connection(conn)
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        conn._pool = self
+        with self._cond:
+            self._created += 1
+        return conn
+
+    def _is_healthy(self, conn: PooledConnection) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _replace(self, conn: PooledConnection) -> PooledConnection:
+        with self._cond:
+            self._health_failures += 1
+        try:
+            conn.discard()
+        except sqlite3.Error:
+            pass
+        # Keep the slot reserved for the fresh connection
+        return self._create()
+
+    def _forget(self) -> None:
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def _drop(self, conn: PooledConnection) -> None:
+        try:
+            conn.discard()
+        except sqlite3.Error:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+
+# --- Shared pools, one per database file ---
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path=None) -> ConnectionPool:
+    """Return the shared pool for db_path (defaults to DB_PATH)."""
+    path = str(db_path or DB_PATH)
+    pool = _pools.get(path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(path)
+            if pool is None:
+                pool = _pools[path] = ConnectionPool(path)
+    return pool
+
+
+def get_db_pool() -> sqlite3.Connection:
+    """
+    Check a connection out of the shared pool for DB_PATH.
+    Calling close() on it returns it to the pool.
+    """
+    return get_pool().acquire()
+
+
+def close_all_pools() -> None:
+    """Close every shared pool (e.g. before deleting the database file)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
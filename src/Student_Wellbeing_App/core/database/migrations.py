@@ -1,5 +1,8 @@
 import os
 import sys
+import uuid
+import sqlite3
+import argparse
 from pathlib import Path
 from datetime import datetime
 
@@ -14,13 +17,14 @@ from src.Student_Wellbeing_App.core.database.connection import (
     DB_NAME,
 )
 
-def run_migrations():
-    # Connect using the same helper + same DB path as the rest of the app
-    conn = get_db_connection()
-    cursor = conn.cursor()
+# ---------------------------------------------------------
+#  Versioned, forward-only migrations
+# ---------------------------------------------------------
+# Each step runs once, inside its own transaction, and is recorded in
+# schema_version. Never edit or renumber a shipped step - add a new one.
 
-    print("DB file path:", DB_NAME)
 
+def _m0001_initial_schema(cursor):
     # 1. Student
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS student (
@@ -158,11 +162,431 @@ def run_migrations():
     )
     """)
 
-    conn.commit()
-    print(f"[{datetime.utcnow()}] ✅Migrations completed successfully on {DB_NAME}")
+
+def _m0002_hot_lookup_indexes(cursor):
+    # Secondary indexes for the lookups every dashboard render performs
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_attendance_student ON attendance(student_id, session_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_attendance_session ON attendance(session_id, session_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_wellbeing_student_week ON wellbeing_record(student_id, week_start)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_submission_student_assessment ON submission(student_id, assessment_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_submission_assessment ON submission(assessment_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_alert_resolved_created ON alert(resolved, created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_log_timestamp ON audit_log(timestamp)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_assessment_module ON assessment(module_code)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_enrollment_module ON enrollment(module_code)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_enrollment_student ON enrollment(student_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_teaching_assignment_user ON teaching_assignment(user_id)")
+
+
+def _m0003_unique_upsert_keys(cursor):
+    # Racing SELECT-then-INSERT upserts could leave duplicate rows behind.
+    # Keep the oldest row of each group - it is the one later upserts kept
+    # updating - then enforce the natural keys the repositories upsert on.
+    cursor.execute("""
+    DELETE FROM wellbeing_record WHERE record_id NOT IN (
+        SELECT MIN(record_id) FROM wellbeing_record GROUP BY student_id, week_start
+    )
+    """)
+    cursor.execute("""
+    DELETE FROM attendance WHERE attendance_id NOT IN (
+        SELECT MIN(attendance_id) FROM attendance GROUP BY student_id, session_date, session_id
+    )
+    """)
+    cursor.execute("""
+    DELETE FROM submission WHERE submission_id NOT IN (
+        SELECT MIN(submission_id) FROM submission GROUP BY student_id, assessment_id
+    )
+    """)
+
+    # The unique indexes replace the plain ones from step 2
+    cursor.execute("DROP INDEX IF EXISTS idx_wellbeing_student_week")
+    cursor.execute("DROP INDEX IF EXISTS idx_attendance_student")
+    cursor.execute("DROP INDEX IF EXISTS idx_submission_student_assessment")
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_wellbeing_student_week ON wellbeing_record(student_id, week_start)")
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_attendance_student_session ON attendance(student_id, session_date, session_id)")
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_submission_student_assessment ON submission(student_id, assessment_id)")
+
+
+# Rebuilds wellbeing_weekly_agg from wellbeing_record (also used by
+# WellbeingRepository.rebuild_weekly_agg)
+WELLBEING_WEEKLY_AGG_REBUILD = """
+INSERT INTO wellbeing_weekly_agg (
+    week_start, cohort_year, record_count,
+    stress_sum, stress_min, stress_max,
+    sleep_sum, sleep_min, sleep_max
+)
+SELECT w.week_start, COALESCE(s.year, 0), COUNT(*),
+       SUM(w.stress_level), MIN(w.stress_level), MAX(w.stress_level),
+       SUM(w.sleep_hours), MIN(w.sleep_hours), MAX(w.sleep_hours)
+FROM wellbeing_record w
+LEFT JOIN student s ON s.student_id = w.student_id
+GROUP BY w.week_start, COALESCE(s.year, 0)
+"""
+
+
+def _m0004_wellbeing_weekly_agg(cursor):
+    # Per week + cohort totals so trend charts read O(weeks) rows.
+    # Kept up to date by WellbeingRepository writes.
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS wellbeing_weekly_agg (
+        week_start   DATE NOT NULL,
+        cohort_year  INTEGER NOT NULL,
+        record_count INTEGER NOT NULL,
+        stress_sum   REAL NOT NULL,
+        stress_min   REAL,
+        stress_max   REAL,
+        sleep_sum    REAL NOT NULL,
+        sleep_min    REAL,
+        sleep_max    REAL,
+        PRIMARY KEY (week_start, cohort_year)
+    )
+    """)
+    # min/max of a week are recomputed from this index after deletes
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_wellbeing_week ON wellbeing_record(week_start)")
+    cursor.execute("DELETE FROM wellbeing_weekly_agg")
+    cursor.execute(WELLBEING_WEEKLY_AGG_REBUILD)
+
+
+def _m0005_audit_log_filters(cursor):
+    # Keyset pages of AuditRepository.query_logs, newest first. log_id is the
+    # rowid, so every index already ends in it and (timestamp, log_id)
+    # ordering comes straight from the index.
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_log_user_ts ON audit_log(user_id, timestamp)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_log_action_ts ON audit_log(action, timestamp)")
+
+
+def _m0006_user_list_sort(cursor):
+    # Sorted, paged user lists (UserRepository.get_page). Each index matches
+    # one sort order, so pages come off the index without a temp sort.
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_name ON user(first_name, lastname, user_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_lastname ON user(lastname, first_name, user_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_role_name ON user(role, first_name, lastname, user_id)")
+
+
+# Refills the student search index from the student table (migration 7,
+# StudentRepository.rebuild_search_index and bulk loaders that insert
+# students directly). Run after DELETE FROM student_search.
+STUDENT_SEARCH_REBUILD = """
+INSERT INTO student_search (student_id, name, email)
+SELECT student_id, first_name || ' ' || lastname, COALESCE(email, '') FROM student
+"""
+
+
+def _m0007_student_search(cursor):
+    # FTS5 index with the trigram tokenizer: any substring of 3+ characters
+    # (case-insensitive) is an index lookup, which also gives fuzzy matching
+    # by trigram overlap. Kept up to date by StudentRepository writes.
+    cursor.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS student_search
+    USING fts5(student_id, name, email, tokenize = 'trigram')
+    """)
+    cursor.execute("DELETE FROM student_search")
+    cursor.execute(STUDENT_SEARCH_REBUILD)
+
+
+# Sequences behind the STUxxxx / EMPxxxx ids: name -> (prefix, table, id column).
+# An id is the prefix plus the number zero-padded to the sequence's width;
+# one width per sequence keeps string order equal to numeric order.
+ID_SEQUENCES = {
+    "student": ("STU", "student", "student_id"),
+    "user": ("EMP", "user", "user_id"),
+}
+# Width for sequences that have not issued any id yet
+DEFAULT_ID_WIDTH = int(os.environ.get("WELLBEING_ID_WIDTH", "4"))
+
+
+def sync_id_sequences(cursor, width: int = None) -> None:
+    """
+    Create missing id_sequence rows and raise last_value to the highest id
+    already in each table (never lowers it). A sequence takes the width of
+    the ids it finds, or `width` if the table has none.
+    """
+    width = width or DEFAULT_ID_WIDTH
+    for name, (prefix, table, column) in ID_SEQUENCES.items():
+        cursor.execute(
+            "INSERT OR IGNORE INTO id_sequence (name, prefix, width, last_value) VALUES (?, ?, ?, 0)",
+            (name, prefix, width),
+        )
+        cursor.execute(
+            f"""
+            UPDATE id_sequence SET
+                last_value = MAX(last_value, COALESCE(t.max_value, 0)),
+                width = COALESCE(t.max_width, width)
+            FROM (
+                SELECT MAX(CAST(substr({column}, {len(prefix) + 1}) AS INTEGER)) AS max_value,
+                       MAX(length({column}) - {len(prefix)}) AS max_width
+                FROM "{table}" WHERE {column} GLOB ?
+            ) AS t
+            WHERE name = ?
+            """,
+            (f"{prefix}[0-9]*", name),
+        )
+
+
+def _m0008_id_sequence(cursor):
+    # Ids are handed out by one atomic UPDATE ... RETURNING on this table
+    # (repositories/IdSequence.py) instead of reading the highest id and
+    # adding one, which let two concurrent saves pick the same id.
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS id_sequence (
+        name       TEXT PRIMARY KEY,
+        prefix     TEXT NOT NULL,
+        width      INTEGER NOT NULL,
+        last_value INTEGER NOT NULL
+    )
+    """)
+    # Rows inserted with explicit ids (SeedData, imports, tests) move the
+    # sequence past themselves, so the next allocation cannot collide.
+    for name, (prefix, table, column) in ID_SEQUENCES.items():
+        suffix = f"CAST(substr(NEW.{column}, {len(prefix) + 1}) AS INTEGER)"
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_id_sequence_sync
+        AFTER INSERT ON "{table}"
+        WHEN NEW.{column} GLOB '{prefix}[0-9]*'
+        BEGIN
+            UPDATE id_sequence SET last_value = {suffix}
+            WHERE name = '{name}' AND last_value < {suffix};
+        END
+        """)
+    sync_id_sequences(cursor)
+
+
+def _m0009_db_meta(cursor):
+    # A random id for this database. The audit archive manifest records it,
+    # so an archive left behind by a wiped or reseeded database (whose
+    # log_ids start over) is never mixed with this one's rows.
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS db_meta (
+        key   TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO db_meta (key, value) VALUES ('db_id', ?)", (uuid.uuid4().hex,))
+
+
+MIGRATIONS = [
+    (1, "initial_schema", _m0001_initial_schema),
+    (2, "hot_lookup_indexes", _m0002_hot_lookup_indexes),
+    (3, "unique_upsert_keys", _m0003_unique_upsert_keys),
+    (4, "wellbeing_weekly_agg", _m0004_wellbeing_weekly_agg),
+    (5, "audit_log_filters", _m0005_audit_log_filters),
+    (6, "user_list_sort", _m0006_user_list_sort),
+    (7, "student_search", _m0007_student_search),
+    (8, "id_sequence", _m0008_id_sequence),
+    (9, "db_meta", _m0009_db_meta),
+]
+
+
+def _ensure_version_table(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version    INTEGER PRIMARY KEY,
+        name       TEXT NOT NULL,
+        applied_at DATETIME NOT NULL
+    )
+    """)
+
+
+def get_schema_version(conn) -> int:
+    """Highest applied migration number (0 for a blank database)."""
+    cursor = conn.cursor()
+    _ensure_version_table(cursor)
+    row = cursor.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    cursor.close()
+    return row[0] or 0
+
+
+# Oldest SQLite the schema and repositories run on: RETURNING (3.35),
+# the FTS5 trigram tokenizer (3.34) and UPDATE ... FROM (3.33)
+MIN_SQLITE_VERSION = (3, 35, 0)
+
+
+def check_sqlite_version(version: str = None) -> None:
+    """Fail with a readable message instead of a syntax error half-way through."""
+    version = version or sqlite3.sqlite_version
+    found = tuple(int(part) for part in version.split(".")[:3])
+    if found < MIN_SQLITE_VERSION:
+        needed = ".".join(map(str, MIN_SQLITE_VERSION))
+        raise RuntimeError(
+            f"SQLite {version} is too old: this app needs SQLite {needed} or newer "
+            f"(RETURNING, FTS5 trigram search). Upgrade Python or its sqlite3 library."
+        )
+
+
+def run_migrations():
+    check_sqlite_version()
+    # Connect using the same helper + same DB path as the rest of the app
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    print("DB file path:", DB_NAME)
+
+    versions = [v for v, _, _ in MIGRATIONS]
+    if versions != sorted(set(versions)):
+        raise RuntimeError("Migration numbers must be unique and ascending.")
+
+    current = get_schema_version(conn)
+    for version, name, step in MIGRATIONS:
+        if version <= current:
+            continue
+        try:
+            cursor.execute("BEGIN")
+            step(cursor)
+            cursor.execute(
+                "INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+                (version, name, datetime.utcnow()),
+            )
+            conn.commit()
+            print(f"  -> applied migration {version:04d}_{name}")
+        except Exception:
+            conn.rollback()
+            cursor.close()
+            conn.close()
+            raise
+
+    print(f"[{datetime.utcnow()}] ✅Migrations completed successfully on {DB_NAME} (schema v{get_schema_version(conn)})")
 
     cursor.close()
     conn.close()
 
+
+# ---------------------------------------------------------
+#  Query plan guard
+# ---------------------------------------------------------
+# Hot queries that must be served by an index. A plain "SCAN <table>" or a
+# temp B-tree sort in their plan means an index went missing.
+HOT_QUERIES = {
+    "attendance_by_student": (
+        "SELECT attendance_id, student_id, session_date, session_id, status FROM attendance WHERE student_id = ?",
+        ("STU0001",),
+    ),
+    "attendance_by_session": (
+        "SELECT attendance_id, student_id, session_date, session_id, status FROM attendance WHERE session_id = ?",
+        ("CS101",),
+    ),
+    "wellbeing_by_student_week": (
+        "SELECT record_id FROM wellbeing_record WHERE student_id = ? AND week_start = ?",
+        ("STU0001", "2025-01-06"),
+    ),
+    "wellbeing_by_student": (
+        "SELECT record_id, student_id, week_start, stress_level, sleep_hours, source_type "
+        "FROM wellbeing_record WHERE student_id = ? ORDER BY week_start DESC",
+        ("STU0001",),
+    ),
+    "submission_by_student_assessment": (
+        "SELECT submission_id FROM submission WHERE student_id = ? AND assessment_id = ?",
+        ("STU0001", 1),
+    ),
+    "submission_by_assessment": (
+        "SELECT submission_id, student_id, mark, status FROM submission WHERE assessment_id = ?",
+        (1,),
+    ),
+    "active_alerts": (
+        "SELECT alert_id, student_id, alert_type, reason, created_at, resolved FROM alert WHERE resolved=0",
+        (),
+    ),
+    "resolved_alerts": (
+        "SELECT alert_id, student_id, alert_type, reason, created_at, resolved FROM alert "
+        "WHERE resolved=1 ORDER BY created_at DESC",
+        (),
+    ),
+    "wellbeing_week_bounds": (
+        "SELECT MIN(w.stress_level), MAX(w.stress_level), MIN(w.sleep_hours), MAX(w.sleep_hours) "
+        "FROM wellbeing_record w LEFT JOIN student s ON s.student_id = w.student_id "
+        "WHERE w.week_start = ? AND COALESCE(s.year, 0) = ?",
+        ("2025-01-06", 2024),
+    ),
+    "recent_audit_logs": (
+        "SELECT * FROM audit_log ORDER BY timestamp DESC LIMIT ?",
+        (50,),
+    ),
+    "audit_logs_page": (
+        "SELECT log_id, user_id, action, details, timestamp FROM audit_log "
+        "WHERE (timestamp, log_id) < (?, ?) ORDER BY timestamp DESC, log_id DESC LIMIT ?",
+        ("2025-06-01 00:00:00", 1000, 51),
+    ),
+    "audit_logs_by_user_page": (
+        "SELECT log_id, user_id, action, details, timestamp FROM audit_log "
+        "WHERE user_id = ? AND timestamp >= ? AND (timestamp, log_id) < (?, ?) "
+        "ORDER BY timestamp DESC, log_id DESC LIMIT ?",
+        ("EMP0001", "2025-01-01", "2025-06-01 00:00:00", 1000, 51),
+    ),
+    "audit_logs_by_action_page": (
+        "SELECT log_id, user_id, action, details, timestamp FROM audit_log "
+        "WHERE action = ? ORDER BY timestamp DESC, log_id DESC LIMIT ?",
+        ("LOGIN", 51),
+    ),
+    "users_page": (
+        "SELECT user_id, first_name, lastname, role FROM user "
+        "ORDER BY first_name, lastname, user_id LIMIT ? OFFSET ?",
+        (100, 200),
+    ),
+    "users_by_role_page": (
+        "SELECT user_id, first_name, lastname, role FROM user WHERE role = ? "
+        "ORDER BY first_name DESC, lastname DESC, user_id DESC LIMIT ? OFFSET ?",
+        ("ADMIN", 100, 0),
+    ),
+    "users_page_by_lastname": (
+        "SELECT user_id, first_name, lastname, role FROM user "
+        "ORDER BY lastname, first_name, user_id LIMIT ? OFFSET ?",
+        (100, 0),
+    ),
+    "assessments_by_module": (
+        "SELECT assessment_id, module_code, title, due_date, weight FROM assessment WHERE module_code = ?",
+        ("CS101",),
+    ),
+    "students_by_module": (
+        "SELECT student_id FROM enrollment WHERE module_code = ?",
+        ("CS101",),
+    ),
+    "modules_by_teacher": (
+        "SELECT module_code FROM teaching_assignment WHERE user_id = ?",
+        ("EMP0001",),
+    ),
+}
+
+
+def _plan_problems(plan_details) -> list:
+    problems = []
+    for detail in plan_details:
+        if detail.startswith("SCAN") and "USING" not in detail:
+            problems.append(detail)
+        elif "USE TEMP B-TREE" in detail:
+            problems.append(detail)
+    return problems
+
+
+def check_query_plans(conn, queries: dict = None) -> dict:
+    """
+    Run EXPLAIN QUERY PLAN for each hot query.
+    Returns {query_name: [offending plan lines]} - empty when all are indexed.
+    """
+    failures = {}
+    for name, (sql, params) in (queries or HOT_QUERIES).items():
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        problems = _plan_problems([row[3] for row in rows])
+        if problems:
+            failures[name] = problems
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations.")
+    parser.add_argument("--check-plans", action="store_true",
+                        help="fail if a hot query falls back to a full table scan")
+    args = parser.parse_args()
+
+    run_migrations()
+    if args.check_plans:
+        conn = get_db_connection()
+        failures = check_query_plans(conn)
+        conn.close()
+        for name, problems in failures.items():
+            print(f"❌ {name}: {'; '.join(problems)}")
+        if failures:
+            sys.exit(1)
+        print(f"✅ All {len(HOT_QUERIES)} hot queries use an index.")
+
+
 if __name__ == "__main__":
-    run_migrations()
\ No newline at end of file
+    main()
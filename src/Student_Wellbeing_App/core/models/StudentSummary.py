@@ -0,0 +1,15 @@
+from typing import NamedTuple
+
+
+# Read-only projection of a student for listings: no password hash.
+# A NamedTuple has __slots__ = (), so each row is one small tuple.
+class StudentSummary(NamedTuple):
+    student_id: str
+    first_name: str
+    lastname: str
+    email: str
+    year: int
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name} {self.lastname}"
@@ -0,0 +1,11 @@
+from typing import NamedTuple
+
+from src.Student_Wellbeing_App.core.models.UserRole import UserRole
+
+
+# Read-only projection of a staff user for listings: no password hash.
+class UserSummary(NamedTuple):
+    user_id: str
+    first_name: str
+    lastname: str
+    role: UserRole
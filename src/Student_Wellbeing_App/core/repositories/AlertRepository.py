@@ -1,10 +1,10 @@
 from src.Student_Wellbeing_App.core.models.Alert import Alert
 from src.Student_Wellbeing_App.core.models.AlertType import AlertType
-from src.Student_Wellbeing_App.core.database.connection import get_db_connection
+from src.Student_Wellbeing_App.core.database.connection import get_db_pool
 
 class AlertRepository:
     def save(self, a: Alert) -> int:
-        con = get_db_connection()
+        con = get_db_pool()
         curs = con.cursor()
         curs.execute(
             "INSERT INTO alert(student_id, alert_type, reason, created_at, resolved) VALUES(?, ?, ?, ?, ?)",
@@ -18,7 +18,7 @@ class AlertRepository:
 
     def list_active(self):
         """Fetch unresolved alerts (resolved = 0)"""
-        con = get_db_connection()
+        con = get_db_pool()
         curs = con.cursor()
         curs.execute(
             "SELECT alert_id, student_id, alert_type, reason, created_at, resolved FROM alert WHERE resolved=0"
@@ -29,9 +29,19 @@ class AlertRepository:
         # Convert rows to Alert objects
         return [Alert(row[0], row[1], row[2], row[3], row[4], bool(row[5])) for row in r]
 
+    def count_active(self) -> int:
+        """Number of unresolved alerts, counted in SQL."""
+        con = get_db_pool()
+        curs = con.cursor()
+        curs.execute("SELECT COUNT(*) FROM alert WHERE resolved=0")
+        total = curs.fetchone()[0]
+        curs.close()
+        con.close()
+        return total
+
     def list_resolved(self):
         """Fetch resolved alerts history (resolved = 1)"""
-        con = get_db_connection()
+        con = get_db_pool()
         curs = con.cursor()
         curs.execute(
             "SELECT alert_id, student_id, alert_type, reason, created_at, resolved FROM alert WHERE resolved=1 ORDER BY created_at DESC"
@@ -42,7 +52,7 @@ class AlertRepository:
         return [Alert(row[0], row[1], row[2], row[3], row[4], bool(row[5])) for row in r]
 
     def resolve(self, i: int):
-        con = get_db_connection()
+        con = get_db_pool()
         curs = con.cursor()
         try:
             curs.execute("UPDATE alert SET resolved=1 WHERE alert_id=?", (i,))
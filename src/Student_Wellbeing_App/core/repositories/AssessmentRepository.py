@@ -1,10 +1,10 @@
 from typing import List
 from src.Student_Wellbeing_App.core.models.Assessment import Assessment
-from src.Student_Wellbeing_App.core.database.connection import get_db_connection
+from src.Student_Wellbeing_App.core.database.connection import get_db_pool
 
 class AssessmentRepository:
     def save(self, a: Assessment) -> int:
-        conn = get_db_connection()
+        conn = get_db_pool()
         cur = conn.cursor()
         cur.execute(
             "INSERT INTO assessment (module_code, title, due_date, weight) VALUES (?, ?, ?, ?)",
@@ -17,7 +17,7 @@ class AssessmentRepository:
         return new_id
 
     def get_by_module(self, module_code: str) -> List[Assessment]:
-        conn = get_db_connection()
+        conn = get_db_pool()
         cur = conn.cursor()
         cur.execute(
             "SELECT assessment_id, module_code, title, due_date, weight FROM assessment WHERE module_code = ?",
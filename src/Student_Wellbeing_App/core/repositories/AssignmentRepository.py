@@ -1,23 +1,10 @@
 # core/repositories/AssignmentRepository.py
 
 import sqlite3
-from pathlib import Path
 from typing import List, Optional
 
 from src.Student_Wellbeing_App.core.models.AssignmentRecord import AssignmentRecord
-
-# Same pattern as your AttendanceRepository
-DB_PATH = (
-        Path(__file__).resolve().parents[2]
-        / "database"
-        / "student_wellbeing_db.sqlite3"
-)
-
-
-def get_db_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+from src.Student_Wellbeing_App.core.database.connection import get_pool
 
 
 class AssignmentRepository:
@@ -44,7 +31,7 @@ class AssignmentRepository:
         Insert or update an AssignmentRecord.
         Returns the assignment_record_id.
         """
-        with get_db_connection() as conn:
+        with get_pool().connection() as conn:
             cur = conn.cursor()
 
             if record.assignment_record_id == 0:
@@ -102,7 +89,7 @@ class AssignmentRepository:
                 return record.assignment_record_id
 
     def get(self, assignment_record_id: int) -> Optional[AssignmentRecord]:
-        with get_db_connection() as conn:
+        with get_pool().connection() as conn:
             cur = conn.cursor()
             cur.execute(
                 """
@@ -116,7 +103,7 @@ class AssignmentRepository:
             return self._row_to_model(row) if row else None
 
     def get_by_student(self, student_id: str) -> List[AssignmentRecord]:
-        with get_db_connection() as conn:
+        with get_pool().connection() as conn:
             cur = conn.cursor()
             cur.execute(
                 """
@@ -133,7 +120,7 @@ class AssignmentRepository:
         """
         Assignments not yet submitted (submitted = 0).
         """
-        with get_db_connection() as conn:
+        with get_pool().connection() as conn:
             cur = conn.cursor()
             cur.execute(
                 """
@@ -151,7 +138,7 @@ class AssignmentRepository:
         """
         Assignments that have a mark.
         """
-        with get_db_connection() as conn:
+        with get_pool().connection() as conn:
             cur = conn.cursor()
             cur.execute(
                 """
@@ -1,37 +1,62 @@
 # src/Student_Wellbeing_App/core/repositories/AttendanceRepository.py
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 from src.Student_Wellbeing_App.core.models.AttendanceRecord import AttendanceRecord
-from src.Student_Wellbeing_App.core.database.connection import get_db_connection
+from src.Student_Wellbeing_App.core.database.connection import get_db_pool
 from src.Student_Wellbeing_App.core.models.AttendanceStatus import AttendanceStatus
 
 class AttendanceRepository:
     def upsert(self, a: AttendanceRecord) -> int:
-        conn = get_db_connection()
+        conn = get_db_pool()
         cur = conn.cursor()
         try:
-            # 1. check if record exists
-            cur.execute("SELECT attendance_id FROM attendance WHERE student_id=? AND session_date=? AND session_id=?", 
-                        (a.student_id, a.session_date, a.session_id))
-            row = cur.fetchone()
-            
-            if row:
-                # 2. if exist -> UPDATE
-                cur.execute("UPDATE attendance SET status=? WHERE attendance_id=?", (a.status.value, row[0]))
-                conn.commit()
-                return row[0]
-            else:
-                # 3. if did not exist -> INSERT
-                cur.execute("INSERT INTO attendance(student_id, session_date, session_id, status) VALUES(?, ?, ?, ?)", 
-                            (a.student_id, a.session_date, a.session_id, a.status.value))
-                conn.commit()
-                return cur.lastrowid or 0
+            # insert, or update the status if this student/session is already marked
+            cur.execute(
+                """
+                INSERT INTO attendance(student_id, session_date, session_id, status) VALUES(?, ?, ?, ?)
+                ON CONFLICT(student_id, session_date, session_id) DO UPDATE SET status = excluded.status
+                RETURNING attendance_id
+                """,
+                (a.student_id, a.session_date, a.session_id, a.status.value))
+            attendance_id = cur.fetchone()[0]
+            conn.commit()
+            return attendance_id
+        finally:
+            cur.close()
+            conn.close()
+
+    def upsert_register(self, session_id: str, session_date, statuses: Dict[str, AttendanceStatus]) -> int:
+        """
+        Write a whole session register (student_id -> status) with one
+        executemany upsert in a single transaction. Returns the row count.
+        """
+        rows = [(student_id, session_date, session_id, status.value) for student_id, status in statuses.items()]
+        if not rows:
+            return 0
+
+        conn = get_db_pool()
+        cur = conn.cursor()
+        try:
+            cur.executemany(
+                """
+                INSERT INTO attendance(student_id, session_date, session_id, status) VALUES(?, ?, ?, ?)
+                ON CONFLICT(student_id, session_date, session_id) DO UPDATE SET status = excluded.status
+                """,
+                rows)
+            conn.commit()
+            print(f"[DB LOG] Saved register for {session_id} on {session_date}: {len(rows)} rows")
+            return len(rows)
+        except Exception as e:
+            conn.rollback()
+            print(f"[DB ERROR] Register save failed: {e}")
+            raise e
         finally:
+            cur.close()
             conn.close()
 
     # update attendance status by attendance_id
     def update_status_by_id(self, attendance_id: int, new_status: str):
-        conn = get_db_connection()
+        conn = get_db_pool()
         try:
             conn.execute(
                 "UPDATE attendance SET status = ? WHERE attendance_id = ?",
@@ -47,7 +72,7 @@ class AttendanceRepository:
 
     # delete attendance record by attendance_id
     def delete_by_id(self, attendance_id: int):
-        conn = get_db_connection()
+        conn = get_db_pool()
         try:
             # insure attendance_id is an integer
             id_val = int(attendance_id)
@@ -71,7 +96,7 @@ class AttendanceRepository:
 
     #  get attendance record by attendance_id
     def get_by_student(self, student_id: str) -> List[AttendanceRecord]:
-        conn = get_db_connection()
+        conn = get_db_pool()
         cur = conn.cursor()
         cur.execute(
             "SELECT attendance_id, student_id, session_date, session_id, status FROM attendance WHERE student_id = ?",
@@ -84,7 +109,7 @@ class AttendanceRepository:
 
     #  get attendance records by session_id
     def get_by_session(self, session_id: str) -> List[AttendanceRecord]:
-        conn = get_db_connection()
+        conn = get_db_pool()
         cur = conn.cursor()
         cur.execute(
             "SELECT attendance_id, student_id, session_date, session_id, status FROM attendance WHERE session_id = ?",
@@ -92,4 +117,5 @@ class AttendanceRepository:
         )
         rows = cur.fetchall()
         cur.close()
+        conn.close()
         return [AttendanceRecord(r[0], r[1], r[2], r[3], AttendanceStatus(r[4])) for r in rows]
\ No newline at end of file
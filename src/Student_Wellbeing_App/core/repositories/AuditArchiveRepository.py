@@ -0,0 +1,261 @@
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.Student_Wellbeing_App.core.database import connection
+
+ARCHIVE_DIRNAME = "audit_archive"
+MANIFEST_NAME = "manifest.json"
+# Decoded month files kept in memory for query(); files are append-only,
+# so (path, bytes) identifies a decoded version exactly
+DECODED_MONTHS_CACHED = 6
+
+_decoded: "OrderedDict[Tuple[str, int], List[Dict[str, Any]]]" = OrderedDict()
+_decoded_lock = threading.Lock()
+
+
+class AuditArchiveRepository:
+    """
+    Append-only monthly archive of audit_log rows, kept next to the database.
+
+    - One file per month, audit_log-YYYY-MM.jsonl.gz. Each rollover appends a
+      new gzip member, so existing bytes are never rewritten and gzip readers
+      see one continuous JSONL stream.
+    - manifest.json records, per month: rows, bytes, min/max log_id,
+      first/last timestamp and the sha256 of the file. It is replaced
+      atomically after the data is on disk; bytes past the recorded size
+      (an interrupted append) are cut off before the next append.
+    - The manifest also records the db_id of the database it belongs to
+      (db_meta, migration 9). An archive owned by another database (the
+      file was wiped or reseeded, so log_ids start over) reads as empty
+      and is moved aside by rotate() before the next append.
+    """
+
+    def __init__(self, archive_dir=None, db_id: Optional[str] = None):
+        self._archive_dir = Path(archive_dir) if archive_dir else None
+        self._db_id = db_id
+
+    @property
+    def archive_dir(self) -> Path:
+        # resolved per call so it follows connection.DB_PATH
+        return self._archive_dir or Path(connection.DB_PATH).parent / ARCHIVE_DIRNAME
+
+    @property
+    def db_id(self) -> Optional[str]:
+        """Id of the database this archive serves (None: an unbound archive directory)."""
+        if self._db_id or self._archive_dir:
+            return self._db_id
+        return current_db_id()
+
+    # ---------- Manifest ----------
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        path = self.archive_dir / MANIFEST_NAME
+        if not path.exists():
+            return {}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def owned(self) -> bool:
+        """False if the archive was written for another database."""
+        owner = self._read_manifest().get("db_id")
+        db_id = self.db_id
+        # manifests from before db_id was recorded are adopted on the next append
+        return owner is None or db_id is None or owner == db_id
+
+    def manifest(self) -> Dict[str, Dict[str, Any]]:
+        if not self.owned():
+            return {}
+        return self._read_manifest().get("months", {})
+
+    def months(self) -> List[str]:
+        return sorted(self.manifest())
+
+    def _write_manifest(self, months: Dict[str, Dict[str, Any]]) -> None:
+        path = self.archive_dir / MANIFEST_NAME
+        tmp = path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"format": "jsonl.gz", "db_id": self.db_id, "months": months}, f, indent=2, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def rotate(self) -> Optional[Path]:
+        """Move the archive aside (audit_archive-<timestamp>); returns the new path, None if there was none."""
+        return rotate_archive(self.archive_dir)
+
+    # ---------- Write ----------
+
+    def append_month(self, month: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Append rows (dicts with log_id, user_id, action, details, timestamp)
+        to the month's file and record them in the manifest.
+        Returns the month's manifest entry.
+        """
+        if not rows:
+            return self.manifest().get(month)
+        if not self.owned():
+            self.rotate()
+        months = self.manifest()
+        entry = months.get(month)
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        path = self.archive_dir / f"audit_log-{month}.jsonl.gz"
+        recorded = entry["bytes"] if entry else 0
+        if path.exists() and path.stat().st_size != recorded:
+            # leftover of an append that never reached the manifest
+            with open(path, "r+b") as f:
+                f.truncate(recorded)
+
+        payload = "".join(json.dumps(r, default=str) + "\n" for r in rows).encode("utf-8")
+        with open(path, "ab") as f:
+            f.write(gzip.compress(payload))
+            f.flush()
+            os.fsync(f.fileno())
+
+        ids = [r["log_id"] for r in rows]
+        stamps = [str(r["timestamp"]) for r in rows]
+        total = len(rows)
+        if entry:
+            ids += [entry["min_log_id"], entry["max_log_id"]]
+            stamps += [entry["first_ts"], entry["last_ts"]]
+            total += entry["rows"]
+        entry = {
+            "file": path.name,
+            "rows": total,
+            "bytes": path.stat().st_size,
+            "min_log_id": min(ids),
+            "max_log_id": max(ids),
+            "first_ts": min(stamps),
+            "last_ts": max(stamps),
+            "sha256": _sha256(path),
+            "updated_at": datetime.now().isoformat(sep=" ", timespec="seconds"),
+        }
+        months[month] = entry
+        self._write_manifest(months)
+        print(f"[DB LOG] Archived {len(rows)} audit entries to {path.name}")
+        return entry
+
+    # ---------- Read ----------
+
+    def read_month(self, month: str, cached: bool = True) -> List[Dict[str, Any]]:
+        """
+        The month's rows in file order. cached=True serves repeat reads of an
+        unchanged file from memory; the rows are shared, so do not mutate them.
+        """
+        entry = self.manifest().get(month)
+        return self._read_entry(entry, cached) if entry else []
+
+    def _read_entry(self, entry: Dict[str, Any], cached: bool = True) -> List[Dict[str, Any]]:
+        path = self.archive_dir / entry["file"]
+        key = (str(path), entry["bytes"])
+        if cached:
+            with _decoded_lock:
+                rows = _decoded.get(key)
+                if rows is not None:
+                    _decoded.move_to_end(key)
+                    return rows
+        with open(path, "rb") as f:
+            data = f.read(entry["bytes"])
+        rows = [json.loads(line) for line in gzip.decompress(data).decode("utf-8").splitlines() if line]
+        if cached:
+            with _decoded_lock:
+                _decoded[key] = rows
+                while len(_decoded) > DECODED_MONTHS_CACHED:
+                    _decoded.popitem(last=False)
+        return rows
+
+    def query(
+            self,
+            user_id: Optional[str] = None,
+            action: Optional[str] = None,
+            since: Optional[str] = None,
+            until: Optional[str] = None,
+            text: Optional[str] = None,
+            after: Optional[Tuple[str, int]] = None,
+            limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """
+        Same filters and (timestamp, log_id) keyset order as
+        AuditRepository.query_logs. Months are read newest first and only
+        until `limit` rows are found, since older months cannot outrank them.
+        """
+        needle = text.lower() if text else None
+        found = []
+        months = self.manifest()
+        for month in sorted(months, reverse=True):
+            if since and month < since[:7]:
+                break
+            if (until and month > until[:7]) or (after and month > str(after[0])[:7]):
+                continue
+            for r in self._read_entry(months[month]):
+                ts = str(r["timestamp"])
+                if user_id and r["user_id"] != user_id:
+                    continue
+                if action and r["action"] != action:
+                    continue
+                if (since and ts < since) or (until and ts >= until):
+                    continue
+                if needle and needle not in (r["details"] or "").lower():
+                    continue
+                if after and (ts, r["log_id"]) >= (str(after[0]), after[1]):
+                    continue
+                found.append(dict(r))   # cached rows are shared
+            if len(found) >= limit:
+                break
+        found.sort(key=lambda r: (str(r["timestamp"]), r["log_id"]), reverse=True)
+        return found[:limit]
+
+    def verify(self) -> List[str]:
+        """Check every archive file against the manifest. Returns problems (empty = intact)."""
+        problems = []
+        for month, entry in sorted(self.manifest().items()):
+            path = self.archive_dir / entry["file"]
+            if not path.exists():
+                problems.append(f"{month}: {entry['file']} is missing")
+                continue
+            if path.stat().st_size != entry["bytes"]:
+                problems.append(f"{month}: size {path.stat().st_size} != manifest {entry['bytes']}")
+            elif _sha256(path) != entry["sha256"]:
+                problems.append(f"{month}: checksum mismatch")
+            elif len(self.read_month(month, cached=False)) != entry["rows"]:
+                problems.append(f"{month}: row count differs from manifest")
+        return problems
+
+
+def current_db_id() -> Optional[str]:
+    """db_meta's db_id of the database at connection.DB_PATH (None before migration 9)."""
+    conn = connection.get_db_pool()
+    try:
+        row = conn.execute("SELECT value FROM db_meta WHERE key = 'db_id'").fetchone()
+    except sqlite3.OperationalError:
+        row = None
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+
+def rotate_archive(archive_dir: Path) -> Optional[Path]:
+    """Rename an archive directory out of the way, keeping its files."""
+    archive_dir = Path(archive_dir)
+    if not archive_dir.exists():
+        return None
+    target = archive_dir.with_name(f"{archive_dir.name}-{datetime.now():%Y%m%d-%H%M%S-%f}")
+    archive_dir.rename(target)
+    print(f"[DB LOG] Moved audit archive aside to {target.name}")
+    return target
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
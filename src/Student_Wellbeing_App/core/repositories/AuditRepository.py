@@ -1,12 +1,13 @@
-from src.Student_Wellbeing_App.core.database.connection import get_db_connection
+from src.Student_Wellbeing_App.core.database.connection import get_db_pool
 from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 
 class AuditRepository:
     def __init__(self):
         self._ensure_table_exists()
 
     def _ensure_table_exists(self):
-        conn = get_db_connection()
+        conn = get_db_pool()
         conn.execute("""
             CREATE TABLE IF NOT EXISTS audit_log (
                 log_id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -21,7 +22,7 @@ class AuditRepository:
 
     def log_action(self, user_id: str, action: str, details: str):
         """write an audit log entry"""
-        conn = get_db_connection()
+        conn = get_db_pool()
         conn.execute(
             "INSERT INTO audit_log (user_id, action, details, timestamp) VALUES (?, ?, ?, ?)",
             (user_id, action, details, datetime.now())
@@ -30,12 +31,82 @@ class AuditRepository:
         conn.close()
         print(f"📝 [AUDIT] {user_id} performed {action}: {details}")
 
+    def log_actions(self, entries: List[Tuple[str, str, str, datetime]]) -> int:
+        """
+        Write many (user_id, action, details, timestamp) entries with one
+        executemany and one commit. Returns the number written.
+        """
+        if not entries:
+            return 0
+        conn = get_db_pool()
+        try:
+            conn.executemany(
+                "INSERT INTO audit_log (user_id, action, details, timestamp) VALUES (?, ?, ?, ?)",
+                entries
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        print(f"📝 [AUDIT] Wrote {len(entries)} entries")
+        return len(entries)
+
     def get_recent_logs(self, limit: int = 50):
         """Get recent audit logs"""
-        conn = get_db_connection()
+        conn = get_db_pool()
         conn.row_factory = lambda c, r: dict(zip([col[0] for col in c.description], r))
         cur = conn.cursor()
         cur.execute("SELECT * FROM audit_log ORDER BY timestamp DESC LIMIT ?", (limit,))
         rows = cur.fetchall()
         conn.close()
-        return rows
\ No newline at end of file
+        return rows
+
+    def query_logs(
+            self,
+            user_id: Optional[str] = None,
+            action: Optional[str] = None,
+            since: Optional[str] = None,
+            until: Optional[str] = None,
+            text: Optional[str] = None,
+            after: Optional[Tuple[str, int]] = None,
+            limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """
+        Audit entries newest first, ordered by (timestamp, log_id).
+        since is inclusive, until exclusive; text matches inside details.
+        after = (timestamp, log_id) of the last row already shown: the
+        index seeks straight past it, so every page costs the same.
+        """
+        where, params = [], []
+        if user_id:
+            where.append("user_id = ?")
+            params.append(user_id)
+        if action:
+            where.append("action = ?")
+            params.append(action)
+        if since:
+            where.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            where.append("timestamp < ?")
+            params.append(until)
+        if text:
+            escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            where.append("details LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+        if after is not None:
+            where.append("(timestamp, log_id) < (?, ?)")
+            params.extend(after)
+
+        sql = "SELECT log_id, user_id, action, details, timestamp FROM audit_log"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY timestamp DESC, log_id DESC LIMIT ?"
+        params.append(limit)
+
+        conn = get_db_pool()
+        cur = conn.cursor()
+        cur.execute(sql, params)
+        rows = [dict(r) for r in cur.fetchall()]
+        cur.close()
+        conn.close()
+        return rows
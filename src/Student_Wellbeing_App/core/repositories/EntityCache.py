@@ -0,0 +1,230 @@
+"""
+Read-through cache for single-entity lookups in the repositories.
+
+Repositories fetch their cache with get_cache(name) on every call and wrap
+the query in get_or_load(); every write path calls invalidate() (or
+clear()) for the keys it touched. Keys are scoped to the current DB_PATH,
+so switching databases never serves rows from another file.
+
+Writes made outside the repositories (seed scripts, another process) are
+not seen until the entry's TTL runs out, which bounds how stale a cached
+row can get. The caches are off by default; the apps turn them on with
+configure_entity_caches(enabled=True) or WELLBEING_ENTITY_CACHE=1.
+"""
+
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable
+
+from src.Student_Wellbeing_App.core.database import connection
+
+# Entries kept per cache, and seconds an entry may be served before reloading
+DEFAULT_MAX_SIZE = int(os.environ.get("WELLBEING_ENTITY_CACHE_SIZE", "1024"))
+DEFAULT_TTL = float(os.environ.get("WELLBEING_ENTITY_CACHE_TTL", "30"))
+
+_MISSING = object()
+
+
+class EntityCache:
+    """
+    Thread-safe LRU cache with a per-entry TTL.
+
+    - get_or_load(key, loader) returns the cached value or calls loader()
+      and stores its result (None included, so "not found" is cached too).
+    - Values are copied on the way out, so callers may mutate what they
+      get without corrupting the cache.
+    - invalidate() bumps a generation counter; a load that started before
+      the invalidation is returned to its caller but never stored.
+    """
+
+    def __init__(self, name: str, max_size: int = DEFAULT_MAX_SIZE, ttl: float = DEFAULT_TTL,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (expires_at, value)
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get_or_load(self, key: Hashable, loader: Callable):
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        token = self.token()
+        value = loader()
+        self.put(key, value, token)
+        return copy.copy(value)
+
+    # ---------- Explicit get / put (for callers that decide what to keep) ----------
+
+    def token(self) -> int:
+        """Take before reading the database; pass to put() so a racing write wins."""
+        with self._lock:
+            return self._generation
+
+    def get(self, key: Hashable, default=None):
+        key = (str(connection.DB_PATH), key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return copy.copy(entry[1])
+            if entry is not None:
+                del self._entries[key]   # expired
+            self._misses += 1
+            return default
+
+    def put(self, key: Hashable, value, token: int = None) -> None:
+        with self._lock:
+            if token is not None and token != self._generation:
+                return
+            self._store((str(connection.DB_PATH), key), value)
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Forget the given keys (for the current database)."""
+        path = str(connection.DB_PATH)
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                if self._entries.pop((path, key), None) is not None:
+                    self._invalidations += 1
+
+    def clear(self) -> None:
+        """Forget everything (after bulk writes that touch unknown keys)."""
+        with self._lock:
+            self._generation += 1
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+
+    def _store(self, key, value) -> None:
+        # caller holds the lock
+        self._entries[key] = (self._clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "name": self.name,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+            }
+
+
+class NullCache:
+    """Stand-in used while caching is disabled: every lookup goes to the loader."""
+
+    def __init__(self, name: str, *args, **kwargs):
+        self.name = name
+
+    def get_or_load(self, key: Hashable, loader: Callable):
+        return loader()
+
+    def token(self) -> int:
+        return 0
+
+    def get(self, key: Hashable, default=None):
+        return default
+
+    def put(self, key: Hashable, value, token: int = None) -> None:
+        pass
+
+    def invalidate(self, *keys: Hashable) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {"name": self.name, "enabled": False}
+
+
+# --- Shared caches, one per entity kind ---
+_settings = {
+    "enabled": os.environ.get("WELLBEING_ENTITY_CACHE", "0") == "1",
+    "max_size": DEFAULT_MAX_SIZE,
+    "ttl": DEFAULT_TTL,
+    "factory": EntityCache,
+}
+# Per-cache overrides of max_size / ttl. "login" holds validated sign-ins
+# (see AuthenticationService), so it stays small and short-lived.
+CACHE_LIMITS = {
+    "login": {"max_size": 256, "ttl": 60.0},
+}
+_caches: Dict[str, object] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name: str):
+    """Return the shared cache called name (a NullCache while disabled)."""
+    cache = _caches.get(name)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(name)
+            if cache is None:
+                cache = _caches[name] = _build(name)
+    return cache
+
+
+def configure_entity_caches(enabled: bool = None, max_size: int = None, ttl: float = None,
+                            factory: Callable = None) -> None:
+    """
+    Change the cache settings and drop every existing cache. `factory`
+    is called as factory(name, max_size=..., ttl=...) and may return any
+    object with the EntityCache methods (e.g. one backed by another store).
+    """
+    with _caches_lock:
+        for key, value in (("enabled", enabled), ("max_size", max_size), ("ttl", ttl), ("factory", factory)):
+            if value is not None:
+                _settings[key] = value
+        _caches.clear()
+
+
+def entity_caches_enabled() -> bool:
+    return _settings["enabled"]
+
+
+def clear_entity_caches() -> None:
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.clear()
+
+
+def entity_cache_stats() -> Dict[str, dict]:
+    with _caches_lock:
+        caches = dict(_caches)
+    return {name: cache.stats() for name, cache in caches.items()}
+
+
+def _build(name: str):
+    if not _settings["enabled"]:
+        return NullCache(name)
+    limits = CACHE_LIMITS.get(name, {})
+    return _settings["factory"](
+        name,
+        max_size=limits.get("max_size", _settings["max_size"]),
+        ttl=limits.get("ttl", _settings["ttl"]),
+    )
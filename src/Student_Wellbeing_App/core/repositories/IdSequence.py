@@ -0,0 +1,216 @@
+"""
+STUxxxx / EMPxxxx id allocation from the id_sequence table (migration 8).
+
+allocate_ids() reserves a run of numbers with a single
+
+    UPDATE id_sequence SET last_value = last_value + ? WHERE name = ? RETURNING ...
+
+SQLite runs that statement under the database write lock, so concurrent
+callers (threads or processes) always get disjoint runs and nobody has to
+read the highest existing id first. Numbers of a rolled-back transaction
+are simply never used; ids can have gaps but never repeat.
+
+With a block size above 1 (WELLBEING_ID_BLOCK_SIZE) each process reserves
+that many numbers at a time in a short transaction of its own and hands
+them out from memory, so busy writers do not all touch the same row.
+Unused numbers of a block are lost when the process exits.
+
+All ids of a sequence share one width, so string order is numeric order.
+When the numbers outgrow it (STU9999), widen_ids() re-pads every existing
+id in every table to the new width (STU09999) in the same transaction,
+then allocation continues (STU10000). Other processes holding a reserved
+block keep formatting it at the old width until they restart, so widen
+ahead of time (set_id_width / the WidenIds command) when blocks are on.
+"""
+
+import os
+import threading
+from typing import Dict, List, Tuple
+
+from src.Student_Wellbeing_App.core.database import connection
+from src.Student_Wellbeing_App.core.database.connection import get_db_pool
+from src.Student_Wellbeing_App.core.database.migrations import ID_SEQUENCES, sync_id_sequences
+from src.Student_Wellbeing_App.core.repositories.EntityCache import get_cache
+
+DEFAULT_BLOCK_SIZE = int(os.environ.get("WELLBEING_ID_BLOCK_SIZE", "1"))
+# Re-pad and continue when a sequence runs out of digits (0: raise IdSequenceError)
+AUTO_WIDEN = os.environ.get("WELLBEING_ID_AUTO_WIDEN", "1") == "1"
+
+
+class IdSequenceError(RuntimeError):
+    """The sequence is missing, exhausted for its width, or cannot be changed."""
+
+
+def _format(prefix: str, width: int, first: int, last: int) -> List[str]:
+    if last >= 10 ** width:
+        # a wider id would sort before the existing ones (STU10000 < STU9999)
+        raise IdSequenceError(
+            f"{prefix} ids are exhausted at width {width}; widen them with set_id_width() / WidenIds"
+        )
+    return [f"{prefix}{n:0{width}d}" for n in range(first, last + 1)]
+
+
+def _bump(cursor, name: str, count: int):
+    cursor.execute(
+        "UPDATE id_sequence SET last_value = last_value + ? WHERE name = ? "
+        "RETURNING last_value, prefix, width",
+        (count, name),
+    )
+    return cursor.fetchone()
+
+
+def allocate_ids(cursor, name: str, count: int = 1) -> List[str]:
+    """
+    Reserve `count` consecutive ids of sequence `name` ("student" / "user")
+    on cursor, inside the caller's transaction: they are only spent if the
+    caller commits.
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
+    row = _bump(cursor, name, count)
+    if row is None:
+        # database created before the row existed; build it from the table
+        sync_id_sequences(cursor)
+        row = _bump(cursor, name, count)
+        if row is None:
+            raise IdSequenceError(f"Unknown id sequence: {name!r}")
+    last, prefix, width = row
+    if last >= 10 ** width and AUTO_WIDEN:
+        width = len(str(last))
+        widen_ids(cursor, name, width)
+        print(f"[DB LOG] {prefix} ids widened to {width} digits")
+    return _format(prefix, width, last - count + 1, last)
+
+
+def widen_ids(cursor, name: str, width: int) -> int:
+    """
+    Re-pad every id of sequence `name` to `width` digits, in every table
+    with a column of that name (foreign keys, the search index) and in
+    user_id columns (audit_log records students too), and record the new width. Runs in the caller's transaction; returns the
+    number of rows changed.
+    """
+    prefix, table, column = ID_SEQUENCES[name]
+    cursor.execute("SELECT width FROM id_sequence WHERE name = ?", (name,))
+    row = cursor.fetchone()
+    if row and row[0] > width:
+        raise IdSequenceError(f"Sequence {name!r} is already {row[0]} digits wide")
+    # parents and children change together; checked again at commit
+    cursor.execute("PRAGMA defer_foreign_keys = ON")
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")
+    changed = 0
+    for (tbl,) in cursor.fetchall():
+        cursor.execute(f'PRAGMA table_info("{tbl}")')
+        for col in {column, "user_id"} & {c[1] for c in cursor.fetchall()}:
+            cursor.execute(
+                f"""
+                UPDATE "{tbl}" SET {col} = ? || substr(? || substr({col}, {len(prefix) + 1}), -?)
+                WHERE {col} GLOB ? AND length({col}) - {len(prefix)} < ?
+                """,
+                (prefix, "0" * width, width, f"{prefix}[0-9]*", width),
+            )
+            changed += cursor.rowcount
+    cursor.execute("UPDATE id_sequence SET width = ? WHERE name = ?", (width, name))
+    # cached rows and reserved blocks still carry the old ids / width
+    get_cache(table).clear()
+    get_cache("login").clear()
+    for seq in list(_sequences.values()):
+        seq.reset()
+    return changed
+
+
+def set_id_width(name: str, width: int) -> int:
+    """
+    Make sequence `name` use `width` digits, re-padding the ids it already
+    issued (see widen_ids). Narrowing is only allowed while it has issued
+    none. Returns the number of rows re-padded.
+    """
+    if name not in ID_SEQUENCES:
+        raise IdSequenceError(f"Unknown id sequence: {name!r}")
+    conn = get_db_pool()
+    cursor = conn.cursor()
+    try:
+        sync_id_sequences(cursor, width)
+        cursor.execute("SELECT last_value, width FROM id_sequence WHERE name = ?", (name,))
+        last, current = cursor.fetchone()
+        if width < current and last:
+            raise IdSequenceError(f"Sequence {name!r} has already issued ids; it cannot get narrower")
+        if last >= 10 ** width:
+            raise IdSequenceError(f"{width} digits cannot hold the {name} ids already issued")
+        if width > current and last:
+            changed = widen_ids(cursor, name, width)
+        else:
+            cursor.execute("UPDATE id_sequence SET width = ? WHERE name = ?", (width, name))
+            changed = 0
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+    return changed
+
+
+class IdSequence:
+    """
+    Per-process allocator for one sequence. block_size=1 allocates on the
+    caller's cursor; larger blocks are reserved (and committed) separately
+    and handed out from memory, one reserve per database file.
+    """
+
+    def __init__(self, name: str, block_size: int = DEFAULT_BLOCK_SIZE):
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        self.name = name
+        self.block_size = block_size
+        self._lock = threading.RLock()   # widen_ids() resets reserves from inside _reserve()
+        self._reserved: Dict[str, Tuple[str, int, int, int]] = {}   # db path -> (prefix, width, next, last)
+
+    def next_ids(self, cursor, count: int = 1) -> List[str]:
+        # requests at least a block long gain nothing from the reserve
+        if self.block_size == 1 or count >= self.block_size:
+            return allocate_ids(cursor, self.name, count)
+        key = str(connection.DB_PATH)
+        with self._lock:
+            prefix, width, nxt, last = self._reserved.get(key, ("", 0, 1, 0))
+            if last - nxt + 1 < count:
+                prefix, width, nxt, last = self._reserve()
+            self._reserved[key] = (prefix, width, nxt + count, last)
+        return _format(prefix, width, nxt, nxt + count - 1)
+
+    def _reserve(self) -> Tuple[str, int, int, int]:
+        conn = get_db_pool()
+        cursor = conn.cursor()
+        try:
+            ids = allocate_ids(cursor, self.name, self.block_size)
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+        first, last = ids[0], ids[-1]
+        prefix = first.rstrip("0123456789")
+        return prefix, len(first) - len(prefix), int(first[len(prefix):]), int(last[len(prefix):])
+
+    def reset(self) -> None:
+        """Forget reserved numbers (they are not returned to the table)."""
+        with self._lock:
+            self._reserved.clear()
+
+
+_sequences: Dict[str, IdSequence] = {}
+_sequences_lock = threading.Lock()
+
+
+def get_sequence(name: str) -> IdSequence:
+    """Shared allocator for sequence `name`, using WELLBEING_ID_BLOCK_SIZE."""
+    with _sequences_lock:
+        seq = _sequences.get(name)
+        if seq is None:
+            seq = _sequences[name] = IdSequence(name, DEFAULT_BLOCK_SIZE)
+        return seq
+
+
+def configure_id_sequences(block_size: int = None) -> None:
+    """Change the block size of the shared allocators (drops their reserves)."""
+    global DEFAULT_BLOCK_SIZE
+    with _sequences_lock:
+        if block_size is not None:
+            DEFAULT_BLOCK_SIZE = block_size
+        _sequences.clear()
@@ -1,20 +1,22 @@
 from typing import List
-from src.Student_Wellbeing_App.core.database.connection import get_db_connection
+from src.Student_Wellbeing_App.core.database.connection import get_db_pool
 from src.Student_Wellbeing_App.core.models.Module import Module
+from src.Student_Wellbeing_App.core.repositories.EntityCache import get_cache
 
 class ModuleRepository:
     # --- Module CRUD ---
     def create_module(self, code: str, title: str):
-        conn = get_db_connection()
+        conn = get_db_pool()
         try:
             conn.execute("INSERT OR IGNORE INTO module (module_code, title) VALUES (?, ?)", (code, title))
             conn.commit()
         finally:
             conn.close()
+            get_cache("module").invalidate(code)
 
     def get_all_modules(self) -> List[Module]:
         # Get all modules in the system
-        conn = get_db_connection()
+        conn = get_db_pool()
         cur = conn.cursor()
         cur.execute("SELECT module_code, title FROM module")
         rows = cur.fetchall()
@@ -23,8 +25,11 @@ class ModuleRepository:
         return [Module(module_code=r[0], title=r[1]) for r in rows]
 
     def get_module_by_code(self, code: str) -> Module:
-        # Get module by its code
-        conn = get_db_connection()
+        # Get module by its code (cached; create_module invalidates)
+        return get_cache("module").get_or_load(code, lambda: self._load_module(code))
+
+    def _load_module(self, code: str) -> Module:
+        conn = get_db_pool()
         cur = conn.cursor()
         cur.execute("SELECT module_code, title FROM module WHERE module_code = ?", (code,))
         row = cur.fetchone()
@@ -35,16 +40,20 @@ class ModuleRepository:
 
     # --- Teaching Assignment (Teacher <-> Module) ---
     def assign_teacher(self, user_id: str, module_code: str):
-        conn = get_db_connection()
+        conn = get_db_pool()
         try:
             conn.execute("INSERT INTO teaching_assignment (user_id, module_code) VALUES (?, ?)", (user_id, module_code))
             conn.commit()
         finally:
             conn.close()
+            get_cache("teacher_modules").invalidate(user_id)
 
     def get_modules_by_teacher(self, user_id: str) -> List[str]:
-        # return list of module_codes taught by the teacher
-        conn = get_db_connection()
+        # return list of module_codes taught by the teacher (cached; assign_teacher invalidates)
+        return get_cache("teacher_modules").get_or_load(user_id, lambda: self._load_teacher_modules(user_id))
+
+    def _load_teacher_modules(self, user_id: str) -> List[str]:
+        conn = get_db_pool()
         cur = conn.cursor()
         cur.execute("SELECT module_code FROM teaching_assignment WHERE user_id = ?", (user_id,))
         rows = cur.fetchall()
@@ -53,7 +62,7 @@ class ModuleRepository:
 
     # --- Enrollment (Student <-> Module) ---
     def enroll_student(self, student_id: str, module_code: str):
-        conn = get_db_connection()
+        conn = get_db_pool()
         try:
             conn.execute("INSERT INTO enrollment (student_id, module_code) VALUES (?, ?)", (student_id, module_code))
             conn.commit()
@@ -62,7 +71,7 @@ class ModuleRepository:
 
     def get_students_by_module(self, module_code: str) -> List[str]:
         # return list of student_ids enrolled in the module
-        conn = get_db_connection()
+        conn = get_db_pool()
         cur = conn.cursor()
         cur.execute("SELECT student_id FROM enrollment WHERE module_code = ?", (module_code,))
         rows = cur.fetchall()
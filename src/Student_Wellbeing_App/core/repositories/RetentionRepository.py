@@ -1,18 +1,23 @@
 from typing import List, Dict, Any
 from src.Student_Wellbeing_App.core.models.RetentionRule import RetentionRule
-from src.Student_Wellbeing_App.core.database.connection import get_db_connection
+from src.Student_Wellbeing_App.core.database.connection import get_db_pool
+from src.Student_Wellbeing_App.core.repositories.WellbeingRepository import WellbeingRepository
+from src.Student_Wellbeing_App.core.repositories.AuditArchiveRepository import AuditArchiveRepository
+from src.Student_Wellbeing_App.core.repositories.EntityCache import get_cache
 import datetime
 
 class RetentionRepository:
     def init_default_rules(self):
-        conn = get_db_connection()
+        conn = get_db_pool()
         conn.execute("INSERT OR IGNORE INTO retention_rule (rule_id, data_type, retention_months, is_active) VALUES (1, 'RESOLVED_ALERTS', 12, 1)")
         conn.execute("INSERT OR IGNORE INTO retention_rule (rule_id, data_type, retention_months, is_active) VALUES (2, 'GRADUATED_STUDENTS', 48, 1)")
+        conn.execute("INSERT OR IGNORE INTO retention_rule (rule_id, data_type, retention_months, is_active) VALUES (3, 'AUDIT_LOG', 12, 1)")
         conn.commit()
         conn.close()
+        get_cache("retention_rule").invalidate(1, 2, 3)
 
     def get_rules(self) -> List[RetentionRule]:
-        conn = get_db_connection()
+        conn = get_db_pool()
         cur = conn.cursor()
         cur.execute("SELECT rule_id, data_type, retention_months, is_active FROM retention_rule")
         rows = cur.fetchall()
@@ -20,7 +25,10 @@ class RetentionRepository:
         return [RetentionRule(*r) for r in rows]
 
     def get_rule_by_id(self, rule_id: int) -> RetentionRule:
-        conn = get_db_connection()
+        return get_cache("retention_rule").get_or_load(rule_id, lambda: self._load_rule(rule_id))
+
+    def _load_rule(self, rule_id: int) -> RetentionRule:
+        conn = get_db_pool()
         cur = conn.cursor()
         cur.execute("SELECT rule_id, data_type, retention_months, is_active FROM retention_rule WHERE rule_id=?", (rule_id,))
         row = cur.fetchone()
@@ -32,29 +40,32 @@ class RetentionRepository:
     # --- CRUD ---
     
     def add_rule(self, data_type: str, months: int, is_active: int):
-        conn = get_db_connection()
-        conn.execute("INSERT INTO retention_rule (data_type, retention_months, is_active) VALUES (?, ?, ?)", 
-                     (data_type, months, is_active))
+        conn = get_db_pool()
+        cur = conn.execute("INSERT INTO retention_rule (data_type, retention_months, is_active) VALUES (?, ?, ?)", 
+                           (data_type, months, is_active))
         conn.commit()
         conn.close()
+        get_cache("retention_rule").invalidate(cur.lastrowid)
 
     def update_rule(self, rule_id: int, months: int, is_active: bool):
-        conn = get_db_connection()
+        conn = get_db_pool()
         conn.execute("UPDATE retention_rule SET retention_months = ?, is_active = ? WHERE rule_id = ?", (months, int(is_active), rule_id))
         conn.commit()
         conn.close()
+        get_cache("retention_rule").invalidate(rule_id)
 
     def delete_rule(self, rule_id: int):
-        conn = get_db_connection()
+        conn = get_db_pool()
         conn.execute("DELETE FROM retention_rule WHERE rule_id = ?", (rule_id,))
         conn.commit()
         conn.close()
+        get_cache("retention_rule").invalidate(rule_id)
 
     # --- Preview Logic ---
 
     def preview_old_alerts(self, months: int) -> List[Dict[str, Any]]:
         """ preview alerts that will be deleted """
-        conn = get_db_connection()
+        conn = get_db_pool()
         conn.row_factory = lambda c, r: dict(zip([col[0] for col in c.description], r)) 
         cur = conn.cursor()
         
@@ -70,7 +81,7 @@ class RetentionRepository:
         current_year = datetime.date.today().year
         cutoff_year = current_year - (total_months // 12)
         
-        conn = get_db_connection()
+        conn = get_db_pool()
         conn.row_factory = lambda c, r: dict(zip([col[0] for col in c.description], r))
         cur = conn.cursor()
         
@@ -79,10 +90,28 @@ class RetentionRepository:
         conn.close()
         return rows
 
+    def preview_audit_log(self, months: int) -> List[Dict[str, Any]]:
+        """closed months of audit_log that would move to the archive"""
+        conn = get_db_pool()
+        conn.row_factory = lambda c, r: dict(zip([col[0] for col in c.description], r))
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT substr(timestamp, 1, 7) AS month, COUNT(*) AS entries,
+                   MIN(timestamp) AS first_entry, MAX(timestamp) AS last_entry
+            FROM audit_log WHERE timestamp < ?
+            GROUP BY month ORDER BY month
+            """,
+            (_audit_cutoff(months),)
+        )
+        rows = cur.fetchall()
+        conn.close()
+        return rows
+
     # --- Execute Logic ---
 
     def cleanup_old_alerts(self, months: int) -> int:
-        conn = get_db_connection()
+        conn = get_db_pool()
         query = f"DELETE FROM alert WHERE resolved = 1 AND created_at < date('now', '-{months} months')"
         cur = conn.execute(query)
         count = cur.rowcount
@@ -95,7 +124,7 @@ class RetentionRepository:
         current_year = datetime.date.today().year
         cutoff_year = current_year - (total_months // 12)
         
-        conn = get_db_connection()
+        conn = get_db_pool()
         cur = conn.cursor()
         # 1. Check ID
         cur.execute("SELECT student_id FROM student WHERE year < ?", (cutoff_year,))
@@ -111,7 +140,71 @@ class RetentionRepository:
         for table in tables:
             conn.execute(f"DELETE FROM {table} WHERE student_id IN ({placeholders})", students)
         conn.execute(f"DELETE FROM student WHERE student_id IN ({placeholders})", students)
+        conn.execute(f"DELETE FROM student_search WHERE student_id IN ({placeholders})", students)
         
         conn.commit()
         conn.close()
-        return len(students)
\ No newline at end of file
+        get_cache("student").invalidate(*students)
+        get_cache("login").invalidate(*students)
+        # Bulk delete bypasses the incremental path; recompute the weekly totals
+        WellbeingRepository().rebuild_weekly_agg()
+        return len(students)
+
+    def archive_audit_log(self, months: int, archive: AuditArchiveRepository = None) -> int:
+        """
+        Move audit_log rows older than the last `months` whole months into the
+        compressed monthly archive, one month per transaction. Returns rows moved.
+        A rerun after a crash is safe: rows that are already in the month's
+        file (same log_id, timestamp, user and action) are deleted without
+        being appended again; every other row is appended first.
+        """
+        archive = archive or AuditArchiveRepository()
+        cutoff = _audit_cutoff(months)
+
+        conn = get_db_pool()
+        cur = conn.cursor()
+        moved = 0
+        try:
+            cur.execute("SELECT DISTINCT substr(timestamp, 1, 7) FROM audit_log WHERE timestamp < ?", (cutoff,))
+            for (month,) in cur.fetchall():
+                start, end = f"{month}-01", _next_month(month)
+                cur.execute("BEGIN IMMEDIATE")
+                cur.execute(
+                    "SELECT log_id, user_id, action, details, timestamp FROM audit_log "
+                    "WHERE timestamp >= ? AND timestamp < ? ORDER BY log_id",
+                    (start, end)
+                )
+                rows = [dict(zip(("log_id", "user_id", "action", "details", "timestamp"), r)) for r in cur.fetchall()]
+                archived = {_archive_key(r) for r in archive.read_month(month)}
+                new_rows = [r for r in rows if _archive_key(r) not in archived]
+                archive.append_month(month, new_rows)
+                # the write lock is held, so the range still holds exactly `rows`,
+                # all of which are now in the file
+                cur.execute("DELETE FROM audit_log WHERE timestamp >= ? AND timestamp < ?", (start, end))
+                conn.commit()
+                moved += len(new_rows)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+            conn.close()
+        return moved
+
+
+def _archive_key(row) -> tuple:
+    return row["log_id"], str(row["timestamp"]), row["user_id"], row["action"]
+
+
+def _audit_cutoff(months: int) -> str:
+    # first day of the month `months` months before the current one;
+    # the current month is never archived
+    today = datetime.date.today()
+    y, m = divmod(today.year * 12 + today.month - 1 - months, 12)
+    return datetime.date(y, m + 1, 1).isoformat()
+
+
+def _next_month(month: str) -> str:
+    y, m = map(int, month.split("-"))
+    y, m = divmod(y * 12 + m, 12)
+    return datetime.date(y, m + 1, 1).isoformat()
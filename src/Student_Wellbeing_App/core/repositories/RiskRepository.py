@@ -0,0 +1,54 @@
+from typing import Dict, List
+
+from src.Student_Wellbeing_App.core.database.connection import get_db_pool
+
+
+class RiskRepository:
+    """
+    Set-based reads for the risk engine: every student's attendance,
+    grade and wellbeing totals from grouped queries on one connection,
+    instead of a lookup per student.
+    """
+
+    def load_student_metrics(self, low_mark_threshold: float = 50.0) -> Dict[str, List]:
+        """
+        Return the metrics as columns (parallel lists, one entry per student):
+        student_id, attendance_total, absences, submissions, low_marks,
+        avg_stress, avg_sleep (None when a student has no wellbeing records).
+        """
+        conn = get_db_pool()
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT s.student_id,
+                   COALESCE(a.total, 0),
+                   COALESCE(a.absent, 0),
+                   COALESCE(sub.total, 0),
+                   COALESCE(sub.low, 0),
+                   w.avg_stress,
+                   w.avg_sleep
+            FROM student s
+            LEFT JOIN (
+                SELECT student_id, COUNT(*) AS total, SUM(status = 'ABSENT') AS absent
+                FROM attendance GROUP BY student_id
+            ) a ON a.student_id = s.student_id
+            LEFT JOIN (
+                SELECT student_id, COUNT(*) AS total, SUM(mark IS NOT NULL AND mark < ?) AS low
+                FROM submission GROUP BY student_id
+            ) sub ON sub.student_id = s.student_id
+            LEFT JOIN (
+                SELECT student_id, AVG(stress_level) AS avg_stress, AVG(sleep_hours) AS avg_sleep
+                FROM wellbeing_record GROUP BY student_id
+            ) w ON w.student_id = s.student_id
+            ORDER BY s.student_id
+            """,
+            (low_mark_threshold,),
+        )
+        rows = cur.fetchall()
+        cur.close()
+        conn.close()
+
+        columns = ["student_id", "attendance_total", "absences", "submissions", "low_marks", "avg_stress", "avg_sleep"]
+        if not rows:
+            return {c: [] for c in columns}
+        return {c: list(values) for c, values in zip(columns, zip(*rows))}
@@ -1,32 +1,56 @@
-import hashlib
-from typing import Optional, List
+import re
+from difflib import SequenceMatcher
+from typing import Any, Dict, Iterable, Iterator, Optional, List, Set, Tuple
 
 from src.Student_Wellbeing_App.core.models.Student import Student
-from src.Student_Wellbeing_App.core.database.connection import get_db_connection
+from src.Student_Wellbeing_App.core.models.StudentSummary import StudentSummary
+from src.Student_Wellbeing_App.core.database.connection import get_db_pool
+from src.Student_Wellbeing_App.core.database.migrations import STUDENT_SEARCH_REBUILD
+from src.Student_Wellbeing_App.core.repositories.EntityCache import get_cache
+from src.Student_Wellbeing_App.core.repositories.IdSequence import get_sequence
+from src.Student_Wellbeing_App.core.security.PasswordHasher import verify_password
+
+# Fuzzy search: trigram candidates fetched per query, and the similarity
+# (difflib ratio, 0..1) a term needs against some word of the row
+FUZZY_CANDIDATES = 50
+FUZZY_MIN_SIMILARITY = 0.7
+
+
+def _fts_phrase(text: str) -> str:
+    """Quote text as a single FTS5 phrase (trigram: a literal substring)."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _like_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _trigrams(text: str, n: int = 3) -> Set[str]:
+    text = text.lower()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def _term_similarity(matcher: SequenceMatcher, term: str, words: List[str]) -> float:
+    """
+    Best difflib ratio of term against each word (or the word's prefix of
+    the same length). `matcher` has term as seq2 so its index is built once.
+    """
+    best = 0.0
+    for word in words:
+        for candidate in {word, word[:len(term)]}:
+            matcher.set_seq1(candidate)
+            # the quick upper bounds skip most words without a full ratio()
+            if matcher.real_quick_ratio() > best and matcher.quick_ratio() > best:
+                best = max(best, matcher.ratio())
+    return best
 
 
 class StudentRepository:
     def _next_stu_id(self, cursor) -> str:
         """
-        Generate the next STU-style student_id: STU0001, STU0002, ...
+        Allocate the next STU-style student_id: STU0001, STU0002, ...
         """
-        cursor.execute(
-            "SELECT student_id FROM student WHERE student_id LIKE 'STU%' "
-            "ORDER BY student_id DESC LIMIT 1"
-        )
-        row = cursor.fetchone()
-
-        if row is None:
-            return "STU0001"
-
-        last_id = row[0]          # e.g. "STU0012"
-        num_part = last_id[3:]    # "0012"
-        try:
-            last_num = int(num_part)
-        except ValueError:
-            last_num = 0
-
-        return f"STU{last_num + 1:04d}"
+        return get_sequence("student").next_ids(cursor)[0]
 
     def save(self, s: Student) -> str:
         """
@@ -34,7 +58,7 @@ class StudentRepository:
         Assumes s.password is already a hash when called from the service.
         Returns the generated student_id.
         """
-        conn = get_db_connection()
+        conn = get_db_pool()
         cursor = conn.cursor()
 
         student_id = self._next_stu_id(cursor)
@@ -53,19 +77,70 @@ class StudentRepository:
                 s.year,
             ),
         )
+        self._index_student(cursor, student_id, s.first_name, s.lastname, s.email)
 
         conn.commit()
         cursor.close()
         conn.close()
+        get_cache("student").invalidate(student_id)
+        get_cache("login").invalidate(student_id)
 
         s.student_id = student_id
         return student_id
 
+    def save_many(self, students: List[Student], enroll_modules: Iterable[str] = ()) -> List[str]:
+        """
+        Create many students in one transaction: their ids come from a
+        single sequence update and the rows go in with executemany.
+        Every new student is also enrolled in each of enroll_modules.
+        Sets and returns the generated student_ids, in input order.
+        """
+        if not students:
+            return []
+        conn = get_db_pool()
+        cursor = conn.cursor()
+        modules = list(enroll_modules)
+        try:
+            student_ids = get_sequence("student").next_ids(cursor, len(students))
+            cursor.executemany(
+                """
+                INSERT INTO student(student_id, first_name, lastname, email, password, year)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (sid, s.first_name, s.lastname, s.email, s.password, s.year)
+                    for sid, s in zip(student_ids, students)
+                ],
+            )
+            cursor.executemany(
+                "INSERT INTO student_search (student_id, name, email) VALUES (?, ?, ?)",
+                [
+                    (sid, f"{s.first_name} {s.lastname}", s.email or "")
+                    for sid, s in zip(student_ids, students)
+                ],
+            )
+            if modules:
+                cursor.executemany(
+                    "INSERT INTO enrollment (student_id, module_code) VALUES (?, ?)",
+                    [(sid, code) for sid in student_ids for code in modules],
+                )
+            conn.commit()
+        finally:
+            # on error the pool rolls the unfinished transaction back
+            cursor.close()
+            conn.close()
+        get_cache("student").invalidate(*student_ids)
+        get_cache("login").invalidate(*student_ids)
+
+        for sid, s in zip(student_ids, students):
+            s.student_id = sid
+        return student_ids
+
     def list_all(self) -> List[Student]:
         """
         Return all students as Student objects.
         """
-        conn = get_db_connection()
+        conn = get_db_pool()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -88,24 +163,138 @@ class StudentRepository:
             for row in rows
         ]
 
+    # ---------- Projections (no password column) ----------
+
+    def list_summaries(self) -> List[StudentSummary]:
+        """All students as slim StudentSummary tuples, ordered by student_id."""
+        conn = get_db_pool()
+        cursor = conn.cursor()
+        cursor.execute("SELECT student_id, first_name, lastname, email, year FROM student ORDER BY student_id")
+        rows = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return [StudentSummary(*row) for row in rows]
+
+    def iter_ids(self, batch_size: int = 1000) -> Iterator[str]:
+        """
+        Yield every student_id in order, reading keyset batches so no
+        connection is held between batches.
+        """
+        last = ""
+        while True:
+            conn = get_db_pool()
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT student_id FROM student WHERE student_id > ? ORDER BY student_id LIMIT ?",
+                (last, batch_size),
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+            cursor.close()
+            conn.close()
+            yield from ids
+            if len(ids) < batch_size:
+                return
+            last = ids[-1]
+
+    def count(self) -> int:
+        conn = get_db_pool()
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM student")
+        total = cursor.fetchone()[0]
+        cursor.close()
+        conn.close()
+        return total
+
+    def find_existing_ids(self, student_ids: Iterable[str]) -> Set[str]:
+        """
+        Return the subset of student_ids that exist, in a few IN (...) queries
+        instead of one lookup per id.
+        """
+        ids = list(dict.fromkeys(student_ids))
+        found = set()
+        if not ids:
+            return found
+
+        conn = get_db_pool()
+        cursor = conn.cursor()
+
+        # stay well below SQLite's bound-parameter limit
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            cursor.execute(
+                f"SELECT student_id FROM student WHERE student_id IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            found.update(row[0] for row in cursor.fetchall())
+
+        cursor.close()
+        conn.close()
+        return found
+
+    def find_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+        """Return the subset of emails already registered (same batching as find_existing_ids)."""
+        values = list(dict.fromkeys(emails))
+        found = set()
+        if not values:
+            return found
+
+        conn = get_db_pool()
+        cursor = conn.cursor()
+        for start in range(0, len(values), 500):
+            chunk = values[start:start + 500]
+            cursor.execute(
+                f"SELECT email FROM student WHERE email IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            found.update(row[0] for row in cursor.fetchall())
+
+        cursor.close()
+        conn.close()
+        return found
+
     def delete(self, student_id: str) -> None:
         """
         Delete a student by STU-style ID.
         """
-        conn = get_db_connection()
+        conn = get_db_pool()
         cursor = conn.cursor()
 
+        self._unindex_student(cursor, student_id)
         cursor.execute("DELETE FROM student WHERE student_id = ?", (student_id,))
         conn.commit()
 
         cursor.close()
         conn.close()
+        get_cache("student").invalidate(student_id)
+        get_cache("login").invalidate(student_id)
+
+    def update_password_hash(self, student_id: str, password_hash: str) -> bool:
+        conn = get_db_pool()
+        cursor = conn.cursor()
+        cursor.execute("UPDATE student SET password = ? WHERE student_id = ?", (password_hash, student_id))
+        changed = cursor.rowcount > 0
+        conn.commit()
+        cursor.close()
+        conn.close()
+        get_cache("student").invalidate(student_id)
+        get_cache("login").invalidate(student_id)
+        return changed
+
+    def get_login_version(self, student_id: str) -> Optional[Tuple[str]]:
+        """(password,) hash of a student, or None; see UserRepository.get_login_version."""
+        conn = get_db_pool()
+        cursor = conn.cursor()
+        cursor.execute("SELECT password FROM student WHERE student_id = ?", (student_id,))
+        row = cursor.fetchone()
+        cursor.close()
+        conn.close()
+        return tuple(row) if row else None
 
     def authenticate_by_id(self, student_id: str, password: str) -> Optional[Student]:
         """
         Authenticate a student by STUxxxx ID and password.
         """
-        conn = get_db_connection()
+        conn = get_db_pool()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -125,9 +314,7 @@ class StudentRepository:
             return None
 
         db_student_id, first_name, lastname, email, db_hash, year = row
-        input_hash = hashlib.sha256(password.encode()).hexdigest()
-
-        if input_hash != db_hash:
+        if not verify_password(password, db_hash):
             return None
 
         return Student(
@@ -141,9 +328,12 @@ class StudentRepository:
 
     def get_student_by_id(self, student_id: str) -> Optional[Student]:
         """
-        Get a student by their student_id.
+        Get a student by their student_id (served from the entity cache when enabled).
         """
-        conn = get_db_connection()
+        return get_cache("student").get_or_load(student_id, lambda: self._load_student(student_id))
+
+    def _load_student(self, student_id: str) -> Optional[Student]:
+        conn = get_db_pool()
         cursor = conn.cursor()
 
         cursor.execute(
@@ -169,4 +359,136 @@ class StudentRepository:
             email=row[3],
             password=row[4],
             year=row[5],
-        )
\ No newline at end of file
+        )
+
+    # ---------- Search index ----------
+
+    @staticmethod
+    def _index_student(cursor, student_id: str, first_name: str, lastname: str, email: Optional[str]) -> None:
+        cursor.execute(
+            "INSERT INTO student_search (student_id, name, email) VALUES (?, ?, ?)",
+            (student_id, f"{first_name} {lastname}", email or ""),
+        )
+
+    @staticmethod
+    def _unindex_student(cursor, student_id: str) -> None:
+        if len(student_id) >= 3:
+            # MATCH narrows to the index entries containing the ID; the
+            # equality check drops longer IDs that merely contain it
+            cursor.execute(
+                "DELETE FROM student_search WHERE student_search MATCH ? AND student_id = ?",
+                (f"student_id : {_fts_phrase(student_id)}", student_id),
+            )
+        else:
+            cursor.execute("DELETE FROM student_search WHERE student_id = ?", (student_id,))
+
+    def rebuild_search_index(self) -> int:
+        """Refill student_search from student (after bulk loads). Returns rows indexed."""
+        conn = get_db_pool()
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM student_search")
+        cursor.execute(STUDENT_SEARCH_REBUILD)
+        count = cursor.rowcount
+        conn.commit()
+        cursor.close()
+        conn.close()
+        return count
+
+    def search(self, query: str, limit: int = 20, fuzzy: bool = True) -> List[Dict[str, Any]]:
+        """
+        Search students by ID, name or email through the student_search index.
+
+        Every whitespace-separated term must appear somewhere in the ID,
+        "first last" name or email (case-insensitive substring, so prefixes
+        match too). Rows where a term starts the ID, a name or the email
+        rank first. If nothing matches and fuzzy is on, students sharing
+        enough of the query's trigrams (typos, swapped letters) are returned
+        instead, best match first. Rows carry no password hashes.
+        """
+        terms = query.split()
+        if not terms or limit < 1:
+            return []
+
+        conn = get_db_pool()
+        cursor = conn.cursor()
+        try:
+            rows = self._search_substring(cursor, terms, limit)
+            long_terms = [t for t in terms if len(t) >= 3]
+            if fuzzy and not rows and long_terms:
+                rows = self._search_fuzzy(cursor, long_terms, limit)
+        finally:
+            cursor.close()
+            conn.close()
+        return rows
+
+    def _search_substring(self, cursor, terms: List[str], limit: int) -> List[Dict[str, Any]]:
+        where, params = [], []
+        indexed = [t for t in terms if len(t) >= 3]
+        if indexed:
+            where.append("student_search MATCH ?")
+            params.append(" AND ".join(_fts_phrase(t) for t in indexed))
+        for t in terms:
+            if len(t) < 3:
+                # too short for a trigram: plain LIKE over the matched rows
+                where.append(
+                    "(f.student_id LIKE ? ESCAPE '\\' OR f.name LIKE ? ESCAPE '\\' OR f.email LIKE ? ESCAPE '\\')"
+                )
+                params.extend([f"%{_like_escape(t)}%"] * 3)
+
+        # Two passes, each stopping at LIMIT instead of sorting every match:
+        # first rows where the first term starts the ID, a name or the email,
+        # then the remaining (mid-word) matches
+        first = _like_escape(terms[0])
+        prefix = ("(f.student_id LIKE ? ESCAPE '\\' OR f.name LIKE ? ESCAPE '\\' "
+                  "OR f.name LIKE ? ESCAPE '\\' OR f.email LIKE ? ESCAPE '\\')")
+        prefix_params = [f"{first}%", f"{first}%", f"% {first}%", f"{first}%"]
+
+        rows = []
+        for condition in (prefix, f"NOT {prefix}"):
+            if len(rows) >= limit:
+                break
+            cursor.execute(
+                f"""
+                SELECT s.student_id, s.first_name, s.lastname, s.email, s.year
+                FROM student_search f
+                JOIN student s ON s.student_id = f.student_id
+                WHERE {" AND ".join(where + [condition])}
+                LIMIT ?
+                """,
+                params + prefix_params + [limit - len(rows)],
+            )
+            found = [dict(row) for row in cursor.fetchall()]
+            found.sort(key=lambda r: (r["lastname"], r["first_name"], r["student_id"]))
+            rows += found
+        return rows
+
+    def _search_fuzzy(self, cursor, terms: List[str], limit: int) -> List[Dict[str, Any]]:
+        # candidates share at least one 3-gram (4-gram for long terms, which
+        # keeps common fragments such as digits from matching half the table)
+        # with the query; difflib then scores them, which tolerates swapped or
+        # missing letters
+        terms = [t.lower() for t in terms]
+        matchers = [SequenceMatcher(None, b=t, autojunk=False) for t in terms]
+        grams = set().union(*(_trigrams(t, 4 if len(t) >= 8 else 3) for t in terms))
+        cursor.execute(
+            """
+            SELECT s.student_id, s.first_name, s.lastname, s.email, s.year,
+                   f.name AS _name, f.email AS _email
+            FROM student_search f
+            JOIN student s ON s.student_id = f.student_id
+            WHERE student_search MATCH ?
+            ORDER BY rank
+            LIMIT ?
+            """,
+            (" OR ".join(_fts_phrase(g) for g in sorted(grams)), FUZZY_CANDIDATES),
+        )
+
+        scored = []
+        for row in cursor.fetchall():
+            words = re.split(r"[\s@._-]+", f"{row['student_id']} {row['_name']} {row['_email']}".lower())
+            score = sum(_term_similarity(m, t, words) for m, t in zip(matchers, terms)) / len(terms)
+            if score >= FUZZY_MIN_SIMILARITY:
+                out = {k: row[k] for k in ("student_id", "first_name", "lastname", "email", "year")}
+                scored.append((score, out))
+        scored.sort(key=lambda pair: (-pair[0], pair[1]["lastname"], pair[1]["student_id"]))
+        return [out for _, out in scored[:limit]]
@@ -1,47 +1,68 @@
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Iterable, Tuple
 from src.Student_Wellbeing_App.core.models.SubmissionRecord import SubmissionRecord
 from src.Student_Wellbeing_App.core.models.SubmissionStatus import SubmissionStatus
-from src.Student_Wellbeing_App.core.database.connection import get_db_connection
+from src.Student_Wellbeing_App.core.database.connection import get_db_pool
 
 class SubmissionRepository:
     def upsert_grade(self, student_id: str, assessment_id: int, mark: float) -> int:
         """
-        mark intelligently:
+        mark intelligently, in one statement:
         - if submission exists for student & assessment -> UPDATE mark
         - else -> INSERT new submission with mark
+        Returns the submission_id.
         """
-        conn = get_db_connection()
+        conn = get_db_pool()
         cur = conn.cursor()
         try:
             cur.execute(
-                "SELECT submission_id FROM submission WHERE student_id = ? AND assessment_id = ?",
-                (student_id, assessment_id)
+                """
+                INSERT INTO submission (student_id, assessment_id, submitted_at, status, mark)
+                VALUES (?, ?, datetime('now'), 'SUBMITTED', ?)
+                ON CONFLICT(student_id, assessment_id) DO UPDATE SET
+                    mark = excluded.mark,
+                    submitted_at = datetime('now')
+                RETURNING submission_id
+                """,
+                (student_id, assessment_id, mark)
             )
-            row = cur.fetchone()
+            submission_id = cur.fetchone()[0]
+            conn.commit()
+            print(f"[DB LOG] Upserted Grade for Submission ID {submission_id} -> {mark}")
+            return submission_id
+        finally:
+            cur.close()
+            conn.close()
 
-            if row:
-                # Update existing submission
-                existing_id = row[0]
-                cur.execute(
-                    "UPDATE submission SET mark = ?, submitted_at = datetime('now') WHERE submission_id = ?",
-                    (mark, existing_id)
-                )
-                conn.commit()
-                print(f"[DB LOG] Updated Grade for Submission ID {existing_id} -> {mark}")
-                return existing_id
-            else:
-                # Insert new submission
-                cur.execute(
-                    """
-                    INSERT INTO submission (student_id, assessment_id, submitted_at, status, mark)
-                    VALUES (?, ?, datetime('now'), 'SUBMITTED', ?)
-                    """,
-                    (student_id, assessment_id, mark)
-                )
-                conn.commit()
-                new_id = cur.lastrowid or 0
-                print(f"[DB LOG] Inserted New Grade Submission ID {new_id}")
-                return new_id
+    def upsert_grades(self, assessment_id: int, grades: Iterable[Tuple[str, float]]) -> int:
+        """
+        Bulk version of upsert_grade: (student_id, mark) pairs for one
+        assessment, written with one executemany in a single transaction.
+        Returns the number of rows written.
+        """
+        rows = [(student_id, assessment_id, mark) for student_id, mark in grades]
+        if not rows:
+            return 0
+
+        conn = get_db_pool()
+        cur = conn.cursor()
+        try:
+            cur.executemany(
+                """
+                INSERT INTO submission (student_id, assessment_id, submitted_at, status, mark)
+                VALUES (?, ?, datetime('now'), 'SUBMITTED', ?)
+                ON CONFLICT(student_id, assessment_id) DO UPDATE SET
+                    mark = excluded.mark,
+                    submitted_at = datetime('now')
+                """,
+                rows
+            )
+            conn.commit()
+            print(f"[DB LOG] Imported {len(rows)} grades for Assessment ID {assessment_id}")
+            return len(rows)
+        except Exception as e:
+            conn.rollback()
+            print(f"[DB ERROR] Grade import failed: {e}")
+            raise e
         finally:
             cur.close()
             conn.close()
@@ -50,7 +71,7 @@ class SubmissionRepository:
     
     def update_mark_by_id(self, submission_id: int, new_mark: float):
         """Directly update the mark of a submission by its ID"""
-        conn = get_db_connection()
+        conn = get_db_pool()
         try:
             conn.execute("UPDATE submission SET mark = ? WHERE submission_id = ?", (new_mark, submission_id))
             conn.commit()
@@ -60,7 +81,7 @@ class SubmissionRepository:
 
     def delete_by_id(self, submission_id: int):
         """Delete a submission record by its ID"""
-        conn = get_db_connection()
+        conn = get_db_pool()
         try:
             conn.execute("DELETE FROM submission WHERE submission_id = ?", (submission_id,))
             conn.commit()
@@ -70,7 +91,7 @@ class SubmissionRepository:
 
     def get_by_assessment(self, assessment_id: int) -> List[dict]:
         """Get all submissions for a specific assessment"""
-        conn = get_db_connection()
+        conn = get_db_pool()
         cur = conn.cursor()
         # Here we return a list of dicts for easier JSON serialization
         cur.execute(
@@ -87,7 +108,7 @@ class SubmissionRepository:
         return self.upsert_grade(student_id, assessment_id, mark)
         
     def get_by_student(self, student_id: str) -> List[SubmissionRecord]:
-        conn = get_db_connection()
+        conn = get_db_pool()
         cur = conn.cursor()
         cur.execute("SELECT submission_id, student_id, assessment_id, submitted_at, status, mark FROM submission WHERE student_id=?", (student_id,))
         rows = cur.fetchall()
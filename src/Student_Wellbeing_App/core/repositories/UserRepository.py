@@ -1,41 +1,34 @@
-import hashlib
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from src.Student_Wellbeing_App.core.models.User import User
 from src.Student_Wellbeing_App.core.models.UserRole import UserRole
-from src.Student_Wellbeing_App.core.database.connection import get_db_connection
+from src.Student_Wellbeing_App.core.models.UserSummary import UserSummary
+from src.Student_Wellbeing_App.core.database.connection import get_db_pool
+from src.Student_Wellbeing_App.core.repositories.EntityCache import get_cache
+from src.Student_Wellbeing_App.core.repositories.IdSequence import get_sequence
+from src.Student_Wellbeing_App.core.security.PasswordHasher import verify_password
 
-
-class UserRepository:
-    def __init__(self):
-        self._conn = get_db_connection()
+# Sortable columns for get_page -> full ORDER BY key (unique, index-backed)
+USER_SORT_KEYS = {
+    "user_id": ("user_id",),
+    "first_name": ("first_name", "lastname", "user_id"),
+    "lastname": ("lastname", "first_name", "user_id"),
+    "role": ("role", "first_name", "lastname", "user_id"),
+}
 
 
+class UserRepository:
     def _next_emp_id(self, cursor) -> str:
         """
-        Generate the next EMP-style user_id: EMP0001, EMP0002, ...
+        Allocate the next EMP-style user_id: EMP0001, EMP0002, ...
         """
-        cursor.execute(
-            "SELECT user_id FROM user WHERE user_id LIKE 'EMP%' ORDER BY user_id DESC LIMIT 1"
-        )
-        row = cursor.fetchone()
-
-        if row is None:
-            return "EMP0001"
-
-        last_id = row[0]          # e.g. "EMP0012"
-        num_part = last_id[3:]    # "0012"
-        try:
-            last_num = int(num_part)
-        except ValueError:
-            last_num = 0
-
-        return f"EMP{last_num + 1:04d}"
+        return get_sequence("user").next_ids(cursor)[0]
 
     # ---------- Creation ----------
 
     def create(self, user: User) -> str:
-        cur = self._conn.cursor()
+        conn = get_db_pool()
+        cur = conn.cursor()
         user_id = self._next_emp_id(cur)
 
         cur.execute(
@@ -51,21 +44,50 @@ class UserRepository:
                 user.role.name,
             ),
         )
-        self._conn.commit()
+        conn.commit()
+        cur.close()
+        conn.close()
+        get_cache("login").invalidate(user_id)
         return user_id
 
+    # ---------- Updates ----------
+
+    def update_password_hash(self, user_id: str, password_hash: str) -> bool:
+        return self._update(user_id, "password_hash", password_hash)
+
+    def update_role(self, user_id: str, role: UserRole) -> bool:
+        return self._update(user_id, "role", role.name)
+
+    def _update(self, user_id: str, column: str, value: str) -> bool:
+        # column is one of the literals above, never user input
+        conn = get_db_pool()
+        cur = conn.cursor()
+        cur.execute(f"UPDATE user SET {column} = ? WHERE user_id = ?", (value, user_id))
+        changed = cur.rowcount > 0
+        conn.commit()
+        cur.close()
+        conn.close()
+        # a cached sign-in must not outlive the password or role it was checked against
+        get_cache("login").invalidate(user_id)
+        return changed
+
     # ---------- Queries ----------
 
     def has_admin(self) -> bool:
-        cur = self._conn.cursor()
+        conn = get_db_pool()
+        cur = conn.cursor()
         cur.execute(
             "SELECT COUNT(*) FROM user WHERE role = ? LIMIT 1;",
             (UserRole.ADMIN.name,),
         )
-        return cur.fetchone() is not None
+        row = cur.fetchone()
+        cur.close()
+        conn.close()
+        return row is not None
 
     def get_by_id(self, user_id: str) -> Optional[User]:
-        cur = self._conn.cursor()
+        conn = get_db_pool()
+        cur = conn.cursor()
         cur.execute(
             """
             SELECT user_id, first_name, lastname, password_hash, role
@@ -75,6 +97,8 @@ class UserRepository:
             (user_id,),
         )
         row = cur.fetchone()
+        cur.close()
+        conn.close()
         if row is None:
             return None
 
@@ -87,7 +111,8 @@ class UserRepository:
         )
 
     def get_all(self) -> List[User]:
-        cur = self._conn.cursor()
+        conn = get_db_pool()
+        cur = conn.cursor()
         cur.execute(
             """
             SELECT user_id, first_name, lastname, password_hash, role
@@ -96,6 +121,8 @@ class UserRepository:
             """
         )
         rows = cur.fetchall()
+        cur.close()
+        conn.close()
 
         return [
             User(
@@ -109,7 +136,8 @@ class UserRepository:
         ]
 
     def get_by_role(self, role: UserRole) -> List[User]:
-        cur = self._conn.cursor()
+        conn = get_db_pool()
+        cur = conn.cursor()
         cur.execute(
             """
             SELECT user_id, first_name, lastname, password_hash, role
@@ -120,6 +148,8 @@ class UserRepository:
             (role.name,),
         )
         rows = cur.fetchall()
+        cur.close()
+        conn.close()
 
         return [
             User(
@@ -132,12 +162,116 @@ class UserRepository:
             for row in rows
         ]
 
+    # ---------- Projections (no password column) ----------
+
+    def list_summaries(self, role: Optional[UserRole] = None) -> List[UserSummary]:
+        """Users (optionally of one role) as slim UserSummary tuples, by name."""
+        where, params = self._list_filters(role, None)
+        conn = get_db_pool()
+        cur = conn.cursor()
+        cur.execute(
+            f"SELECT user_id, first_name, lastname, role FROM user{where} "
+            "ORDER BY first_name, lastname, user_id",
+            params,
+        )
+        rows = cur.fetchall()
+        cur.close()
+        conn.close()
+        return [UserSummary(row[0], row[1], row[2], UserRole[row[3]]) for row in rows]
+
+    def iter_ids(self, batch_size: int = 1000) -> Iterator[str]:
+        """Yield every user_id in order, one keyset batch per checkout."""
+        last = ""
+        while True:
+            conn = get_db_pool()
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT user_id FROM user WHERE user_id > ? ORDER BY user_id LIMIT ?",
+                (last, batch_size),
+            )
+            ids = [row[0] for row in cur.fetchall()]
+            cur.close()
+            conn.close()
+            yield from ids
+            if len(ids) < batch_size:
+                return
+            last = ids[-1]
+
+    # ---------- Paged listing (virtual user table) ----------
+
+    @staticmethod
+    def _list_filters(role: Optional[UserRole], text: Optional[str]) -> Tuple[str, list]:
+        where, params = [], []
+        if role is not None:
+            where.append("role = ?")
+            params.append(role.name)
+        if text:
+            escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            where.append(
+                "(user_id LIKE ? ESCAPE '\\' OR first_name LIKE ? ESCAPE '\\' OR lastname LIKE ? ESCAPE '\\')"
+            )
+            params.extend([f"%{escaped}%"] * 3)
+        return (" WHERE " + " AND ".join(where)) if where else "", params
+
+    def count(self, role: Optional[UserRole] = None, text: Optional[str] = None) -> int:
+        where, params = self._list_filters(role, text)
+        conn = get_db_pool()
+        cur = conn.cursor()
+        cur.execute(f"SELECT COUNT(*) FROM user{where}", params)
+        row = cur.fetchone()
+        cur.close()
+        conn.close()
+        return row[0]
+
+    def get_page(
+            self,
+            offset: int = 0,
+            limit: int = 100,
+            role: Optional[UserRole] = None,
+            text: Optional[str] = None,
+            sort: str = "first_name",
+            descending: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        One page of the user list as plain rows (user_id, first_name,
+        lastname, role) - no password hashes. `text` matches anywhere in the
+        ID or either name; `sort` is one of USER_SORT_KEYS.
+        """
+        if sort not in USER_SORT_KEYS:
+            raise ValueError(f"Cannot sort users by {sort!r}")
+        where, params = self._list_filters(role, text)
+        direction = " DESC" if descending else ""
+        order = ", ".join(col + direction for col in USER_SORT_KEYS[sort])
+
+        conn = get_db_pool()
+        cur = conn.cursor()
+        cur.execute(
+            f"SELECT user_id, first_name, lastname, role FROM user{where} "
+            f"ORDER BY {order} LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        )
+        rows = cur.fetchall()
+        cur.close()
+        conn.close()
+        return [dict(row) for row in rows]
+
+    def get_login_version(self, user_id: str) -> Optional[Tuple[str, str]]:
+        """(password_hash, role) of a user, or None; a primary-key read that lets
+        cached logins notice changes made by another process."""
+        conn = get_db_pool()
+        cur = conn.cursor()
+        cur.execute("SELECT password_hash, role FROM user WHERE user_id = ?", (user_id,))
+        row = cur.fetchone()
+        cur.close()
+        conn.close()
+        return tuple(row) if row else None
+
     def authenticate_by_id(self, user_id: int, password: str) -> Optional[User]:
         """
         Authenticate a system user by user_id + password.
-        Assumes password_hash is stored in the DB (SHA-256).
+        Accepts any hash format PasswordHasher knows (scrypt, PBKDF2, legacy SHA-256).
         """
-        conn = get_db_connection()
+        conn = get_db_pool()
         cur = conn.cursor()
         cur.execute(
             """
@@ -155,9 +289,8 @@ class UserRepository:
             return None
 
         db_user_id, first_name, lastname, db_hash, role_str = row
-        input_hash = hashlib.sha256(password.encode()).hexdigest()
-
-        if input_hash != db_hash:
+        # constant-time compare inside the hasher
+        if not verify_password(password, db_hash):
             return None
 
         return User(
@@ -1,58 +1,55 @@
-from typing import List, Optional
+import math
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import date
 from src.Student_Wellbeing_App.core.models.WellbeingRecord import WellbeingRecord
-from src.Student_Wellbeing_App.core.database.connection import get_db_connection
+from src.Student_Wellbeing_App.core.database.connection import get_db_pool
+from src.Student_Wellbeing_App.core.database.migrations import WELLBEING_WEEKLY_AGG_REBUILD
+
+# Per (week_start, cohort_year) totals of the rows matching a WHERE clause
+_AGG_GROUP_SELECT = """
+    SELECT w.week_start, COALESCE(s.year, 0), COUNT(*),
+           SUM(w.stress_level), MIN(w.stress_level), MAX(w.stress_level),
+           SUM(w.sleep_hours), MIN(w.sleep_hours), MAX(w.sleep_hours)
+    FROM wellbeing_record w
+    LEFT JOIN student s ON s.student_id = w.student_id
+    WHERE {where}
+    GROUP BY w.week_start, COALESCE(s.year, 0)
+"""
+
 
 class WellbeingRepository:
     def upsert(self, w: WellbeingRecord) -> int:
         """
         Smart Insert/Update based on Student ID + Week Start Date.
-        If a record exists for this student on this week_start, update it.
-        Otherwise, insert a new one.
+        One INSERT ... ON CONFLICT statement: an existing record for this
+        student/week is updated in place, otherwise a new one is inserted.
+        wellbeing_weekly_agg is adjusted in the same transaction.
+        Returns the record_id either way.
         """
-        conn = get_db_connection()
+        conn = get_db_pool()
         cur = conn.cursor()
         
         try:
-            # 1. Check if record exists for this week
+            cur.execute("BEGIN IMMEDIATE")
+            stale = self._agg_remove(cur, "w.student_id = ? AND w.week_start = ?", (w.student_id, w.week_start))
             cur.execute(
                 """
-                SELECT record_id 
-                FROM wellbeing_record 
-                WHERE student_id = ? AND week_start = ?
+                INSERT INTO wellbeing_record(
+                    student_id, week_start, stress_level, sleep_hours, source_type
+                ) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(student_id, week_start) DO UPDATE SET
+                    stress_level = excluded.stress_level,
+                    sleep_hours = excluded.sleep_hours
+                RETURNING record_id
                 """,
-                (w.student_id, w.week_start)
+                (w.student_id, w.week_start, w.stress_level, w.sleep_hours, w.source_type)
             )
-            row = cur.fetchone()
-            
-            if row:
-                # [Update]
-                existing_id = row[0]
-                cur.execute(
-                    """
-                    UPDATE wellbeing_record 
-                    SET stress_level = ?, sleep_hours = ? 
-                    WHERE record_id = ?
-                    """,
-                    (w.stress_level, w.sleep_hours, existing_id)
-                )
-                conn.commit()
-                print(f"[DB LOG] Updated Wellbeing ID {existing_id}")
-                return existing_id
-            else:
-                # [Insert]
-                cur.execute(
-                    """
-                    INSERT INTO wellbeing_record(
-                        student_id, week_start, stress_level, sleep_hours, source_type
-                    ) VALUES (?, ?, ?, ?, ?)
-                    """,
-                    (w.student_id, w.week_start, w.stress_level, w.sleep_hours, w.source_type)
-                )
-                conn.commit()
-                new_id = cur.lastrowid or 0
-                print(f"[DB LOG] Inserted New Wellbeing ID {new_id}")
-                return new_id
+            record_id = cur.fetchone()[0]
+            self._agg_add(cur, "w.record_id = ?", (record_id,))
+            self._agg_refresh(cur, stale)
+            conn.commit()
+            print(f"[DB LOG] Upserted Wellbeing ID {record_id}")
+            return record_id
                 
         except Exception as e:
             print(f"[DB ERROR] Upsert failed: {e}")
@@ -63,36 +60,245 @@ class WellbeingRepository:
 
     def update_by_id(self, record_id: int, stress: int, sleep: float):
         """Direct update from data editor"""
-        conn = get_db_connection()
+        conn = get_db_pool()
+        cur = conn.cursor()
         try:
-            conn.execute(
+            cur.execute("BEGIN IMMEDIATE")
+            stale = self._agg_remove(cur, "w.record_id = ?", (record_id,))
+            cur.execute(
                 "UPDATE wellbeing_record SET stress_level = ?, sleep_hours = ? WHERE record_id = ?",
                 (stress, sleep, record_id)
             )
+            self._agg_add(cur, "w.record_id = ?", (record_id,))
+            self._agg_refresh(cur, stale)
             conn.commit()
         finally:
+            cur.close()
             conn.close()
 
     def delete_by_id(self, record_id: int):
         """Direct delete"""
-        conn = get_db_connection()
+        conn = get_db_pool()
+        cur = conn.cursor()
         try:
-            conn.execute("DELETE FROM wellbeing_record WHERE record_id = ?", (record_id,))
+            cur.execute("BEGIN IMMEDIATE")
+            stale = self._agg_remove(cur, "w.record_id = ?", (record_id,))
+            cur.execute("DELETE FROM wellbeing_record WHERE record_id = ?", (record_id,))
+            self._agg_refresh(cur, stale)
             conn.commit()
             print(f"[DB LOG] Deleted Wellbeing ID {record_id}")
         finally:
+            cur.close()
             conn.close()
 
-    def get_by_student(self, student_id: str) -> List[WellbeingRecord]:
-        conn = get_db_connection()
+    # ---------- Weekly aggregate ----------
+
+    def get_weekly_trend(self) -> List[Tuple]:
+        """(week_start, avg_stress, avg_sleep) per week, oldest first, from the aggregate."""
+        conn = get_db_pool()
         cur = conn.cursor()
-        
         cur.execute(
             """
+            SELECT week_start,
+                   SUM(stress_sum) / SUM(record_count) AS avg_stress,
+                   SUM(sleep_sum) / SUM(record_count) AS avg_sleep
+            FROM wellbeing_weekly_agg
+            GROUP BY week_start
+            ORDER BY week_start
+            """
+        )
+        rows = cur.fetchall()
+        cur.close()
+        conn.close()
+        return [tuple(r) for r in rows]
+
+    def cohort_stats(self, threshold: int, since: Optional[date] = None, until: Optional[date] = None) -> List[Tuple]:
+        """
+        One row per cohort (student.year), in one grouped query:
+        (year, students, records, avg_stress, avg_sleep,
+         high_stress_records, high_stress_students).
+        since/until bound week_start, both inclusive.
+        """
+        where, params = [], [threshold, threshold]
+        if since is not None:
+            where.append("w.week_start >= ?")
+            params.append(str(since))
+        if until is not None:
+            where.append("w.week_start <= ?")
+            params.append(str(until))
+
+        conn = get_db_pool()
+        cur = conn.cursor()
+        cur.execute(
+            f"""
+            SELECT s.year,
+                   COUNT(DISTINCT w.student_id),
+                   COUNT(*),
+                   AVG(w.stress_level),
+                   AVG(w.sleep_hours),
+                   SUM(w.stress_level >= ?),
+                   COUNT(DISTINCT CASE WHEN w.stress_level >= ? THEN w.student_id END)
+            FROM wellbeing_record w
+            JOIN student s ON s.student_id = w.student_id
+            {"WHERE " + " AND ".join(where) if where else ""}
+            GROUP BY s.year
+            ORDER BY s.year
+            """,
+            params
+        )
+        rows = cur.fetchall()
+        cur.close()
+        conn.close()
+        return [tuple(r) for r in rows]
+
+    def signal_stats(self, threshold: int, recent_window: int) -> List[Tuple]:
+        """
+        One row per student with records, in one pass over wellbeing_record:
+        (student_id, records, high_stress_weeks, recent_records, recent_avg_sleep)
+        where "recent" is the student's latest recent_window weeks.
+        """
+        conn = get_db_pool()
+        cur = conn.cursor()
+        cur.execute(
+            """
+            WITH ranked AS (
+                SELECT student_id, stress_level, sleep_hours,
+                       ROW_NUMBER() OVER (PARTITION BY student_id ORDER BY week_start DESC) AS rn
+                FROM wellbeing_record
+            )
+            SELECT student_id,
+                   COUNT(*),
+                   SUM(stress_level >= ?),
+                   SUM(rn <= ?),
+                   AVG(CASE WHEN rn <= ? THEN sleep_hours END)
+            FROM ranked
+            GROUP BY student_id
+            """,
+            (threshold, recent_window, recent_window)
+        )
+        rows = cur.fetchall()
+        cur.close()
+        conn.close()
+        return [tuple(r) for r in rows]
+
+    def rebuild_weekly_agg(self) -> int:
+        """Recompute wellbeing_weekly_agg from scratch. Returns the number of groups."""
+        conn = get_db_pool()
+        cur = conn.cursor()
+        try:
+            cur.execute("BEGIN IMMEDIATE")
+            cur.execute("DELETE FROM wellbeing_weekly_agg")
+            cur.execute(WELLBEING_WEEKLY_AGG_REBUILD)
+            groups = cur.rowcount
+            conn.commit()
+            print(f"[DB LOG] Rebuilt wellbeing_weekly_agg: {groups} groups")
+            return groups
+        finally:
+            cur.close()
+            conn.close()
+
+    def check_weekly_agg(self) -> List[Dict]:
+        """
+        Compare wellbeing_weekly_agg with a fresh GROUP BY over wellbeing_record.
+        Returns one dict per mismatching (week_start, cohort_year); empty when consistent.
+        """
+        conn = get_db_pool()
+        cur = conn.cursor()
+        cur.execute(_AGG_GROUP_SELECT.format(where="1 = 1"))
+        expected = {(r[0], r[1]): tuple(r[2:]) for r in cur.fetchall()}
+        cur.execute(
+            "SELECT week_start, cohort_year, record_count, stress_sum, stress_min, stress_max, "
+            "sleep_sum, sleep_min, sleep_max FROM wellbeing_weekly_agg"
+        )
+        actual = {(r[0], r[1]): tuple(r[2:]) for r in cur.fetchall()}
+        cur.close()
+        conn.close()
+
+        problems = []
+        for key in sorted(set(expected) | set(actual), key=str):
+            want, got = expected.get(key), actual.get(key)
+            # sums of REAL values drift by a few ulps under add/subtract
+            if want is None or got is None or not all(
+                    (a is None and b is None) or (a is not None and b is not None and math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9))
+                    for a, b in zip(want, got)):
+                problems.append({"week_start": key[0], "cohort_year": key[1], "expected": want, "actual": got})
+        return problems
+
+    # Incremental maintenance. Callers run these inside their write
+    # transaction: _agg_remove before rows change, _agg_add after, then
+    # _agg_refresh for groups whose min/max may have been removed.
+
+    def _agg_remove(self, cur, where: str, params: tuple) -> Set[Tuple]:
+        cur.execute(_AGG_GROUP_SELECT.format(where=where), params)
+        stale = set()
+        for week, cohort, n, s_sum, s_min, s_max, l_sum, l_min, l_max in cur.fetchall():
+            cur.execute(
+                """
+                UPDATE wellbeing_weekly_agg
+                SET record_count = record_count - ?, stress_sum = stress_sum - ?, sleep_sum = sleep_sum - ?
+                WHERE week_start = ? AND cohort_year = ?
+                RETURNING stress_min, stress_max, sleep_min, sleep_max
+                """,
+                (n, s_sum, l_sum, week, cohort)
+            )
+            bounds = cur.fetchone()
+            # only a removed extreme forces a rescan of the week
+            if bounds is None or s_min <= bounds[0] or s_max >= bounds[1] or l_min <= bounds[2] or l_max >= bounds[3]:
+                stale.add((week, cohort))
+        return stale
+
+    def _agg_add(self, cur, where: str, params: tuple) -> None:
+        cur.execute(
+            """
+            INSERT INTO wellbeing_weekly_agg (
+                week_start, cohort_year, record_count,
+                stress_sum, stress_min, stress_max,
+                sleep_sum, sleep_min, sleep_max
+            )
+            """ + _AGG_GROUP_SELECT.format(where=where) + """
+            ON CONFLICT(week_start, cohort_year) DO UPDATE SET
+                record_count = record_count + excluded.record_count,
+                stress_sum = stress_sum + excluded.stress_sum,
+                stress_min = MIN(COALESCE(stress_min, excluded.stress_min), excluded.stress_min),
+                stress_max = MAX(COALESCE(stress_max, excluded.stress_max), excluded.stress_max),
+                sleep_sum = sleep_sum + excluded.sleep_sum,
+                sleep_min = MIN(COALESCE(sleep_min, excluded.sleep_min), excluded.sleep_min),
+                sleep_max = MAX(COALESCE(sleep_max, excluded.sleep_max), excluded.sleep_max)
+            """,
+            params
+        )
+
+    def _agg_refresh(self, cur, groups: Set[Tuple]) -> None:
+        for week, cohort in groups:
+            cur.execute(
+                "DELETE FROM wellbeing_weekly_agg WHERE week_start = ? AND cohort_year = ? AND record_count <= 0",
+                (week, cohort)
+            )
+            if cur.rowcount:
+                continue
+            cur.execute(
+                """
+                UPDATE wellbeing_weekly_agg SET (stress_min, stress_max, sleep_min, sleep_max) = (
+                    SELECT MIN(w.stress_level), MAX(w.stress_level), MIN(w.sleep_hours), MAX(w.sleep_hours)
+                    FROM wellbeing_record w
+                    LEFT JOIN student s ON s.student_id = w.student_id
+                    WHERE w.week_start = ? AND COALESCE(s.year, 0) = ?
+                )
+                WHERE week_start = ? AND cohort_year = ?
+                """,
+                (week, cohort, week, cohort)
+            )
+
+    def get_by_student(self, student_id: str, newest_first: bool = True) -> List[WellbeingRecord]:
+        conn = get_db_pool()
+        cur = conn.cursor()
+        
+        cur.execute(
+            f"""
             SELECT record_id, student_id, week_start, stress_level, sleep_hours, source_type 
             FROM wellbeing_record 
             WHERE student_id = ?
-            ORDER BY week_start DESC
+            ORDER BY week_start {"DESC" if newest_first else "ASC"}
             """, 
             (student_id,)
         )
@@ -0,0 +1,329 @@
+"""
+Password hashing for users and students.
+
+Hashes are stored as self-describing strings, so the cost parameters can
+change per deployment without breaking existing accounts:
+
+    scrypt$<n>$<r>$<p>$<salt>$<hash>
+    pbkdf2_sha256$<iterations>$<salt>$<hash>
+    <64 hex chars>                          legacy unsalted SHA-256
+
+verify_password() accepts all three; needs_rehash() is True for another
+algorithm or a lower cost than the active hasher's (never for a higher
+one), and AuthenticationService uses it to upgrade hashes on the next
+successful login.
+
+Configuration (environment):
+- WELLBEING_PASSWORD_HASHER    scrypt (default) or pbkdf2_sha256
+- WELLBEING_PASSWORD_COST      e.g. "n=32768,r=8,p=1" / "iterations=900000",
+                               or "auto" to calibrate to the target below
+- WELLBEING_PASSWORD_TARGET_MS target time per hash for "auto" (default 50)
+
+The KDFs run on a small worker pool: hashlib releases the GIL while it
+works, and the pool bounds how many hashes (and, for scrypt, how much
+memory) are in flight during a login storm. Bulk imports use
+hash_passwords(), which spreads a batch over a process pool instead
+(WELLBEING_PASSWORD_PROCESSES, default one per CPU). That pool is started
+once and reused, so in a long-running app it keeps that many idle worker
+processes after the first large import; set the variable to 1 to hash on
+the thread pool only.
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import re
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+
+SALT_BYTES = 16
+HASH_WORKERS = int(os.environ.get("WELLBEING_PASSWORD_WORKERS", str(min(4, os.cpu_count() or 2))))
+HASH_PROCESSES = int(os.environ.get("WELLBEING_PASSWORD_PROCESSES", str(os.cpu_count() or 1)))
+# Batches smaller than this are not worth starting worker processes for
+MIN_PROCESS_BATCH = 64
+DEFAULT_TARGET_MS = float(os.environ.get("WELLBEING_PASSWORD_TARGET_MS", "50"))
+
+_LEGACY_SHA256 = re.compile(r"[0-9a-f]{64}")
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii")
+
+
+def _unb64(text: str) -> bytes:
+    return base64.b64decode(text.encode("ascii"), validate=True)
+
+
+class ScryptHasher:
+    """hashlib.scrypt; memory use is 128 * r * n bytes per hash."""
+
+    algorithm = "scrypt"
+    MAX_N = 2 ** 17   # 128 MiB at r=8; calibration never goes above this
+
+    def __init__(self, n: int = 2 ** 14, r: int = 8, p: int = 1):
+        if n < 2 or n & (n - 1):
+            raise ValueError("scrypt n must be a power of two")
+        if r < 1 or p < 1:
+            raise ValueError("scrypt r and p must be at least 1")
+        self.n, self.r, self.p = n, r, p
+
+    def hash(self, password: str) -> str:
+        salt = os.urandom(SALT_BYTES)
+        digest = self._derive(password, salt, self.n, self.r, self.p)
+        return f"{self.algorithm}${self.n}${self.r}${self.p}${_b64(salt)}${_b64(digest)}"
+
+    def verify(self, password: str, encoded: str) -> bool:
+        try:
+            _, n, r, p, salt, digest = encoded.split("$")
+            n, r, p, salt, digest = int(n), int(r), int(p), _unb64(salt), _unb64(digest)
+            # bad parameters (n not a power of two, too much memory) raise here too
+            candidate = self._derive(password, salt, n, r, p, len(digest))
+        except ValueError:
+            return False
+        return hmac.compare_digest(candidate, digest)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        # only upgrade hashes weaker than ours: processes that calibrated
+        # differently must not keep rewriting each other's hashes
+        try:
+            algorithm, n, r, p = encoded.split("$")[:4]
+            return algorithm != self.algorithm or int(n) < self.n or int(r) < self.r or int(p) < self.p
+        except ValueError:
+            return True
+
+    @staticmethod
+    def _derive(password: str, salt: bytes, n: int, r: int, p: int, length: int = 32) -> bytes:
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                              maxmem=2 * 128 * r * n + 1024 * 1024, dklen=length)
+
+    @classmethod
+    def calibrate(cls, target_ms: float = DEFAULT_TARGET_MS, r: int = 8, p: int = 1) -> "ScryptHasher":
+        """Largest power-of-two n whose hash takes at most about target_ms here."""
+        n = 2 ** 12
+        while n < cls.MAX_N:
+            elapsed = _time_ms(lambda: cls._derive("calibrate", b"\0" * SALT_BYTES, n * 2, r, p))
+            if elapsed > target_ms:
+                break
+            n *= 2
+        return cls(n=n, r=r, p=p)
+
+    def __repr__(self):
+        return f"ScryptHasher(n={self.n}, r={self.r}, p={self.p})"
+
+
+class Pbkdf2Hasher:
+    """hashlib.pbkdf2_hmac with SHA-256."""
+
+    algorithm = "pbkdf2_sha256"
+    MIN_ITERATIONS = 100_000
+    CALIBRATION_STEP = 50_000
+
+    def __init__(self, iterations: int = 600_000):
+        if iterations < 1:
+            raise ValueError("iterations must be at least 1")
+        self.iterations = iterations
+
+    def hash(self, password: str) -> str:
+        salt = os.urandom(SALT_BYTES)
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, self.iterations)
+        return f"{self.algorithm}${self.iterations}${_b64(salt)}${_b64(digest)}"
+
+    def verify(self, password: str, encoded: str) -> bool:
+        try:
+            _, iterations, salt, digest = encoded.split("$")
+            iterations, salt, digest = int(iterations), _unb64(salt), _unb64(digest)
+        except ValueError:
+            return False
+        candidate = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations, len(digest))
+        return hmac.compare_digest(candidate, digest)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        try:
+            algorithm, iterations = encoded.split("$")[:2]
+            return algorithm != self.algorithm or int(iterations) < self.iterations
+        except ValueError:
+            return True
+
+    @classmethod
+    def calibrate(cls, target_ms: float = DEFAULT_TARGET_MS) -> "Pbkdf2Hasher":
+        """
+        Iterations that take about target_ms here (never below MIN_ITERATIONS),
+        rounded down to a multiple of CALIBRATION_STEP so restarts agree.
+        """
+        probe = 20_000
+        elapsed = _time_ms(lambda: hashlib.pbkdf2_hmac("sha256", b"calibrate", b"\0" * SALT_BYTES, probe))
+        iterations = int(probe * target_ms / max(elapsed, 1e-3))
+        iterations -= iterations % cls.CALIBRATION_STEP
+        return cls(iterations=max(cls.MIN_ITERATIONS, iterations))
+
+    def __repr__(self):
+        return f"Pbkdf2Hasher(iterations={self.iterations})"
+
+
+class LegacySha256Hasher:
+    """The original unsalted SHA-256 hex digests; only used to verify old hashes."""
+
+    algorithm = "sha256"
+
+    def hash(self, password: str) -> str:
+        return hashlib.sha256(password.encode()).hexdigest()
+
+    def verify(self, password: str, encoded: str) -> bool:
+        return hmac.compare_digest(self.hash(password).encode(), encoded.encode())
+
+    def needs_rehash(self, encoded: str) -> bool:
+        return True
+
+
+HASHERS = {
+    ScryptHasher.algorithm: ScryptHasher,
+    Pbkdf2Hasher.algorithm: Pbkdf2Hasher,
+}
+
+
+def identify(encoded: Optional[str]) -> Optional[str]:
+    """Algorithm name of a stored hash, or None if it is not one we know."""
+    if not encoded:
+        return None
+    if _LEGACY_SHA256.fullmatch(encoded):
+        return LegacySha256Hasher.algorithm
+    algorithm = encoded.split("$", 1)[0]
+    return algorithm if algorithm in HASHERS else None
+
+
+def make_hasher(algorithm: str = ScryptHasher.algorithm, cost: str = "", target_ms: float = DEFAULT_TARGET_MS):
+    """
+    Build a hasher. cost is "" (defaults), "auto" (calibrate to target_ms)
+    or "key=value,..." constructor arguments, e.g. "n=32768,r=8".
+    """
+    if algorithm == "pbkdf2":
+        algorithm = Pbkdf2Hasher.algorithm
+    try:
+        cls = HASHERS[algorithm]
+    except KeyError:
+        raise ValueError(f"Unknown password hasher: {algorithm!r}") from None
+    cost = (cost or "").strip()
+    if cost == "auto":
+        return cls.calibrate(target_ms)
+    kwargs = {}
+    for part in filter(None, (p.strip() for p in cost.split(","))):
+        key, _, value = part.partition("=")
+        kwargs[key.strip()] = int(value)
+    return cls(**kwargs)
+
+
+# --- Active hasher and worker pool ---
+_hasher = None
+_hasher_lock = threading.Lock()
+_executor = None
+_worker_threads = set()
+_process_executor = None
+_process_count = 0
+
+
+def get_hasher():
+    """The hasher new hashes are made with (built from the environment on first use)."""
+    global _hasher
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                _hasher = make_hasher(
+                    os.environ.get("WELLBEING_PASSWORD_HASHER", ScryptHasher.algorithm),
+                    os.environ.get("WELLBEING_PASSWORD_COST", ""),
+                )
+    return _hasher
+
+
+def set_hasher(hasher) -> None:
+    """Replace the active hasher (None: rebuild from the environment on next use)."""
+    global _hasher
+    with _hasher_lock:
+        _hasher = hasher
+
+
+def hash_password(password: str) -> str:
+    return _run(get_hasher().hash, password)
+
+
+def hash_passwords(passwords: List[str], processes: int = None) -> List[str]:
+    """
+    Hash a batch with the active hasher, in input order. Large batches are
+    split over `processes` worker processes (default HASH_PROCESSES); on a
+    single CPU, or for small batches, they go through the thread pool.
+    """
+    hasher = get_hasher()
+    processes = HASH_PROCESSES if processes is None else processes
+    if processes <= 1 or len(passwords) < MIN_PROCESS_BATCH:
+        return [_run(hasher.hash, pw) for pw in passwords]
+    pool = _process_pool(processes)
+    try:
+        return list(pool.map(hasher.hash, passwords, chunksize=max(1, len(passwords) // (processes * 4))))
+    except BrokenProcessPool:
+        _shutdown_process_pool()   # a worker died; start a fresh pool next time
+        raise
+
+
+def _process_pool(processes: int) -> ProcessPoolExecutor:
+    """
+    The shared worker processes, started on first use and kept for later
+    batches so each import (e.g. every Streamlit upload) does not pay for
+    interpreter start-up. At most max(processes) of any call stay alive.
+    """
+    global _process_executor, _process_count
+    with _hasher_lock:
+        if _process_executor is None or _process_count < processes:
+            if _process_executor is not None:
+                _process_executor.shutdown(wait=True)
+            # spawn: forking a process that runs threads (Streamlit, the sinks) is unsafe
+            _process_executor = ProcessPoolExecutor(max_workers=processes,
+                                                    mp_context=multiprocessing.get_context("spawn"))
+            _process_count = processes
+        return _process_executor
+
+
+def _shutdown_process_pool() -> None:
+    global _process_executor, _process_count
+    with _hasher_lock:
+        if _process_executor is not None:
+            _process_executor.shutdown(wait=False)
+        _process_executor, _process_count = None, 0
+
+
+def verify_password(password: str, encoded: Optional[str]) -> bool:
+    algorithm = identify(encoded)
+    if algorithm is None:
+        return False
+    if algorithm == LegacySha256Hasher.algorithm:
+        return LegacySha256Hasher().verify(password, encoded)   # cheap, no need for the pool
+    return _run(HASHERS[algorithm]().verify, password, encoded)
+
+
+def needs_rehash(encoded: Optional[str]) -> bool:
+    """True if encoded uses another algorithm than the active hasher, or a lower cost."""
+    return not encoded or get_hasher().needs_rehash(encoded)
+
+
+def _run(fn, *args):
+    global _executor
+    if threading.get_ident() in _worker_threads:
+        return fn(*args)
+    if _executor is None:
+        with _hasher_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=HASH_WORKERS,
+                    thread_name_prefix="pw-hash",
+                    initializer=lambda: _worker_threads.add(threading.get_ident()),
+                )
+    return _executor.submit(fn, *args).result()
+
+
+def _time_ms(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000
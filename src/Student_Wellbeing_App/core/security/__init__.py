@@ -0,0 +1,3 @@
+"""
+Password hashing, shared by the repositories and services.
+"""
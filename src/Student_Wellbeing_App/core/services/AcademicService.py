@@ -3,17 +3,20 @@ from src.Student_Wellbeing_App.core.models.AcademicSummary import AcademicSummar
 from src.Student_Wellbeing_App.core.services.SubmissionService import SubmissionService
 from src.Student_Wellbeing_App.core.services.AttendanceService import AttendanceService
 from src.Student_Wellbeing_App.core.services.StudentService import StudentService
+from src.Student_Wellbeing_App.core.services.RiskEngine import RiskEngine
 
 class AcademicService:
     def __init__(
         self, 
         submission_service: Optional[SubmissionService] = None, 
         attendance_service: Optional[AttendanceService] = None,
-        student_service: Optional[StudentService] = None
+        student_service: Optional[StudentService] = None,
+        risk_engine: Optional[RiskEngine] = None
     ):
         self.submission_service = submission_service or SubmissionService()
         self.attendance_service = attendance_service or AttendanceService()
         self.student_service = student_service or StudentService()
+        self.risk_engine = risk_engine or RiskEngine()
 
     def get_student_academic_profile(self, student_id: str):
         """
@@ -33,21 +36,15 @@ class AcademicService:
         }
 
     def get_low_attendance_students(self, students: list, threshold: float = 75.0) -> List[Tuple[object, float]]:
-        results = []
-        for s in students:
-            pct = self.attendance_service.get_attendance_percentage(s.student_id)
-            if pct is not None and pct < threshold:
-                results.append((s, pct))
-        return results
+        # One set-based pass for everyone instead of a query per student
+        ids = [s.student_id for s in students]
+        pct = self.risk_engine.compute(attendance_threshold=threshold)["attendance_pct"].reindex(ids).fillna(100.0)
+        return [(s, float(p)) for s, p in zip(students, pct) if p < threshold]
 
     def get_low_mark_students(self, students: list, threshold: float = 50.0) -> List[Tuple[object, int]]:
-        low_marks_list = []
-        for s in students:
-            subs = self.submission_service.get_submissions_for_student(s.student_id)
-            low = [x for x in subs if x.mark is not None and x.mark < threshold]
-            if low:
-                low_marks_list.append((s, len(low)))
-        return low_marks_list
+        ids = [s.student_id for s in students]
+        low = self.risk_engine.compute(low_mark_threshold=threshold)["low_marks"].reindex(ids).fillna(0)
+        return [(s, int(n)) for s, n in zip(students, low) if n > 0]
 
     def get_student_academic_summary(self, student_id: str) -> Optional[AcademicSummary]:
         """
@@ -1,4 +1,5 @@
-from typing import List, Optional
+from collections import Counter
+from typing import Dict, List, Optional, Union
 from src.Student_Wellbeing_App.core.models.AttendanceRecord import AttendanceRecord
 from src.Student_Wellbeing_App.core.models.AttendanceStatus import AttendanceStatus
 from src.Student_Wellbeing_App.core.repositories.AttendanceRepository import AttendanceRepository
@@ -15,6 +16,23 @@ class AttendanceService:
         self.audit.log(performed_by, "UPSERT_ATTENDANCE", f"Recorded {status.value} for {student_id} in {session_id}")
         return new_id
 
+    def record_session_register(self, session_id: str, session_date, register: Dict[str, Union[AttendanceStatus, str]], performed_by: str = "UNKNOWN") -> int:
+        """
+        Record attendance for a whole class in one go.
+        register maps student_id -> AttendanceStatus (or its string value).
+        All rows are committed together and summarised in one audit entry.
+        """
+        # Validate everything before touching the database
+        statuses = {sid: s if isinstance(s, AttendanceStatus) else AttendanceStatus(s) for sid, s in register.items()}
+        if not statuses:
+            return 0
+
+        saved = self.repo.upsert_register(session_id, session_date, statuses)
+        counts = Counter(s.value for s in statuses.values())
+        summary = ", ".join(f"{k} {v}" for k, v in sorted(counts.items()))
+        self.audit.log(performed_by, "BULK_UPSERT_ATTENDANCE", f"Recorded register for {session_id} on {session_date}: {saved} students ({summary})")
+        return saved
+
     def update_attendance_status(self, attendance_id: int, new_status: str, performed_by: str = "UNKNOWN"):
         self.repo.update_status_by_id(attendance_id, new_status)
         self.audit.log(performed_by, "UPDATE_ATTENDANCE", f"ID {attendance_id} status changed to {new_status}")
@@ -1,14 +1,89 @@
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Tuple, Union
 from src.Student_Wellbeing_App.core.repositories.AuditRepository import AuditRepository
+from src.Student_Wellbeing_App.core.repositories.AuditArchiveRepository import AuditArchiveRepository
+from src.Student_Wellbeing_App.core.services.AuditSink import AuditSink, get_audit_sink
+
+# Largest page query_logs() returns
+MAX_PAGE_SIZE = 500
+
 
 class AuditService:
-    def __init__(self):
+    def __init__(self, sink: AuditSink = None):
         self.repo = AuditRepository()
+        self.archive = AuditArchiveRepository()
+        # None -> use the shared sink if one is running, else write directly
+        self.sink = sink
 
     def log(self, user_id: str, action: str, details: str):
         # Record an audit log entry
         # if user_id is None or empty, use "SYSTEM" as operator
         operator = user_id if user_id else "SYSTEM"
-        self.repo.log_action(operator, action, details)
+        sink = self.sink or get_audit_sink()
+        if sink is not None:
+            sink.submit(operator, action, details)
+        else:
+            self.repo.log_action(operator, action, details)
 
     def get_logs(self):
-        return self.repo.get_recent_logs()
\ No newline at end of file
+        # make entries still sitting in the queue visible to the reader
+        sink = self.sink or get_audit_sink()
+        if sink is not None:
+            sink.flush(timeout=1.0)
+        return self.repo.get_recent_logs()
+
+    def query_logs(
+            self,
+            user_id: Optional[str] = None,
+            action: Optional[str] = None,
+            since: Union[date, datetime, str, None] = None,
+            until: Union[date, datetime, str, None] = None,
+            text: Optional[str] = None,
+            after_cursor: Optional[Tuple[str, int]] = None,
+            limit: int = 50,
+    ) -> Dict[str, Any]:
+        """
+        One page of audit entries, newest first, spanning the live table and
+        the monthly archive. A plain date for `until` includes that whole day.
+        Returns {"rows": [...], "next_cursor": ...}; pass next_cursor back as
+        after_cursor for the following page (None means this was the last one).
+        """
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+        sink = self.sink or get_audit_sink()
+        if sink is not None:
+            sink.flush(timeout=1.0)
+
+        # one extra row tells us whether another page exists
+        filters = dict(
+            user_id=user_id or None,
+            action=action or None,
+            since=_time_bound(since),
+            until=_time_bound(until, end_of_day=True),
+            text=text or None,
+            after=tuple(after_cursor) if after_cursor else None,
+            limit=limit + 1,
+        )
+        rows = self.repo.query_logs(**filters)
+        if self.archive.months():
+            archived = self.archive.query(**filters)
+            rows = sorted(rows + archived, key=lambda r: (str(r["timestamp"]), r["log_id"]), reverse=True)
+            rows = rows[:limit + 1]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1]["timestamp"], rows[-1]["log_id"])
+        return {"rows": rows, "next_cursor": next_cursor}
+
+
+def _time_bound(value, end_of_day: bool = False) -> Optional[str]:
+    # Timestamps are stored as 'YYYY-MM-DD HH:MM:SS[.ffffff]' text, so bounds
+    # are compared as strings in the same format.
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return (value + timedelta(days=1) if end_of_day else value).isoformat()
+    return str(value)
@@ -0,0 +1,219 @@
+import atexit
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+from src.Student_Wellbeing_App.core.repositories.AuditRepository import AuditRepository
+
+
+class AuditSink:
+    """
+    Buffered audit writer in front of AuditRepository.
+
+    - submit() stamps the entry and appends it to a bounded in-memory queue;
+      the caller never waits for the database.
+    - A background thread writes queued entries in batches (one executemany,
+      one commit) once batch_size entries are waiting or flush_interval
+      seconds have passed.
+    - When the queue is full, submit() waits up to put_timeout seconds for
+      room and then drops the entry (counted in stats()["dropped"]).
+    - Entries written more than late_after seconds after submit() are
+      counted as late.
+    - close() (also registered with atexit) drains the queue before the
+      writer stops; flush() waits for everything submitted so far.
+    - synchronous=True writes each entry before submit() returns, with no
+      thread; used by tests and one-off scripts.
+    """
+
+    def __init__(
+            self,
+            repo: AuditRepository = None,
+            max_queue: int = 10000,
+            batch_size: int = 200,
+            flush_interval: float = 0.5,
+            put_timeout: float = 0.1,
+            late_after: float = 5.0,
+            synchronous: bool = False,
+    ):
+        if max_queue < 1 or batch_size < 1:
+            raise ValueError("max_queue and batch_size must be at least 1")
+        self.repo = repo or AuditRepository()
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.late_after = late_after
+        self.synchronous = synchronous
+
+        self._cond = threading.Condition()
+        self._queue = deque()        # (entry, monotonic submit time)
+        self._in_flight = 0          # entries taken by the writer, not yet committed
+        self._flush_requests = 0
+        self._closed = False
+
+        # counters for stats()
+        self._enqueued = 0
+        self._written = 0
+        self._batches = 0
+        self._dropped = 0
+        self._late = 0
+        self._failed_batches = 0
+        self._max_depth = 0
+
+        self._thread = None
+        if not synchronous:
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    # ---------- Producer side ----------
+
+    def submit(self, user_id: str, action: str, details: str) -> bool:
+        """Queue one entry. Returns False if it had to be dropped."""
+        item = ((user_id, action, details, datetime.now()), time.monotonic())
+        if self.synchronous:
+            with self._cond:
+                self._enqueued += 1
+            self._write([item])
+            return True
+
+        deadline = item[1] + self.put_timeout
+        with self._cond:
+            while len(self._queue) >= self.max_queue and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._dropped += 1
+                    print(f"⚠️ [AUDIT] Queue full, dropped {action} by {user_id}")
+                    return False
+                self._cond.wait(remaining)
+            closed = self._closed
+            self._enqueued += 1
+            if not closed:
+                self._queue.append(item)
+                self._max_depth = max(self._max_depth, len(self._queue))
+                if len(self._queue) >= self.batch_size:
+                    self._cond.notify_all()
+
+        if closed:
+            # writer already stopped (e.g. during interpreter shutdown)
+            self._write([item])
+        return True
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until every entry submitted so far is committed."""
+        if self.synchronous:
+            return True
+        with self._cond:
+            self._flush_requests += 1
+            self._cond.notify_all()
+            try:
+                return self._cond.wait_for(lambda: not self._queue and not self._in_flight, timeout)
+            finally:
+                self._flush_requests -= 1
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Write everything still queued and stop the writer thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            atexit.unregister(self.close)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "mode": "sync" if self.synchronous else "async",
+                "queue_depth": len(self._queue),
+                "max_depth": self._max_depth,
+                "in_flight": self._in_flight,
+                "enqueued": self._enqueued,
+                "written": self._written,
+                "batches": self._batches,
+                "dropped": self._dropped,
+                "late": self._late,
+                "failed_batches": self._failed_batches,
+            }
+
+    # ---------- Writer thread ----------
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.flush_interval
+                while (len(self._queue) < self.batch_size and not self._closed
+                       and not (self._flush_requests and self._queue)):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if not self._queue:
+                    if self._closed:
+                        return
+                    continue
+                batch = [self._queue.popleft() for _ in range(min(len(self._queue), self.batch_size))]
+                self._in_flight = len(batch)
+                self._cond.notify_all()  # room for producers waiting on a full queue
+
+            self._write(batch)
+
+            with self._cond:
+                self._in_flight = 0
+                self._cond.notify_all()
+
+    def _write(self, batch: list) -> None:
+        entries = [entry for entry, _ in batch]
+        written = 0
+        for attempt in (1, 2):
+            try:
+                written = self.repo.log_actions(entries)
+                break
+            except Exception as e:
+                print(f"[DB ERROR] Audit batch of {len(entries)} failed (attempt {attempt}): {e}")
+                with self._cond:
+                    self._failed_batches += 1
+
+        now = time.monotonic()
+        with self._cond:
+            if written:
+                self._written += len(entries)
+                self._batches += 1
+                self._late += sum(1 for _, submitted in batch if now - submitted > self.late_after)
+            else:
+                self._dropped += len(entries)
+
+
+# --- Shared sink used by every AuditService ---
+_shared_sink = None
+_shared_lock = threading.Lock()
+
+
+def start_audit_sink(**kwargs) -> AuditSink:
+    """Start (or return the running) shared sink. kwargs go to AuditSink."""
+    global _shared_sink
+    with _shared_lock:
+        if _shared_sink is None or _shared_sink.closed:
+            _shared_sink = AuditSink(**kwargs)
+        return _shared_sink
+
+
+def get_audit_sink() -> Optional[AuditSink]:
+    """The shared sink, or None when audit writes are synchronous."""
+    return _shared_sink
+
+
+def stop_audit_sink() -> None:
+    """Drain and stop the shared sink; AuditService goes back to direct writes."""
+    global _shared_sink
+    with _shared_lock:
+        sink, _shared_sink = _shared_sink, None
+    if sink is not None:
+        sink.close()
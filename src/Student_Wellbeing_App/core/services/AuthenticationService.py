@@ -1,5 +1,10 @@
 # core/services/AuthenticationService.py
 
+import copy
+import hashlib
+import hmac
+import logging
+import os
 from dataclasses import dataclass
 from typing import Optional, Literal, Union
 
@@ -7,9 +12,28 @@ from src.Student_Wellbeing_App.core.models.User import User
 from src.Student_Wellbeing_App.core.models.Student import Student
 from src.Student_Wellbeing_App.core.repositories.UserRepository import UserRepository
 from src.Student_Wellbeing_App.core.repositories.StudentRepository import StudentRepository
+from src.Student_Wellbeing_App.core.repositories.EntityCache import get_cache
+from src.Student_Wellbeing_App.core.security.PasswordHasher import hash_password, needs_rehash
 
 AuthKind = Literal["user", "student"]
 
+logger = logging.getLogger(__name__)
+
+# Per-process key for the login cache tags; never stored anywhere
+_LOGIN_KEY = os.urandom(32)
+
+
+def _login_tag(code: str, password: str) -> bytes:
+    """Keyed digest of an identifier + password, so the cache never holds the password."""
+    return hmac.new(_LOGIN_KEY, f"{code}\0{password}".encode(), hashlib.sha256).digest()
+
+
+def _login_version(principal) -> tuple:
+    """What get_login_version() returns while the account is unchanged."""
+    if isinstance(principal, User):
+        return principal.password_hash, principal.role.value
+    return (principal.password,)
+
 
 @dataclass
 class AuthResult:
@@ -22,6 +46,16 @@ class AuthenticationService:
     High-level authentication façade using ID patterns:
     - EMPxxxx → system users
     - STUxxxx (or any 'ST' prefix) → students
+
+    authenticate_any() remembers successful logins in the "login" entity
+    cache (when enabled): a repeat login with the same password is checked
+    against the cached tag with hmac.compare_digest and skips the password
+    hash. Password/role updates, deletes and new accounts invalidate the
+    entry in this process; changes made by other processes are caught by
+    re-reading the stored hash (and role) on every hit.
+
+    After a successful login a legacy SHA-256 (or outdated-cost) hash is
+    re-hashed with the active PasswordHasher and written back.
     """
 
     def __init__(
@@ -34,11 +68,17 @@ class AuthenticationService:
 
     def authenticate_user(self, user_id: str, password: str) -> Optional[User]:
         """Explicitly authenticate a system user by EMP-style user_id."""
-        return self.user_repo.authenticate_by_id(user_id, password)
+        user = self.user_repo.authenticate_by_id(user_id, password)
+        if user is not None:
+            self._upgrade_hash(self.user_repo, user_id, user, "password_hash", password)
+        return user
 
     def authenticate_student(self, student_id: str, password: str) -> Optional[Student]:
         """Explicitly authenticate a student by STU-style student_id."""
-        return self.student_repo.authenticate_by_id(student_id, password)
+        student = self.student_repo.authenticate_by_id(student_id, password)
+        if student is not None:
+            self._upgrade_hash(self.student_repo, student_id, student, "password", password)
+        return student
 
     def authenticate_any(self, identifier: str, password: str) -> Optional[AuthResult]:
 
@@ -46,17 +86,41 @@ class AuthenticationService:
 
         # System user IDs: EMP0001, EMP0002, ...
         if code.startswith("EMP"):
-            user = self.user_repo.authenticate_by_id(code, password)
-            if user is not None:
-                return AuthResult(kind="user", principal=user)
+            kind, authenticate, repo = "user", self.authenticate_user, self.user_repo
+        # Student IDs: STU0001, STU0002, ... (or any 'ST' prefix)
+        elif code.startswith("ST"):
+            kind, authenticate, repo = "student", self.authenticate_student, self.student_repo
+        else:
+            # Unknown prefix – you could optionally try both here, but for now we fail fast
             return None
 
-        # Student IDs: STU0001, STU0002, ... (or any 'ST' prefix)
-        if code.startswith("ST"):
-            student = self.student_repo.authenticate_by_id(code, password)
-            if student is not None:
-                return AuthResult(kind="student", principal=student)
+        cache = get_cache("login")
+        tag = _login_tag(code, password)
+        cached = cache.get(code)
+        if cached is not None and hmac.compare_digest(cached[0], tag):
+            # the cache is per process: make sure no other process changed the account since
+            if repo.get_login_version(code) == _login_version(cached[1]):
+                return AuthResult(kind=kind, principal=copy.copy(cached[1]))
+            cache.invalidate(code)
+
+        # Failed logins are never cached; a wrong password always reaches the repository
+        token = cache.token()
+        principal = authenticate(code, password)
+        if principal is None:
             return None
+        cache.put(code, (tag, copy.copy(principal)), token)
+        return AuthResult(kind=kind, principal=principal)
 
-        # Unknown prefix – you could optionally try both here, but for now we fail fast
-        return None
+    @staticmethod
+    def _upgrade_hash(repo, principal_id: str, principal, field: str, password: str) -> None:
+        """Re-hash a stored hash the active hasher did not make (runs once per account)."""
+        stored = getattr(principal, field, None)
+        if not isinstance(stored, str) or not needs_rehash(stored):
+            return
+        new_hash = hash_password(password)
+        try:
+            if repo.update_password_hash(principal_id, new_hash):
+                setattr(principal, field, new_hash)
+        except Exception:
+            # the login itself succeeded; the upgrade is retried next time
+            logger.warning("Could not upgrade password hash for %s", principal_id, exc_info=True)
@@ -1,6 +1,8 @@
 from typing import Dict, List, Optional, Any
 from datetime import date
 
+import pandas as pd
+
 # Repositories
 from src.Student_Wellbeing_App.core.repositories.StudentRepository import StudentRepository
 from src.Student_Wellbeing_App.core.repositories.AlertRepository import AlertRepository
@@ -42,6 +44,8 @@ class DashboardService:
 
     def get_enrolled_students(self, code): return self.module_repo.get_students_by_module(code)
 
+    def get_all_modules(self): return self.module_repo.get_all_modules()
+
     # --- Assessments & Grades ---
     
     def create_assessment(self, module_code, title, due_date, weight, performed_by="TEACHER"):
@@ -61,6 +65,49 @@ class DashboardService:
         self.submission_repo.upsert_grade(student_id, assessment_id, mark)
         self.audit.log(performed_by, "SUBMIT_GRADE", f"Graded {student_id} on Assmt {assessment_id}: {mark}")
 
+    def import_grades(self, assessment_id: int, rows, performed_by="TEACHER") -> Dict[str, Any]:
+        """
+        Bulk grade import for one assessment.
+        rows: a DataFrame, or a CSV path / uploaded file, with student_id and mark columns.
+        Invalid rows are skipped and reported; valid ones are upserted in one
+        transaction and summarised in a single audit entry.
+        Returns {"total", "imported", "rejected": [{"row", "student_id", "mark", "reason"}]}.
+        """
+        df = rows.copy() if isinstance(rows, pd.DataFrame) else pd.read_csv(rows, dtype={"student_id": str})
+        df.columns = [str(c).strip().lower() for c in df.columns]
+        missing = {"student_id", "mark"} - set(df.columns)
+        if missing:
+            raise ValueError(f"Grade import needs columns: {', '.join(sorted(missing))}")
+
+        df = df.reset_index(drop=True)
+        sid = df["student_id"].astype("string").str.strip()
+        mark = pd.to_numeric(df["mark"], errors="coerce")
+
+        # Vectorized checks, first failing reason wins
+        reason = pd.Series(None, index=df.index, dtype="object")
+        reason = reason.mask(reason.isna() & mark.notna() & ~mark.between(0, 100), "mark out of range 0-100")
+        reason = reason.mask(reason.isna() & mark.isna(), "mark is not a number")
+        reason = reason.mask(sid.isna() | (sid == ""), "missing student_id")
+
+        known = self.student_repo.find_existing_ids(sid[reason.isna()].tolist())
+        reason = reason.mask(reason.isna() & ~sid.isin(known), "unknown student_id")
+        # Last valid row wins when a student appears twice
+        valid = reason.isna()
+        reason = reason.mask(valid & sid.where(valid).duplicated(keep="last"), "superseded by a later row")
+
+        ok = reason.isna()
+        grades = list(zip(sid[ok].tolist(), mark[ok].astype(float).tolist()))
+        imported = self.submission_repo.upsert_grades(assessment_id, grades) if grades else 0
+
+        rejected = [
+            {"row": int(i) + 1, "student_id": df.at[i, "student_id"], "mark": df.at[i, "mark"], "reason": reason[i]}
+            for i in reason[~ok].index
+        ]
+        if imported:
+            self.audit.log(performed_by, "BULK_IMPORT_GRADES",
+                           f"Imported {imported} grades on Assmt {assessment_id} ({len(rejected)} rejected of {len(df)} rows)")
+        return {"total": len(df), "imported": imported, "rejected": rejected}
+
     def update_grade_direct(self, submission_id: int, mark: float, performed_by="TEACHER"):
         self.submission_repo.update_mark_by_id(submission_id, mark)
         self.audit.log(performed_by, "UPDATE_GRADE", f"Updated Submission {submission_id} mark to {mark}")
@@ -71,7 +118,8 @@ class DashboardService:
 
     # --- Stats ---
     def get_admin_stats(self):
-        return {"total_students": len(self.student_repo.list_all()), "active_alerts": len(self.alert_repo.list_active())}
+        # COUNT(*) in SQL: no rows (or password hashes) leave the database
+        return {"total_students": self.student_repo.count(), "active_alerts": self.alert_repo.count_active()}
 
     def calculate_attendance_rate(self, sid):
         records = self.attendance_repo.get_by_student(sid)
@@ -81,8 +129,8 @@ class DashboardService:
         return round(((total - absences) / total) * 100, 1)
 
     def get_student_wellbeing_trend(self, sid):
-        records = self.wellbeing_repo.get_by_student(sid)
-        records.sort(key=lambda r: r.week_start)
+        # oldest first straight from the (student_id, week_start) index
+        records = self.wellbeing_repo.get_by_student(sid, newest_first=False)
         return {"dates": [r.week_start for r in records], "stress": [r.stress_level for r in records], "sleep": [r.sleep_hours for r in records]}
 
     def get_module_attendance_records(self, session_id):
@@ -97,4 +145,4 @@ class DashboardService:
         return {"avg_attendance": round(((total - absences) / total) * 100, 1), "total_sessions": total, "absent_count": absences}
 
     def generate_plain_text_report(self):
-        return f"System Status: {len(self.student_repo.list_all())} Students."
\ No newline at end of file
+        return f"System Status: {self.student_repo.count()} Students."
\ No newline at end of file
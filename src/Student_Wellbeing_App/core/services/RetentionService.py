@@ -35,6 +35,8 @@ class RetentionService:
             data = self.repo.preview_old_alerts(rule.retention_months)
         elif rule.data_type == 'GRADUATED_STUDENTS':
             data = self.repo.preview_graduated_students(rule.retention_months)
+        elif rule.data_type == 'AUDIT_LOG':
+            data = self.repo.preview_audit_log(rule.retention_months)
         return pd.DataFrame(data) if data else pd.DataFrame()
 
     # --- Execute ---
@@ -47,6 +49,9 @@ class RetentionService:
             count = self.repo.cleanup_old_alerts(rule.retention_months)
         elif rule.data_type == 'GRADUATED_STUDENTS':
             count = self.repo.cleanup_graduated_students(rule.retention_months)
+        elif rule.data_type == 'AUDIT_LOG':
+            # moved to the compressed archive, not deleted
+            count = self.repo.archive_audit_log(rule.retention_months)
             
         self.audit.log(performed_by, "EXECUTE_RETENTION", f"Rule {rule.data_type} cleaned {count} records")
         return count
\ No newline at end of file
@@ -0,0 +1,62 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.Student_Wellbeing_App.core.repositories.RiskRepository import RiskRepository
+
+
+class RiskEngine:
+    """
+    Computes academic and wellbeing risk indicators for every student at
+    once from a handful of aggregate queries.
+
+    compute() returns a DataFrame indexed by student_id with columns:
+      attendance_total, absences, attendance_pct,
+      submissions, low_marks, avg_stress, avg_sleep,
+      low_attendance, has_low_marks, high_stress, low_sleep  (bool flags)
+      risk_flags  (number of flags raised)
+    """
+
+    def __init__(
+            self,
+            repo: Optional[RiskRepository] = None,
+            attendance_threshold: float = 75.0,
+            low_mark_threshold: float = 50.0,
+            stress_threshold: float = 4.0,
+            sleep_threshold: float = 6.0,
+    ):
+        self.repo = repo or RiskRepository()
+        self.attendance_threshold = attendance_threshold
+        self.low_mark_threshold = low_mark_threshold
+        self.stress_threshold = stress_threshold
+        self.sleep_threshold = sleep_threshold
+
+    def compute(
+            self,
+            attendance_threshold: Optional[float] = None,
+            low_mark_threshold: Optional[float] = None,
+    ) -> pd.DataFrame:
+        attendance_threshold = self.attendance_threshold if attendance_threshold is None else attendance_threshold
+        low_mark_threshold = self.low_mark_threshold if low_mark_threshold is None else low_mark_threshold
+
+        df = pd.DataFrame(self.repo.load_student_metrics(low_mark_threshold)).set_index("student_id")
+        for col in ["attendance_total", "absences", "submissions", "low_marks"]:
+            df[col] = df[col].astype("int64")
+        df["avg_stress"] = df["avg_stress"].astype("float64")
+        df["avg_sleep"] = df["avg_sleep"].astype("float64")
+
+        # Same arithmetic as AttendanceService.get_attendance_percentage:
+        # no records counts as full attendance
+        total = df["attendance_total"].astype("float64")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct = ((total - df["absences"]) / total) * 100.0
+        df["attendance_pct"] = pct.where(df["attendance_total"] > 0, 100.0)
+
+        df["low_attendance"] = df["attendance_pct"] < attendance_threshold
+        df["has_low_marks"] = df["low_marks"] > 0
+        df["high_stress"] = df["avg_stress"] >= self.stress_threshold
+        df["low_sleep"] = df["avg_sleep"] < self.sleep_threshold
+        flags = ["low_attendance", "has_low_marks", "high_stress", "low_sleep"]
+        df["risk_flags"] = df[flags].sum(axis=1).astype("int64")
+        return df
@@ -1,17 +1,40 @@
-import hashlib
 import re
+import sqlite3
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Dict, Iterable, Iterator, Optional, List
+
+import pandas as pd
 
 from src.Student_Wellbeing_App.core.models.Student import Student
+from src.Student_Wellbeing_App.core.models.StudentSummary import StudentSummary
+from src.Student_Wellbeing_App.core.repositories.ModuleRepository import ModuleRepository
 from src.Student_Wellbeing_App.core.repositories.StudentRepository import StudentRepository
+from src.Student_Wellbeing_App.core.services.AuditService import AuditService
+from src.Student_Wellbeing_App.core.security.PasswordHasher import hash_password, hash_passwords
+
+EMAIL_PATTERN = r"^[^@]+@[^@]+\.[^@]+$"
+MIN_COHORT_YEAR = 2000
+# Students written per transaction by import_students
+IMPORT_CHUNK_SIZE = 500
+# Accepted CSV headers -> import column
+IMPORT_COLUMNS = {
+    "first_name": "first_name", "firstname": "first_name",
+    "last_name": "last_name", "lastname": "last_name",
+    "email": "email",
+    "password": "password",
+    "cohort_year": "cohort_year", "year": "cohort_year",
+}
 
 
 class StudentService:
     """High-level operations related to students."""
 
-    def __init__(self, repo: Optional[StudentRepository] = None):
+    def __init__(self, repo: Optional[StudentRepository] = None,
+                 module_repo: Optional[ModuleRepository] = None,
+                 audit: Optional[AuditService] = None):
         self.repo = repo or StudentRepository()
+        self.module_repo = module_repo or ModuleRepository()
+        self.audit = audit or AuditService()
 
     def register_student(
             self,
@@ -27,21 +50,43 @@ class StudentService:
 
         Returns the generated STUxxxx student_id.
         """
+        return self.repo.save(self._build_student(first_name, last_name, email, password, cohort_year))
+
+    def register_students(self, students: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        Register many students at once. Each item has the register_student
+        arguments as keys (first_name, last_name, email, password,
+        cohort_year). Everything is validated before anything is written;
+        the ids are allocated with one sequence update and the rows saved
+        in one transaction.
+
+        Returns the generated student_ids, in input order.
+        """
+        built = []
+        for i, item in enumerate(students):
+            try:
+                built.append(self._build_student(**item))
+            except ValueError as e:
+                raise ValueError(f"Student #{i + 1}: {e}") from None
+        return self.repo.save_many(built)
+
+    @staticmethod
+    def _build_student(first_name: str, last_name: str, email: str, password: str, cohort_year: int) -> Student:
         if not first_name.strip() or not last_name.strip():
             raise ValueError("Name fields cannot be empty.")
 
         email = email.strip().lower()
-        if not re.match(r"^[^@]+@[^@]+\.[^@]+$", email):
+        if not re.match(EMAIL_PATTERN, email):
             raise ValueError("Invalid email format.")
 
         current_year = datetime.utcnow().year
-        if cohort_year < 2000 or cohort_year > current_year + 1:
+        if cohort_year < MIN_COHORT_YEAR or cohort_year > current_year + 1:
             raise ValueError("Cohort year is outside a sensible range.")
 
         # Hash the password before persisting
-        password_hash = hashlib.sha256(password.encode()).hexdigest()
+        password_hash = hash_password(password)
 
-        student = Student(
+        return Student(
             student_id="",                               # will be set by repo (e.g. STU0001)
             first_name=first_name.strip().title(),
             lastname=last_name.strip().title(),
@@ -50,12 +95,132 @@ class StudentService:
             year=cohort_year,
         )
 
-        return self.repo.save(student)
+    def import_students(self, rows, enroll_modules: Iterable[str] = (), performed_by="ADMIN",
+                        chunk_size: int = IMPORT_CHUNK_SIZE, processes: int = None) -> Dict[str, Any]:
+        """
+        Bulk onboarding from a DataFrame, or a CSV path / uploaded file, with
+        first_name, last_name, email, password and cohort_year columns.
+        Every imported student is enrolled in each of enroll_modules.
+
+        Rows are validated together; bad rows are skipped and reported while
+        the rest go in. Passwords are hashed on a process pool, then students
+        and enrollments are inserted chunk_size rows per transaction with one
+        id block each. Returns {"total", "imported", "enrolled",
+        "created": [{"row", "student_id", "email"}],
+        "rejected": [{"row", "email", "reason"}], "error"}.
+
+        If a write fails part-way, the chunks already committed stay: the
+        import stops, is audited, and "error" describes the failure (None
+        when every valid row was saved).
+        """
+        df = rows.copy() if isinstance(rows, pd.DataFrame) else pd.read_csv(rows, dtype=str, keep_default_na=False)
+        df.columns = [IMPORT_COLUMNS.get(str(c).strip().lower(), str(c).strip().lower()) for c in df.columns]
+        missing = {"first_name", "last_name", "email", "password", "cohort_year"} - set(df.columns)
+        if missing:
+            raise ValueError(f"Student import needs columns: {', '.join(sorted(missing))}")
+
+        modules = list(dict.fromkeys(c.strip() for c in enroll_modules if c and c.strip()))
+        unknown = [c for c in modules if self.module_repo.get_module_by_code(c) is None]
+        if unknown:
+            raise ValueError(f"Unknown module(s): {', '.join(unknown)}")
+
+        df = df.reset_index(drop=True)
+        first = df["first_name"].astype("string").fillna("").str.strip().str.title()
+        last = df["last_name"].astype("string").fillna("").str.strip().str.title()
+        email = df["email"].astype("string").fillna("").str.strip().str.lower()
+        password = df["password"].astype("string").fillna("")
+        year = pd.to_numeric(df["cohort_year"], errors="coerce")
+
+        # Vectorized checks, in priority order: the first failing reason wins
+        reason = pd.Series(None, index=df.index, dtype="object")
+
+        def reject(mask, text):
+            nonlocal reason
+            reason = reason.mask(reason.isna() & mask, text)
+
+        reject((first == "") | (last == ""), "missing name")
+        reject(~email.str.match(EMAIL_PATTERN), "invalid email")
+        reject(year.isna() | (year % 1 != 0), "cohort_year is not a whole number")
+        reject(~year.between(MIN_COHORT_YEAR, datetime.utcnow().year + 1), "cohort_year out of range")
+        reject(password == "", "missing password")
+        reject(email.where(reason.isna()).duplicated(keep="first") & email.ne(""), "duplicate email in file")
+        taken = self.repo.find_existing_emails(email[reason.isna()].tolist())
+        reject(email.isin(taken), "email already registered")
+
+        ok = reason.isna()
+        rejected = [{"row": int(i) + 1, "email": df.at[i, "email"], "reason": reason[i]} for i in reason[~ok].index]
+        rows_ok = list(reason[ok].index)
+        hashes = hash_passwords(password[ok].tolist(), processes) if rows_ok else []
+        students = [
+            Student("", first[i], last[i], email[i], h, int(year[i]))
+            for i, h in zip(rows_ok, hashes)
+        ]
+
+        created, clashed, error = [], 0, None
+        try:
+            for start in range(0, len(students), chunk_size):
+                chunk = list(zip(rows_ok[start:start + chunk_size], students[start:start + chunk_size]))
+                try:
+                    self.repo.save_many([s for _, s in chunk], modules)
+                    created.extend(chunk)
+                except sqlite3.IntegrityError:
+                    # a row clashed with a concurrent write; retry one by one to isolate it
+                    for i, s in chunk:
+                        try:
+                            self.repo.save_many([s], modules)
+                            created.append((i, s))
+                        except sqlite3.IntegrityError as e:
+                            clashed += 1
+                            rejected.append({"row": int(i) + 1, "email": df.at[i, "email"], "reason": f"not saved: {e}"})
+        except Exception as e:
+            # earlier chunks are committed: stop here and report what went in
+            error = f"{type(e).__name__}: {e}"
+            print(f"[DB LOG] Student import stopped after {len(created)} students: {error}")
+
+        rejected.sort(key=lambda r: r["row"])
+        if created or error:
+            details = f"Imported {len(created)} students ({len(rejected)} rejected of {len(df)} rows)"
+            if modules:
+                details += f", enrolled in {', '.join(modules)}"
+            if error:
+                details += f"; stopped after a failure, {len(students) - len(created) - clashed} valid rows not saved: {error}"
+            self.audit.log(performed_by, "BULK_IMPORT_STUDENTS", details)
+        return {
+            "total": len(df),
+            "imported": len(created),
+            "enrolled": len(created) * len(modules),
+            "created": [{"row": int(i) + 1, "student_id": s.student_id, "email": s.email} for i, s in created],
+            "rejected": rejected,
+            "error": error,
+        }
+
+    def change_password(self, student_id: str, password: str) -> bool:
+        """Set a new password; False if the student does not exist."""
+        return self.repo.update_password_hash(student_id, hash_password(password))
 
     def list_students(self) -> List[Student]:
         """Return all students."""
         return self.repo.list_all()
 
+    def list_summaries(self) -> List[StudentSummary]:
+        """All students without password hashes, for listings."""
+        return self.repo.list_summaries()
+
+    def iter_student_ids(self, batch_size: int = 1000) -> Iterator[str]:
+        return self.repo.iter_ids(batch_size)
+
+    def count_students(self) -> int:
+        return self.repo.count()
+
+    def search(self, q: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Find students by ID, name or email (substring/prefix first, then
+        fuzzy). Returns at most `limit` rows without password hashes.
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        return self.repo.search(q or "", limit=limit)
+
     def remove_student(self, student_id: str) -> None:
         """Remove a student by STUxxxx ID."""
         self.repo.delete(student_id)
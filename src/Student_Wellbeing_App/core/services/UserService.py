@@ -1,14 +1,15 @@
-import hashlib
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from src.Student_Wellbeing_App.core.models.User import User
 from src.Student_Wellbeing_App.core.models.UserRole import UserRole
+from src.Student_Wellbeing_App.core.models.UserSummary import UserSummary
 from src.Student_Wellbeing_App.core.repositories.UserRepository import UserRepository
+from src.Student_Wellbeing_App.core.security.PasswordHasher import hash_password, verify_password
 
 
 def _hash_password(plain_password: str) -> str:
-    # Simple hash – in a real app you’d use bcrypt/argon2
-    return hashlib.sha256(plain_password.encode()).hexdigest()
+    # Salted KDF (scrypt by default); see PasswordHasher for the cost settings
+    return hash_password(plain_password)
 
 
 class UserService:
@@ -35,6 +36,13 @@ class UserService:
         )
         return self.user_repository.create(user)
 
+    def change_password(self, user_id: str, plain_password: str) -> bool:
+        """Set a new password; False if the user does not exist."""
+        return self.user_repository.update_password_hash(user_id, _hash_password(plain_password))
+
+    def change_role(self, user_id: str, role: UserRole) -> bool:
+        return self.user_repository.update_role(user_id, role)
+
     # ---------- Queries for dashboards ----------
 
     def get_all_users(self) -> List[User]:
@@ -43,6 +51,28 @@ class UserService:
     def get_users_by_role(self, role: UserRole) -> List[User]:
         return self.user_repository.get_by_role(role)
 
+    def list_user_summaries(self, role: Optional[UserRole] = None) -> List[UserSummary]:
+        """Users without password hashes, for listings."""
+        return self.user_repository.list_summaries(role)
+
+    def iter_user_ids(self, batch_size: int = 1000) -> Iterator[str]:
+        return self.user_repository.iter_ids(batch_size)
+
+    def count_users(self, role: Optional[UserRole] = None, text: Optional[str] = None) -> int:
+        return self.user_repository.count(role=role, text=text)
+
+    def get_users_page(
+            self,
+            offset: int = 0,
+            limit: int = 100,
+            role: Optional[UserRole] = None,
+            text: Optional[str] = None,
+            sort: str = "first_name",
+            descending: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """One sorted, filtered page of the user list (no password hashes)."""
+        return self.user_repository.get_page(offset, limit, role=role, text=text, sort=sort, descending=descending)
+
     # ---------- Authentication helper (for AuthenticationService) ----------
 
     def verify_credentials(
@@ -52,7 +82,7 @@ class UserService:
         if user is None:
             return None
 
-        if user.password_hash == _hash_password(plain_password):
+        if verify_password(plain_password, user.password_hash):
             return user
         return None
 
@@ -1,4 +1,4 @@
-from typing import Optional, List, Union
+from typing import Dict, Optional, List, Union
 from datetime import date, timedelta, datetime
 from src.Student_Wellbeing_App.core.models.WellbeingRecord import WellbeingRecord
 from src.Student_Wellbeing_App.core.repositories.WellbeingRepository import WellbeingRepository
@@ -59,4 +59,47 @@ class WellbeingService:
 
     def high_stress_weeks(self, student_id: str, threshold: int = 4) -> List[WellbeingRecord]:
         records = self.repo.get_by_student(student_id)
-        return [r for r in records if r.stress_level >= threshold]
\ No newline at end of file
+        return [r for r in records if r.stress_level >= threshold]
+
+    def cohort_overview(
+            self,
+            threshold: int = 4,
+            since: Optional[date] = None,
+            until: Optional[date] = None,
+    ) -> Dict[int, Dict[str, float]]:
+        """
+        Wellbeing summary per cohort year, optionally limited to weeks
+        between since and until (inclusive). Only students with records count.
+        {year: {total_students, total_records, avg_stress, avg_sleep,
+                high_stress_records, high_stress_students}}
+        """
+        overview = {}
+        for year, students, records, avg_stress, avg_sleep, hs_records, hs_students in \
+                self.repo.cohort_stats(threshold, since, until):
+            overview[year] = {
+                "total_students": students,
+                "total_records": records,
+                "avg_stress": avg_stress or 0.0,
+                "avg_sleep": avg_sleep or 0.0,
+                "high_stress_records": hs_records or 0,
+                "high_stress_students": hs_students or 0,
+            }
+        return overview
+
+    def scan_wellbeing_signals(self, threshold: int = 4, recent_window: int = 5) -> Dict[str, Dict[str, float]]:
+        """
+        High-stress week counts and trailing-window sleep for every student
+        with records, from a single query.
+        {student_id: {records, high_stress_weeks, recent_records, recent_avg_sleep}}
+        """
+        if recent_window < 1:
+            raise ValueError("recent_window must be at least 1")
+        return {
+            sid: {
+                "records": records,
+                "high_stress_weeks": high_stress or 0,
+                "recent_records": recent,
+                "recent_avg_sleep": avg_sleep,
+            }
+            for sid, records, high_stress, recent, avg_sleep in self.repo.signal_stats(threshold, recent_window)
+        }
@@ -13,6 +13,8 @@ if str(project_root) not in sys.path:
 
 # --- Imports ---
 import data_loader 
+import report_export
+from src.Student_Wellbeing_App.core.database.migrations import run_migrations
 from src.Student_Wellbeing_App.core.services.AuthenticationService import AuthenticationService
 from src.Student_Wellbeing_App.core.services.StudentService import StudentService
 from src.Student_Wellbeing_App.core.services.UserService import UserService
@@ -22,6 +24,8 @@ from src.Student_Wellbeing_App.core.services.AttendanceService import Attendance
 from src.Student_Wellbeing_App.core.services.AlertService import AlertService
 from src.Student_Wellbeing_App.core.services.RetentionService import RetentionService 
 from src.Student_Wellbeing_App.core.services.AuditService import AuditService
+from src.Student_Wellbeing_App.core.services.AuditSink import start_audit_sink
+from src.Student_Wellbeing_App.core.repositories.EntityCache import configure_entity_caches, entity_caches_enabled
 
 from src.Student_Wellbeing_App.core.models.UserRole import UserRole
 from src.Student_Wellbeing_App.core.models.AttendanceStatus import AttendanceStatus
@@ -30,9 +34,14 @@ from src.Student_Wellbeing_App.core.models.SubmissionStatus import SubmissionSta
 # --- Page Config ---
 st.set_page_config(page_title="Student Wellbeing System", layout="wide", page_icon="🎓")
 
-# [CACHE DISABLED] to prevent stale data issues during dev
-# @st.cache_resource 
+# Services hold no data (repositories check connections out per call),
+# so one set can be shared by every session
+@st.cache_resource
 def get_services():
+    # Ensure DB + tables exist (the repositories write to tables added by later migrations)
+    run_migrations()
+    # Audit entries are queued and written in batches by a background thread
+    start_audit_sink()
     return {
         "auth": AuthenticationService(),
         "student": StudentService(),
@@ -47,6 +56,13 @@ def get_services():
 
 services = get_services()
 
+# Reuse analytics across reruns/sessions until the database changes
+if not data_loader.cache_info()["enabled"]:
+    data_loader.enable_cache()
+# Serve repeated student/module/rule lookups from memory; repository writes invalidate
+if not entity_caches_enabled():
+    configure_entity_caches(enabled=True)
+
 # --- Session State ---
 if 'user_info' not in st.session_state:
     st.session_state.user_info = None
@@ -194,7 +210,41 @@ if user_kind == 'user' and user_role == UserRole.COURSE_DIRECTOR:
                                 st.rerun()
                             except Exception as e:
                                 st.error(f"Error: {e}")
-            
+
+            with st.expander("🧾 Mark Whole Class (Session Register)"):
+                if not enrolled_students_for_att:
+                    st.warning("No students enrolled.")
+                else:
+                    reg_date = st.date_input("Session Date", date.today(), key="register_date")
+                    register_df = pd.DataFrame({
+                        "student_id": enrolled_students_for_att,
+                        "status": AttendanceStatus.PRESENT.value,
+                    })
+                    edited_register = st.data_editor(
+                        register_df,
+                        column_config={
+                            "student_id": st.column_config.TextColumn("Student ID", disabled=True),
+                            "status": st.column_config.SelectboxColumn(
+                                "Status",
+                                options=[s.value for s in AttendanceStatus],
+                                required=True
+                            )
+                        },
+                        hide_index=True,
+                        key=f"register_editor_{selected_module}_{st.session_state.att_editor_key}",
+                        use_container_width=True
+                    )
+
+                    if st.button("💾 Save Register", key="save_register_btn"):
+                        try:
+                            register = dict(zip(edited_register["student_id"], edited_register["status"]))
+                            saved = services["attendance"].record_session_register(selected_module, reg_date, register, performed_by=current_user.user_id)
+                            st.success(f"Saved register for {saved} students on {reg_date}")
+                            st.session_state.att_editor_key += 1
+                            st.rerun()
+                        except Exception as e:
+                            st.error(f"Error: {e}")
+
             st.divider()
 
             # --- Lower Part: Interactive Table ---
@@ -307,6 +357,20 @@ if user_kind == 'user' and user_role == UserRole.COURSE_DIRECTOR:
                                 st.session_state.grade_editor_key += 1
                                 st.rerun()
 
+                with st.expander("📤 Import Grades (CSV)"):
+                    st.caption("CSV with columns **student_id** and **mark** (0-100). Existing grades are overwritten.")
+                    grades_file = st.file_uploader("Upload grades", type=["csv"], key=f"grades_upload_{selected_assess_id}")
+                    if grades_file is not None and st.button("📥 Import", key="import_grades_btn"):
+                        try:
+                            result = services["dashboard"].import_grades(int(selected_assess_id), grades_file, performed_by=current_user.user_id)
+                            st.success(f"Imported {result['imported']} of {result['total']} rows")
+                            if result["rejected"]:
+                                st.warning(f"{len(result['rejected'])} rows were skipped:")
+                                st.dataframe(pd.DataFrame(result["rejected"]), hide_index=True, use_container_width=True)
+                            st.session_state.grade_editor_key += 1
+                        except Exception as e:
+                            st.error(f"Import failed: {e}")
+
                 # --- B. Grade Book ---
                 st.markdown(f"#### 📋 Grade Book: {assess_options[selected_assess_id]}")
                 
@@ -409,11 +473,13 @@ elif user_kind == 'user' and user_role in [UserRole.WELLBEING_OFFICER, UserRole.
     # --- Tab 2: Search ---
     with tabs[1]:
         st.subheader("Student Profile Search")
-        all_students = services["student"].list_students()
-        q = st.text_input("Search Name/ID").lower()
-        filtered = [s for s in all_students if q in s.student_id.lower() or q in s.first_name.lower()] if q else all_students
-        opts = {s.student_id: f"{s.first_name} {s.lastname} ({s.student_id})" for s in filtered}
-        
+        q = st.text_input("Search Name/ID/Email", placeholder="e.g. STU0012, smith, jo@uni")
+        # Indexed search: only the best matches leave the database
+        matches = services["student"].search(q, limit=50) if q.strip() else []
+        opts = {s["student_id"]: f"{s['first_name']} {s['lastname']} ({s['student_id']})" for s in matches}
+        if q.strip() and not opts:
+            st.info("No students match that search.")
+
         sel_sid = st.selectbox("Select Student", list(opts.keys()), format_func=lambda x: opts[x]) if opts else None
         
         if sel_sid:
@@ -495,23 +561,31 @@ elif user_kind == 'user' and user_role in [UserRole.WELLBEING_OFFICER, UserRole.
         st.divider()
         # --- 3. Export Data ---
         st.markdown("#### 3. Export Comprehensive Student Report")
-        st.caption("Download a CSV containing academic, attendance, and wellbeing metrics. **'Risk Status'** is automatically calculated based on thresholds.")
+        st.caption("Download a CSV or Parquet file containing academic, attendance, and wellbeing metrics. **'Risk Status'** is automatically calculated based on thresholds.")
         
-        df_export = data_loader.load_full_export_data()
+        # Only the first rows are loaded here; the download streams every
+        # student through report_export in chunks
+        chunks = data_loader.iter_export_chunks(chunk_size=200)
+        df_export = next(chunks, None)
+        chunks.close()
         
-        if not df_export.empty:
-            # CSV Download Button
-            csv = df_export.to_csv(index=False).encode('utf-8')
-            st.download_button(
-                label="📥 Download Full Report (with Wellbeing Risks)",
-                data=csv,
-                file_name=f"student_wellbeing_report_{date.today()}.csv",
-                mime="text/csv",
-                type="primary"
-            )
+        if df_export is not None and not df_export.empty:
+            e1, e2 = st.columns([1, 3])
+            export_fmt = e1.radio("Format", list(report_export.FORMATS), horizontal=True, key="export_format")
+            if e2.button("⚙️ Build Full Report"):
+                with st.spinner("Exporting..."):
+                    report_file, n_rows = report_export.export_report(export_fmt)
+                with report_file:
+                    st.download_button(
+                        label=f"📥 Download Full Report ({n_rows} students, with Wellbeing Risks)",
+                        data=report_file,
+                        file_name=f"student_wellbeing_report_{date.today()}.{export_fmt}",
+                        mime=report_export.FORMATS[export_fmt],
+                        type="primary"
+                    )
             
             # Enhanced Preview Table
-            with st.expander("👁️ Preview Report Data"):
+            with st.expander(f"👁️ Preview Report Data (first {len(df_export)} students)"):
                 st.dataframe(
                     df_export,
                     column_config={
@@ -556,6 +630,37 @@ elif user_kind == 'user' and user_role in [UserRole.WELLBEING_OFFICER, UserRole.
                     services["dashboard"].enroll_student_to_module(s_id, m_code_s)
                     st.success(f"Enrolled {s_id}")
 
+        with st.expander("📥 Import Students (CSV)"):
+            st.caption("CSV with columns **first_name**, **last_name**, **email**, **password** and **cohort_year**. "
+                       "Invalid rows are skipped and listed; the rest are registered.")
+            students_file = st.file_uploader("Upload intake", type=["csv"], key="students_upload")
+            import_modules = st.multiselect("Enroll everyone in", [m.module_code for m in services["dashboard"].get_all_modules()])
+            if students_file is not None and st.button("📥 Import Students", key="import_students_btn"):
+                try:
+                    with st.spinner("Hashing passwords and registering students..."):
+                        result = services["student"].import_students(students_file, enroll_modules=import_modules,
+                                                                     performed_by=current_user.user_id)
+                    if result["error"]:
+                        st.error(f"Import stopped after {result['imported']} of {result['total']} students: "
+                                 f"{result['error']}. The students below were registered; upload the remaining rows again.")
+                    else:
+                        st.success(f"Imported {result['imported']} of {result['total']} students "
+                                   f"({result['enrolled']} enrollments)")
+                    if result["created"]:
+                        st.dataframe(pd.DataFrame(result["created"]), hide_index=True, use_container_width=True)
+                        st.download_button(
+                            label="📥 Download new student IDs",
+                            data=pd.DataFrame(result["created"]).to_csv(index=False),
+                            file_name=f"student_ids_{date.today()}.csv",
+                            mime="text/csv",
+                        )
+                    if result["rejected"]:
+                        st.warning(f"{len(result['rejected'])} rows were skipped:")
+                        st.dataframe(pd.DataFrame(result["rejected"]), hide_index=True, use_container_width=True)
+                except ValueError as e:
+                    # raised before anything is written (missing columns, unknown module)
+                    st.error(f"Import failed: {e}")
+
     # --- Tab 5: Data Retention Policy ---
     with tabs[4]:
         st.subheader("⚙️ Data Retention & Privacy Policy")
@@ -592,7 +697,7 @@ elif user_kind == 'user' and user_role in [UserRole.WELLBEING_OFFICER, UserRole.
         with c_add:
             with st.expander("➕ Add New Rule"):
                 with st.form("add_rule_form"):
-                    new_type = st.selectbox("Data Type", ["RESOLVED_ALERTS", "GRADUATED_STUDENTS"])
+                    new_type = st.selectbox("Data Type", ["RESOLVED_ALERTS", "GRADUATED_STUDENTS", "AUDIT_LOG"])
                     new_months = st.number_input("Months", 1, 120, 12)
                     if st.form_submit_button("Add Rule"):
                         services["retention"].create_rule(new_type, new_months, True)
@@ -640,7 +745,45 @@ elif user_kind == 'user' and user_role in [UserRole.WELLBEING_OFFICER, UserRole.
         st.subheader("🛡️ System Audit Logs")
         st.info("Tracking critical actions (Seed data simulates history).")
         
-        logs = services["audit"].get_logs()
+        f1, f2, f3, f4 = st.columns([1, 1, 2, 2])
+        f_user = f1.text_input("User ID", key="audit_f_user").strip()
+        f_action = f2.text_input("Action", key="audit_f_action").strip().upper()
+        f_text = f3.text_input("Details contain", key="audit_f_text").strip()
+        f_range = f4.date_input("Date range", value=(), key="audit_f_range")
+        since = f_range[0] if len(f_range) > 0 else None
+        until = f_range[1] if len(f_range) > 1 else None
+
+        # Pages of 100 are appended to the table; new filters start over
+        filters = (f_user, f_action, f_text, since, until)
+        refresh = st.button("🔄 Refresh Logs")
+        if refresh or st.session_state.get("audit_filters") != filters:
+            st.session_state.audit_filters = filters
+            st.session_state.audit_rows = []
+            st.session_state.audit_cursor = None
+            st.session_state.audit_done = False
+
+        def load_audit_page():
+            """
+            Append the next keyset page to audit_rows.
+
+            Streamlit has no scroll events (st.dataframe does not report its
+            scroll position, and there is no core widget that can), so true
+            infinite scroll would need a custom JS component. Instead the
+            "Load older entries" button calls this; each click is still one
+            constant-time keyset query, whatever the table size.
+            """
+            page = services["audit"].query_logs(
+                user_id=f_user, action=f_action, since=since, until=until, text=f_text,
+                after_cursor=st.session_state.audit_cursor, limit=100
+            )
+            st.session_state.audit_rows.extend(page["rows"])
+            st.session_state.audit_cursor = page["next_cursor"]
+            st.session_state.audit_done = page["next_cursor"] is None
+
+        if not st.session_state.audit_rows and not st.session_state.audit_done:
+            load_audit_page()
+
+        logs = st.session_state.audit_rows
         if logs:
             df_logs = pd.DataFrame(logs)
             st.dataframe(
@@ -655,10 +798,11 @@ elif user_kind == 'user' and user_role in [UserRole.WELLBEING_OFFICER, UserRole.
                 use_container_width=True,
                 hide_index=True
             )
-            if st.button("🔄 Refresh Logs"):
-                st.rerun()
+            st.caption(f"Showing {len(logs)} entries" + (" (all loaded)" if st.session_state.audit_done else ""))
+            if not st.session_state.audit_done:
+                st.button("⬇️ Load older entries", on_click=load_audit_page)
         else:
-            st.info("Audit log is empty.")
+            st.info("No audit entries match these filters." if any(filters) else "Audit log is empty.")
 
 # ---------------------------------------------------------
 #  VIEW 3: STUDENT VIEW
@@ -1,3 +1,7 @@
+import functools
+import threading
+
+import numpy as np
 import pandas as pd
 import sqlite3
 import sys
@@ -14,10 +18,147 @@ from src.Student_Wellbeing_App.core.database.connection import DB_PATH
 def get_db():
     return sqlite3.connect(DB_PATH)
 
+# --- Result cache ---
+# Loader results are shared across reruns and sessions and keyed on
+# SQLite's PRAGMA data_version, read from a connection that never writes:
+# the value changes whenever any other connection (services, seed scripts,
+# other processes) commits, so a cached frame is reused only while the
+# database is exactly as it was when the frame was built.
+_cache_enabled = False
+_cache = {}
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
+_observer = None  # (db_path, connection) used only for PRAGMA data_version
+
+
+def enable_cache(enabled: bool = True) -> None:
+    """Turn the loader cache on (the Streamlit app does) or off (default)."""
+    global _cache_enabled
+    _cache_enabled = enabled
+    clear_cache()
+
+
+def clear_cache() -> None:
+    global _observer
+    with _cache_lock:
+        _cache.clear()
+        _cache_stats.update(hits=0, misses=0)
+        if _observer is not None:
+            _observer[1].close()
+            _observer = None
+
+
+def cache_info() -> dict:
+    with _cache_lock:
+        return {**_cache_stats, "entries": len(_cache), "enabled": _cache_enabled}
+
+
+def data_version_token():
+    """Cheap token that changes whenever another connection commits to DB_PATH."""
+    global _observer
+    with _cache_lock:
+        if _observer is None or _observer[0] != str(DB_PATH):
+            if _observer is not None:
+                _observer[1].close()
+                # data_version is per connection: the new observer's counter
+                # restarts and says nothing about entries checked by the old one
+                _cache.clear()
+            _observer = (str(DB_PATH), sqlite3.connect(DB_PATH, check_same_thread=False))
+        path, conn = _observer
+        return path, conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+def _freeze(value):
+    # make dict/list arguments usable in a cache key
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def cached_loader(func):
+    """Serve func's DataFrame from the cache while the data version is unchanged."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _cache_enabled:
+            return func(*args, **kwargs)
+
+        key = (str(DB_PATH), func.__name__, _freeze(args), _freeze(kwargs))
+        token = data_version_token()
+        with _cache_lock:
+            hit = _cache.get(key)
+            if hit is not None and hit[0] == token:
+                _cache_stats["hits"] += 1
+                return hit[1].copy()
+            _cache_stats["misses"] += 1
+
+        # token was read before the query, so a write racing with it can only
+        # make the entry look older than it is (refetched next time), never newer
+        df = func(*args, **kwargs)
+        with _cache_lock:
+            _cache[key] = (token, df)
+        return df.copy()
+
+    return wrapper
+
+# --- Risk thresholds used by the export ---
+RISK_THRESHOLDS = {
+    "high_stress": 4.0,      # avg stress >= this
+    "low_sleep": 6.0,        # 0 < avg sleep < this
+    "low_attendance": 80.0,  # attendance % < this
+    "low_grade": 50.0,       # 0 < avg grade < this
+}
+# flag labels, in the order they appear in Risk_Status
+_RISK_LABELS = ["High Stress", "Low Sleep", "Low Attendance", "Low Grades"]
+
+
+def _risk_status_labels() -> np.ndarray:
+    """Every Risk_Status string, indexed by a 4-bit flag code (bit i = _RISK_LABELS[i])."""
+    labels = []
+    for code in range(1 << len(_RISK_LABELS)):
+        flags = [name for bit, name in enumerate(_RISK_LABELS) if code & (1 << bit)]
+        labels.append(f"⚠️ AT RISK: {', '.join(flags)}" if flags else "Normal")
+    return np.array(labels, dtype=object)
+
+
+_RISK_STATUS_LABELS = _risk_status_labels()
+
+
+def identify_risk(df: pd.DataFrame, thresholds: dict = None) -> pd.Series:
+    """
+    Risk_Status for every row at once.
+    Expects avg_stress, avg_sleep, attendance_pct and avg_grade columns
+    (already cleaned, no NaN). thresholds overrides RISK_THRESHOLDS keys.
+    """
+    t = {**RISK_THRESHOLDS, **(thresholds or {})}
+    masks = [
+        df['avg_stress'].to_numpy() >= t["high_stress"],
+        (df['avg_sleep'].to_numpy() < t["low_sleep"]) & (df['avg_sleep'].to_numpy() > 0),  # > 0 to avoid new students
+        df['attendance_pct'].to_numpy() < t["low_attendance"],
+        (df['avg_grade'].to_numpy() < t["low_grade"]) & (df['avg_grade'].to_numpy() > 0),
+    ]
+    code = np.zeros(len(df), dtype=np.int64)
+    for bit, mask in enumerate(masks):
+        code |= mask.astype(np.int64) << bit
+    # astype(str) gives the same dtype a row-wise apply of strings would
+    return pd.Series(_RISK_STATUS_LABELS[code], index=df.index).astype(str)
+
 # --- 1. Overall Wellbeing Trends ---
+@cached_loader
 def load_aggregate_wellbeing_trend():
     conn = get_db()
+    # read the per-week/cohort totals kept by WellbeingRepository: O(weeks) rows
     query = """
+    SELECT week_start,
+           SUM(stress_sum) / SUM(record_count) as avg_stress,
+           SUM(sleep_sum) / SUM(record_count) as avg_sleep
+    FROM wellbeing_weekly_agg
+    GROUP BY week_start
+    ORDER BY week_start
+    """
+    # databases migrated before wellbeing_weekly_agg existed scan the raw records
+    fallback = """
     SELECT week_start, 
            AVG(stress_level) as avg_stress, 
            AVG(sleep_hours) as avg_sleep
@@ -25,11 +166,19 @@ def load_aggregate_wellbeing_trend():
     GROUP BY week_start
     ORDER BY week_start
     """
-    df = pd.read_sql_query(query, conn)
+    try:
+        df = pd.read_sql_query(query, conn)
+    except pd.errors.DatabaseError as e:
+        if "no such table: wellbeing_weekly_agg" not in str(e):
+            conn.close()
+            raise
+        print("[DB LOG] wellbeing_weekly_agg is missing (run the migrations); averaging the raw records")
+        df = pd.read_sql_query(fallback, conn)
     conn.close()
     return df
 
 # --- 2. carriculum Performance Summary ---
+@cached_loader
 def load_course_performance_summary():
     conn = get_db()
     # A. average grades per module
@@ -57,8 +206,10 @@ def load_course_performance_summary():
     return df_grades if not df_grades.empty else df_att
 
 # --- 3. Export Full Student Data with Risk Status ---
-def load_full_export_data():
-    """generate a full export dataframe with risk status for each student"""
+@cached_loader
+def load_full_export_data(thresholds: dict = None):
+    """generate a full export dataframe with risk status for each student
+    thresholds: optional overrides for RISK_THRESHOLDS"""
     conn = get_db()
     
     # 1. base student info
@@ -86,40 +237,77 @@ def load_full_export_data():
     
     conn.close()
     
+    return _finish_export_frame(df_stu, df_grade, df_att, df_well, thresholds)
+
+
+EXPORT_COLUMNS = ['student_id', 'first_name', 'lastname', 'Risk_Status', 'avg_stress', 'avg_sleep', 'attendance_pct', 'avg_grade', 'email']
+
+
+def _finish_export_frame(df_stu, df_grade, df_att, df_well, thresholds=None):
     # --- Merge Data ---
     df = pd.merge(df_stu, df_grade, on='student_id', how='left')
     df = pd.merge(df, df_att, on='student_id', how='left')
     df = pd.merge(df, df_well, on='student_id', how='left') # merge wellbeing data
     
     # --- Data cleaning---
-    df['avg_grade'] = df['avg_grade'].fillna(0).round(1)
-    df['attendance_pct'] = df['attendance_pct'].fillna(100.0).round(1) # no attendance means full attendance
-    df['avg_stress'] = df['avg_stress'].fillna(0).round(1)
-    df['avg_sleep'] = df['avg_sleep'].fillna(0).round(1)
+    # fixed dtypes: an export chunk with no grades/wellbeing/emails must not
+    # come out as int64 / all-null columns (CSV "0" vs "0.0", Parquet schema)
+    df['avg_grade'] = df['avg_grade'].astype('float64').fillna(0).round(1)
+    df['attendance_pct'] = df['attendance_pct'].astype('float64').fillna(100.0).round(1) # no attendance means full attendance
+    df['avg_stress'] = df['avg_stress'].astype('float64').fillna(0).round(1)
+    df['avg_sleep'] = df['avg_sleep'].astype('float64').fillna(0).round(1)
+    df['email'] = df['email'].astype('string')
     
-    # risk logic identification
-    def identify_risk(row):
-        flags = []
-        # risk criteria
-        if row['avg_stress'] >= 4.0: flags.append("High Stress")
-        if row['avg_sleep'] < 6.0 and row['avg_sleep'] > 0: flags.append("Low Sleep") # > 0 to avoid new students
-        if row['attendance_pct'] < 80.0: flags.append("Low Attendance")
-        if row['avg_grade'] < 50.0 and row['avg_grade'] > 0: flags.append("Low Grades")
-        
-        if flags:
-            return f"⚠️ AT RISK: {', '.join(flags)}"
-        return "Normal"
-
-    df['Risk_Status'] = df.apply(identify_risk, axis=1)
+    # risk logic identification (vectorized)
+    df['Risk_Status'] = identify_risk(df, thresholds)
     
     # return specific columns in order
-    cols = ['student_id', 'first_name', 'lastname', 'Risk_Status', 'avg_stress', 'avg_sleep', 'attendance_pct', 'avg_grade', 'email']
     # make sure all cols exist
-    final_cols = [c for c in cols if c in df.columns]
+    final_cols = [c for c in EXPORT_COLUMNS if c in df.columns]
     
     return df[final_cols]
 
+
+def iter_export_chunks(chunk_size: int = 5000, thresholds: dict = None):
+    """Yield the full export (same columns as load_full_export_data) in
+    student_id order, chunk_size students at a time. Each chunk's
+    aggregates only read that student_id range, so memory stays flat."""
+    conn = get_db()
+    try:
+        last_id = ""
+        while True:
+            df_stu = pd.read_sql_query(
+                "SELECT student_id, first_name, lastname, email, year FROM student "
+                "WHERE student_id > ? ORDER BY student_id LIMIT ?",
+                conn, params=(last_id, chunk_size)
+            )
+            if df_stu.empty:
+                return
+            bounds = (df_stu['student_id'].iloc[0], df_stu['student_id'].iloc[-1])
+
+            df_grade = pd.read_sql_query("""
+                SELECT student_id, AVG(mark) as avg_grade FROM submission
+                WHERE mark > 0 AND student_id BETWEEN ? AND ? GROUP BY student_id
+            """, conn, params=bounds)
+            df_att = pd.read_sql_query("""
+                SELECT student_id,
+                       CAST(SUM(CASE WHEN status='PRESENT' THEN 1 ELSE 0 END) AS FLOAT) / COUNT(*) * 100 as attendance_pct
+                FROM attendance
+                WHERE student_id BETWEEN ? AND ? GROUP BY student_id
+            """, conn, params=bounds)
+            df_well = pd.read_sql_query("""
+                SELECT student_id, AVG(stress_level) as avg_stress, AVG(sleep_hours) as avg_sleep
+                FROM wellbeing_record
+                WHERE student_id BETWEEN ? AND ? GROUP BY student_id
+            """, conn, params=bounds)
+
+            yield _finish_export_frame(df_stu, df_grade, df_att, df_well, thresholds)
+            last_id = bounds[1]
+    finally:
+        conn.close()
+
 # academic performance and attendance data for students
+@cached_loader
 def load_academic_data(module_code=None):
     conn = get_db()
     if module_code:
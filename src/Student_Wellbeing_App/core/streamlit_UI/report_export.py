@@ -0,0 +1,117 @@
+"""
+Streaming export of the full student risk report (CSV or Parquet).
+
+Students are read in keyset-ordered chunks (data_loader.iter_export_chunks)
+and each chunk is written out before the next is fetched, so memory use
+does not grow with the number of students.
+
+Run:  python -m src.Student_Wellbeing_App.core.streamlit_UI.report_export --format parquet -o report.parquet
+"""
+
+import argparse
+import tempfile
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+from src.Student_Wellbeing_App.core.streamlit_UI import data_loader
+
+FORMATS = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+DEFAULT_CHUNK_SIZE = 5000
+# spooled exports stay in memory up to this size, then move to a temp file
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+
+def _csv_blocks(chunk_size: int, thresholds: dict):
+    """(UTF-8 bytes, student count) per chunk, header first."""
+    header = True
+    for chunk in data_loader.iter_export_chunks(chunk_size, thresholds):
+        yield chunk.to_csv(index=False, header=header).encode("utf-8"), len(chunk)
+        header = False
+    if header:
+        # no students: still emit the header row
+        yield (",".join(data_loader.EXPORT_COLUMNS) + "\n").encode("utf-8"), 0
+
+
+def iter_csv_bytes(chunk_size: int = DEFAULT_CHUNK_SIZE, thresholds: dict = None):
+    """Yield the CSV report as UTF-8 byte blocks, one per chunk (header first)."""
+    for data, _ in _csv_blocks(chunk_size, thresholds):
+        yield data
+
+
+def write_csv(fh, chunk_size: int = DEFAULT_CHUNK_SIZE, thresholds: dict = None) -> int:
+    """Write the CSV report to a binary file object. Returns the number of students."""
+    rows = 0
+    for data, n in _csv_blocks(chunk_size, thresholds):
+        fh.write(data)
+        rows += n
+    return rows
+
+
+def write_parquet(fh, chunk_size: int = DEFAULT_CHUNK_SIZE, thresholds: dict = None) -> int:
+    """Write the Parquet report to a binary file object, one row group per chunk.
+    Returns the number of students."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export needs pyarrow (pip install pyarrow, see requirements.txt).") from None
+
+    rows = 0
+    writer = None
+    try:
+        for chunk in data_loader.iter_export_chunks(chunk_size, thresholds):
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(fh, table.schema)
+            else:
+                # later chunks follow the first chunk's schema (e.g. all-null columns)
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+            rows += len(chunk)
+        if writer is None:
+            empty = pd.DataFrame(columns=data_loader.EXPORT_COLUMNS)
+            writer = pq.ParquetWriter(fh, pa.Table.from_pandas(empty, preserve_index=False).schema)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+WRITERS = {"csv": write_csv, "parquet": write_parquet}
+
+
+def export_report(fmt: str = "csv", chunk_size: int = DEFAULT_CHUNK_SIZE, thresholds: dict = None):
+    """
+    Build the report into a SpooledTemporaryFile, rewound and ready to read.
+    Returns (file, student_count); the caller closes the file.
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format: {fmt!r} (expected one of {', '.join(WRITERS)})")
+    fh = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, mode="w+b")
+    try:
+        rows = WRITERS[fmt](fh, chunk_size, thresholds)
+    except Exception:
+        fh.close()
+        raise
+    fh.seek(0)
+    return fh, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the full student risk report.")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+    parser.add_argument("-o", "--output", help="output file (default: student_wellbeing_report_<date>.<format>)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="students fetched and written per chunk")
+    args = parser.parse_args()
+
+    output = Path(args.output or f"student_wellbeing_report_{date.today()}.{args.format}")
+    with open(output, "wb") as fh:
+        rows = WRITERS[args.format](fh, args.chunk_size)
+    print(f"✅ Exported {rows} students to {output}")
+
+
+if __name__ == "__main__":
+    main()
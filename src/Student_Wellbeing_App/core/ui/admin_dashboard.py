@@ -6,6 +6,8 @@ from src.Student_Wellbeing_App.core.models.UserRole import UserRole
 from src.Student_Wellbeing_App.core.services.StudentService import StudentService
 from src.Student_Wellbeing_App.core.services.UserService import UserService
 from src.Student_Wellbeing_App.core.ui.base_dashboard import BaseDashboard
+from src.Student_Wellbeing_App.core.ui.task_runner import TaskRunner
+from src.Student_Wellbeing_App.core.ui.virtual_treeview import VirtualTreeview
 
 
 class AddUserDialog(tk.Toplevel):
@@ -109,7 +111,10 @@ class AddUserDialog(tk.Toplevel):
         btn_frame.grid(row=8, column=0, columnspan=2, pady=10, sticky="e")
 
         ttk.Button(btn_frame, text="Cancel", command=self.destroy).pack(side="right", padx=5)
-        ttk.Button(btn_frame, text="Save", command=self._handle_save).pack(side="right", padx=5)
+        self.save_btn = ttk.Button(btn_frame, text="Save", command=self._handle_save)
+        self.save_btn.pack(side="right", padx=5)
+        self.tasks = TaskRunner(self, max_workers=1)
+        self.bind("<Destroy>", self._on_destroy, add="+")
 
         self.transient(master)
         self.grab_set()
@@ -139,66 +144,69 @@ class AddUserDialog(tk.Toplevel):
             messagebox.showerror("Error", "Invalid role selected.", parent=self)
             return
 
-        try:
-            if role_name == "STUDENT":
-                # Extra validation for student fields
-                email = self.email_var.get().strip()
-                cohort_text = self.cohort_year_var.get().strip()
-
-                if not email or not cohort_text:
-                    messagebox.showerror(
-                        "Error",
-                        "Email and cohort year are required for a student.",
-                        parent=self,
-                    )
-                    return
-
-                try:
-                    cohort_year = int(cohort_text)
-                except ValueError:
-                    messagebox.showerror(
-                        "Error",
-                        "Cohort year must be a number.",
-                        parent=self,
-                    )
-                    return
+        if role_name == "STUDENT":
+            # Extra validation for student fields
+            email = self.email_var.get().strip()
+            cohort_text = self.cohort_year_var.get().strip()
 
+            if not email or not cohort_text:
+                messagebox.showerror(
+                    "Error",
+                    "Email and cohort year are required for a student.",
+                    parent=self,
+                )
+                return
+
+            try:
+                cohort_year = int(cohort_text)
+            except ValueError:
+                messagebox.showerror(
+                    "Error",
+                    "Cohort year must be a number.",
+                    parent=self,
+                )
+                return
+
+            def create():
                 # Create student via StudentService (new model)
-                student_id = self.student_service.register_student(
+                return "Student", self.student_service.register_student(
                     first_name=first_name,
                     last_name=lastname,
                     email=email,
                     password=password,
                     cohort_year=cohort_year,
                 )
-                messagebox.showinfo(
-                    "Success",
-                    f"Student created with ID: {student_id}",
-                    parent=self,
-                )
-            else:
+        else:
+            def create():
                 # Non-student staff user
-                user_id = self.user_service.create_user(
+                return "User", self.user_service.create_user(
                     first_name=first_name,
                     lastname=lastname,
                     plain_password=password,
                     role=role,
                 )
-                messagebox.showinfo(
-                    "Success",
-                    f"User created with ID: {user_id}",
-                    parent=self,
-                )
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to create account:\n{e}", parent=self)
-            return
+        # Hashing the password is deliberately slow; keep it off the Tk thread
+        self.save_btn.config(state="disabled")
+        self.tasks.submit("create", create, on_done=self._on_created, on_error=self._on_create_failed)
+
+    def _on_created(self, result):
+        kind, new_id = result
+        messagebox.showinfo("Success", f"{kind} created with ID: {new_id}", parent=self)
 
         if self.on_user_created:
             self.on_user_created()
 
         self.destroy()
 
+    def _on_create_failed(self, error: Exception):
+        self.save_btn.config(state="normal")
+        messagebox.showerror("Error", f"Failed to create account:\n{error}", parent=self)
+
+    def _on_destroy(self, event):
+        if event.widget is self:
+            self.tasks.shutdown()
+
 
 class AdminDashboard(BaseDashboard):
     ROLE_NAME = "Admin"
@@ -245,6 +253,12 @@ class AdminDashboard(BaseDashboard):
             "<<ComboboxSelected>>", lambda e: self.refresh_users()
         )
 
+        ttk.Label(top_bar, text="Search:").pack(side="left", padx=(10, 0))
+        self.search_var = tk.StringVar()
+        ttk.Entry(top_bar, textvariable=self.search_var, width=20).pack(side="left", padx=5)
+        self._search_after = None
+        self.search_var.trace_add("write", self._on_search_changed)
+
         ttk.Button(top_bar, text="Add User", command=self.open_add_user_dialog).pack(
             side="left", padx=10
         )
@@ -257,51 +271,59 @@ class AdminDashboard(BaseDashboard):
         table_frame = ttk.Frame(self)
         table_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
-        self.tree = ttk.Treeview(
+        # Only the visible rows live in the Treeview; pages, sort and
+        # filters are fetched from the database as the user scrolls
+        self.users_view = VirtualTreeview(
             table_frame,
             columns=("user_id", "first_name", "lastname", "role"),
-            show="headings",
+            key="user_id",
+            fetch_page=self._fetch_users_page,
+            count=self._count_users,
+            headings={"user_id": "User ID", "first_name": "First name", "lastname": "Last name", "role": "Role"},
+            sortable=("user_id", "first_name", "lastname", "role"),
+            sort="first_name",
+            runner=self.tasks,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to load users:\n{e}", parent=self),
         )
-        self.tree.heading("user_id", text="User ID")
-        self.tree.heading("first_name", text="First name")
-        self.tree.heading("lastname", text="Last name")
-        self.tree.heading("role", text="Role")
-
-        self.tree.column("user_id", width=120, anchor="center")
-        self.tree.column("first_name", width=150, anchor="w")
-        self.tree.column("lastname", width=150, anchor="w")
-        self.tree.column("role", width=100, anchor="center")
-
-        vsb = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscroll=vsb.set)
-
-        self.tree.pack(side="left", fill="both", expand=True)
-        vsb.pack(side="right", fill="y")
+        self.users_view.column("user_id", width=120, anchor="center")
+        self.users_view.column("first_name", width=150, anchor="w")
+        self.users_view.column("lastname", width=150, anchor="w")
+        self.users_view.column("role", width=100, anchor="center")
+        self.users_view.pack(fill="both", expand=True)
+        self.tree = self.users_view.tree
 
         self.refresh_users()
 
-    def refresh_users(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
+    def _user_filters(self) -> dict:
         role_filter = self.role_filter_var.get()
+        return {
+            "role": None if role_filter == "All" else UserRole[role_filter],
+            "text": self.search_var.get().strip() or None,
+        }
 
-        try:
-            if role_filter == "All":
-                users = self.user_service.get_all_users()
-            else:
-                role = UserRole[role_filter]
-                users = self.user_service.get_users_by_role(role)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load users:\n{e}", parent=self)
-            return
+    def _fetch_users_page(self, offset, limit, sort, descending, filters):
+        return self.user_service.get_users_page(offset, limit, sort=sort, descending=descending, **filters)
 
-        for u in users:
-            self.tree.insert(
-                "",
-                "end",
-                values=(u.user_id, u.first_name, u.lastname, u.role.name),
-            )
+    def _count_users(self, filters):
+        return self.user_service.count_users(**filters)
+
+    def refresh_users(self):
+        filters = self._user_filters()
+        if filters == self.users_view.filters:
+            # same filters: re-read the visible window and apply it as a diff
+            self.users_view.refresh()
+        else:
+            self.users_view.set_filters(**filters)
+
+    def _on_search_changed(self, *_):
+        # wait for a pause in typing before querying
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+        self._search_after = self.after(250, self._apply_search)
+
+    def _apply_search(self):
+        self._search_after = None
+        self.refresh_users()
 
     def open_add_user_dialog(self):
         AddUserDialog(
@@ -18,6 +18,7 @@ from src.Student_Wellbeing_App.core.repositories.UserRepository import UserRepos
 from src.Student_Wellbeing_App.core.services.StudentService import StudentService
 from src.Student_Wellbeing_App.core.repositories.StudentRepository import StudentRepository
 from src.Student_Wellbeing_App.core.database.migrations import run_migrations
+from src.Student_Wellbeing_App.core.repositories.EntityCache import configure_entity_caches
 from src.Student_Wellbeing_App.core.services.WellbeingService import WellbeingService
 
 
@@ -29,6 +30,7 @@ class WellbeingApp(tk.Tk):
 
         # 1. Ensure DB + tables exist
         run_migrations()
+        configure_entity_caches(enabled=True)
 
         # 2. Set up services & repos
         self.user_repo = UserRepository()
@@ -1,4 +1,6 @@
-from tkinter import ttk
+from tkinter import ttk, messagebox
+
+from src.Student_Wellbeing_App.core.ui.task_runner import TaskRunner
 
 
 class BaseDashboard(ttk.Frame):
@@ -9,3 +11,62 @@ class BaseDashboard(ttk.Frame):
             text=header_text,
             font=("Segoe UI", 14, "bold"),
         ).pack(pady=15, anchor="w", padx=10)
+
+        # Status bar for background tasks (packed before the subclass content
+        # so it keeps its place at the bottom)
+        self._status_bar = ttk.Frame(self)
+        self._status_bar.pack(side="bottom", fill="x", padx=10, pady=(0, 5))
+        self._status_label = ttk.Label(self._status_bar, text="", font=("Segoe UI", 9))
+        self._status_label.pack(side="left")
+        self._status_cancel = ttk.Button(self._status_bar, text="Cancel", command=self.cancel_tasks)
+        self._status_progress = ttk.Progressbar(self._status_bar, length=160)
+
+        self.tasks = TaskRunner(self, on_change=self._update_status_bar)
+        self.bind("<Destroy>", self._on_destroy, add="+")
+
+    # ---------- Background tasks ----------
+
+    def run_task(self, key: str, fn, *args, on_done=None, on_error=None, label: str = None, **kwargs):
+        """
+        Run fn(*args, **kwargs) off the Tk thread and pass its result to
+        on_done on the Tk thread. Errors go to on_error, or an error dialog.
+        """
+        if on_error is None:
+            on_error = self._show_task_error
+        return self.tasks.submit(key, fn, *args, on_done=on_done, on_error=on_error, label=label, **kwargs)
+
+    def cancel_tasks(self):
+        self.tasks.cancel()
+
+    def _show_task_error(self, error: Exception):
+        messagebox.showerror("Error", str(error), parent=self)
+
+    def _update_status_bar(self, runner: TaskRunner):
+        running = runner.running()
+        if not running:
+            self._status_label.config(text="")
+            self._status_progress.stop()
+            self._status_progress.pack_forget()
+            self._status_cancel.pack_forget()
+            return
+
+        labels = ", ".join(t.label for t in running)
+        progress = running[0].progress if len(running) == 1 else None
+        if progress and progress[1]:
+            done, total = progress
+            self._status_progress.stop()
+            self._status_progress.config(mode="determinate", maximum=total, value=done)
+            self._status_label.config(text=f"⏳ {labels} ({done}/{total})")
+        else:
+            if str(self._status_progress.cget("mode")) != "indeterminate":
+                self._status_progress.config(mode="indeterminate", value=0)
+            self._status_progress.start(15)
+            self._status_label.config(text=f"⏳ {labels}…")
+
+        if not self._status_progress.winfo_ismapped():
+            self._status_cancel.pack(side="right")
+            self._status_progress.pack(side="right", padx=5)
+
+    def _on_destroy(self, event):
+        if event.widget is self:
+            self.tasks.shutdown()
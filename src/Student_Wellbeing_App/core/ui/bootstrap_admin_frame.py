@@ -5,6 +5,7 @@ from tkinter import ttk, messagebox
 
 from src.Student_Wellbeing_App.core.models.UserRole import UserRole
 from src.Student_Wellbeing_App.core.services.UserService import UserService
+from src.Student_Wellbeing_App.core.ui.task_runner import TaskRunner
 
 
 class BootstrapAdminFrame(ttk.Frame):
@@ -44,9 +45,12 @@ class BootstrapAdminFrame(ttk.Frame):
         ttk.Label(self, text="Admin Password").pack(pady=(10, 0))
         ttk.Entry(self, textvariable=self.password_var, show="*").pack(pady=5)
 
-        ttk.Button(self, text="Create Admin", command=self.handle_create_admin).pack(
-            pady=15
-        )
+        self.create_btn = ttk.Button(self, text="Create Admin", command=self.handle_create_admin)
+        self.create_btn.pack(pady=15)
+
+        # create_user hashes the password with a slow KDF; run it off the Tk thread
+        self.tasks = TaskRunner(self, max_workers=1)
+        self.bind("<Destroy>", self._on_destroy, add="+")
 
     def handle_create_admin(self):
         first_name = self.first_name_var.get().strip()
@@ -57,16 +61,25 @@ class BootstrapAdminFrame(ttk.Frame):
             messagebox.showerror("Error", "Please fill in all fields.")
             return
 
-        try:
-            admin_id = self.user_service.create_user(
-                first_name=first_name,
-                lastname=lastname,
-                plain_password=password,
-                role=UserRole.ADMIN,
-            )
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to create admin: {e}")
-            return
+        self.create_btn.config(state="disabled")
+        self.tasks.submit(
+            "create-admin", self.user_service.create_user,
+            first_name=first_name,
+            lastname=lastname,
+            plain_password=password,
+            role=UserRole.ADMIN,
+            on_done=self._on_admin_created,
+            on_error=self._on_create_failed,
+        )
 
+    def _on_admin_created(self, admin_id: str):
         messagebox.showinfo("Success", f"Admin created with ID: {admin_id}")
         self.on_admin_created()
+
+    def _on_create_failed(self, error: Exception):
+        self.create_btn.config(state="normal")
+        messagebox.showerror("Error", f"Failed to create admin: {error}")
+
+    def _on_destroy(self, event):
+        if event.widget is self:
+            self.tasks.shutdown()
@@ -6,6 +6,7 @@ from src.Student_Wellbeing_App.core.services.AuthenticationService import (
     AuthenticationService,
     AuthResult,
 )
+from src.Student_Wellbeing_App.core.ui.task_runner import TaskRunner
 
 
 class LoginFrame(ttk.Frame):
@@ -45,8 +46,12 @@ class LoginFrame(ttk.Frame):
             row=1, column=1, padx=10, pady=10, sticky="ew"
         )
 
-        login_btn = ttk.Button(self, text="Login", command=self.handle_login)
-        login_btn.grid(row=2, column=0, columnspan=2, pady=15)
+        self.login_btn = ttk.Button(self, text="Login", command=self.handle_login)
+        self.login_btn.grid(row=2, column=0, columnspan=2, pady=15)
+
+        # Password checks use a slow KDF; run them off the Tk thread
+        self.tasks = TaskRunner(self, max_workers=1)
+        self.bind("<Destroy>", self._on_destroy, add="+")
 
     def handle_login(self):
         identifier = self.id_var.get().strip()   # EMP0001 or STU0001
@@ -58,11 +63,18 @@ class LoginFrame(ttk.Frame):
             )
             return
 
-        auth_result = self.auth_service.authenticate_any(
-            identifier, password
+        self.login_btn.config(state="disabled")
+        self.tasks.submit(
+            "login", self.auth_service.authenticate_any, identifier, password,
+            on_done=self._on_login_result, on_error=self._on_login_error,
         )
 
-        
+    def _on_login_error(self, error: Exception):
+        self.login_btn.config(state="normal")
+        messagebox.showerror("Error", str(error), parent=self)
+
+    def _on_login_result(self, auth_result: Optional[AuthResult]):
+        self.login_btn.config(state="normal")
         if auth_result is None:
             messagebox.showerror("Login failed", "Invalid ID or password.", parent=self)
             self.password_var.set("")
@@ -71,3 +83,6 @@ class LoginFrame(ttk.Frame):
         # success – hand off to app
         self.on_login_success(auth_result)
 
+    def _on_destroy(self, event):
+        if event.widget is self:
+            self.tasks.shutdown()
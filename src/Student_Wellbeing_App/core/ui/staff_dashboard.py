@@ -7,6 +7,7 @@ from src.Student_Wellbeing_App.core.services.StudentService import StudentServic
 from src.Student_Wellbeing_App.core.services.WellbeingService import WellbeingService
 from src.Student_Wellbeing_App.core.services.AcademicService import AcademicService
 from src.Student_Wellbeing_App.core.ui.base_dashboard import BaseDashboard
+from src.Student_Wellbeing_App.core.ui.task_runner import current_task
 
 
 class StaffDashboard(BaseDashboard):
@@ -115,17 +116,24 @@ class StaffDashboard(BaseDashboard):
             messagebox.showwarning("Input Required", "Enter a student ID", parent=self)
             return
 
-        try:
-            profile = self.academic_service.get_student_academic_profile(student_id)
-            student = self.student_service.get_student_by_id(student_id)
-            if not student:
-                messagebox.showerror("Not Found", f"Student ID {student_id} not found.", parent=self)
-                return
+        self.run_task(
+            "academics", self._load_academic_record, student_id,
+            on_done=lambda result: self._on_student_loaded(student_id, result, self.display_student_academic_profile),
+            label=f"Loading {student_id}",
+        )
 
-            self.display_student_academic_profile(student, profile)
+    def _load_academic_record(self, student_id):
+        student = self.student_service.get_student_by_id(student_id)
+        if not student:
+            return None
+        return student, self.academic_service.get_student_academic_profile(student_id)
 
-        except Exception as e:
-            messagebox.showerror("Error", str(e), parent=self)
+    def _on_student_loaded(self, student_id, result, display):
+        """Shared on_done for per-student lookups: result is None or (student, *data)."""
+        if result is None:
+            messagebox.showerror("Not Found", f"Student ID {student_id} not found.", parent=self)
+            return
+        display(*result)
 
     def display_student_academic_profile(self, student, profile: dict):
         self.ac_results_text.config(state="normal")
@@ -161,12 +169,17 @@ class StaffDashboard(BaseDashboard):
 
     def _show_low_attendance_students(self):
         """List all students below the attendance threshold."""
-        try:
-            students = self.student_service.list_students()
-            results = self.academic_service.get_low_attendance_students(students)
-        except Exception as e:
-            return messagebox.showerror("Error", str(e), parent=self)
+        self.run_task(
+            "academics", self._load_low_attendance_students,
+            on_done=self._display_low_attendance_students,
+            label="Checking attendance",
+        )
+
+    def _load_low_attendance_students(self):
+        students = self.student_service.list_summaries()
+        return self.academic_service.get_low_attendance_students(students)
 
+    def _display_low_attendance_students(self, results):
         self.ac_results_text.config(state="normal")
         self.ac_results_text.delete("1.0", "end")
 
@@ -183,14 +196,15 @@ class StaffDashboard(BaseDashboard):
         self.ac_results_text.config(state="disabled")
 
     def _show_low_mark_students(self):
-        
-        try:
-            students = self.student_service.list_students()
-            low_mark_students = self.academic_service.get_low_mark_students(students)
-        except Exception as e:
-            return messagebox.showerror("Error", str(e), parent=self)
+        self.run_task(
+            "academics", self._load_low_mark_students,
+            on_done=self._display_low_mark_students,
+            label="Checking marks",
+        )
 
-        self._display_low_mark_students(low_mark_students)
+    def _load_low_mark_students(self):
+        students = self.student_service.list_summaries()
+        return self.academic_service.get_low_mark_students(students)
 
     def _display_low_mark_students(self, low_mark_students):
         self.ac_results_text.config(state="normal")
@@ -218,18 +232,17 @@ class StaffDashboard(BaseDashboard):
             messagebox.showwarning("Input Required", "Enter a student ID", parent=self)
             return
 
-        try:
-            student = self.student_service.get_student_by_id(student_id)
-            if not student:
-                messagebox.showerror("Not Found", f"Student ID {student_id} not found.", parent=self)
-                return
-
-            records = self.academic_service.attendance_service.get_attendance_for_student(student_id)
-
-            self._display_attendance_records(student, records)
+        self.run_task(
+            "academics", self._load_attendance_records, student_id,
+            on_done=lambda result: self._on_student_loaded(student_id, result, self._display_attendance_records),
+            label=f"Loading attendance for {student_id}",
+        )
 
-        except Exception as e:
-            messagebox.showerror("Error", str(e), parent=self)
+    def _load_attendance_records(self, student_id):
+        student = self.student_service.get_student_by_id(student_id)
+        if not student:
+            return None
+        return student, self.academic_service.attendance_service.get_attendance_for_student(student_id)
 
     def _display_attendance_records(self, student, records):
         self.ac_results_text.config(state="normal")
@@ -303,20 +316,19 @@ class StaffDashboard(BaseDashboard):
         if not student_id:
             return messagebox.showwarning("Input Required", "Please enter a student ID.", parent=self)
 
-        try:
-            student = self.student_service.get_student_by_id(student_id)
-
-            if not student:
-                messagebox.showerror(
-                    "Not Found", f"Student ID {student_id} not found.")
-                return
-
-            records = self.wellbeing_service.get_records_for_student(student_id)
-            high_stress = self.wellbeing_service.high_stress_weeks(student_id)
-        except Exception as e:
-            return messagebox.showerror("Error", str(e), parent=self)
+        self.run_task(
+            "wellbeing", self._load_student_wellbeing, student_id,
+            on_done=lambda result: self._on_student_loaded(student_id, result, self.display_student_wellbeing),
+            label=f"Loading {student_id}",
+        )
 
-        self.display_student_wellbeing(student, records, high_stress)
+    def _load_student_wellbeing(self, student_id):
+        student = self.student_service.get_student_by_id(student_id)
+        if not student:
+            return None
+        records = self.wellbeing_service.get_records_for_student(student_id)
+        high_stress = [r for r in records if r.stress_level >= 4]
+        return student, records, high_stress
 
     def display_student_wellbeing(self, student, records, high_stress_weeks):
         self.wb_results_text.config(state="normal")
@@ -361,15 +373,21 @@ class StaffDashboard(BaseDashboard):
         self.wb_results_text.config(state="disabled")
 
     def _show_high_risk_students(self):
-        students = self.student_service.list_students()
-        results = [
-            (s, len(self.wellbeing_service.high_stress_weeks(s.student_id)))
+        self.run_task(
+            "wellbeing", self._load_high_risk_students,
+            on_done=self.display_high_risk_results,
+            label="Finding high-risk students",
+        )
+
+    def _load_high_risk_students(self):
+        students = self.student_service.list_summaries()
+        signals = self.wellbeing_service.scan_wellbeing_signals(threshold=4)
+        return [
+            (s, signals[s.student_id]["high_stress_weeks"])
             for s in students
-            if self.wellbeing_service.high_stress_weeks(s.student_id)
+            if s.student_id in signals and signals[s.student_id]["high_stress_weeks"]
         ]
 
-        self.display_high_risk_results(results)
-
     def display_high_risk_results(self, results):
         self.wb_results_text.config(state="normal")
         self.wb_results_text.delete("1.0", "end")
@@ -392,46 +410,12 @@ class StaffDashboard(BaseDashboard):
         self.wb_results_text.config(state="disabled")
 
     def _show_cohort_stress_overview(self):
-        """Compute wellbeing stats per cohort and render them."""
-        students = self.student_service.list_students()
-        cohort_data = {}
-
-        for s in students:
-            records = self.wellbeing_service.get_records_for_student(s.student_id)
-
-            if records:
-
-                cohort = s.year
-                if cohort not in cohort_data:
-                    cohort_data[cohort] = {
-                        "total_students": 0,
-                        "total_records": 0,
-                        "high_stress_count": 0,
-                        "sum_stress": 0.0,
-                        "sum_sleep": 0.0,
-                        "avg_stress": 0.0,
-                        "avg_sleep": 0.0,
-                    }
-
-                data = cohort_data[cohort]
-                high_stress_weeks = self.wellbeing_service.high_stress_weeks(s.student_id)
-
-                data["total_students"] += 1
-                data["total_records"] += len(records)
-                data["high_stress_count"] += len(high_stress_weeks)
-                data["sum_stress"] += sum(r.stress_level for r in records)
-                data["sum_sleep"] += sum(r.sleep_hours for r in records)
-
-        # Finalise averages
-        for data in cohort_data.values():
-            if data["total_records"] > 0:
-                data["avg_stress"] = data["sum_stress"] / data["total_records"]
-                data["avg_sleep"] = data["sum_sleep"] / data["total_records"]
-            else:
-                data["avg_stress"] = 0.0
-                data["avg_sleep"] = 0.0
-
-        self.display_cohort_overview(cohort_data)
+        """Fetch wellbeing stats per cohort (one grouped query) and render them."""
+        self.run_task(
+            "wellbeing", self.wellbeing_service.cohort_overview, threshold=4,
+            on_done=self.display_cohort_overview,
+            label="Building cohort overview",
+        )
 
     def display_cohort_overview(self, cohort_data):
         """Display stress overview by cohort."""
@@ -447,13 +431,14 @@ class StaffDashboard(BaseDashboard):
             for cohort in sorted(cohort_data.keys()):
                 data = cohort_data[cohort]
                 high_stress_pct = (
-                        data["high_stress_count"] / data["total_students"] * 100) if data["total_students"] > 0 else 0
+                        data["high_stress_students"] / data["total_students"] * 100) if data["total_students"] > 0 else 0
 
                 content += f"Year {cohort} Cohort:\n"
                 content += f"  • Students: {data['total_students']}\n"
                 content += f"  • Average Stress Level: {data['avg_stress']:.1f}/5\n"
                 content += f"  • Average Sleep: {data['avg_sleep']:.1f}hrs\n"
-                content += f"  • High-Risk Students: {data['high_stress_count']} ({high_stress_pct:.0f}%)\n"
+                content += f"  • High-Risk Students: {data['high_stress_students']} ({high_stress_pct:.0f}%)\n"
+                content += f"  • High-Stress Weeks: {data['high_stress_records']} of {data['total_records']} records\n"
                 content += "-" * 70 + "\n"
 
         self.wb_results_text.insert("1.0", content)
@@ -461,41 +446,51 @@ class StaffDashboard(BaseDashboard):
 
     def show_alerts(self):
         """Collect wellbeing alerts for all students and render them."""
-        try:
-            students = self.student_service.list_students()
-            alerts = []
-
-            for s in students:
-                # All wellbeing records for the student
-                records = self.wellbeing_service.get_records_for_student(s.student_id)
-                # High-stress weeks
-                weeks = self.wellbeing_service.high_stress_weeks(s.student_id)
-
-                # High stress alert
-                if weeks:
-                    alerts.append({
-                        "student": s,
-                        "type": "High Stress",
-                        "severity": len(weeks),
-                        "message": f"{len(weeks)} weeks with high stress levels",
-                    })
-
-                # Low sleep alert (based on last 5 records, if any)
-                if records:
-                    recent_records = records[-5:]
-                    avg_sleep = sum(r.sleep_hours for r in recent_records) / len(recent_records)
-                    if avg_sleep < 6:
-                        alerts.append({
-                            "student": s,
-                            "type": "Low Sleep",
-                            "severity": 6 - avg_sleep,
-                            "message": f"Average sleep: {avg_sleep:.1f}hrs (below recommended 6hrs)",
-                        })
-
-            self.display_alerts(alerts)
-
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to retrieve data: {e}", parent=self)
+        self.run_task(
+            "wellbeing", self._collect_alerts,
+            on_done=self.display_alerts,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to retrieve data: {e}", parent=self),
+            label="Collecting alerts",
+        )
+
+    def _collect_alerts(self):
+        """Runs in a worker thread; must not touch widgets."""
+        task = current_task()
+        students = self.student_service.list_summaries()
+        # Stress counts and recent sleep for every student in one query
+        signals = self.wellbeing_service.scan_wellbeing_signals(threshold=4, recent_window=5)
+        alerts = []
+
+        for i, s in enumerate(students, 1):
+            if task and i % 500 == 0:
+                task.check()
+                task.report_progress(i, len(students))
+
+            signal = signals.get(s.student_id)
+            if not signal:
+                continue
+
+            # High stress alert
+            weeks = signal["high_stress_weeks"]
+            if weeks:
+                alerts.append({
+                    "student": s,
+                    "type": "High Stress",
+                    "severity": weeks,
+                    "message": f"{weeks} weeks with high stress levels",
+                })
+
+            # Low sleep alert (based on the last 5 records)
+            avg_sleep = signal["recent_avg_sleep"]
+            if avg_sleep is not None and avg_sleep < 6:
+                alerts.append({
+                    "student": s,
+                    "type": "Low Sleep",
+                    "severity": 6 - avg_sleep,
+                    "message": f"Average sleep: {avg_sleep:.1f}hrs (below recommended 6hrs)",
+                })
+
+        return alerts
 
     def display_alerts(self, alerts):
         """Render wellbeing alerts grouped by student."""
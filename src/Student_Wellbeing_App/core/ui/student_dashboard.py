@@ -17,6 +17,7 @@ from src.Student_Wellbeing_App.core.services.WellbeingService import WellbeingSe
 from src.Student_Wellbeing_App.core.services.AcademicService import AcademicService
 
 from src.Student_Wellbeing_App.core.ui.base_dashboard import BaseDashboard
+from src.Student_Wellbeing_App.core.ui.virtual_treeview import sync_tree
 
 
 # ---------------------------------------------------------------
@@ -125,8 +126,16 @@ class StudentDashboard(BaseDashboard):
             font=("Segoe UI", 12, "bold"),
         ).pack(anchor="w", pady=(0, 5))
 
-        records = self._load_attendance_records()
+        loading = ttk.Label(tab, text="Loading attendance…", font=("Segoe UI", 9))
+        loading.pack(anchor="w", padx=5)
 
+        def render(records):
+            loading.destroy()
+            self._render_attendance(tab, records)
+
+        self.run_task("attendance", self._load_attendance_records, on_done=render, label="Loading attendance")
+
+    def _render_attendance(self, tab, records):
         # Compute simple stats from *all* available records (so it actually shows data)
         present = absent = late = 0
         for r in records:
@@ -211,13 +220,14 @@ class StudentDashboard(BaseDashboard):
         self.submissions_tree.column("remark", width=150, anchor="w")
 
         self.submissions_tree.pack(fill="both", expand=True, padx=5, pady=5)
+        self._submission_rows = {}   # iid -> values currently in the tree
 
         # load and render data
         self._load_and_display_student_submissions()
 
 
     def _load_and_display_student_submissions(self):
-        """Fetch academic profile and render into the submissions tab."""
+        """Fetch the academic profile in the background and render it into the submissions tab."""
         if not self.academic_service:
             self.sub_summary_label.config(text="Academic service not configured")
             return
@@ -227,14 +237,13 @@ class StudentDashboard(BaseDashboard):
             self.sub_summary_label.config(text="No student ID found.")
             return
 
-        try:
-            profile = self.academic_service.get_student_academic_profile(sid)
-            student = self.student
-        except Exception as e:
-            self.sub_summary_label.config(text=f"Error loading submissions: {e}")
-            return
-
-        self._display_student_submissions(student, profile)
+        self.sub_summary_label.config(text="Loading submissions…")
+        self.run_task(
+            "submissions", self.academic_service.get_student_academic_profile, sid,
+            on_done=lambda profile: self._display_student_submissions(self.student, profile),
+            on_error=lambda e: self.sub_summary_label.config(text=f"Error loading submissions: {e}"),
+            label="Loading submissions",
+        )
 
 
 
@@ -242,12 +251,9 @@ class StudentDashboard(BaseDashboard):
     def _display_student_submissions(self, student, profile: dict):
         """
         Adaptation of display_student_academic_profile for the student's Submissions tab.
-        Fills the Treeview and shows a one-line summary.
+        Fills the Treeview (as a diff against the rows already shown) and
+        shows a one-line summary.
         """
-        # clear old rows
-        for row in self.submissions_tree.get_children():
-            self.submissions_tree.delete(row)
-
         subs = profile.get("submissions", [])
         low_marks = profile.get("low_marks", [])
 
@@ -265,8 +271,9 @@ class StudentDashboard(BaseDashboard):
 
         self.sub_summary_label.config(text=summary_text)
 
-        # --- populate tree rows ---
-        for s in subs:
+        # --- build tree rows ---
+        rows = []
+        for i, s in enumerate(subs):
             assessment_id = getattr(s, "assessment_id", getattr(s, "assignment_id", "N/A"))
 
             submitted_at = getattr(s, "submitted_at", None)
@@ -290,11 +297,10 @@ class StudentDashboard(BaseDashboard):
             else:
                 remark = "Not graded"
 
-            self.submissions_tree.insert(
-                "",
-                "end",
-                values=(assessment_id, submitted_str, status_text, mark_str, remark),
-            )
+            iid = str(getattr(s, "submission_id", None) or f"{assessment_id}:{i}")
+            rows.append((iid, (assessment_id, submitted_str, status_text, mark_str, remark)))
+
+        sync_tree(self.submissions_tree, rows, self._submission_rows)
 
 
     # ===========================================================
@@ -315,9 +321,12 @@ class StudentDashboard(BaseDashboard):
         self.wb_text = tk.Text(tab, height=8, wrap="word", state="disabled")
         self.wb_text.pack(fill="both", expand=False, padx=5, pady=5)
 
-        # Graph area
-        self._plot_wellbeing_graph(tab)
-        self._load_wellbeing_summary()
+        # Graph and summary share one background fetch
+        def render(records):
+            self._plot_wellbeing_graph(tab, records)
+            self._load_wellbeing_summary(records)
+
+        self.run_task("wellbeing", self._load_wellbeing_records, on_done=render, label="Loading wellbeing")
 
     def _load_wellbeing_records(self):
         try:
@@ -329,9 +338,7 @@ class StudentDashboard(BaseDashboard):
         except Exception:
             return []
 
-    def _load_wellbeing_summary(self):
-        records = self._load_wellbeing_records()
-
+    def _load_wellbeing_summary(self, records):
         self.wb_text.config(state="normal")
         self.wb_text.delete("1.0", "end")
 
@@ -349,8 +356,7 @@ class StudentDashboard(BaseDashboard):
 
         self.wb_text.config(state="disabled")
 
-    def _plot_wellbeing_graph(self, parent):
-        records = self._load_wellbeing_records()
+    def _plot_wellbeing_graph(self, parent, records):
         if not records:
             fig = Figure(figsize=(5, 3))
             ax = fig.add_subplot(111)
@@ -0,0 +1,210 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+# Milliseconds between checks for finished tasks on the Tk thread
+POLL_INTERVAL_MS = 50
+
+_local = threading.local()
+logger = logging.getLogger(__name__)
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task by Task.check() once the task has been cancelled."""
+
+
+class Task:
+    """
+    One background call started by TaskRunner.submit().
+
+    The worker function can reach its Task through current_task() to
+    report progress or to stop early when cancelled; everything else
+    (callbacks, widget updates) happens on the Tk thread.
+    """
+
+    def __init__(self, key: str, fn: Callable, args: tuple, kwargs: dict,
+                 on_done: Optional[Callable], on_error: Optional[Callable], label: str):
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.on_done = on_done
+        self.on_error = on_error
+        self.label = label
+        self.future = None
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+        self._progress = None   # (done, total) or None for "unknown"
+
+    def same_call(self, fn: Callable, args: tuple, kwargs: dict) -> bool:
+        return self.fn == fn and self.args == args and self.kwargs == kwargs
+
+    # ---------- Called from the worker ----------
+
+    def report_progress(self, done: int, total: int) -> None:
+        with self._lock:
+            self._progress = (done, total)
+
+    def check(self) -> None:
+        """Raise TaskCancelled if the task was cancelled."""
+        if self._cancel_event.is_set():
+            raise TaskCancelled(self.key)
+
+    # ---------- Called from the Tk thread ----------
+
+    def cancel(self) -> None:
+        """Ask the task to stop. Its callbacks will not run."""
+        self._cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()   # only succeeds if it has not started yet
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @property
+    def progress(self):
+        with self._lock:
+            return self._progress
+
+    @property
+    def done(self) -> bool:
+        return self.future is not None and self.future.done()
+
+
+def current_task() -> Optional[Task]:
+    """The Task whose worker function is running on this thread, if any."""
+    return getattr(_local, "task", None)
+
+
+class TaskRunner:
+    """
+    Runs service calls on a small thread pool so the Tk main loop never
+    blocks on the database.
+
+    - submit(key, fn, *args, on_done=..., on_error=...) starts fn in a worker.
+      `key` names the output slot (e.g. the results panel a button fills).
+    - A repeated click while the same call is still running is coalesced:
+      the running Task is returned and nothing new is started.
+    - A different call on a busy key supersedes the old one; the old task
+      is cancelled and its result is thrown away.
+    - Results come back through widget.after() polling, so on_done,
+      on_error and on_change always run on the Tk thread and may touch
+      widgets directly.
+    - on_change(runner) is called whenever the set of running tasks or
+      their progress changes; dashboards use it for the status bar.
+    """
+
+    def __init__(self, widget, max_workers: int = 2, poll_interval_ms: int = POLL_INTERVAL_MS,
+                 on_change: Callable = None):
+        self.widget = widget
+        self.poll_interval_ms = poll_interval_ms
+        self.on_change = on_change
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ui-task")
+        self._tasks: Dict[str, Task] = {}
+        self._after_id = None
+        self._last_state = None
+        self._closed = False
+
+    # ---------- Public API (Tk thread only) ----------
+
+    def submit(self, key: str, fn: Callable, *args, on_done: Callable = None,
+               on_error: Callable = None, label: str = None, **kwargs) -> Optional[Task]:
+        if self._closed:
+            return None
+
+        running = self._tasks.get(key)
+        if running is not None:
+            if running.same_call(fn, args, kwargs) and not running.cancelled:
+                return running
+            running.cancel()
+
+        task = Task(key, fn, args, kwargs, on_done, on_error, label or key)
+        task.future = self._executor.submit(self._call, task)
+        self._tasks[key] = task
+        self._schedule_poll()
+        self._notify()
+        return task
+
+    def cancel(self, key: str = None) -> None:
+        """Cancel the task on `key`, or every task when key is None."""
+        keys = [key] if key is not None else list(self._tasks)
+        for k in keys:
+            task = self._tasks.pop(k, None)
+            if task is not None:
+                task.cancel()
+        self._notify()
+
+    def is_running(self, key: str) -> bool:
+        return key in self._tasks
+
+    def running(self) -> list:
+        return list(self._tasks.values())
+
+    def shutdown(self) -> None:
+        """Cancel everything and stop polling (e.g. when the dashboard is destroyed)."""
+        if self._closed:
+            return
+        self._closed = True
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass  # widget already gone
+            self._after_id = None
+        # queued calls were cancelled with their tasks above (cancel_futures needs Python 3.9)
+        self._executor.shutdown(wait=False)
+
+    def poll(self) -> None:
+        """Deliver finished tasks. Runs on the Tk thread via after()."""
+        self._after_id = None
+        if self._closed:
+            return
+
+        for key, task in list(self._tasks.items()):
+            if not task.done:
+                continue
+            del self._tasks[key]
+            if task.cancelled or task.future.cancelled():
+                continue
+            error = task.future.exception()
+            if isinstance(error, TaskCancelled):
+                continue
+            if error is not None:
+                if task.on_error:
+                    task.on_error(error)
+                else:
+                    logger.error("%s failed", task.label, exc_info=error)
+            elif task.on_done:
+                task.on_done(task.future.result())
+
+        self._notify()
+        if self._tasks:
+            self._schedule_poll()
+
+    # ---------- Internals ----------
+
+    @staticmethod
+    def _call(task: Task):
+        task.check()
+        _local.task = task
+        try:
+            return task.fn(*task.args, **task.kwargs)
+        finally:
+            _local.task = None
+
+    def _schedule_poll(self) -> None:
+        if self._after_id is None and not self._closed:
+            self._after_id = self.widget.after(self.poll_interval_ms, self.poll)
+
+    def _notify(self) -> None:
+        if self.on_change is None:
+            return
+        state = tuple((t.key, t.progress) for t in self._tasks.values())
+        if state != self._last_state:
+            self._last_state = state
+            self.on_change(self)
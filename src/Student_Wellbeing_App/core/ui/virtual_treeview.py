@@ -0,0 +1,276 @@
+import threading
+from collections import OrderedDict
+from tkinter import ttk
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Rows fetched per query, and how many pages stay cached
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_MAX_PAGES = 8
+
+
+class PagedRows:
+    """
+    Page cache in front of a paged query.
+
+    fetch_page(offset, limit) returns a list of rows and count() the total.
+    Pages are fetched on demand and the least recently used ones are
+    dropped once more than max_pages are held. invalidate() forgets
+    everything (after a filter/sort change or a write).
+    """
+
+    def __init__(self, fetch_page: Callable, count: Callable,
+                 page_size: int = DEFAULT_PAGE_SIZE, max_pages: int = DEFAULT_MAX_PAGES):
+        if page_size < 1 or max_pages < 1:
+            raise ValueError("page_size and max_pages must be at least 1")
+        self.fetch_page = fetch_page
+        self.count = count
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._lock = threading.Lock()
+        self._pages = OrderedDict()
+        self._total = None
+        self.fetches = 0
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._pages.clear()
+            self._total = None
+
+    def total(self) -> int:
+        with self._lock:
+            if self._total is not None:
+                return self._total
+        total = self.count()
+        with self._lock:
+            self._total = total
+        return total
+
+    def window(self, offset: int, limit: int) -> List:
+        """Rows offset .. offset+limit (fewer at the end of the list)."""
+        rows = []
+        first = offset // self.page_size
+        last = (offset + max(limit, 1) - 1) // self.page_size
+        for page_no in range(first, last + 1):
+            page = self._page(page_no)
+            start = page_no * self.page_size
+            lo = max(offset - start, 0)
+            hi = min(offset + limit - start, len(page))
+            rows.extend(page[lo:hi])
+            if len(page) < self.page_size:
+                break
+        return rows
+
+    def _page(self, page_no: int) -> List:
+        with self._lock:
+            page = self._pages.get(page_no)
+            if page is not None:
+                self._pages.move_to_end(page_no)
+                return page
+        page = self.fetch_page(page_no * self.page_size, self.page_size)
+        with self._lock:
+            self.fetches += 1
+            self._pages[page_no] = page
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        return page
+
+
+def sync_tree(tree, rows: Sequence[Tuple[str, tuple]], known: Dict[str, tuple]) -> Dict[str, int]:
+    """
+    Make the tree's top-level items match `rows` ([(iid, values), ...]) in
+    order, touching only what changed: stale items are deleted, changed
+    values updated, new items inserted and moved items re-positioned.
+    `known` maps iid -> values last written and is updated in place.
+    Returns counts of each operation.
+    """
+    ops = {"deleted": 0, "updated": 0, "inserted": 0, "moved": 0}
+    wanted = {iid for iid, _ in rows}
+    stale = [iid for iid in tree.get_children() if iid not in wanted]
+    if stale:
+        tree.delete(*stale)
+        for iid in stale:
+            known.pop(iid, None)
+        ops["deleted"] = len(stale)
+
+    for index, (iid, values) in enumerate(rows):
+        if iid not in known:
+            tree.insert("", index, iid=iid, values=values)
+            known[iid] = values
+            ops["inserted"] += 1
+            continue
+        if known[iid] != values:
+            tree.item(iid, values=values)
+            known[iid] = values
+            ops["updated"] += 1
+        if tree.index(iid) != index:
+            tree.move(iid, "", index)
+            ops["moved"] += 1
+    return ops
+
+
+class VirtualTreeview(ttk.Frame):
+    """
+    Treeview that only ever holds the rows on screen.
+
+    - fetch_page(offset, limit, sort, descending, filters) -> list of dicts
+      and count(filters) -> int are called off the Tk thread when a
+      TaskRunner is given (rapid scrolling coalesces into the latest window).
+    - The scrollbar is driven from the total row count, so dragging it
+      jumps straight to any position without loading the rows in between.
+    - Clicking a sortable heading toggles the sort; set_filters() changes
+      the filters. Both go back to the query, never to Python-side sorting.
+    - refresh() re-reads the current window and applies it as a diff.
+    """
+
+    def __init__(
+            self,
+            master,
+            columns: Sequence[str],
+            key: str,
+            fetch_page: Callable,
+            count: Callable,
+            headings: Optional[Dict[str, str]] = None,
+            sortable: Sequence[str] = (),
+            sort: Optional[str] = None,
+            height: int = 20,
+            page_size: int = DEFAULT_PAGE_SIZE,
+            runner=None,
+            on_error: Optional[Callable] = None,
+    ):
+        super().__init__(master)
+        self.columns = tuple(columns)
+        self.key = key
+        self.height = height
+        self.runner = runner
+        self.on_error = on_error
+        self.sort = sort
+        self.descending = False
+        self.filters = {}
+        self.offset = 0
+        self.total = 0
+
+        self._fetch_page = fetch_page
+        self._count = count
+        self._headings = headings or {}
+        self._sortable = set(sortable)
+        self._known = {}
+        self._page_size = page_size
+        self._task_key = f"virtual-tree-{id(self)}"
+        self.rows = self._new_rows()
+
+        self.tree = ttk.Treeview(self, columns=self.columns, show="headings", height=height)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+        self._update_headings()
+
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self._on_wheel)
+        self.tree.bind("<Prior>", lambda e: self.scroll_to(self.offset - self.height))
+        self.tree.bind("<Next>", lambda e: self.scroll_to(self.offset + self.height))
+
+    # ---------- Public API ----------
+
+    def column(self, name: str, **kwargs):
+        return self.tree.column(name, **kwargs)
+
+    def set_filters(self, **filters) -> None:
+        """Replace the filters and reload from the top."""
+        if filters == self.filters:
+            return
+        self.filters = filters
+        self.offset = 0
+        self.reload()
+
+    def sort_by(self, column: str) -> None:
+        """Sort by column, or flip the direction if it is already the sort column."""
+        if column == self.sort:
+            self.descending = not self.descending
+        else:
+            self.sort, self.descending = column, False
+        self._update_headings()
+        self.offset = 0
+        self.reload()
+
+    def reload(self) -> None:
+        """Forget cached pages and show the current window."""
+        self.rows = self._new_rows()
+        self._load()
+
+    refresh = reload
+
+    def scroll_to(self, offset: int) -> None:
+        offset = max(0, min(int(offset), max(self.total - self.height, 0)))
+        if offset != self.offset:
+            self.offset = offset
+            self._load()
+
+    def selected_keys(self) -> List[str]:
+        return list(self.tree.selection())
+
+    # ---------- Loading ----------
+
+    def _new_rows(self) -> PagedRows:
+        # Each cache is bound to one sort + filter combination, so a worker
+        # still reading the old query can never fill the new cache
+        sort, descending, filters = self.sort, self.descending, dict(self.filters)
+        return PagedRows(
+            lambda offset, limit: self._fetch_page(offset, limit, sort, descending, filters),
+            lambda: self._count(filters),
+            page_size=self._page_size,
+        )
+
+    def _read_window(self, rows: PagedRows, offset: int):
+        """Runs in a worker thread when a runner is set; must not touch widgets."""
+        total = rows.total()
+        offset = max(0, min(offset, max(total - self.height, 0)))
+        return rows, offset, total, rows.window(offset, self.height)
+
+    def _load(self) -> None:
+        if self.runner is None:
+            self._apply(self._read_window(self.rows, self.offset))
+        else:
+            self.runner.submit(self._task_key, self._read_window, self.rows, self.offset,
+                               on_done=self._apply, on_error=self.on_error, label="Loading rows")
+
+    def _apply(self, result) -> None:
+        rows_source, offset, total, rows = result
+        if rows_source is not self.rows:
+            return  # filters or sort changed while this window was loading
+        self.offset, self.total = offset, total
+        sync_tree(
+            self.tree,
+            [(str(row[self.key]), tuple(row[c] for c in self.columns)) for row in rows],
+            self._known,
+        )
+        if total:
+            self.scrollbar.set(offset / total, min(offset + self.height, total) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    # ---------- Events ----------
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.scroll_to(round(float(args[0]) * self.total))
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1]
+            step = self.height if unit == "pages" else 1
+            self.scroll_to(self.offset + amount * step)
+
+    def _on_wheel(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+        return "break"
+
+    def _update_headings(self):
+        for column in self.columns:
+            text = self._headings.get(column, column)
+            if column == self.sort:
+                text += " ▼" if self.descending else " ▲"
+            if column in self._sortable:
+                self.tree.heading(column, text=text, command=lambda c=column: self.sort_by(c))
+            else:
+                self.tree.heading(column, text=text)
@@ -0,0 +1,35 @@
+"""
+Shared fixtures: a temporary database file instead of the bundled one,
+for every test.
+"""
+
+import pytest
+
+from src.Student_Wellbeing_App.core.database import connection as db_conn
+from src.Student_Wellbeing_App.core.database import migrations
+from src.Student_Wellbeing_App.core.streamlit_UI import data_loader
+
+
+@pytest.fixture(autouse=True)
+def temp_db_path(tmp_path, monkeypatch):
+    """
+    Point connections, migrations and data_loader at tmp_path/test.sqlite3
+    (not created yet). Pools opened on it are closed afterwards.
+
+    Used by every test, so services built against the default database
+    never open (and switch to WAL) the bundled student_wellbeing_db.sqlite3.
+    """
+    db_file = tmp_path / "test.sqlite3"
+    monkeypatch.setattr(db_conn, "DB_PATH", db_file)
+    monkeypatch.setattr(db_conn, "DB_NAME", db_file)
+    monkeypatch.setattr(migrations, "DB_NAME", db_file)
+    monkeypatch.setattr(data_loader, "DB_PATH", db_file)
+    yield db_file
+    db_conn.close_all_pools()
+
+
+@pytest.fixture
+def migrated_db(temp_db_path):
+    """temp_db_path with every migration applied; yields the file path."""
+    migrations.run_migrations()
+    return temp_db_path
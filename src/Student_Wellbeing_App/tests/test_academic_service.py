@@ -3,6 +3,7 @@ from unittest.mock import MagicMock
 
 from src.Student_Wellbeing_App.core.services.AcademicService import AcademicService
 from src.Student_Wellbeing_App.core.models.AcademicSummary import AcademicSummary
+from src.Student_Wellbeing_App.core.services.RiskEngine import RiskEngine
 
 
 def _make_submission(mark):
@@ -13,6 +14,24 @@ def _make_student(student_id="STU0001"):
     return types.SimpleNamespace(student_id=student_id)
 
 
+def _risk_engine(**columns):
+    """RiskEngine over a mocked repository returning the given metric columns."""
+    ids = columns["student_id"]
+    metrics = {
+        "student_id": ids,
+        "attendance_total": [0] * len(ids),
+        "absences": [0] * len(ids),
+        "submissions": [0] * len(ids),
+        "low_marks": [0] * len(ids),
+        "avg_stress": [None] * len(ids),
+        "avg_sleep": [None] * len(ids),
+    }
+    metrics.update(columns)
+    repo = MagicMock()
+    repo.load_student_metrics.return_value = metrics
+    return RiskEngine(repo=repo)
+
+
 def test_get_student_academic_profile_counts_low_marks_and_attendance():
     submission_service = MagicMock()
     attendance_service = MagicMock()
@@ -42,15 +61,20 @@ def test_get_student_academic_profile_counts_low_marks_and_attendance():
 
 
 def test_get_low_attendance_students_filters_below_threshold():
-    attendance_service = MagicMock()
-    students = [_make_student("STU0001"), _make_student("STU0002")]
+    students = [_make_student("STU0001"), _make_student("STU0002"), _make_student("STU0003")]
 
-    attendance_service.get_attendance_percentage.side_effect = [60.0, 85.0]
+    # 60% and 85% attendance; STU0003 has no records (counts as 100%)
+    engine = _risk_engine(
+        student_id=["STU0001", "STU0002", "STU0003"],
+        attendance_total=[10, 20, 0],
+        absences=[4, 3, 0],
+    )
 
     service = AcademicService(
         submission_service=MagicMock(),
-        attendance_service=attendance_service,
-        student_service=MagicMock()
+        attendance_service=MagicMock(),
+        student_service=MagicMock(),
+        risk_engine=engine
     )
 
     result = service.get_low_attendance_students(students, threshold=75.0)
@@ -58,23 +82,26 @@ def test_get_low_attendance_students_filters_below_threshold():
     student, pct = result[0]
     assert student.student_id == "STU0001"
     assert pct == 60.0
+    # one aggregate read, no per-student lookups
+    engine.repo.load_student_metrics.assert_called_once()
+    service.attendance_service.get_attendance_percentage.assert_not_called()
 
 
 def test_get_low_mark_students_counts_low_submissions():
-    submission_service = MagicMock()
-
     s1 = _make_student("STU0001")
     s2 = _make_student("STU0002")
 
-    submission_service.get_submissions_for_student.side_effect = [
-        [_make_submission(40), _make_submission(30)],  # 2 low
-        [_make_submission(60)],                        # no low
-    ]
+    engine = _risk_engine(
+        student_id=["STU0001", "STU0002"],
+        submissions=[2, 1],
+        low_marks=[2, 0],
+    )
 
     service = AcademicService(
-        submission_service=submission_service,
+        submission_service=MagicMock(),
         attendance_service=MagicMock(),
-        student_service=MagicMock()
+        student_service=MagicMock(),
+        risk_engine=engine
     )
 
     result = service.get_low_mark_students([s1, s2], threshold=50.0)
@@ -82,6 +109,8 @@ def test_get_low_mark_students_counts_low_submissions():
     student, count = result[0]
     assert student.student_id == "STU0001"
     assert count == 2
+    engine.repo.load_student_metrics.assert_called_once_with(50.0)
+    service.submission_service.get_submissions_for_student.assert_not_called()
 
 
 def test_get_student_academic_summary_returns_none_if_student_missing():
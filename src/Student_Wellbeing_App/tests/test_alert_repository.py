@@ -14,7 +14,7 @@ from src.Student_Wellbeing_App.core.models.AlertType import AlertType
 class TestAlertRepositorySave:
     """Test suite for saving alerts to database."""
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_pool')
     def test_save_alert_with_all_fields(self, mock_get_db):
         """Verify alert can be saved with all required fields."""
         # Mock the database connection
@@ -58,7 +58,7 @@ class TestAlertRepositorySave:
         
         assert new_id == 1
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_pool')
     def test_save_alert_unresolved(self, mock_get_db):
         """Verify unresolved alert is saved correctly."""
         mock_conn = Mock()
@@ -82,8 +82,8 @@ class TestAlertRepositorySave:
         call_args = mock_cursor.execute.call_args
         assert call_args[0][1][4] == 0
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_connection')
-    # used to mock get_db_connection function
+    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_pool')
+    # used to mock get_db_pool function
     def test_save_alert_resolved(self, mock_get_db):
         """Verify resolved alert can be saved."""
         mock_conn = Mock()
@@ -107,7 +107,7 @@ class TestAlertRepositorySave:
         call_args = mock_cursor.execute.call_args
         assert call_args[0][1][4] == 1
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_pool')
     def test_save_alert_with_empty_reason(self, mock_get_db):
         """Verify alert can be saved with empty reason string."""
         mock_conn = Mock()
@@ -135,7 +135,7 @@ class TestAlertRepositorySave:
 class TestAlertRepositoryListActive:
     """Test suite for retrieving active alerts."""
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_pool')
     def test_list_active_returns_unresolved_alerts(self, mock_get_db):
         """Verify list_active returns only unresolved alerts."""
         mock_conn = Mock()
@@ -170,7 +170,7 @@ class TestAlertRepositoryListActive:
         assert alerts[0].student_id == "S001"
         assert alerts[1].student_id == "S002"
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_pool')
     def test_list_active_returns_empty_when_no_alerts(self, mock_get_db):
         """Verify list_active returns empty list when no active alerts."""
         mock_conn = Mock()
@@ -186,7 +186,24 @@ class TestAlertRepositoryListActive:
         mock_cursor.close.assert_called_once()
         mock_conn.close.assert_called_once()
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_pool')
+    def test_count_active_uses_count_query(self, mock_get_db):
+        """Verify count_active counts in SQL instead of fetching rows."""
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_get_db.return_value = mock_conn
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchone.return_value = (4,)
+
+        repo = AlertRepository()
+
+        assert repo.count_active() == 4
+        sql = mock_cursor.execute.call_args[0][0]
+        assert "COUNT(*)" in sql and "resolved=0" in sql
+        mock_cursor.fetchall.assert_not_called()
+        mock_conn.close.assert_called_once()
+
+    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_pool')
     def test_list_active_alert_object_creation(self, mock_get_db):
         """Verify Alert objects are properly created from database rows."""
         mock_conn = Mock()
@@ -211,7 +228,7 @@ class TestAlertRepositoryListActive:
         assert alert.created_at == now
         assert alert.resolved is False 
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_pool')
     def test_list_active_multiple_alerts_same_student(self, mock_get_db):
         """Verify multiple alerts for same student are all returned."""
         mock_conn = Mock()
@@ -235,7 +252,7 @@ class TestAlertRepositoryListActive:
 class TestAlertRepositoryResolve:
     """Test suite for resolving alerts."""
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_pool')
     def test_resolve_alert_by_id(self, mock_get_db):
         """Verify alert is resolved by ID."""
         mock_conn = Mock()
@@ -254,7 +271,7 @@ class TestAlertRepositoryResolve:
         assert expected_fragment in call_args[0][0]
         assert call_args[0][1] == (1,)
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_pool')
     def test_resolve_multiple_different_alerts(self, mock_get_db):
         """Verify different alerts can be resolved."""
         mock_conn = Mock()
@@ -271,7 +288,7 @@ class TestAlertRepositoryResolve:
         # Verify execute was called for each
         assert mock_cursor.execute.call_count == 4
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_pool')
     def test_resolve_alert_closes_connection(self, mock_get_db):
         """Verify connection is closed after resolving."""
         mock_conn = Mock()
@@ -285,7 +302,7 @@ class TestAlertRepositoryResolve:
         mock_cursor.close.assert_called_once()
         mock_conn.close.assert_called_once()
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_pool')
     def test_resolve_nonexistent_alert(self, mock_get_db):
         """Verify resolving non-existent alert doesn't error."""
         mock_conn = Mock()
@@ -304,7 +321,7 @@ class TestAlertRepositoryResolve:
 class TestAlertRepositoryIntegration:
     """Integration tests for AlertRepository workflows."""
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_pool')
     def test_save_and_list_workflow(self, mock_get_db):
         """Verify save followed by list_active workflow."""
         mock_conn = Mock()
@@ -334,7 +351,7 @@ class TestAlertRepositoryIntegration:
         assert len(alerts) == 1
         assert alerts[0].student_id == "S009"
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_pool')
     def test_save_resolve_workflow(self, mock_get_db):
         """Verify save followed by resolve workflow."""
         mock_conn = Mock()
@@ -361,7 +378,7 @@ class TestAlertRepositoryIntegration:
         # Verify both operations executed
         assert mock_cursor.execute.call_count == 2
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_pool')
     def test_multiple_operations_connection_management(self, mock_get_db):
         """Verify connection management across multiple operations."""
         mock_conn = Mock()
@@ -378,7 +395,7 @@ class TestAlertRepositoryIntegration:
         repo.list_active()
         repo.resolve(1)
 
-        # Verify get_db_connection was called 3 times (once per operation)
+        # Verify get_db_pool was called 3 times (once per operation)
         assert mock_get_db.call_count == 3
         # Verify close was called for each connection
         assert mock_cursor.close.call_count == 3
@@ -388,7 +405,7 @@ class TestAlertRepositoryIntegration:
 class TestAlertRepositoryErrorHandling:
     """Test suite for error handling in AlertRepository."""
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_pool')
     def test_save_handles_database_error(self, mock_get_db):
         """Verify save handles database errors gracefully (re-raises)."""
         mock_conn = Mock()
@@ -403,7 +420,7 @@ class TestAlertRepositoryErrorHandling:
         with pytest.raises(Exception):
             repo.save(alert)
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_pool')
     def test_list_active_handles_database_error(self, mock_get_db):
         """Verify list_active handles database errors."""
         mock_conn = Mock()
@@ -417,7 +434,7 @@ class TestAlertRepositoryErrorHandling:
         with pytest.raises(Exception):
             repo.list_active()
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_pool')
     def test_resolve_handles_database_error(self, mock_get_db):
         """Verify resolve handles database errors gracefully."""
         mock_conn = Mock()
@@ -442,7 +459,7 @@ class TestAlertRepositoryErrorHandling:
 class TestAlertRepositoryDataValidation:
     """Test suite for data validation in AlertRepository."""
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_pool')
     def test_save_preserves_alert_data_integrity(self, mock_get_db):
         """Verify saved alert data maintains integrity."""
         mock_conn = Mock()
@@ -472,7 +489,7 @@ class TestAlertRepositoryDataValidation:
         assert saved_data[3] == timestamp
         assert saved_data[4] == 1
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AlertRepository.get_db_pool')
     def test_list_active_returns_correct_alert_types(self, mock_get_db):
         """Verify list_active returns alerts with correct types."""
         mock_conn = Mock()
@@ -54,7 +54,7 @@ def mock_db_conn():
 @pytest.fixture
 def repository(mock_db_conn):
     """Initializes Repository with the mock connection."""
-    with patch("src.Student_Wellbeing_App.core.repositories.AssessmentRepository.get_db_connection", return_value=mock_db_conn):
+    with patch("src.Student_Wellbeing_App.core.repositories.AssessmentRepository.get_db_pool", return_value=mock_db_conn):
         yield AssessmentRepository()
 
 class TestAssessmentRepository:
@@ -14,7 +14,8 @@ CREATE TABLE attendance (
     student_id TEXT NOT NULL,
     session_date DATE NOT NULL,
     session_id TEXT NOT NULL,
-    status TEXT NOT NULL
+    status TEXT NOT NULL,
+    UNIQUE(student_id, session_date, session_id)
 );
 """
 
@@ -49,7 +50,7 @@ def mock_db_conn():
 @pytest.fixture
 def repository(mock_db_conn):
     """Initializes Repository with the mock connection."""
-    with patch("src.Student_Wellbeing_App.core.repositories.AttendanceRepository.get_db_connection", return_value=mock_db_conn):
+    with patch("src.Student_Wellbeing_App.core.repositories.AttendanceRepository.get_db_pool", return_value=mock_db_conn):
         yield AttendanceRepository()
 
 class TestAttendanceRepository:
@@ -167,3 +168,28 @@ class TestAttendanceRepository:
         student_ids = [r.student_id for r in results]
         assert "StudentA" in student_ids
         assert "StudentB" in student_ids
+
+    def test_upsert_register_writes_whole_session(self, repository, mock_db_conn):
+        """Test: a register inserts new rows and updates existing ones in one commit."""
+        repository.upsert(AttendanceRecord(0, "StudentA", date(2025, 3, 1), "LECTURE_1", AttendanceStatus.ABSENT))
+        mock_db_conn.commit.reset_mock()
+
+        saved = repository.upsert_register("LECTURE_1", date(2025, 3, 1), {
+            "StudentA": AttendanceStatus.PRESENT,
+            "StudentB": AttendanceStatus.LATE,
+            "StudentC": AttendanceStatus.ABSENT,
+        })
+
+        assert saved == 3
+        mock_db_conn.commit.assert_called_once()
+        results = {r.student_id: r.status for r in repository.get_by_session("LECTURE_1")}
+        assert results == {
+            "StudentA": AttendanceStatus.PRESENT,
+            "StudentB": AttendanceStatus.LATE,
+            "StudentC": AttendanceStatus.ABSENT,
+        }
+
+    def test_upsert_register_empty_is_noop(self, repository, mock_db_conn):
+        """Test: an empty register does not open a transaction."""
+        assert repository.upsert_register("LECTURE_1", date(2025, 3, 1), {}) == 0
+        mock_db_conn.commit.assert_not_called()
@@ -1,3 +1,4 @@
+import pytest
 from datetime import date
 from unittest.mock import MagicMock
 
@@ -59,3 +60,41 @@ def test_get_attendance_percentage_calculates_correctly():
     pct = service.get_attendance_percentage("STU0001")
     # 2 present out of 3 = 66.66...
     assert abs(pct - (2 / 3 * 100)) < 0.01
+
+
+def test_record_session_register_writes_once_and_logs_summary():
+    repo = MagicMock()
+    audit = MagicMock()
+
+    service = AttendanceService(repo=repo)
+    service.audit = audit
+
+    repo.upsert_register.return_value = 3
+
+    saved = service.record_session_register(
+        "CS101", date(2025, 1, 1),
+        {"STU0001": AttendanceStatus.PRESENT, "STU0002": "ABSENT", "STU0003": AttendanceStatus.PRESENT},
+        performed_by="EMP0001",
+    )
+
+    assert saved == 3
+    repo.upsert_register.assert_called_once()
+    _, _, statuses = repo.upsert_register.call_args[0]
+    assert statuses["STU0002"] == AttendanceStatus.ABSENT
+    repo.upsert.assert_not_called()
+
+    audit.log.assert_called_once()
+    args, _ = audit.log.call_args
+    assert args[0] == "EMP0001"
+    assert args[1] == "BULK_UPSERT_ATTENDANCE"
+    assert "ABSENT 1" in args[2] and "PRESENT 2" in args[2]
+
+
+def test_record_session_register_rejects_unknown_status_before_writing():
+    repo = MagicMock()
+    service = AttendanceService(repo=repo)
+    service.audit = MagicMock()
+
+    with pytest.raises(ValueError):
+        service.record_session_register("CS101", date(2025, 1, 1), {"STU0001": "SLEEPING"})
+    repo.upsert_register.assert_not_called()
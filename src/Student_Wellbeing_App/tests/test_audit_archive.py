@@ -0,0 +1,158 @@
+import datetime
+
+import pytest
+
+from src.Student_Wellbeing_App.core.database import connection as db_conn
+from src.Student_Wellbeing_App.core.repositories import AuditArchiveRepository as archive_module
+from src.Student_Wellbeing_App.core.repositories.AuditArchiveRepository import AuditArchiveRepository
+from src.Student_Wellbeing_App.core.repositories.AuditRepository import AuditRepository
+from src.Student_Wellbeing_App.core.repositories.RetentionRepository import RetentionRepository, _audit_cutoff
+from src.Student_Wellbeing_App.core.services.AuditService import AuditService
+
+
+def _row(log_id, ts, action="LOGIN", details="d"):
+    return {"log_id": log_id, "user_id": "EMP0001", "action": action, "details": details, "timestamp": ts}
+
+
+class TestAuditArchiveRepository:
+
+    def test_appends_accumulate_in_manifest(self, tmp_path):
+        archive = AuditArchiveRepository(tmp_path)
+        archive.append_month("2024-01", [_row(1, "2024-01-02 10:00:00"), _row(2, "2024-01-05 10:00:00")])
+        entry = archive.append_month("2024-01", [_row(9, "2024-01-31 23:59:59")])
+
+        assert entry["rows"] == 3
+        assert (entry["min_log_id"], entry["max_log_id"]) == (1, 9)
+        assert (entry["first_ts"], entry["last_ts"]) == ("2024-01-02 10:00:00", "2024-01-31 23:59:59")
+        assert [r["log_id"] for r in archive.read_month("2024-01")] == [1, 2, 9]
+        assert archive.verify() == []
+
+    def test_interrupted_append_is_cut_off(self, tmp_path):
+        archive = AuditArchiveRepository(tmp_path)
+        archive.append_month("2024-01", [_row(1, "2024-01-02 10:00:00")])
+        # bytes that never made it into the manifest
+        with open(tmp_path / "audit_log-2024-01.jsonl.gz", "ab") as f:
+            f.write(b"partial gzip member")
+        assert archive.verify() != []
+
+        archive.append_month("2024-01", [_row(2, "2024-01-03 10:00:00")])
+        assert [r["log_id"] for r in archive.read_month("2024-01")] == [1, 2]
+        assert archive.verify() == []
+
+    def test_query_applies_filters_and_cursor(self, tmp_path):
+        archive = AuditArchiveRepository(tmp_path)
+        archive.append_month("2024-01", [_row(i, f"2024-01-{i:02d} 09:00:00", details=f"item {i}") for i in range(1, 11)])
+        archive.append_month("2024-02", [_row(20 + i, f"2024-02-{i:02d} 09:00:00", action="UPDATE") for i in range(1, 6)])
+
+        assert [r["log_id"] for r in archive.query(limit=3)] == [25, 24, 23]
+        assert [r["log_id"] for r in archive.query(action="LOGIN", after=("2024-01-05 09:00:00", 5), limit=2)] == [4, 3]
+        assert [r["log_id"] for r in archive.query(text="ITEM 1", until="2024-01-02")] == [1]
+
+
+class TestAuditLogRollover:
+
+    @pytest.fixture
+    def db(self, migrated_db):
+
+        today = datetime.date.today()
+        old = [(f"U{i % 2}", "LOGIN", f"old {i}", f"2023-{1 + i % 3:02d}-10 08:00:{i:02d}") for i in range(30)]
+        recent = [("U1", "LOGIN", f"recent {i}", f"{today.isoformat()} 08:00:{i:02d}") for i in range(5)]
+        AuditRepository().log_actions(old + recent)
+        return migrated_db.parent
+
+    def _live_count(self):
+        conn = db_conn.get_db_connection()
+        n = conn.execute("SELECT COUNT(*) FROM audit_log").fetchone()[0]
+        conn.close()
+        return n
+
+    def test_closed_months_move_to_archive(self, db):
+        repo = RetentionRepository()
+        preview = repo.preview_audit_log(12)
+        assert [(p["month"], p["entries"]) for p in preview] == [("2023-01", 10), ("2023-02", 10), ("2023-03", 10)]
+
+        assert repo.archive_audit_log(12) == 30
+        assert self._live_count() == 5
+
+        archive = AuditArchiveRepository()
+        assert archive.archive_dir == db / "audit_archive"
+        assert archive.months() == ["2023-01", "2023-02", "2023-03"]
+        assert archive.verify() == []
+        # nothing left to move
+        assert repo.archive_audit_log(12) == 0
+
+    def test_rerun_after_crash_does_not_duplicate(self, db):
+        repo = RetentionRepository()
+        archive = AuditArchiveRepository()
+        # January reached the archive, but the delete never committed
+        conn = db_conn.get_db_connection()
+        rows = [dict(r) for r in conn.execute(
+            "SELECT log_id, user_id, action, details, timestamp FROM audit_log "
+            "WHERE timestamp < '2023-02-01' ORDER BY log_id")]
+        conn.close()
+        archive.append_month("2023-01", rows)
+
+        assert repo.archive_audit_log(12) == 20
+        assert archive.manifest()["2023-01"]["rows"] == 10
+        assert self._live_count() == 5
+
+    def test_archive_of_another_database_is_moved_aside(self, db):
+        # an archive left by a previous (wiped) database, covering the same
+        # month and a higher log_id than anything live
+        stale = AuditArchiveRepository(db / "audit_archive", db_id="old-database")
+        stale.append_month("2023-01", [_row(500, "2023-01-01 00:00:00", details="stale")])
+        archive = AuditArchiveRepository()
+        assert not archive.owned()
+        assert archive.months() == []
+        assert AuditService().query_logs(text="stale")["rows"] == []
+
+        assert RetentionRepository().archive_audit_log(12) == 30
+        assert [r["log_id"] for r in archive.read_month("2023-01")] == list(range(1, 31, 3))
+        assert archive.verify() == []
+        rotated = [p for p in db.iterdir() if p.name.startswith("audit_archive-")]
+        assert len(rotated) == 1 and (rotated[0] / "audit_log-2023-01.jsonl.gz").exists()
+
+    def test_rows_below_the_archived_max_are_still_archived(self, db):
+        archive = AuditArchiveRepository()
+        # the file has a later id for January than some rows still live
+        archive.append_month("2023-01", [_row(999, "2023-01-31 00:00:00")])
+
+        assert RetentionRepository().archive_audit_log(12) == 30
+        assert archive.manifest()["2023-01"]["rows"] == 11
+        assert self._live_count() == 5
+
+    def test_query_reuses_decoded_months(self, db, monkeypatch):
+        RetentionRepository().archive_audit_log(12)
+        service = AuditService()
+        service.query_logs(limit=40)
+        decoded = []
+        real = archive_module.gzip.decompress
+        monkeypatch.setattr(archive_module.gzip, "decompress", lambda data: decoded.append(1) or real(data))
+
+        assert len(service.query_logs(limit=40)["rows"]) == 35
+        assert decoded == []
+
+    def test_query_logs_spans_live_and_archive(self, db):
+        RetentionRepository().archive_audit_log(12)
+        service = AuditService()
+
+        seen, cursor = [], None
+        while True:
+            page = service.query_logs(limit=4, after_cursor=cursor)
+            seen.extend(page["rows"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        keys = [(str(r["timestamp"]), r["log_id"]) for r in seen]
+        assert len(keys) == 35
+        assert keys == sorted(keys, reverse=True)
+
+        page = service.query_logs(user_id="U0", since=datetime.date(2023, 1, 1), until=datetime.date(2023, 1, 31))
+        assert len(page["rows"]) == 5
+
+
+def test_cutoff_is_a_month_start():
+    cutoff = datetime.date.fromisoformat(_audit_cutoff(0))
+    assert cutoff.day == 1
+    assert cutoff <= datetime.date.today()
+    assert _audit_cutoff(12) < _audit_cutoff(0)
@@ -14,7 +14,7 @@ from src.Student_Wellbeing_App.core.repositories.AuditRepository import AuditRep
 class TestAuditRepositoryLog:
     """Test suite for logging audit records to database."""
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AuditRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AuditRepository.get_db_pool')
     def test_log_action_success(self, mock_get_db):
         """Verify log_action saves correct data to the database."""
         # Setup Mock
@@ -54,7 +54,7 @@ class TestAuditRepositoryLog:
         # Verify timestamp was generated and is a datetime object
         assert isinstance(params[3], datetime)
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AuditRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AuditRepository.get_db_pool')
     def test_log_action_closes_connection(self, mock_get_db):
         """Verify database connection closes after logging."""
         mock_conn = Mock()
@@ -66,7 +66,7 @@ class TestAuditRepositoryLog:
         # Expect close called twice: once for __init__, once for log_action
         assert mock_conn.close.call_count == 2
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AuditRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AuditRepository.get_db_pool')
     def test_log_action_with_special_chars(self, mock_get_db):
         """Verify logging handles special characters in details."""
         mock_conn = Mock()
@@ -83,10 +83,40 @@ class TestAuditRepositoryLog:
         assert params[2] == special_details
 
 
+class TestAuditRepositoryBatch:
+    """Test suite for batched audit writes."""
+
+    @patch('src.Student_Wellbeing_App.core.repositories.AuditRepository.get_db_pool')
+    def test_log_actions_uses_one_executemany(self, mock_get_db):
+        """Verify a batch is written with one executemany and one commit."""
+        mock_conn = Mock()
+        mock_get_db.return_value = mock_conn
+        repo = AuditRepository()
+
+        entries = [("U1", "A", "one", datetime.now()), ("U2", "B", "two", datetime.now())]
+        assert repo.log_actions(entries) == 2
+
+        sql, params = mock_conn.executemany.call_args[0]
+        assert "INSERT INTO audit_log" in sql
+        assert params == entries
+        # one commit for __init__, one for the batch
+        assert mock_conn.commit.call_count == 2
+
+    @patch('src.Student_Wellbeing_App.core.repositories.AuditRepository.get_db_pool')
+    def test_log_actions_empty_batch_skips_db(self, mock_get_db):
+        """Verify an empty batch does not check out a connection."""
+        mock_get_db.return_value = Mock()
+        repo = AuditRepository()
+        mock_get_db.reset_mock()
+
+        assert repo.log_actions([]) == 0
+        mock_get_db.assert_not_called()
+
+
 class TestAuditRepositoryRetrieval:
     """Test suite for retrieving audit logs."""
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AuditRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AuditRepository.get_db_pool')
     def test_get_recent_logs_returns_rows(self, mock_get_db):
         """Verify get_recent_logs returns data from cursor."""
         mock_conn = Mock()
@@ -114,7 +144,7 @@ class TestAuditRepositoryRetrieval:
         )
         mock_conn.close.assert_called()
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AuditRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AuditRepository.get_db_pool')
     def test_get_recent_logs_default_limit(self, mock_get_db):
         """Verify get_recent_logs uses default limit of 50."""
         mock_conn = Mock()
@@ -132,7 +162,7 @@ class TestAuditRepositoryRetrieval:
 class TestAuditRepositoryInitialization:
     """Test suite for Repository initialization logic."""
 
-    @patch('src.Student_Wellbeing_App.core.repositories.AuditRepository.get_db_connection')
+    @patch('src.Student_Wellbeing_App.core.repositories.AuditRepository.get_db_pool')
     def test_init_creates_table(self, mock_get_db):
         """Verify table creation logic runs on initialization."""
         mock_conn = Mock()
@@ -152,3 +182,44 @@ class TestAuditRepositoryInitialization:
         assert create_table_called
         assert mock_conn.commit.called
         assert mock_conn.close.called
+
+
+class TestAuditRepositoryQuery:
+    """Keyset pagination and filters against a migrated temp database."""
+
+    @pytest.fixture
+    def repo(self, migrated_db):
+        repo = AuditRepository()
+        # three entries share each timestamp, so paging must break ties on log_id
+        repo.log_actions([
+            (f"U{i % 3}", "LOGIN" if i % 2 else "UPDATE", f"entry {i} 100%_done" if i == 7 else f"entry {i}",
+             f"2025-01-{1 + i // 3:02d} 09:00:00")
+            for i in range(30)
+        ])
+        return repo
+
+    def _all_pages(self, repo, limit, **filters):
+        seen, after = [], None
+        while True:
+            rows = repo.query_logs(after=after, limit=limit, **filters)
+            seen.extend(rows)
+            if len(rows) < limit:
+                return seen
+            after = (rows[-1]["timestamp"], rows[-1]["log_id"])
+
+    def test_pages_cover_every_row_once_newest_first(self, repo):
+        rows = self._all_pages(repo, limit=4)
+        keys = [(r["timestamp"], r["log_id"]) for r in rows]
+        assert len(keys) == 30
+        assert keys == sorted(keys, reverse=True)
+
+    def test_filters_combine(self, repo):
+        rows = self._all_pages(repo, limit=2, user_id="U1", action="LOGIN",
+                               since="2025-01-02", until="2025-01-08")
+        expected = [i for i in range(30) if i % 3 == 1 and i % 2 and 3 <= i < 21]
+        assert sorted(int(r["details"].split()[1]) for r in rows) == expected
+
+    def test_text_filter_treats_wildcards_literally(self, repo):
+        rows = repo.query_logs(text="100%_")
+        assert [r["details"] for r in rows] == ["entry 7 100%_done"]
+        assert repo.query_logs(text="entry 1") != []
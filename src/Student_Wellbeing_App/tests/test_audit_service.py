@@ -1,5 +1,8 @@
+from datetime import date, datetime
 from unittest.mock import MagicMock
 
+import pytest
+
 from src.Student_Wellbeing_App.core.services.AuditService import AuditService
 
 
@@ -30,3 +33,55 @@ def test_get_logs_passes_through_to_repo():
     logs = service.get_logs()
     assert logs == ["log1"]
     repo.get_recent_logs.assert_called_once()
+
+
+def _rows(n):
+    return [{"log_id": 100 - i, "timestamp": f"2025-01-01 09:00:{i:02d}"} for i in range(n)]
+
+
+def test_query_logs_returns_cursor_when_more_rows_exist():
+    repo = MagicMock()
+    repo.query_logs.return_value = _rows(3)
+    service = AuditService()
+    service.repo = repo
+
+    page = service.query_logs(limit=2)
+    assert len(page["rows"]) == 2
+    assert page["next_cursor"] == ("2025-01-01 09:00:01", 99)
+    assert repo.query_logs.call_args.kwargs["limit"] == 3
+
+
+def test_query_logs_last_page_has_no_cursor():
+    repo = MagicMock()
+    repo.query_logs.return_value = _rows(1)
+    service = AuditService()
+    service.repo = repo
+
+    assert service.query_logs(limit=2)["next_cursor"] is None
+
+
+def test_query_logs_normalises_filters():
+    repo = MagicMock()
+    repo.query_logs.return_value = []
+    service = AuditService()
+    service.repo = repo
+
+    service.query_logs(user_id="", action="LOGIN", since=date(2025, 1, 1), until=date(2025, 1, 31),
+                       after_cursor=["2025-01-02 10:00:00", 5])
+    kwargs = repo.query_logs.call_args.kwargs
+    assert kwargs["user_id"] is None
+    assert kwargs["action"] == "LOGIN"
+    assert kwargs["since"] == "2025-01-01"
+    # a plain date includes the whole day
+    assert kwargs["until"] == "2025-02-01"
+    assert kwargs["after"] == ("2025-01-02 10:00:00", 5)
+
+    service.query_logs(until=datetime(2025, 1, 31, 12, 30))
+    assert repo.query_logs.call_args.kwargs["until"] == "2025-01-31 12:30:00"
+
+
+def test_query_logs_rejects_bad_limit():
+    service = AuditService()
+    service.repo = MagicMock()
+    with pytest.raises(ValueError):
+        service.query_logs(limit=0)
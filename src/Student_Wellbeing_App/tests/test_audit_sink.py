@@ -0,0 +1,135 @@
+import threading
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.Student_Wellbeing_App.core.services import AuditSink as sink_mod
+from src.Student_Wellbeing_App.core.services.AuditService import AuditService
+from src.Student_Wellbeing_App.core.services.AuditSink import AuditSink
+
+
+def _repo():
+    repo = MagicMock()
+    repo.log_actions.side_effect = lambda entries: len(entries)
+    return repo
+
+
+def _written(repo):
+    return [entry for call in repo.log_actions.call_args_list for entry in call.args[0]]
+
+
+def test_synchronous_mode_writes_before_returning():
+    repo = _repo()
+    sink = AuditSink(repo=repo, synchronous=True)
+
+    assert sink.submit("EMP0001", "ACTION", "details") is True
+    (entry,) = _written(repo)
+    assert entry[:3] == ("EMP0001", "ACTION", "details")
+    assert isinstance(entry[3], datetime)
+    assert sink.stats()["written"] == 1
+
+
+def test_entries_are_written_in_batches():
+    repo = _repo()
+    sink = AuditSink(repo=repo, batch_size=10, flush_interval=60)
+    try:
+        for i in range(25):
+            sink.submit("EMP0001", "ACTION", str(i))
+        assert sink.flush(timeout=5)
+
+        assert [e[2] for e in _written(repo)] == [str(i) for i in range(25)]
+        stats = sink.stats()
+        assert stats["written"] == 25 and stats["queue_depth"] == 0
+        # 2 full batches, the remainder goes out on flush
+        assert stats["batches"] == 3
+    finally:
+        sink.close()
+
+
+def test_close_drains_the_queue():
+    repo = _repo()
+    sink = AuditSink(repo=repo, batch_size=100, flush_interval=60)
+    for i in range(5):
+        sink.submit("EMP0001", "ACTION", str(i))
+    sink.close()
+
+    assert len(_written(repo)) == 5
+    # submits after close still reach the database
+    sink.submit("EMP0001", "ACTION", "late")
+    assert _written(repo)[-1][2] == "late"
+
+
+def test_full_queue_drops_and_counts():
+    release = threading.Event()
+    repo = MagicMock()
+    repo.log_actions.side_effect = lambda entries: release.wait(5) and len(entries)
+    sink = AuditSink(repo=repo, max_queue=2, batch_size=1, flush_interval=0.01, put_timeout=0.01)
+    try:
+        sink.submit("U", "A", "blocks the writer")
+        # wait until the writer has taken the first entry
+        for _ in range(500):
+            if sink.stats()["in_flight"]:
+                break
+            threading.Event().wait(0.01)
+        results = [sink.submit("U", "A", str(i)) for i in range(4)]
+
+        assert results == [True, True, False, False]
+        assert sink.stats()["dropped"] == 2
+        assert sink.stats()["max_depth"] == 2
+    finally:
+        release.set()
+        sink.close()
+    assert sink.stats()["written"] == 3
+
+
+def test_failed_batch_is_retried_then_counted_as_dropped():
+    repo = MagicMock()
+    repo.log_actions.side_effect = [RuntimeError("locked"), 1, RuntimeError("x"), RuntimeError("y")]
+    sink = AuditSink(repo=repo, synchronous=True)
+
+    sink.submit("U", "A", "retried")
+    sink.submit("U", "A", "lost")
+    stats = sink.stats()
+    assert stats["written"] == 1
+    assert stats["dropped"] == 1
+    assert stats["failed_batches"] == 3
+
+
+def test_late_entries_are_counted():
+    repo = _repo()
+    sink = AuditSink(repo=repo, late_after=-1, synchronous=True)
+    sink.submit("U", "A", "d")
+    assert sink.stats()["late"] == 1
+
+
+@pytest.fixture
+def shared_sink():
+    repo = _repo()
+    sink = sink_mod.start_audit_sink(repo=repo, flush_interval=60)
+    yield sink, repo
+    sink_mod.stop_audit_sink()
+
+
+def test_audit_service_routes_through_shared_sink(shared_sink):
+    sink, repo = shared_sink
+    service = AuditService()
+    service.repo = MagicMock()
+
+    service.log("", "ACTION", "details")
+    service.repo.log_action.assert_not_called()
+
+    service.get_logs()  # flushes first so the reader sees the entry
+    assert _written(repo)[0][:3] == ("SYSTEM", "ACTION", "details")
+    service.repo.get_recent_logs.assert_called_once()
+
+
+def test_stop_returns_service_to_direct_writes(shared_sink):
+    sink_mod.stop_audit_sink()
+    assert sink_mod.get_audit_sink() is None
+    assert shared_sink[0].closed
+
+    service = AuditService()
+    service.repo = MagicMock()
+    service.log("EMP0001", "ACTION", "details")
+    service.repo.log_action.assert_called_once_with("EMP0001", "ACTION", "details")
@@ -1,9 +1,23 @@
+import hashlib
+import sqlite3
 from unittest.mock import MagicMock
 
+import pytest
+
+from src.Student_Wellbeing_App.core.database import connection as db_conn
+from src.Student_Wellbeing_App.core.models.User import User
+from src.Student_Wellbeing_App.core.models.UserRole import UserRole
+from src.Student_Wellbeing_App.core.repositories import EntityCache as entity_cache
+from src.Student_Wellbeing_App.core.repositories.StudentRepository import StudentRepository
+from src.Student_Wellbeing_App.core.repositories.UserRepository import UserRepository
+from src.Student_Wellbeing_App.core.security import PasswordHasher as hasher_mod
+from src.Student_Wellbeing_App.core.security.PasswordHasher import ScryptHasher
 from src.Student_Wellbeing_App.core.services.AuthenticationService import (
     AuthenticationService,
     AuthResult,
 )
+from src.Student_Wellbeing_App.core.services.StudentService import StudentService
+from src.Student_Wellbeing_App.core.services.UserService import UserService
 
 
 def test_authenticate_user_delegates_to_user_repo():
@@ -58,3 +72,102 @@ def test_authenticate_any_st_prefix_returns_student_authresult():
 def test_authenticate_any_unknown_prefix_returns_none():
     service = AuthenticationService(user_repo=MagicMock(), student_repo=MagicMock())
     assert service.authenticate_any("ABC123", "pw") is None
+
+
+# ---------- Login cache ----------
+
+@pytest.fixture
+def login_cache_enabled():
+    saved = dict(entity_cache._settings)
+    entity_cache.configure_entity_caches(enabled=True)
+    yield
+    entity_cache._settings.update(saved)
+    entity_cache.configure_entity_caches()
+
+
+def test_repeat_login_is_served_from_the_cache(login_cache_enabled):
+    user_repo = MagicMock()
+    user = User("EMP0001", "Ada", "L", "hash", UserRole.ADMIN)
+    user_repo.authenticate_by_id.return_value = user
+    # the stored row, as written back by the hash upgrade
+    user_repo.get_login_version.side_effect = lambda uid: (user.password_hash, "ADMIN")
+    service = AuthenticationService(user_repo=user_repo, student_repo=MagicMock())
+
+    first = service.authenticate_any("EMP0001", "pw")
+    second = service.authenticate_any(" emp0001 ", "pw")
+
+    assert second.kind == "user" and second.principal == first.principal
+    assert second.principal is not first.principal
+    user_repo.authenticate_by_id.assert_called_once_with("EMP0001", "pw")
+
+
+def test_wrong_password_is_never_served_from_the_cache(login_cache_enabled):
+    student_repo = MagicMock()
+    student_repo.authenticate_by_id.side_effect = lambda sid, pw: "STUDENT" if pw == "right" else None
+    service = AuthenticationService(user_repo=MagicMock(), student_repo=student_repo)
+
+    assert service.authenticate_any("STU0001", "right").principal == "STUDENT"
+    assert service.authenticate_any("STU0001", "wrong") is None
+    assert service.authenticate_any("STU0001", "wrong") is None
+    assert student_repo.authenticate_by_id.call_count == 3
+
+
+def test_password_and_role_changes_drop_the_cached_login(migrated_db, login_cache_enabled):
+    users = UserService()
+    students = StudentService()
+    auth = AuthenticationService()
+    uid = users.create_user("Ada", "Lovelace", "old-pw", UserRole.COURSE_DIRECTOR)
+    sid = students.register_student("Jane", "Smith", "jane@uni.ac.uk", "old-pw", 2025)
+
+    assert auth.authenticate_any(uid, "old-pw").principal.role == UserRole.COURSE_DIRECTOR
+    assert users.change_role(uid, UserRole.ADMIN)
+    assert auth.authenticate_any(uid, "old-pw").principal.role == UserRole.ADMIN
+
+    assert auth.authenticate_any(sid, "old-pw") is not None
+    assert students.change_password(sid, "new-pw")
+    assert auth.authenticate_any(sid, "old-pw") is None
+    assert auth.authenticate_any(sid, "new-pw").principal.student_id == sid
+
+    students.remove_student(sid)
+    assert auth.authenticate_any(sid, "new-pw") is None
+
+
+def test_changes_from_another_process_drop_the_cached_login(migrated_db, login_cache_enabled):
+    uid = UserService().create_user("Ada", "Lovelace", "pw", UserRole.ADMIN)
+    sid = StudentService().register_student("Jane", "Smith", "jane@uni.ac.uk", "pw", 2025)
+    auth = AuthenticationService()
+    assert auth.authenticate_any(uid, "pw") is not None
+    assert auth.authenticate_any(sid, "pw") is not None
+
+    # written behind this process's back, so nothing invalidated the cache
+    conn = sqlite3.connect(migrated_db)
+    conn.execute("UPDATE user SET role = 'WELLBEING_OFFICER' WHERE user_id = ?", (uid,))
+    conn.execute("UPDATE student SET password = ? WHERE student_id = ?", (hashlib.sha256(b"new").hexdigest(), sid))
+    conn.commit()
+    conn.close()
+
+    assert auth.authenticate_any(uid, "pw").principal.role == UserRole.WELLBEING_OFFICER
+    assert auth.authenticate_any(sid, "pw") is None
+
+
+def test_legacy_sha256_hash_is_upgraded_on_login(migrated_db, monkeypatch):
+    monkeypatch.setattr(hasher_mod, "_hasher", ScryptHasher(n=16, r=1, p=1))
+    legacy = hashlib.sha256(b"password123").hexdigest()
+    conn = db_conn.get_db_pool()
+    conn.execute("INSERT INTO user VALUES ('EMP0001', 'Ada', 'L', ?, 'ADMIN')", (legacy,))
+    conn.execute("INSERT INTO student VALUES ('STU0001', 'Jane', 'S', 'j@uni.ac.uk', ?, 2025)", (legacy,))
+    conn.commit()
+    conn.close()
+    auth = AuthenticationService()
+
+    for code in ("EMP0001", "STU0001"):
+        assert auth.authenticate_any(code, "wrong") is None
+        assert auth.authenticate_any(code, "password123") is not None
+
+    user = UserRepository().get_by_id("EMP0001")
+    student = StudentRepository().get_student_by_id("STU0001")
+    for stored in (user.password_hash, student.password):
+        assert stored.startswith("scrypt$16$1$1$")
+    assert auth.authenticate_any("EMP0001", "password123").principal.password_hash == user.password_hash
+    assert auth.authenticate_any("STU0001", "password123") is not None
+    assert auth.authenticate_any("STU0001", "wrong") is None
@@ -1,4 +1,5 @@
 import sqlite3
+import threading
 import pytest
 
 # Concise imports: Assumes pytest is run from the project root (G:\BG project)
@@ -113,7 +114,7 @@ class TestGetDbConnection:
 class TestGetDbPool:
     """
     Test suite for get_db_pool function.
-    Note: Requires get_db_pool to be defined in connection.py (usually as an alias).
+    Note: get_db_pool checks a connection out of the shared ConnectionPool.
     """
 
     def test_get_db_pool_returns_connection(self, tmp_path, monkeypatch):
@@ -147,3 +148,252 @@ class TestGetDbPool:
         assert con1 is not con2
         con1.close()
         con2.close()
+
+    def test_get_db_pool_close_returns_connection_to_pool(self, tmp_path, monkeypatch):
+        """Verify close() on a pooled connection keeps it open for the next caller."""
+        _use_temp_db(tmp_path, monkeypatch)
+        con1 = db_conn.get_db_pool()
+        con1.close()
+        con2 = db_conn.get_db_pool()
+
+        assert con2 is con1
+        assert con2.execute("SELECT 1").fetchone()[0] == 1
+        con2.close()
+
+
+class TestConnectionPool:
+    """Test suite for ConnectionPool checkout/return semantics."""
+
+    def test_pragmas_applied_once_per_connection(self, tmp_path):
+        """Verify reused connections keep their PRAGMAs and are not recreated."""
+        pool = db_conn.ConnectionPool(tmp_path / "pool.sqlite3", max_size=2)
+        for _ in range(5):
+            con = pool.acquire()
+            assert con.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+            con.close()
+
+        assert pool.stats()["created"] == 1
+        assert pool.stats()["checkouts"] == 5
+        pool.close_all()
+
+    def test_max_size_is_enforced(self, tmp_path):
+        """Verify a checkout beyond max_size times out."""
+        pool = db_conn.ConnectionPool(tmp_path / "pool.sqlite3", max_size=2)
+        con1 = pool.acquire()
+        con2 = pool.acquire()
+
+        with pytest.raises(db_conn.PoolTimeoutError):
+            pool.acquire(timeout=0.05)
+
+        con1.close()
+        con2.close()
+        assert pool.stats()["size"] == 2
+        pool.close_all()
+
+    def test_waiting_checkout_gets_released_connection(self, tmp_path):
+        """Verify a blocked caller receives a connection as soon as one is returned."""
+        pool = db_conn.ConnectionPool(tmp_path / "pool.sqlite3", max_size=1)
+        held = pool.acquire()
+        got = []
+
+        worker = threading.Thread(target=lambda: got.append(pool.acquire(timeout=2)))
+        worker.start()
+        held.close()
+        worker.join()
+
+        assert got == [held]
+        got[0].close()
+        pool.close_all()
+
+    def test_release_rolls_back_uncommitted_work(self, tmp_path):
+        """Verify uncommitted writes never leak to the next caller."""
+        pool = db_conn.ConnectionPool(tmp_path / "pool.sqlite3", max_size=1)
+        con = pool.acquire()
+        con.execute("CREATE TABLE t(id INTEGER)")
+        con.commit()
+        con.execute("INSERT INTO t VALUES (1)")
+        con.close()
+
+        con = pool.acquire()
+        assert con.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+        con.close()
+        pool.close_all()
+
+    def test_release_resets_row_factory(self, tmp_path):
+        """Verify a caller's custom row_factory is not inherited by the next one."""
+        pool = db_conn.ConnectionPool(tmp_path / "pool.sqlite3", max_size=1)
+        con = pool.acquire()
+        con.row_factory = lambda c, r: dict(zip([col[0] for col in c.description], r))
+        con.close()
+
+        con = pool.acquire()
+        assert con.row_factory is sqlite3.Row
+        con.close()
+        pool.close_all()
+
+    def test_health_check_replaces_broken_connection(self, tmp_path):
+        """Verify a dead idle connection is replaced on checkout."""
+        pool = db_conn.ConnectionPool(tmp_path / "pool.sqlite3", max_size=1, health_check_interval=0)
+        con = pool.acquire()
+        con.close()
+        sqlite3.Connection.close(con)  # simulate a handle that died while idle
+
+        fresh = pool.acquire()
+        assert fresh is not con
+        assert fresh.execute("SELECT 1").fetchone()[0] == 1
+        assert pool.stats()["health_failures"] == 1
+        fresh.close()
+        pool.close_all()
+
+    def test_concurrent_checkouts_stay_bounded(self, tmp_path):
+        """Verify many threads share a small pool without errors."""
+        pool = db_conn.ConnectionPool(tmp_path / "pool.sqlite3", max_size=3)
+        errors = []
+
+        def work():
+            try:
+                for _ in range(50):
+                    con = pool.acquire()
+                    con.execute("SELECT 1").fetchone()
+                    con.close()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stats = pool.stats()
+        assert errors == []
+        assert stats["size"] <= 3
+        assert stats["in_use"] == 0
+        pool.close_all()
+
+    def test_close_all_refuses_new_checkouts(self, tmp_path):
+        """Verify a closed pool raises instead of handing out connections."""
+        pool = db_conn.ConnectionPool(tmp_path / "pool.sqlite3", max_size=1)
+        pool.close_all()
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            pool.acquire()
+
+    def test_get_pool_is_shared_per_database(self, tmp_path, monkeypatch):
+        """Verify get_pool hands out one pool per database file."""
+        _use_temp_db(tmp_path, monkeypatch)
+        assert db_conn.get_pool() is db_conn.get_pool()
+        assert db_conn.get_pool() is not db_conn.get_pool(tmp_path / "other.sqlite3")
+
+
+class TestStorageProfiles:
+    """Test suite for WAL mode and the named storage profiles."""
+
+    def test_default_profile_enables_wal(self, tmp_path, monkeypatch):
+        """Verify connections run in WAL mode with the balanced settings."""
+        _use_temp_db(tmp_path, monkeypatch)
+        con = db_conn.get_db_connection()
+        settings = db_conn.get_storage_settings(con)
+
+        assert settings["profile"] == "balanced"
+        assert settings["journal_mode"] == "WAL"
+        assert settings["synchronous"] == "NORMAL"
+        assert settings["temp_store"] == "MEMORY"
+        assert settings["busy_timeout"] == 5000
+        assert settings["foreign_keys"] is True
+        con.close()
+
+    def test_apply_named_profile(self, tmp_path):
+        """Verify a named profile's PRAGMAs are applied to a connection."""
+        con = sqlite3.connect(tmp_path / "profile.sqlite3")
+        db_conn.apply_storage_profile(con, "durable")
+        settings = db_conn.get_storage_settings(con)
+
+        assert settings["synchronous"] == "FULL"
+        assert settings["cache_size"] == -8000
+        assert settings["mmap_size"] == 0
+        con.close()
+
+    def test_unknown_profile_raises(self, tmp_path):
+        """Verify a typo in the profile name fails loudly."""
+        con = sqlite3.connect(tmp_path / "profile.sqlite3")
+        with pytest.raises(ValueError):
+            db_conn.apply_storage_profile(con, "turbo")
+        with pytest.raises(ValueError):
+            db_conn.set_storage_profile("turbo")
+        con.close()
+
+    def test_set_storage_profile_recycles_pool(self, tmp_path, monkeypatch):
+        """Verify pooled connections pick up a newly selected profile."""
+        _use_temp_db(tmp_path, monkeypatch)
+        try:
+            db_conn.set_storage_profile("bulk-load")
+            settings = db_conn.get_storage_settings()
+            assert settings["profile"] == "bulk-load"
+            assert settings["synchronous"] == "OFF"
+        finally:
+            db_conn.set_storage_profile(db_conn.DEFAULT_STORAGE_PROFILE)
+
+    def test_writer_commits_while_reader_holds_snapshot(self, tmp_path, monkeypatch):
+        """Verify WAL lets a writer commit while a read transaction is open."""
+        _use_temp_db(tmp_path, monkeypatch)
+        setup = db_conn.get_db_connection()
+        setup.execute("CREATE TABLE t(id INTEGER)")
+        setup.execute("INSERT INTO t VALUES (1)")
+        setup.commit()
+        setup.close()
+
+        reader = db_conn.get_db_connection()
+        reader.execute("BEGIN")
+        assert reader.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 1
+
+        writer = db_conn.get_db_connection()
+        writer.execute("PRAGMA busy_timeout = 100")
+        writer.execute("INSERT INTO t VALUES (2)")
+        writer.commit()  # would raise "database is locked" with a rollback journal
+
+        # reader still sees its snapshot until it ends the transaction
+        assert reader.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 1
+        reader.rollback()
+        assert reader.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 2
+        reader.close()
+        writer.close()
+
+    def test_concurrent_readers_and_writer(self, tmp_path, monkeypatch):
+        """Verify readers and a writer on the pool never hit 'database is locked'."""
+        _use_temp_db(tmp_path, monkeypatch)
+        con = db_conn.get_db_pool()
+        con.execute("CREATE TABLE t(id INTEGER)")
+        con.commit()
+        con.close()
+        errors = []
+
+        def writer():
+            try:
+                for i in range(100):
+                    c = db_conn.get_db_pool()
+                    c.execute("INSERT INTO t VALUES (?)", (i,))
+                    c.commit()
+                    c.close()
+            except Exception as e:
+                errors.append(e)
+
+        def reader():
+            try:
+                for _ in range(100):
+                    c = db_conn.get_db_pool()
+                    c.execute("SELECT COUNT(*) FROM t").fetchone()
+                    c.close()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        con = db_conn.get_db_pool()
+        assert con.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 100
+        con.close()
@@ -1,7 +1,11 @@
+import io
 from datetime import date
 from types import SimpleNamespace
 from unittest.mock import MagicMock
 
+import pandas as pd
+import pytest
+
 from src.Student_Wellbeing_App.core.services.DashboardService import DashboardService
 from src.Student_Wellbeing_App.core.models.AttendanceStatus import AttendanceStatus
 
@@ -62,6 +66,18 @@ def test_delete_grade_entry_deletes_and_logs():
     service.audit.log.assert_called_once()
 
 
+def test_admin_stats_counts_in_sql():
+    service = DashboardService()
+    service.student_repo = MagicMock()
+    service.alert_repo = MagicMock()
+    service.student_repo.count.return_value = 120
+    service.alert_repo.count_active.return_value = 7
+
+    assert service.get_admin_stats() == {"total_students": 120, "active_alerts": 7}
+    service.student_repo.list_all.assert_not_called()
+    service.alert_repo.list_active.assert_not_called()
+
+
 def test_calculate_attendance_rate_handles_empty_records_as_100():
     service = DashboardService()
     service.attendance_repo = MagicMock()
@@ -93,3 +109,48 @@ def test_get_module_stats_returns_zeroes_when_no_records():
     assert stats["avg_attendance"] == 0.0
     assert stats["total_sessions"] == 0
     assert stats["absent_count"] == 0
+
+
+def test_import_grades_validates_and_writes_once():
+    service = DashboardService()
+    service.student_repo = MagicMock()
+    service.submission_repo = MagicMock()
+    service.audit = MagicMock()
+    service.student_repo.find_existing_ids.return_value = {"STU0001", "STU0002", "STU0003"}
+    service.submission_repo.upsert_grades.return_value = 1
+
+    rows = pd.DataFrame({
+        "student_id": ["STU0001", "STU0002", "STU0003", "STU9999", "", "STU0001"],
+        "mark": [55, "abc", 101, 70, 80, 65.5],
+    })
+    result = service.import_grades(7, rows, performed_by="EMP0001")
+
+    service.submission_repo.upsert_grades.assert_called_once_with(7, [("STU0001", 65.5)])
+    assert result["total"] == 6
+    assert result["imported"] == 1
+    reasons = {r["row"]: r["reason"] for r in result["rejected"]}
+    assert reasons == {
+        1: "superseded by a later row",
+        2: "mark is not a number",
+        3: "mark out of range 0-100",
+        4: "unknown student_id",
+        5: "missing student_id",
+    }
+    service.audit.log.assert_called_once()
+    assert service.audit.log.call_args[0][1] == "BULK_IMPORT_GRADES"
+
+
+def test_import_grades_reads_csv_and_requires_columns():
+    service = DashboardService()
+    service.student_repo = MagicMock()
+    service.submission_repo = MagicMock()
+    service.audit = MagicMock()
+    service.student_repo.find_existing_ids.return_value = {"STU0001"}
+    service.submission_repo.upsert_grades.return_value = 1
+
+    result = service.import_grades(3, io.StringIO("Student_ID,Mark\nSTU0001,72\n"))
+    assert result["imported"] == 1
+    service.submission_repo.upsert_grades.assert_called_once_with(3, [("STU0001", 72.0)])
+
+    with pytest.raises(ValueError):
+        service.import_grades(3, pd.DataFrame({"student_id": ["STU0001"]}))
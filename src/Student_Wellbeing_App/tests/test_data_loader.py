@@ -2,6 +2,8 @@
 
 import sqlite3
 
+import numpy as np
+import pandas as pd
 import pytest
 
 from src.Student_Wellbeing_App.core.streamlit_UI import data_loader
@@ -123,6 +125,14 @@ def test_load_aggregate_wellbeing_trend_aggregates_by_week(test_db):
     assert pytest.approx(row_week1["avg_sleep"], 0.001) == 7.0
 
 
+def test_load_aggregate_wellbeing_trend_only_falls_back_for_a_missing_table(test_db):
+    # a broken aggregate table is an error, not a reason to scan the raw records
+    test_db.execute("CREATE TABLE wellbeing_weekly_agg (week_start TEXT)")
+
+    with pytest.raises(pd.errors.DatabaseError, match="stress_sum"):
+        data_loader.load_aggregate_wellbeing_trend()
+
+
 # ---------- Tests: load_course_performance_summary ----------
 
 def test_load_course_performance_summary_merges_grades_and_attendance(test_db):
@@ -360,3 +370,125 @@ def test_load_academic_data_without_module_returns_all_students(test_db):
     # Ensure both avg_mark and present_count are present and non-null
     assert not df["avg_mark"].isna().any()
     assert not df["present_count"].isna().any()
+
+
+# ---------- Tests: vectorized identify_risk ----------
+
+def _row_risk(row, t=data_loader.RISK_THRESHOLDS):
+    """Row-by-row reference for the risk rules."""
+    flags = []
+    if row['avg_stress'] >= t["high_stress"]: flags.append("High Stress")
+    if row['avg_sleep'] < t["low_sleep"] and row['avg_sleep'] > 0: flags.append("Low Sleep")
+    if row['attendance_pct'] < t["low_attendance"]: flags.append("Low Attendance")
+    if row['avg_grade'] < t["low_grade"] and row['avg_grade'] > 0: flags.append("Low Grades")
+    if flags:
+        return f"⚠️ AT RISK: {', '.join(flags)}"
+    return "Normal"
+
+
+def _risk_frame(n=2000, seed=3):
+    rng = np.random.default_rng(seed)
+    # include exact boundary values so >= / < / > 0 edges are exercised
+    return pd.DataFrame({
+        "avg_stress": rng.choice([0.0, 3.9, 4.0, 4.1, 5.0], n),
+        "avg_sleep": rng.choice([0.0, 0.1, 5.9, 6.0, 8.0], n),
+        "attendance_pct": rng.choice([0.0, 79.9, 80.0, 100.0], n),
+        "avg_grade": rng.choice([0.0, 0.1, 49.9, 50.0, 90.0], n),
+    })
+
+
+def test_identify_risk_matches_row_rules():
+    df = _risk_frame()
+    expected = df.apply(_row_risk, axis=1)
+    result = data_loader.identify_risk(df)
+    assert result.tolist() == expected.tolist()
+    assert result.dtype == expected.dtype
+
+
+def test_identify_risk_thresholds_are_configurable():
+    df = _risk_frame()
+    t = {**data_loader.RISK_THRESHOLDS, "high_stress": 3.0, "low_attendance": 90.0}
+    result = data_loader.identify_risk(df, {"high_stress": 3.0, "low_attendance": 90.0})
+    assert result.tolist() == df.apply(lambda r: _row_risk(r, t), axis=1).tolist()
+
+
+def test_identify_risk_empty_frame():
+    df = _risk_frame(n=0)
+    assert data_loader.identify_risk(df).empty
+
+
+# ---------- Tests: data-version cache ----------
+
+@pytest.fixture
+def cached_file_db(migrated_db):
+    """Migrated temp DB shared by data_loader and the pooled repositories, cache on."""
+    db_file = migrated_db
+    conn = sqlite3.connect(db_file)
+    conn.execute("INSERT INTO student VALUES ('STU0001', 'Ann', 'Lee', 'ann@uni.ac.uk', 'x', 2025)")
+    conn.execute("INSERT INTO wellbeing_record(student_id, week_start, stress_level, sleep_hours, source_type) "
+                 "VALUES ('STU0001', '2025-01-06', 2, 8.0, 'survey')")
+    conn.commit()
+    conn.close()
+    # raw inserts bypass the repository, so bring the weekly aggregate up to date
+    from src.Student_Wellbeing_App.core.repositories.WellbeingRepository import WellbeingRepository
+    WellbeingRepository().rebuild_weekly_agg()
+
+    data_loader.enable_cache()
+    yield db_file
+    data_loader.enable_cache(False)
+
+
+def test_cache_reuses_results_until_data_changes(cached_file_db):
+    from datetime import date
+    from src.Student_Wellbeing_App.core.models.WellbeingRecord import WellbeingRecord
+    from src.Student_Wellbeing_App.core.repositories.WellbeingRepository import WellbeingRepository
+
+    first = data_loader.load_aggregate_wellbeing_trend()
+    second = data_loader.load_aggregate_wellbeing_trend()
+    assert second.equals(first)
+    assert data_loader.cache_info()["hits"] == 1
+
+    # a write through the repositories (pooled connection) invalidates the entry
+    WellbeingRepository().upsert(WellbeingRecord(0, "STU0001", "2025-01-13", 5, 4.0, "survey"))
+    third = data_loader.load_aggregate_wellbeing_trend()
+    assert len(third) == 2
+    assert data_loader.cache_info()["misses"] == 2
+
+    # reads alone never invalidate
+    data_loader.load_aggregate_wellbeing_trend()
+    assert data_loader.cache_info()["hits"] == 2
+
+
+def test_cache_keys_on_arguments_and_returns_copies(cached_file_db):
+    df = data_loader.load_full_export_data()
+    df.loc[0, "Risk_Status"] = "tampered"
+
+    again = data_loader.load_full_export_data()
+    assert again.loc[0, "Risk_Status"] == "Normal"
+
+    strict = data_loader.load_full_export_data(thresholds={"low_attendance": 101.0})
+    assert "Low Attendance" in strict.loc[0, "Risk_Status"]
+    assert data_loader.cache_info()["entries"] == 2
+
+
+def test_cache_keys_on_the_database_path(cached_file_db, tmp_path, monkeypatch):
+    assert len(data_loader.load_aggregate_wellbeing_trend()) == 1
+
+    # another loader runs against a second database
+    monkeypatch.setattr(data_loader, "DB_PATH", tmp_path / "other.sqlite3")
+    data_loader.data_version_token()
+
+    # back on the first one after a write nobody observed: the new observer's
+    # data_version restarts, so the entry from before must not be reused
+    conn = sqlite3.connect(cached_file_db)
+    conn.execute("INSERT INTO wellbeing_weekly_agg VALUES ('2025-03-03', 2025, 1, 5, 5, 5, 6, 6, 6)")
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(data_loader, "DB_PATH", cached_file_db)
+    assert len(data_loader.load_aggregate_wellbeing_trend()) == 2
+
+
+def test_cache_disabled_by_default_calls_through(test_db):
+    assert data_loader.cache_info()["enabled"] is False
+    data_loader.load_aggregate_wellbeing_trend()
+    assert data_loader.cache_info()["entries"] == 0
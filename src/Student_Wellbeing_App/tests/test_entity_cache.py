@@ -0,0 +1,178 @@
+"""
+Tests for the repository entity cache: LRU/TTL behaviour on its own and
+invalidation by the repository write paths against a temp database.
+"""
+
+import pytest
+
+from src.Student_Wellbeing_App.core.models.Student import Student
+from src.Student_Wellbeing_App.core.repositories import EntityCache as entity_cache
+from src.Student_Wellbeing_App.core.repositories.EntityCache import EntityCache, NullCache, get_cache
+from src.Student_Wellbeing_App.core.repositories.ModuleRepository import ModuleRepository
+from src.Student_Wellbeing_App.core.repositories.RetentionRepository import RetentionRepository
+from src.Student_Wellbeing_App.core.repositories.StudentRepository import StudentRepository
+from src.Student_Wellbeing_App.core.database import connection as db_conn
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestEntityCache:
+
+    def test_read_through_counts_hits_and_misses(self):
+        cache = EntityCache("t", max_size=4, ttl=10)
+        calls = []
+
+        def load():
+            calls.append(1)
+            return ["CS101"]
+
+        assert cache.get_or_load("k", load) == ["CS101"]
+        assert cache.get_or_load("k", load) == ["CS101"]
+        assert len(calls) == 1
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+    def test_none_is_cached_and_values_are_copied(self):
+        cache = EntityCache("t", max_size=4, ttl=10)
+        assert cache.get_or_load("missing", lambda: None) is None
+        assert cache.get_or_load("missing", lambda: pytest.fail("loader called")) is None
+
+        first = cache.get_or_load("k", lambda: ["a"])
+        first.append("mutated")
+        assert cache.get_or_load("k", lambda: pytest.fail("loader called")) == ["a"]
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = EntityCache("t", max_size=2, ttl=10)
+        cache.get_or_load("a", lambda: 1)
+        cache.get_or_load("b", lambda: 2)
+        cache.get_or_load("a", lambda: 1)      # a is now most recent
+        cache.get_or_load("c", lambda: 3)      # evicts b
+
+        assert cache.get_or_load("a", lambda: "reloaded") == 1
+        assert cache.get_or_load("b", lambda: "reloaded") == "reloaded"
+        assert cache.stats()["evictions"] == 2
+
+    def test_entries_expire_after_ttl(self):
+        clock = FakeClock()
+        cache = EntityCache("t", max_size=4, ttl=5, clock=clock)
+        cache.get_or_load("k", lambda: "old")
+        clock.now = 4.9
+        assert cache.get_or_load("k", lambda: "new") == "old"
+        clock.now = 5.0
+        assert cache.get_or_load("k", lambda: "new") == "new"
+
+    def test_load_racing_with_invalidate_is_not_stored(self):
+        cache = EntityCache("t", max_size=4, ttl=10)
+
+        def stale_load():
+            cache.invalidate("k")   # a writer commits while we are reading
+            return "stale"
+
+        assert cache.get_or_load("k", stale_load) == "stale"
+        assert cache.get_or_load("k", lambda: "fresh") == "fresh"
+
+    def test_invalid_settings_are_rejected(self):
+        with pytest.raises(ValueError):
+            EntityCache("t", max_size=0)
+        with pytest.raises(ValueError):
+            EntityCache("t", ttl=0)
+
+
+class TestCacheRegistry:
+
+    @pytest.fixture(autouse=True)
+    def restore_settings(self):
+        saved = dict(entity_cache._settings)
+        yield
+        entity_cache._settings.update(saved)
+        entity_cache.configure_entity_caches()
+
+    def test_disabled_caches_are_null_caches(self):
+        entity_cache.configure_entity_caches(enabled=False)
+        assert isinstance(get_cache("student"), NullCache)
+        assert entity_cache.entity_cache_stats()["student"] == {"name": "student", "enabled": False}
+
+    def test_factory_and_sizes_are_pluggable(self):
+        made = []
+
+        def factory(name, max_size, ttl):
+            made.append((name, max_size, ttl))
+            return EntityCache(name, max_size=max_size, ttl=ttl)
+
+        entity_cache.configure_entity_caches(enabled=True, max_size=7, ttl=2.5, factory=factory)
+        cache = get_cache("module")
+        assert get_cache("module") is cache
+        assert made == [("module", 7, 2.5)]
+
+
+class TestRepositoryInvalidation:
+    """Cached lookups stay correct across every write path of the repositories."""
+
+    @pytest.fixture(autouse=True)
+    def database(self, migrated_db):
+        saved = dict(entity_cache._settings)
+        entity_cache.configure_entity_caches(enabled=True, ttl=60)
+        yield
+        entity_cache._settings.update(saved)
+        entity_cache.configure_entity_caches()
+
+    def test_student_lookups_hit_the_cache_until_delete(self):
+        repo = StudentRepository()
+        assert repo.get_student_by_id("STU0001") is None
+        sid = repo.save(Student("", "Jane", "Smith", "jane@uni.ac.uk", "hash", 2025))
+
+        assert repo.get_student_by_id(sid).first_name == "Jane"
+        assert repo.get_student_by_id(sid).first_name == "Jane"
+        assert get_cache("student").stats()["hits"] == 1
+
+        repo.delete(sid)
+        assert repo.get_student_by_id(sid) is None
+
+    def test_module_and_teacher_lookups_are_invalidated(self):
+        conn = db_conn.get_db_pool()
+        conn.execute("INSERT INTO user VALUES ('EMP0001', 'Ada', 'L', 'h', 'COURSE_DIRECTOR')")
+        conn.commit()
+        conn.close()
+        repo = ModuleRepository()
+
+        assert repo.get_module_by_code("CS101") is None
+        repo.create_module("CS101", "Intro")
+        assert repo.get_module_by_code("CS101").title == "Intro"
+
+        assert repo.get_modules_by_teacher("EMP0001") == []
+        repo.assign_teacher("EMP0001", "CS101")
+        assert repo.get_modules_by_teacher("EMP0001") == ["CS101"]
+
+    def test_retention_rule_updates_and_deletes_are_seen(self):
+        repo = RetentionRepository()
+        assert repo.get_rule_by_id(1) is None
+        repo.init_default_rules()
+        assert repo.get_rule_by_id(1).retention_months == 12
+
+        repo.update_rule(1, 6, False)
+        rule = repo.get_rule_by_id(1)
+        assert (rule.retention_months, rule.is_active) == (6, 0)
+
+        assert repo.get_rule_by_id(4) is None
+        repo.add_rule("RESOLVED_ALERTS", 3, 1)
+        assert repo.get_rule_by_id(4).retention_months == 3
+
+        repo.delete_rule(4)
+        assert repo.get_rule_by_id(4) is None
+
+    def test_graduate_cleanup_drops_cached_students(self):
+        conn = db_conn.get_db_pool()
+        conn.execute("INSERT INTO student VALUES ('STU0001', 'Old', 'Grad', 'g@uni.ac.uk', 'h', 2000)")
+        conn.commit()
+        conn.close()
+        repo = StudentRepository()
+        assert repo.get_student_by_id("STU0001") is not None
+
+        assert RetentionRepository().cleanup_graduated_students(12) == 1
+        assert repo.get_student_by_id("STU0001") is None
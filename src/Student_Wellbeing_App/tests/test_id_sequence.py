@@ -0,0 +1,221 @@
+"""
+Tests for STU/EMP id allocation from the id_sequence table: concurrent
+saves, bulk allocation, block pre-allocation, widths and the sync with
+rows inserted under explicit ids.
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from src.Student_Wellbeing_App.core.models.Student import Student
+from src.Student_Wellbeing_App.core.models.User import User
+from src.Student_Wellbeing_App.core.models.UserRole import UserRole
+from src.Student_Wellbeing_App.core.repositories import IdSequence as id_sequence
+from src.Student_Wellbeing_App.core.repositories.IdSequence import IdSequence, IdSequenceError, allocate_ids, set_id_width
+from src.Student_Wellbeing_App.core.repositories.StudentRepository import StudentRepository
+from src.Student_Wellbeing_App.core.repositories.UserRepository import UserRepository
+from src.Student_Wellbeing_App.core.security import PasswordHasher
+from src.Student_Wellbeing_App.core.services.StudentService import StudentService
+from src.Student_Wellbeing_App.core.database import connection as db_conn
+from src.Student_Wellbeing_App.core.database import migrations
+
+
+@pytest.fixture
+def db_file(migrated_db):
+    yield migrated_db
+    id_sequence.configure_id_sequences(block_size=1)
+
+
+def _student(i: int = 1) -> Student:
+    return Student("", f"First{i}", f"Last{i}", f"s{i}@uni.ac.uk", "hash", 2025)
+
+
+def _sequence(db_file, name):
+    con = sqlite3.connect(db_file)
+    row = con.execute("SELECT last_value, width FROM id_sequence WHERE name = ?", (name,)).fetchone()
+    con.close()
+    return row
+
+
+class TestAllocation:
+
+    def test_first_ids_and_separate_sequences(self, db_file):
+        assert StudentRepository().save(_student()) == "STU0001"
+        assert UserRepository().create(User("", "Ada", "L", "h", UserRole.ADMIN)) == "EMP0001"
+        assert StudentRepository().save(_student(2)) == "STU0002"
+
+    def test_explicit_inserts_move_the_sequence(self, db_file):
+        con = sqlite3.connect(db_file)
+        con.execute("INSERT INTO student VALUES ('STU0041', 'Seed', 'Ed', 's@uni.ac.uk', 'h', 2025)")
+        con.commit()
+        con.close()
+
+        assert StudentRepository().save(_student()) == "STU0042"
+
+    def test_migration_syncs_existing_ids(self, tmp_path):
+        con = sqlite3.connect(tmp_path / "old.sqlite3")
+        con.execute("CREATE TABLE student (student_id TEXT PRIMARY KEY)")
+        con.execute("CREATE TABLE user (user_id TEXT PRIMARY KEY)")
+        con.executemany("INSERT INTO student VALUES (?)", [("STU0007",), ("STU0100",), ("LEGACY",)])
+        migrations._m0008_id_sequence(con.cursor())
+
+        rows = dict((r[0], r[1:]) for r in con.execute("SELECT name, last_value, width FROM id_sequence"))
+        assert rows == {"student": (100, 4), "user": (0, migrations.DEFAULT_ID_WIDTH)}
+        con.close()
+
+    def test_rolled_back_ids_are_never_reused(self, db_file):
+        conn = db_conn.get_db_pool()
+        cur = conn.cursor()
+        assert allocate_ids(cur, "student", 3) == ["STU0001", "STU0002", "STU0003"]
+        conn.rollback()
+        assert allocate_ids(cur, "student") == ["STU0001"]   # nothing was committed
+        conn.commit()
+        conn.close()
+        assert StudentRepository().save(_student()) == "STU0002"
+
+    def test_concurrent_saves_get_distinct_ids(self, db_file):
+        repo = StudentRepository()
+        ids, errors = [], []
+        barrier = threading.Barrier(8)
+
+        def worker(n):
+            barrier.wait()
+            try:
+                for i in range(10):
+                    ids.append(repo.save(_student(n * 100 + i)))
+            except Exception as e:   # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert sorted(ids) == [f"STU{i:04d}" for i in range(1, 81)]
+
+    def test_save_many_uses_one_block(self, db_file):
+        repo = StudentRepository()
+        repo.save(_student())
+        students = [_student(i) for i in range(2, 6)]
+
+        ids = repo.save_many(students)
+
+        assert ids == ["STU0002", "STU0003", "STU0004", "STU0005"]
+        assert [s.student_id for s in students] == ids
+        assert repo.get_student_by_id("STU0005").first_name == "First5"
+        assert [r["student_id"] for r in repo.search("Last3")] == ["STU0003"]
+        assert repo.save_many([]) == []
+
+
+class TestBlocksAndWidth:
+
+    def test_block_reservation_hands_out_from_memory(self, db_file):
+        seq = IdSequence("student", block_size=10)
+        conn = db_conn.get_db_pool()
+        cur = conn.cursor()
+
+        assert seq.next_ids(cur, 2) == ["STU0001", "STU0002"]
+        assert _sequence(db_file, "student") == (10, 4)    # whole block committed up front
+        assert seq.next_ids(cur, 8)[-1] == "STU0010"
+        assert seq.next_ids(cur) == ["STU0011"]
+        assert _sequence(db_file, "student") == (20, 4)
+        conn.close()
+
+        # another allocator (another process) starts after the reserved block
+        assert allocate_ids(db_conn.get_db_pool().cursor(), "student") == ["STU0021"]
+
+    def test_repositories_use_configured_block_size(self, db_file):
+        id_sequence.configure_id_sequences(block_size=50)
+        assert StudentRepository().save(_student()) == "STU0001"
+        assert _sequence(db_file, "student") == (50, 4)
+
+    def test_unused_sequence_takes_any_width(self, db_file):
+        set_id_width("student", 6)
+        assert StudentRepository().save(_student()) == "STU000001"
+        with pytest.raises(IdSequenceError):
+            set_id_width("student", 4)   # would shorten an issued id
+
+    def test_widening_repads_ids_in_every_table(self, db_file):
+        repo = StudentRepository()
+        sid = repo.save(_student())
+        con = sqlite3.connect(db_file)
+        con.execute("INSERT INTO module VALUES ('CS101', 'Intro')")
+        con.execute("INSERT INTO enrollment (student_id, module_code) VALUES (?, 'CS101')", (sid,))
+        con.execute("INSERT INTO audit_log (user_id, action, details, timestamp) VALUES ('STU0001', 'LOGIN', '', '2025-01-01')")
+        con.commit()
+        con.close()
+
+        assert set_id_width("student", 6) == 4    # student, search index, enrollment, audit_log
+
+        con = sqlite3.connect(db_file)
+        assert con.execute("SELECT student_id FROM enrollment").fetchall() == [("STU000001",)]
+        assert con.execute("SELECT user_id FROM audit_log").fetchall() == [("STU000001",)]
+        assert con.execute("PRAGMA foreign_key_check").fetchall() == []
+        con.close()
+        assert repo.get_student_by_id("STU000001").first_name == "First1"
+        assert [r["student_id"] for r in repo.search("Last1")] == ["STU000001"]
+        assert repo.save(_student(2)) == "STU000002"
+
+    def test_allocation_past_9999_widens_automatically(self, db_file):
+        con = sqlite3.connect(db_file)
+        con.execute("INSERT INTO student VALUES ('STU9999', 'Last', 'One', 'l@uni.ac.uk', 'h', 2025)")
+        con.execute("INSERT INTO enrollment (student_id, module_code) VALUES ('STU9999', NULL)")
+        con.commit()
+        con.close()
+        repo = StudentRepository()
+
+        assert repo.save(_student()) == "STU10000"
+        assert repo.save_many([_student(2), _student(3)]) == ["STU10001", "STU10002"]
+        assert repo.get_student_by_id("STU09999").first_name == "Last"
+        assert _sequence(db_file, "student") == (10002, 5)
+        ids = [s.student_id for s in repo.list_summaries()]
+        assert ids == ["STU09999", "STU10000", "STU10001", "STU10002"]   # string order = creation order
+
+    def test_exhausted_width_raises_without_auto_widen(self, db_file, monkeypatch):
+        monkeypatch.setattr(id_sequence, "AUTO_WIDEN", False)
+        con = sqlite3.connect(db_file)
+        con.execute("UPDATE id_sequence SET last_value = 9999 WHERE name = 'user'")
+        con.commit()
+        con.close()
+
+        with pytest.raises(IdSequenceError):
+            UserRepository().create(User("", "Ada", "L", "h", UserRole.ADMIN))
+        assert _sequence(db_file, "user") == (9999, 4)   # the failed allocation rolled back
+
+
+class TestRegisterStudents:
+
+    @pytest.fixture(autouse=True)
+    def cheap_hasher(self):
+        PasswordHasher.set_hasher(PasswordHasher.make_hasher("scrypt", "n=1024"))
+        yield
+        PasswordHasher.set_hasher(None)
+
+    def test_register_students_saves_all(self, db_file):
+        service = StudentService()
+        ids = service.register_students([
+            {"first_name": "jane", "last_name": "smith", "email": "Jane@Uni.ac.uk",
+             "password": "pw", "cohort_year": 2025},
+            {"first_name": "Tom", "last_name": "Jones", "email": "tom@uni.ac.uk",
+             "password": "pw", "cohort_year": 2024},
+        ])
+
+        assert ids == ["STU0001", "STU0002"]
+        jane = service.get_student_by_id("STU0001")
+        assert (jane.first_name, jane.email) == ("Jane", "jane@uni.ac.uk")
+        assert PasswordHasher.verify_password("pw", jane.password)
+
+    def test_invalid_row_writes_nothing(self, db_file):
+        service = StudentService()
+        with pytest.raises(ValueError, match="Student #2"):
+            service.register_students([
+                {"first_name": "Jane", "last_name": "Smith", "email": "jane@uni.ac.uk",
+                 "password": "pw", "cohort_year": 2025},
+                {"first_name": "Bad", "last_name": "Email", "email": "nope",
+                 "password": "pw", "cohort_year": 2025},
+            ])
+        assert service.count_students() == 0
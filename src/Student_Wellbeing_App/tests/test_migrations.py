@@ -522,3 +522,170 @@ class TestUserTable:
             )
             con.commit()
         con.close()
+
+
+class TestSchemaVersioning:
+    """Test suite for numbered migrations and the schema_version table"""
+
+    def test_schema_version_records_every_step(self, tmp_path, monkeypatch):
+        """Verify each migration is recorded once, in order"""
+        _use_temp_db(tmp_path, monkeypatch)
+        migrations.run_migrations()
+        migrations.run_migrations()
+
+        con = db_conn.get_db_connection()
+        rows = con.execute("SELECT version, name FROM schema_version ORDER BY version").fetchall()
+        assert [(r["version"], r["name"]) for r in rows] == [(v, n) for v, n, _ in migrations.MIGRATIONS]
+        assert migrations.get_schema_version(con) == migrations.MIGRATIONS[-1][0]
+        con.close()
+
+    def test_only_pending_steps_are_applied(self, tmp_path, monkeypatch):
+        """Verify an existing database is upgraded without re-running old steps"""
+        _use_temp_db(tmp_path, monkeypatch)
+        calls = []
+        monkeypatch.setattr(migrations, "MIGRATIONS", [
+            (1, "first", lambda cur: calls.append(1)),
+        ])
+        migrations.run_migrations()
+
+        monkeypatch.setattr(migrations, "MIGRATIONS", [
+            (1, "first", lambda cur: calls.append(1)),
+            (2, "second", lambda cur: calls.append(2)),
+        ])
+        migrations.run_migrations()
+        assert calls == [1, 2]
+
+    def test_failed_step_is_rolled_back(self, tmp_path, monkeypatch):
+        """Verify a failing step leaves neither its changes nor its version behind"""
+        _use_temp_db(tmp_path, monkeypatch)
+
+        def broken(cur):
+            cur.execute("CREATE TABLE half_done (x INTEGER)")
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(migrations, "MIGRATIONS", [(1, "broken", broken)])
+        with pytest.raises(RuntimeError):
+            migrations.run_migrations()
+
+        con = db_conn.get_db_connection()
+        assert migrations.get_schema_version(con) == 0
+        assert con.execute(
+            "SELECT name FROM sqlite_master WHERE name = 'half_done'"
+        ).fetchone() is None
+        con.close()
+
+
+class TestUniqueUpsertKeys:
+    """Test suite for the dedupe + unique constraint migration"""
+
+    def test_duplicates_are_removed_before_constraints(self, tmp_path, monkeypatch):
+        """Verify an old database with duplicate rows upgrades cleanly"""
+        _use_temp_db(tmp_path, monkeypatch)
+        monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS[:2])
+        migrations.run_migrations()
+
+        con = db_conn.get_db_connection()
+        con.execute("INSERT INTO student(student_id, first_name, lastname, email, password, year) "
+                    "VALUES ('S001', 'John', 'Doe', 'john@example.com', 'pass', 1)")
+        con.execute("INSERT INTO assessment(module_code, title, due_date, weight) VALUES ('CS101', 'Exam', '2025-05-01', 1)")
+        for stress in (3, 5):
+            con.execute("INSERT INTO wellbeing_record(student_id, week_start, stress_level, sleep_hours, source_type) "
+                        "VALUES ('S001', '2025-01-06', ?, 7, 'survey')", (stress,))
+            con.execute("INSERT INTO attendance(student_id, session_date, session_id, status) "
+                        "VALUES ('S001', '2025-01-06', 'CS101', 'PRESENT')")
+            con.execute("INSERT INTO submission(student_id, assessment_id, submitted_at, status, mark) "
+                        "VALUES ('S001', 1, '2025-05-01', 'SUBMITTED', ?)", (stress * 10,))
+        con.commit()
+        con.close()
+
+        monkeypatch.undo()
+        _use_temp_db(tmp_path, monkeypatch)
+        migrations.run_migrations()
+
+        con = db_conn.get_db_connection()
+        assert con.execute("SELECT COUNT(*) FROM wellbeing_record").fetchone()[0] == 1
+        assert con.execute("SELECT COUNT(*) FROM attendance").fetchone()[0] == 1
+        assert con.execute("SELECT COUNT(*) FROM submission").fetchone()[0] == 1
+        # the oldest row of each group survives
+        assert con.execute("SELECT stress_level FROM wellbeing_record").fetchone()[0] == 3
+
+        with pytest.raises(sqlite3.IntegrityError):
+            con.execute("INSERT INTO wellbeing_record(student_id, week_start, stress_level, sleep_hours, source_type) "
+                        "VALUES ('S001', '2025-01-06', 1, 8, 'survey')")
+        con.close()
+
+
+class TestWellbeingWeeklyAgg:
+    """Test suite for the weekly wellbeing aggregate migration"""
+
+    def test_existing_records_are_backfilled(self, tmp_path, monkeypatch):
+        """Verify upgrading a populated database fills the aggregate"""
+        _use_temp_db(tmp_path, monkeypatch)
+        monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS[:3])
+        migrations.run_migrations()
+
+        con = db_conn.get_db_connection()
+        for sid, year in (("S001", 2024), ("S002", 2024), ("S003", 2025)):
+            con.execute("INSERT INTO student(student_id, first_name, lastname, email, password, year) "
+                        "VALUES (?, 'A', 'B', ?, 'pass', ?)", (sid, f"{sid}@example.com", year))
+        for sid, stress, sleep in (("S001", 2, 8.0), ("S002", 4, 6.0), ("S003", 5, 5.0)):
+            con.execute("INSERT INTO wellbeing_record(student_id, week_start, stress_level, sleep_hours, source_type) "
+                        "VALUES (?, '2025-01-06', ?, ?, 'survey')", (sid, stress, sleep))
+        con.commit()
+        con.close()
+
+        monkeypatch.undo()
+        _use_temp_db(tmp_path, monkeypatch)
+        migrations.run_migrations()
+
+        con = db_conn.get_db_connection()
+        rows = con.execute(
+            "SELECT cohort_year, record_count, stress_sum, stress_min, stress_max, sleep_sum "
+            "FROM wellbeing_weekly_agg WHERE week_start = '2025-01-06' ORDER BY cohort_year"
+        ).fetchall()
+        assert [tuple(r) for r in rows] == [(2024, 2, 6, 2, 4, 14.0), (2025, 1, 5, 5, 5, 5.0)]
+        con.close()
+
+
+class TestQueryPlans:
+    """Test suite for the hot-query EXPLAIN QUERY PLAN guard"""
+
+    def test_hot_queries_use_indexes(self, tmp_path, monkeypatch):
+        """Verify no hot query falls back to a table scan after migrating"""
+        _use_temp_db(tmp_path, monkeypatch)
+        migrations.run_migrations()
+
+        con = db_conn.get_db_connection()
+        assert migrations.check_query_plans(con) == {}
+        con.close()
+
+    def test_missing_index_is_reported(self, tmp_path, monkeypatch):
+        """Verify dropping an index makes the guard fail"""
+        _use_temp_db(tmp_path, monkeypatch)
+        migrations.run_migrations()
+
+        con = db_conn.get_db_connection()
+        con.execute("DROP INDEX idx_attendance_session")
+        failures = migrations.check_query_plans(con)
+        assert "attendance_by_session" in failures
+        assert any(line.startswith("SCAN") for line in failures["attendance_by_session"])
+        con.close()
+
+
+class TestSqliteVersion:
+    """Test suite for the minimum SQLite version check"""
+
+    def test_old_sqlite_is_refused_before_migrating(self, tmp_path, monkeypatch):
+        """Verify an old SQLite fails up front with the version it needs"""
+        db_file = _use_temp_db(tmp_path, monkeypatch)
+        monkeypatch.setattr(sqlite3, "sqlite_version", "3.31.1")
+
+        with pytest.raises(RuntimeError, match=r"SQLite 3\.31\.1 is too old.*3\.35\.0"):
+            migrations.run_migrations()
+        assert not db_file.exists()
+
+    def test_current_sqlite_passes(self):
+        """Verify the check accepts this interpreter's SQLite and newer versions"""
+        migrations.check_sqlite_version()
+        migrations.check_sqlite_version("3.35.0")
+        migrations.check_sqlite_version("3.45.1")
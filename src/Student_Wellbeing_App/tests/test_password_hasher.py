@@ -0,0 +1,94 @@
+import hashlib
+
+import pytest
+
+from src.Student_Wellbeing_App.core.security import PasswordHasher as hasher_mod
+from src.Student_Wellbeing_App.core.security.PasswordHasher import (
+    Pbkdf2Hasher,
+    ScryptHasher,
+    hash_password,
+    identify,
+    make_hasher,
+    needs_rehash,
+    set_hasher,
+    verify_password,
+)
+
+
+@pytest.fixture
+def cheap_scrypt():
+    saved = hasher_mod._hasher
+    set_hasher(ScryptHasher(n=16, r=1, p=1))
+    yield
+    set_hasher(saved)
+
+
+@pytest.mark.parametrize("hasher", [ScryptHasher(n=16, r=1, p=1), Pbkdf2Hasher(iterations=1000)])
+def test_hash_roundtrip_is_salted(hasher):
+    first, second = hasher.hash("s3cret"), hasher.hash("s3cret")
+
+    assert first != second
+    assert identify(first) == hasher.algorithm
+    assert hasher.verify("s3cret", first) and hasher.verify("s3cret", second)
+    assert not hasher.verify("S3cret", first)
+    assert not hasher.needs_rehash(first)
+
+
+def test_verify_password_reads_parameters_from_the_stored_hash(cheap_scrypt):
+    old = ScryptHasher(n=8, r=1, p=1).hash("pw")
+    pbkdf2 = Pbkdf2Hasher(iterations=500).hash("pw")
+    legacy = hashlib.sha256(b"pw").hexdigest()
+
+    for encoded in (old, pbkdf2, legacy):
+        assert verify_password("pw", encoded)
+        assert not verify_password("nope", encoded)
+        assert needs_rehash(encoded)
+    assert not needs_rehash(hash_password("pw"))
+
+
+def test_stronger_hashes_are_not_downgraded(cheap_scrypt):
+    # e.g. another process calibrated "auto" to a higher cost
+    assert not needs_rehash(ScryptHasher(n=32, r=1, p=1).hash("pw"))
+    assert not needs_rehash(ScryptHasher(n=16, r=2, p=1).hash("pw"))
+    assert not Pbkdf2Hasher(iterations=1000).needs_rehash(Pbkdf2Hasher(iterations=2000).hash("pw"))
+    assert Pbkdf2Hasher(iterations=2000).needs_rehash(Pbkdf2Hasher(iterations=1000).hash("pw"))
+
+
+def test_pbkdf2_calibration_is_rounded():
+    assert Pbkdf2Hasher.calibrate(target_ms=200).iterations % Pbkdf2Hasher.CALIBRATION_STEP == 0
+
+
+def test_unknown_or_broken_hashes_never_verify():
+    assert identify("bcrypt$whatever") is None
+    assert not verify_password("pw", "bcrypt$whatever")
+    assert not verify_password("pw", "")
+    assert not verify_password("pw", None)
+    assert not verify_password("pw", "scrypt$16$1$1$not-base64$")
+    salt = "AAAAAAAAAAAAAAAAAAAAAA=="
+    assert not verify_password("pw", f"scrypt$1000$1$1${salt}${salt}")   # n not a power of two
+    assert not verify_password("pw", f"scrypt$16$0$1${salt}${salt}")
+
+
+def test_make_hasher_parses_cost_settings():
+    assert repr(make_hasher("scrypt", "n=32, r=2")) == "ScryptHasher(n=32, r=2, p=1)"
+    assert repr(make_hasher("pbkdf2", "iterations=1234")) == "Pbkdf2Hasher(iterations=1234)"
+    with pytest.raises(ValueError):
+        make_hasher("md5")
+    with pytest.raises(ValueError):
+        make_hasher("scrypt", "n=1000")   # not a power of two
+
+
+def test_calibration_stays_within_bounds():
+    assert ScryptHasher.calibrate(target_ms=0.001).n == 2 ** 12
+    assert Pbkdf2Hasher.calibrate(target_ms=0.001).iterations == Pbkdf2Hasher.MIN_ITERATIONS
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_hash_passwords_keeps_order(cheap_scrypt, monkeypatch, processes):
+    monkeypatch.setattr(hasher_mod, "MIN_PROCESS_BATCH", 2)
+    passwords = [f"pw{i}" for i in range(6)]
+
+    hashes = hasher_mod.hash_passwords(passwords, processes=processes)
+
+    assert [verify_password(pw, h) for pw, h in zip(passwords, hashes)] == [True] * 6
+    assert not needs_rehash(hashes[0])
@@ -0,0 +1,117 @@
+import io
+import random
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from src.Student_Wellbeing_App.core.streamlit_UI import data_loader
+from src.Student_Wellbeing_App.core.streamlit_UI import report_export
+
+
+@pytest.fixture
+def export_db(migrated_db):
+    """Migrated temp DB with students spread over every risk combination."""
+    db_file = migrated_db
+    rnd = random.Random(11)
+    conn = sqlite3.connect(db_file)
+    conn.execute("INSERT INTO module VALUES ('CS101', 'Intro')")
+    conn.execute("INSERT INTO assessment (module_code, title, due_date, weight) VALUES ('CS101', 'Exam', '2025-05-01', 100)")
+    for i in range(1, 301):
+        sid = f"STU{i:04d}"
+        conn.execute("INSERT INTO student VALUES (?, 'F', 'L', ?, 'x', 2025)", (sid, f"{sid}@uni.ac.uk"))
+        if i % 7:  # some students have no grades, attendance or wellbeing at all
+            conn.execute("INSERT INTO submission (student_id, assessment_id, submitted_at, status, mark) "
+                         "VALUES (?, 1, '2025-05-01', 'SUBMITTED', ?)", (sid, rnd.randint(20, 95)))
+            conn.executemany(
+                "INSERT INTO attendance (student_id, session_date, session_id, status) VALUES (?, ?, 'CS101', ?)",
+                [(sid, f"2025-01-{d:02d}", rnd.choice(["PRESENT", "PRESENT", "ABSENT"])) for d in range(1, 6)],
+            )
+            conn.execute("INSERT INTO wellbeing_record (student_id, week_start, stress_level, sleep_hours, source_type) "
+                         "VALUES (?, '2025-01-06', ?, ?, 'survey')", (sid, rnd.randint(1, 5), round(rnd.uniform(4, 9), 1)))
+    conn.commit()
+    conn.close()
+    return db_file
+
+
+def _full_report():
+    return data_loader.load_full_export_data().sort_values("student_id").reset_index(drop=True)
+
+
+def test_chunks_match_full_export(export_db):
+    chunks = list(data_loader.iter_export_chunks(chunk_size=64))
+    assert [len(c) for c in chunks] == [64, 64, 64, 64, 44]
+    streamed = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(streamed, _full_report())
+
+
+def test_chunks_pass_thresholds(export_db):
+    strict = {"high_stress": 1.0, "low_sleep": 9.0, "low_attendance": 101.0, "low_grade": 101.0}
+    streamed = pd.concat(data_loader.iter_export_chunks(chunk_size=100, thresholds=strict), ignore_index=True)
+    expected = data_loader.load_full_export_data(strict).sort_values("student_id").reset_index(drop=True)
+    assert streamed["Risk_Status"].tolist() == expected["Risk_Status"].tolist()
+    assert (streamed["Risk_Status"] != data_loader.load_full_export_data().sort_values("student_id")["Risk_Status"].values).any()
+
+
+def test_csv_export_matches_dataframe_csv(export_db):
+    fh, rows = report_export.export_report("csv", chunk_size=50)
+    with fh:
+        data = fh.read()
+    assert rows == 300
+    assert data == _full_report().to_csv(index=False).encode("utf-8")
+    assert b"".join(report_export.iter_csv_bytes(chunk_size=70)) == data
+
+
+def test_csv_export_of_empty_database_has_header(migrated_db):
+    buf = io.BytesIO()
+    assert report_export.write_csv(buf) == 0
+    assert buf.getvalue().decode("utf-8").strip() == ",".join(data_loader.EXPORT_COLUMNS)
+
+
+@pytest.fixture
+def sparse_first_chunk_db(migrated_db):
+    """The first students have no grades, wellbeing records or emails; later ones do."""
+    conn = sqlite3.connect(migrated_db)
+    conn.execute("INSERT INTO module VALUES ('CS101', 'Intro')")
+    conn.execute("INSERT INTO assessment (module_code, title, due_date, weight) VALUES ('CS101', 'Exam', '2025-05-01', 100)")
+    for i in range(1, 7):
+        sid = f"STU{i:04d}"
+        conn.execute("INSERT INTO student VALUES (?, 'F', 'L', ?, 'x', 2025)", (sid, None if i <= 4 else f"{sid}@uni.ac.uk"))
+        if i > 4:
+            conn.execute("INSERT INTO submission (student_id, assessment_id, submitted_at, status, mark) "
+                         "VALUES (?, 1, '2025-05-01', 'SUBMITTED', 62.5)", (sid,))
+            conn.execute("INSERT INTO wellbeing_record (student_id, week_start, stress_level, sleep_hours, source_type) "
+                         "VALUES (?, '2025-01-06', 3, 7.5, 'survey')", (sid,))
+    conn.commit()
+    conn.close()
+    return migrated_db
+
+
+def test_sparse_first_chunk_streams_the_same_csv(sparse_first_chunk_db):
+    buf = io.BytesIO()
+    assert report_export.write_csv(buf, chunk_size=4) == 6
+    assert buf.getvalue() == data_loader.load_full_export_data().to_csv(index=False).encode("utf-8")
+
+
+def test_sparse_first_chunk_parquet_export(sparse_first_chunk_db):
+    pytest.importorskip("pyarrow")
+    fh, rows = report_export.export_report("parquet", chunk_size=4)
+    with fh:
+        df = pd.read_parquet(io.BytesIO(fh.read()))
+    assert rows == 6
+    assert df["avg_sleep"].tolist() == [0.0] * 4 + [7.5, 7.5]
+    assert df["email"].isna().sum() == 4
+
+
+def test_unknown_format_is_rejected(export_db):
+    with pytest.raises(ValueError):
+        report_export.export_report("xlsx")
+
+
+def test_parquet_export_round_trips(export_db):
+    pytest.importorskip("pyarrow")
+    fh, rows = report_export.export_report("parquet", chunk_size=64)
+    with fh:
+        df = pd.read_parquet(io.BytesIO(fh.read()))
+    assert rows == 300
+    pd.testing.assert_frame_equal(df, _full_report(), check_dtype=False)
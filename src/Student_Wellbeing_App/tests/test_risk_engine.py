@@ -0,0 +1,80 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.Student_Wellbeing_App.core.database import connection as db_conn
+from src.Student_Wellbeing_App.core.services.AcademicService import AcademicService
+from src.Student_Wellbeing_App.core.services.AttendanceService import AttendanceService
+from src.Student_Wellbeing_App.core.services.RiskEngine import RiskEngine
+from src.Student_Wellbeing_App.core.services.StudentService import StudentService
+from src.Student_Wellbeing_App.core.services.SubmissionService import SubmissionService
+
+
+@pytest.fixture
+def seeded_db(migrated_db):
+    """Migrated temp database with a random mix of attendance, marks and wellbeing."""
+    rnd = random.Random(1)
+    conn = db_conn.get_db_connection()
+    conn.execute("INSERT INTO assessment(module_code, title, due_date, weight) VALUES ('CS101', 'A1', '2025-05-01', 50)")
+    conn.execute("INSERT INTO assessment(module_code, title, due_date, weight) VALUES ('CS101', 'A2', '2025-06-01', 50)")
+    for i in range(1, 41):
+        sid = f"STU{i:04d}"
+        conn.execute("INSERT INTO student VALUES (?, 'F', 'L', ?, 'x', 2025)", (sid, f"{sid}@uni.ac.uk"))
+        for d in range(rnd.randint(0, 9)):
+            status = rnd.choice(["PRESENT", "ABSENT", "LATE", "EXCUSED"])
+            conn.execute("INSERT INTO attendance(student_id, session_date, session_id, status) VALUES (?, ?, 'CS101', ?)",
+                         (sid, date(2025, 1, 1) + timedelta(days=d), status))
+        for aid in rnd.sample([1, 2], rnd.randint(0, 2)):
+            mark = rnd.choice([None, rnd.uniform(0, 100)])
+            conn.execute("INSERT INTO submission(student_id, assessment_id, submitted_at, status, mark) "
+                         "VALUES (?, ?, '2025-05-01', 'SUBMITTED', ?)", (sid, aid, mark))
+        for w in range(rnd.randint(0, 3)):
+            conn.execute("INSERT INTO wellbeing_record(student_id, week_start, stress_level, sleep_hours, source_type) "
+                         "VALUES (?, ?, ?, ?, 'survey')",
+                         (sid, date(2025, 1, 6) + timedelta(weeks=w), rnd.randint(1, 5), round(rnd.uniform(4, 9), 1)))
+    conn.commit()
+    conn.close()
+
+    return migrated_db
+
+
+def test_service_outputs_match_per_student_loops(seeded_db):
+    """The set-based path returns exactly what the old per-student loops did."""
+    students = StudentService().list_students()
+    attendance, submissions = AttendanceService(), SubmissionService()
+    service = AcademicService()
+
+    for threshold in (50.0, 75.0, 90.0):
+        expected = []
+        for s in students:
+            pct = attendance.get_attendance_percentage(s.student_id)
+            if pct < threshold:
+                expected.append((s.student_id, pct))
+        got = [(s.student_id, pct) for s, pct in service.get_low_attendance_students(students, threshold)]
+        assert got == expected
+
+    for threshold in (40.0, 50.0, 70.0):
+        expected = []
+        for s in students:
+            low = [x for x in submissions.get_submissions_for_student(s.student_id) if x.mark is not None and x.mark < threshold]
+            if low:
+                expected.append((s.student_id, len(low)))
+        got = [(s.student_id, n) for s, n in service.get_low_mark_students(students, threshold)]
+        assert got == expected
+
+
+def test_compute_flags_and_uses_one_connection(seeded_db):
+    pool = db_conn.get_pool()
+    before = pool.stats()["checkouts"]
+
+    df = RiskEngine().compute()
+
+    assert pool.stats()["checkouts"] - before == 1
+    assert len(df) == 40
+    assert df.index.is_unique
+    no_attendance = df[df["attendance_total"] == 0]
+    assert (no_attendance["attendance_pct"] == 100.0).all()
+    assert (df["high_stress"] == (df["avg_stress"] >= 4.0)).all()
+    expected_flags = df[["low_attendance", "has_low_marks", "high_stress", "low_sleep"]].sum(axis=1)
+    assert (df["risk_flags"] == expected_flags).all()
@@ -0,0 +1,124 @@
+"""
+Tests for the bulk student onboarding pipeline (StudentService.import_students
+and the ImportStudents CLI) against a temp database.
+"""
+
+import sqlite3
+import sys
+
+import pandas as pd
+import pytest
+
+from src.Student_Wellbeing_App.core.database import ImportStudents
+from src.Student_Wellbeing_App.core.security import PasswordHasher
+from src.Student_Wellbeing_App.core.services.StudentService import StudentService
+
+
+@pytest.fixture(autouse=True)
+def database(migrated_db):
+    db_file = migrated_db
+    con = sqlite3.connect(db_file)
+    con.executemany("INSERT INTO module VALUES (?, ?)", [("CS101", "Intro"), ("DS201", "Data")])
+    con.execute("INSERT INTO student VALUES ('STU0007', 'Old', 'Timer', 'taken@uni.ac.uk', 'h', 2024)")
+    con.commit()
+    con.close()
+    PasswordHasher.set_hasher(PasswordHasher.ScryptHasher(n=16, r=1, p=1))
+    yield db_file
+    PasswordHasher.set_hasher(None)
+
+
+def _intake():
+    return pd.DataFrame([
+        ["jane", "smith", "Jane@Uni.ac.uk", "pw1", "2025"],
+        ["", "NoFirst", "nofirst@uni.ac.uk", "pw", "2025"],
+        ["Bad", "Email", "not-an-email", "pw", "2025"],
+        ["Old", "Cohort", "old@uni.ac.uk", "pw", "1999"],
+        ["Half", "Year", "half@uni.ac.uk", "pw", "2025.5"],
+        ["No", "Password", "nopw@uni.ac.uk", "", "2025"],
+        ["Jane", "Again", "jane@uni.ac.uk", "pw", "2025"],
+        ["Taken", "Email", "taken@uni.ac.uk", "pw", "2025"],
+        ["tom", "jones", "tom@uni.ac.uk", "pw2", "2024"],
+    ], columns=["first_name", "lastname", "email", "password", "year"])
+
+
+def test_valid_rows_are_imported_and_bad_rows_reported(database):
+    service = StudentService()
+    result = service.import_students(_intake(), enroll_modules=["CS101", "DS201"], chunk_size=1)
+
+    assert (result["total"], result["imported"], result["enrolled"], result["error"]) == (9, 2, 4, None)
+    assert result["created"] == [
+        {"row": 1, "student_id": "STU0008", "email": "jane@uni.ac.uk"},
+        {"row": 9, "student_id": "STU0009", "email": "tom@uni.ac.uk"},
+    ]
+    assert [(r["row"], r["reason"]) for r in result["rejected"]] == [
+        (2, "missing name"),
+        (3, "invalid email"),
+        (4, "cohort_year out of range"),
+        (5, "cohort_year is not a whole number"),
+        (6, "missing password"),
+        (7, "duplicate email in file"),
+        (8, "email already registered"),
+    ]
+
+    jane = service.get_student_by_id("STU0008")
+    assert (jane.first_name, jane.lastname, jane.year) == ("Jane", "Smith", 2025)
+    assert PasswordHasher.verify_password("pw1", jane.password)
+
+    con = sqlite3.connect(database)
+    enrolled = con.execute("SELECT student_id, module_code FROM enrollment ORDER BY 1, 2").fetchall()
+    audit = con.execute("SELECT action, details FROM audit_log").fetchall()
+    con.close()
+    assert enrolled == [("STU0008", "CS101"), ("STU0008", "DS201"), ("STU0009", "CS101"), ("STU0009", "DS201")]
+    assert audit == [("BULK_IMPORT_STUDENTS", "Imported 2 students (7 rejected of 9 rows), enrolled in CS101, DS201")]
+
+
+def test_failure_part_way_returns_and_audits_the_committed_chunks(database, monkeypatch):
+    service = StudentService()
+    save_many = service.repo.save_many
+    calls = []
+
+    def failing_save_many(students, modules=()):
+        calls.append(len(students))
+        if len(calls) == 2:
+            raise sqlite3.OperationalError("disk I/O error")
+        return save_many(students, modules)
+
+    monkeypatch.setattr(service.repo, "save_many", failing_save_many)
+    result = service.import_students(_intake(), enroll_modules=["CS101"], chunk_size=1)
+
+    assert result["error"] == "OperationalError: disk I/O error"
+    assert result["created"] == [{"row": 1, "student_id": "STU0008", "email": "jane@uni.ac.uk"}]
+    assert (result["imported"], result["enrolled"], len(result["rejected"])) == (1, 1, 7)
+    assert service.count_students() == 2
+
+    con = sqlite3.connect(database)
+    audit = con.execute("SELECT details FROM audit_log WHERE action = 'BULK_IMPORT_STUDENTS'").fetchall()
+    con.close()
+    assert audit == [("Imported 1 students (7 rejected of 9 rows), enrolled in CS101; "
+                      "stopped after a failure, 1 valid rows not saved: OperationalError: disk I/O error",)]
+
+
+def test_batch_level_problems_raise(database):
+    service = StudentService()
+    with pytest.raises(ValueError, match="password"):
+        service.import_students(pd.DataFrame({"first_name": [], "last_name": [], "email": [], "cohort_year": []}))
+    with pytest.raises(ValueError, match="XX999"):
+        service.import_students(_intake(), enroll_modules=["CS101", "XX999"])
+    assert service.count_students() == 1
+
+
+def test_cli_imports_csv_and_writes_ids(database, tmp_path, monkeypatch, capsys):
+    csv_file, ids_file = tmp_path / "intake.csv", tmp_path / "ids.csv"
+    csv_file.write_text(
+        "First_Name,Last_Name,Email,Password,Cohort_Year\n"
+        "Ada,Lovelace,ada@uni.ac.uk,pw,2025\n"
+        "Bad,Row,bad,pw,2025\n"
+    )
+    monkeypatch.setattr(sys, "argv", ["ImportStudents", str(csv_file), "--enroll", "CS101", "--ids-out", str(ids_file)])
+
+    with pytest.raises(SystemExit) as exit_info:
+        ImportStudents.main()
+
+    assert exit_info.value.code == 1          # one row was rejected
+    assert "row 2 (bad): invalid email" in capsys.readouterr().out
+    assert pd.read_csv(ids_file).to_dict("records") == [{"row": 1, "student_id": "STU0008", "email": "ada@uni.ac.uk"}]
@@ -9,6 +9,7 @@ from unittest.mock import Mock, patch, ANY
 
 from src.Student_Wellbeing_App.core.models.Student import Student
 from src.Student_Wellbeing_App.core.repositories.StudentRepository import StudentRepository
+from src.Student_Wellbeing_App.core.database import connection as db_conn
 
 
 class TestStudentRepository:
@@ -20,7 +21,7 @@ class TestStudentRepository:
         Fixture to mock the database connection and cursor.
         Returns (mock_conn, mock_cursor).
         """
-        with patch('src.Student_Wellbeing_App.core.repositories.StudentRepository.get_db_connection') as mock_connect:
+        with patch('src.Student_Wellbeing_App.core.repositories.StudentRepository.get_db_pool') as mock_connect:
             mock_conn = Mock()
             mock_cursor = Mock()
             
@@ -33,8 +34,8 @@ class TestStudentRepository:
         """Verify the first student saved gets ID 'STU0001'."""
         mock_conn, mock_cursor = mock_db
         
-        # Mock ID check returning None (no existing students)
-        mock_cursor.fetchone.return_value = None
+        # Sequence update returns (last_value, prefix, width)
+        mock_cursor.fetchone.return_value = (1, "STU", 4)
         
         repo = StudentRepository()
         student = Student(
@@ -53,20 +54,27 @@ class TestStudentRepository:
         
         # Verify INSERT
         mock_cursor.execute.assert_called()
-        insert_args = [call for call in mock_cursor.execute.call_args_list if "INSERT INTO student" in call[0][0]]
+        insert_args = [call for call in mock_cursor.execute.call_args_list if "INSERT INTO student(" in call[0][0]]
         assert len(insert_args) == 1
         
         params = insert_args[0][0][1]
         assert params[0] == "STU0001"
+
+        # ID comes from the sequence table, not from scanning student
+        assert "UPDATE id_sequence" in mock_cursor.execute.call_args_list[0][0][0]
+
+        # Search index row written in the same transaction
+        index_args = [call for call in mock_cursor.execute.call_args_list if "INSERT INTO student_search" in call[0][0]]
+        assert index_args[0][0][1] == ("STU0001", "Jane Doe", "jane@example.com")
         
         mock_conn.commit.assert_called_once()
 
     def test_save_increments_id(self, mock_db):
-        """Verify ID increments correctly from existing max ID."""
+        """Verify the ID is formatted from the sequence's new last_value."""
         _, mock_cursor = mock_db
         
-        # Mock existing max ID
-        mock_cursor.fetchone.return_value = ("STU0042",)
+        # Sequence was at 42
+        mock_cursor.fetchone.return_value = (43, "STU", 4)
         
         repo = StudentRepository()
         student = Student("", "John", "Doe", "john@ex.com", "pw", 2)
@@ -176,3 +184,85 @@ class TestStudentRepository:
         result = repo.authenticate_by_id("UNKNOWN", "pass")
         
         assert result is None
+
+    def test_find_existing_ids_chunks_in_queries(self, mock_db):
+        """Verify ids are looked up with chunked IN (...) queries."""
+        mock_conn, mock_cursor = mock_db
+        mock_cursor.fetchall.side_effect = [[("STU0001",)], [("STU0600",)]]
+
+        repo = StudentRepository()
+        ids = [f"STU{i:04d}" for i in range(1, 601)] + ["STU0001"]
+        result = repo.find_existing_ids(ids)
+
+        assert result == {"STU0001", "STU0600"}
+        assert mock_cursor.execute.call_count == 2  # 500 + 100, duplicate ignored
+        sql, params = mock_cursor.execute.call_args_list[0][0]
+        assert "WHERE student_id IN (" in sql
+        assert len(params) == 500
+        mock_conn.close.assert_called_once()
+
+
+class TestStudentSearch:
+    """The student_search index against a migrated temp database."""
+
+    @pytest.fixture
+    def repo(self, migrated_db):
+        repo = StudentRepository()
+        for first, last, email in [
+            ("Jane", "Smith", "jane.smith@uni.ac.uk"),
+            ("John", "Smithers", "jsmithers@uni.ac.uk"),
+            ("Aisha", "Khan", "aisha.k@uni.ac.uk"),
+            ("Tom", "O'Neil", "tom_oneil@uni.ac.uk"),
+        ]:
+            repo.save(Student("", first, last, email, "hash", 2025))
+        return repo
+
+    @staticmethod
+    def _ids(rows):
+        return [r["student_id"] for r in rows]
+
+    def test_save_indexes_and_search_matches_substrings(self, repo):
+        assert self._ids(repo.search("smith")) == ["STU0001", "STU0002"]
+        assert self._ids(repo.search("SMITHERS")) == ["STU0002"]
+        assert self._ids(repo.search("stu0003")) == ["STU0003"]
+        assert self._ids(repo.search("k@uni")) == ["STU0003"]
+        assert self._ids(repo.search("jane smith")) == ["STU0001"]
+        assert "password" not in repo.search("smith")[0]
+
+    def test_prefix_hits_rank_first_and_limit_applies(self, repo):
+        # "ai" starts Aisha's name; it only sits mid-word elsewhere
+        assert self._ids(repo.search("ai"))[0] == "STU0003"
+        assert len(repo.search("uni", limit=2)) == 2
+
+    def test_short_and_special_terms(self, repo):
+        assert self._ids(repo.search("O'")) == ["STU0004"]
+        assert self._ids(repo.search("m_o")) == ["STU0004"]
+        assert repo.search("   ") == []
+
+    def test_fuzzy_match_only_when_nothing_matches_exactly(self, repo):
+        assert self._ids(repo.search("Smiht"))[:1] == ["STU0001"]
+        assert repo.search("Smiht", fuzzy=False) == []
+        assert repo.search("zzzzzz") == []
+
+    def test_projections_skip_the_password_column(self, repo):
+        summaries = repo.list_summaries()
+        assert [s.student_id for s in summaries] == ["STU0001", "STU0002", "STU0003", "STU0004"]
+        assert summaries[0] == ("STU0001", "Jane", "Smith", "jane.smith@uni.ac.uk", 2025)
+        assert summaries[0].full_name == "Jane Smith"
+        assert not hasattr(summaries[0], "password")
+
+        assert list(repo.iter_ids(batch_size=3)) == ["STU0001", "STU0002", "STU0003", "STU0004"]
+        assert repo.count() == 4
+
+    def test_delete_and_rebuild_keep_index_in_step(self, repo):
+        repo.delete("STU0001")
+        assert self._ids(repo.search("smith")) == ["STU0002"]
+
+        con = db_conn.get_db_connection()
+        con.execute("INSERT INTO student VALUES ('STU0100', 'Bulk', 'Loaded', 'bulk@uni.ac.uk', 'x', 2025)")
+        con.commit()
+        con.close()
+        assert repo.search("bulk") == []
+
+        assert repo.rebuild_search_index() == 4
+        assert self._ids(repo.search("bulk")) == ["STU0100"]
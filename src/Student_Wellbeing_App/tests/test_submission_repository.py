@@ -15,7 +15,8 @@ CREATE TABLE submission (
     assessment_id INTEGER NOT NULL,
     submitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     status TEXT NOT NULL,
-    mark REAL
+    mark REAL,
+    UNIQUE(student_id, assessment_id)
 );
 """
 
@@ -51,10 +52,10 @@ def mock_db_conn():
 @pytest.fixture
 def repository(mock_db_conn):
     """
-    Initializes the Repository and patches get_db_connection to return
+    Initializes the Repository and patches get_db_pool to return
     our non-closing mock connection.
     """
-    with patch("src.Student_Wellbeing_App.core.repositories.SubmissionRepository.get_db_connection", return_value=mock_db_conn):
+    with patch("src.Student_Wellbeing_App.core.repositories.SubmissionRepository.get_db_pool", return_value=mock_db_conn):
         yield SubmissionRepository()
 
 class TestSubmissionRepository:
@@ -179,3 +180,17 @@ class TestSubmissionRepository:
         assert len(records) == 1
         # Logic check: r[4] if r[4] in ... else 'SUBMITTED'
         assert records[0].status == SubmissionStatus.PRESENT
+
+    def test_upsert_grades_bulk_inserts_and_updates(self, repository, mock_db_conn):
+        """Verify: bulk import upserts every pair in a single commit."""
+        existing_id = repository.upsert_grade("StudentA", 700, 40.0)
+        mock_db_conn.commit.reset_mock()
+
+        written = repository.upsert_grades(700, [("StudentA", 75.0), ("StudentB", 82.5)])
+
+        assert written == 2
+        mock_db_conn.commit.assert_called_once()
+        results = {r["student_id"]: r for r in repository.get_by_assessment(700)}
+        assert results["StudentA"]["id"] == existing_id
+        assert results["StudentA"]["mark"] == 75.0
+        assert results["StudentB"]["mark"] == 82.5
@@ -0,0 +1,182 @@
+import threading
+import time
+
+import pytest
+
+from src.Student_Wellbeing_App.core.ui.task_runner import TaskRunner, TaskCancelled, current_task
+
+
+class FakeWidget:
+    """Stands in for a Tk widget: after() callbacks run when the test pumps them."""
+
+    def __init__(self):
+        self.pending = {}
+        self._next = 0
+
+    def after(self, ms, callback):
+        self._next += 1
+        self.pending[self._next] = callback
+        return self._next
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def pump(self, runner, timeout=5.0):
+        """Run scheduled callbacks until the runner is idle."""
+        deadline = time.monotonic() + timeout
+        while self.pending:
+            assert time.monotonic() < deadline, "tasks did not finish"
+            for after_id in list(self.pending):
+                self.pending.pop(after_id)()
+            time.sleep(0.005)
+
+
+@pytest.fixture
+def widget():
+    return FakeWidget()
+
+
+@pytest.fixture
+def runner(widget):
+    r = TaskRunner(widget, max_workers=2)
+    yield r
+    r.shutdown()
+
+
+def test_result_is_delivered_on_the_polling_thread(widget, runner):
+    worker_threads, callback_threads, results = [], [], []
+
+    def work(x):
+        worker_threads.append(threading.current_thread())
+        return x * 2
+
+    def done(value):
+        callback_threads.append(threading.current_thread())
+        results.append(value)
+
+    runner.submit("k", work, 21, on_done=done)
+    widget.pump(runner)
+
+    assert results == [42]
+    assert worker_threads[0] is not threading.current_thread()
+    assert callback_threads == [threading.current_thread()]
+    assert not runner.is_running("k")
+
+
+def test_errors_go_to_on_error(widget, runner):
+    errors = []
+
+    def boom():
+        raise ValueError("bad input")
+
+    runner.submit("k", boom, on_done=lambda _: pytest.fail("on_done called"), on_error=errors.append)
+    widget.pump(runner)
+
+    assert len(errors) == 1 and str(errors[0]) == "bad input"
+
+
+def test_errors_without_on_error_are_logged(widget, runner, caplog):
+    def boom():
+        raise ValueError("bad input")
+
+    runner.submit("k", boom, label="Loading report")
+    widget.pump(runner)
+
+    [record] = caplog.records
+    assert record.getMessage() == "Loading report failed"
+    assert str(record.exc_info[1]) == "bad input"
+
+
+def test_repeated_identical_submit_is_coalesced(widget, runner):
+    release = threading.Event()
+    calls, results = [], []
+
+    def slow(x):
+        calls.append(x)
+        release.wait(5)
+        return x
+
+    first = runner.submit("k", slow, 1, on_done=results.append)
+    second = runner.submit("k", slow, 1, on_done=results.append)
+    assert second is first
+
+    release.set()
+    widget.pump(runner)
+    assert calls == [1]
+    assert results == [1]
+
+
+def test_different_call_on_same_key_supersedes_the_old_one(widget, runner):
+    release = threading.Event()
+    results = []
+
+    def slow(x):
+        release.wait(5)
+        return x
+
+    runner.submit("k", slow, "old", on_done=results.append)
+    runner.submit("k", slow, "new", on_done=results.append)
+
+    release.set()
+    widget.pump(runner)
+    assert results == ["new"]
+
+
+def test_cancel_drops_the_result_and_stops_cooperative_work(widget, runner):
+    started, stopped = threading.Event(), threading.Event()
+    results = []
+
+    def loop():
+        task = current_task()
+        started.set()
+        try:
+            for _ in range(500):
+                task.check()
+                time.sleep(0.01)
+        except TaskCancelled:
+            stopped.set()
+            raise
+        return "finished"
+
+    runner.submit("k", loop, on_done=results.append)
+    assert started.wait(5)
+    runner.cancel("k")
+
+    assert stopped.wait(5)
+    widget.pump(runner)
+    assert results == []
+    assert runner.running() == []
+
+
+def test_progress_reaches_on_change(widget):
+    seen = []
+    step = threading.Event()
+    runner = TaskRunner(widget, on_change=lambda r: seen.append([t.progress for t in r.running()]))
+    try:
+        def work():
+            current_task().report_progress(1, 2)
+            step.wait(5)
+            return None
+
+        runner.submit("k", work)
+        deadline = time.monotonic() + 5
+        while [(1, 2)] not in seen:
+            assert time.monotonic() < deadline, "progress never reached on_change"
+            for after_id in list(widget.pending):
+                widget.pending.pop(after_id)()
+            time.sleep(0.005)
+        step.set()
+        widget.pump(runner)
+        assert seen[-1] == []
+    finally:
+        runner.shutdown()
+
+
+def test_shutdown_cancels_polling_and_refuses_new_work(widget):
+    runner = TaskRunner(widget)
+    runner.submit("k", time.sleep, 0.05)
+    assert widget.pending
+
+    runner.shutdown()
+    assert widget.pending == {}
+    assert runner.submit("k", time.sleep, 0) is None
@@ -10,6 +10,7 @@ from unittest.mock import Mock, patch
 from src.Student_Wellbeing_App.core.models.User import User
 from src.Student_Wellbeing_App.core.models.UserRole import UserRole
 from src.Student_Wellbeing_App.core.repositories.UserRepository import UserRepository
+from src.Student_Wellbeing_App.core.database import connection as db_conn
 
 
 class TestUserRepository:
@@ -18,7 +19,7 @@ class TestUserRepository:
     @pytest.fixture
     def mock_db_connection(self):
         """Fixture to mock the database connection and cursor."""
-        with patch('src.Student_Wellbeing_App.core.repositories.UserRepository.get_db_connection') as mock_conn_func:
+        with patch('src.Student_Wellbeing_App.core.repositories.UserRepository.get_db_pool') as mock_conn_func:
             mock_conn = Mock()
             mock_cursor = Mock()
             
@@ -27,35 +28,37 @@ class TestUserRepository:
             
             yield mock_conn_func, mock_conn, mock_cursor
 
-    def test_init_establishes_connection(self, mock_db_connection):
-        """Verify repository initializes with a database connection."""
-        mock_conn_func, _, _ = mock_db_connection
+    def test_query_returns_connection_to_pool(self, mock_db_connection):
+        """Verify each query checks out a pooled connection and closes (returns) it."""
+        mock_conn_func, mock_conn, mock_cursor = mock_db_connection
+        mock_cursor.fetchone.return_value = None
         
         repo = UserRepository()
+        repo.get_by_id("EMP0001")
         
-        assert repo._conn is not None
         assert mock_conn_func.called
+        mock_conn.close.assert_called_once()
 
     def test_next_emp_id_initial(self, mock_db_connection):
         """Verify the first generated ID is EMP0001 if no users exist."""
         _, _, mock_cursor = mock_db_connection
         
-        # Mock fetchone to return None (no existing IDs)
-        mock_cursor.fetchone.return_value = None
+        # Sequence update returns (last_value, prefix, width)
+        mock_cursor.fetchone.return_value = (1, "EMP", 4)
         
         repo = UserRepository()
         # Accessing private method for direct testing
         next_id = repo._next_emp_id(mock_cursor)
         
         assert next_id == "EMP0001"
-        assert "SELECT user_id" in mock_cursor.execute.call_args[0][0]
+        assert "UPDATE id_sequence" in mock_cursor.execute.call_args[0][0]
 
     def test_next_emp_id_increment(self, mock_db_connection):
         """Verify ID increments correctly (e.g., EMP0012 -> EMP0013)."""
         _, _, mock_cursor = mock_db_connection
         
-        # Mock fetchone to return the last ID
-        mock_cursor.fetchone.return_value = ("EMP0012",)
+        # Sequence was at 12
+        mock_cursor.fetchone.return_value = (13, "EMP", 4)
         
         repo = UserRepository()
         next_id = repo._next_emp_id(mock_cursor)
@@ -66,8 +69,8 @@ class TestUserRepository:
         """Verify creating a user generates ID, inserts record, and commits."""
         _, mock_conn, mock_cursor = mock_db_connection
         
-        # Mock ID generation query to return a previous ID
-        mock_cursor.fetchone.return_value = ("EMP0009",)
+        # Sequence was at 9
+        mock_cursor.fetchone.return_value = (10, "EMP", 4)
         
         repo = UserRepository()
         
@@ -264,3 +267,57 @@ class TestUserRepository:
         user = repo.authenticate_by_id("NONEXISTENT", "anyPassword")
         
         assert user is None
+
+
+class TestUserPaging:
+    """count / get_page against a migrated temp database."""
+
+    @pytest.fixture
+    def repo(self, migrated_db):
+        con = db_conn.get_db_connection()
+        users = [
+            ("EMP0001", "Alice", "Zed", "ADMIN"),
+            ("EMP0002", "Bob", "Young", "COURSE_DIRECTOR"),
+            ("EMP0003", "Carol", "Xu", "WELLBEING_OFFICER"),
+            ("EMP0004", "Alice", "Adams", "COURSE_DIRECTOR"),
+            ("EMP0005", "Dan_", "Walker", "COURSE_DIRECTOR"),
+        ]
+        con.executemany(
+            "INSERT INTO user (user_id, first_name, lastname, password_hash, role) VALUES (?, ?, ?, 'x', ?)",
+            users,
+        )
+        con.commit()
+        con.close()
+
+        return UserRepository()
+
+    def test_pages_follow_sort_order(self, repo):
+        first = repo.get_page(0, 2, sort="first_name")
+        second = repo.get_page(2, 2, sort="first_name")
+        ids = [r["user_id"] for r in first + second]
+        assert ids == ["EMP0004", "EMP0001", "EMP0002", "EMP0003"]
+        assert "password_hash" not in first[0]
+
+        by_last_desc = repo.get_page(0, 10, sort="lastname", descending=True)
+        assert [r["lastname"] for r in by_last_desc] == ["Zed", "Young", "Xu", "Walker", "Adams"]
+
+    def test_filters_are_applied_in_sql(self, repo):
+        assert repo.count() == 5
+        assert repo.count(role=UserRole.COURSE_DIRECTOR) == 3
+        assert repo.count(text="ali") == 2
+        assert [r["user_id"] for r in repo.get_page(0, 10, role=UserRole.COURSE_DIRECTOR, text="alice")] == ["EMP0004"]
+        # LIKE wildcards in the search text are literal
+        assert [r["user_id"] for r in repo.get_page(0, 10, text="_")] == ["EMP0005"]
+
+    def test_summaries_and_ids(self, repo):
+        summaries = repo.list_summaries(role=UserRole.COURSE_DIRECTOR)
+        assert [u.user_id for u in summaries] == ["EMP0004", "EMP0002", "EMP0005"]
+        assert summaries[0].role is UserRole.COURSE_DIRECTOR
+        assert "password_hash" not in summaries[0]._fields
+
+        assert len(repo.list_summaries()) == 5
+        assert list(repo.iter_ids(batch_size=2)) == ["EMP0001", "EMP0002", "EMP0003", "EMP0004", "EMP0005"]
+
+    def test_unknown_sort_column_is_rejected(self, repo):
+        with pytest.raises(ValueError):
+            repo.get_page(sort="password_hash")
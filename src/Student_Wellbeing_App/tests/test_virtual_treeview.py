@@ -0,0 +1,104 @@
+import pytest
+
+from src.Student_Wellbeing_App.core.ui.virtual_treeview import PagedRows, sync_tree
+
+
+class FakeTree:
+    """The slice of ttk.Treeview that sync_tree uses, with an operation log."""
+
+    def __init__(self):
+        self.order = []
+        self.values = {}
+        self.log = []
+
+    def get_children(self):
+        return tuple(self.order)
+
+    def delete(self, *iids):
+        for iid in iids:
+            self.order.remove(iid)
+            del self.values[iid]
+        self.log.append(("delete", iids))
+
+    def insert(self, parent, index, iid, values):
+        self.order.insert(index, iid)
+        self.values[iid] = values
+        self.log.append(("insert", iid))
+
+    def item(self, iid, values):
+        self.values[iid] = values
+        self.log.append(("item", iid))
+
+    def index(self, iid):
+        return self.order.index(iid)
+
+    def move(self, iid, parent, index):
+        self.order.remove(iid)
+        self.order.insert(index, iid)
+        self.log.append(("move", iid))
+
+
+def _source(n):
+    calls = []
+
+    def fetch(offset, limit):
+        calls.append((offset, limit))
+        return list(range(offset, min(offset + limit, n)))
+
+    return fetch, calls
+
+
+def test_window_spans_pages_and_stops_at_the_end():
+    fetch, calls = _source(25)
+    rows = PagedRows(fetch, lambda: 25, page_size=10)
+
+    assert rows.window(8, 5) == [8, 9, 10, 11, 12]
+    assert calls == [(0, 10), (10, 10)]
+    assert rows.window(20, 10) == [20, 21, 22, 23, 24]
+    assert rows.total() == 25
+
+
+def test_pages_are_cached_and_evicted_lru():
+    fetch, calls = _source(100)
+    rows = PagedRows(fetch, lambda: 100, page_size=10, max_pages=2)
+
+    rows.window(0, 5)
+    rows.window(10, 5)
+    rows.window(0, 5)          # cached, becomes most recent
+    rows.window(20, 5)         # evicts page 1
+    rows.window(0, 5)
+    rows.window(10, 5)         # fetched again
+    assert calls == [(0, 10), (10, 10), (20, 10), (10, 10)]
+
+    rows.invalidate()
+    rows.window(0, 5)
+    assert calls[-1] == (0, 10)
+
+
+def test_rejects_empty_pages():
+    with pytest.raises(ValueError):
+        PagedRows(lambda o, l: [], lambda: 0, page_size=0)
+
+
+def test_sync_tree_only_touches_changed_rows():
+    tree, known = FakeTree(), {}
+    sync_tree(tree, [("a", (1,)), ("b", (2,)), ("c", (3,))], known)
+    tree.log.clear()
+
+    ops = sync_tree(tree, [("a", (1,)), ("c", (30,)), ("d", (4,))], known)
+
+    assert tree.order == ["a", "c", "d"]
+    assert tree.values == {"a": (1,), "c": (30,), "d": (4,)}
+    assert ops == {"deleted": 1, "updated": 1, "inserted": 1, "moved": 0}
+    assert ("item", "a") not in tree.log
+
+
+def test_sync_tree_reorders_existing_rows():
+    tree, known = FakeTree(), {}
+    sync_tree(tree, [("a", (1,)), ("b", (2,)), ("c", (3,))], known)
+
+    ops = sync_tree(tree, [("c", (3,)), ("b", (2,)), ("a", (1,))], known)
+
+    assert tree.order == ["c", "b", "a"]
+    assert ops["inserted"] == ops["deleted"] == ops["updated"] == 0
+    assert ops["moved"] >= 1
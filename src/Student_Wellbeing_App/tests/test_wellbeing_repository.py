@@ -3,12 +3,14 @@ Tests for WellbeingRepository class.
 Tests persistence, updates, deletions, and retrieval of wellbeing records.
 """
 
+import random
 import pytest
-from datetime import date
+from datetime import date, timedelta
 from unittest.mock import Mock, patch, ANY
 
 from src.Student_Wellbeing_App.core.models.WellbeingRecord import WellbeingRecord
 from src.Student_Wellbeing_App.core.repositories.WellbeingRepository import WellbeingRepository
+from src.Student_Wellbeing_App.core.database import connection as db_conn
 
 
 class TestWellbeingRepository:
@@ -20,7 +22,7 @@ class TestWellbeingRepository:
         Fixture to mock the database connection and cursor.
         Returns a tuple of (mock_connection, mock_cursor).
         """
-        with patch('src.Student_Wellbeing_App.core.repositories.WellbeingRepository.get_db_connection') as mock_connect:
+        with patch('src.Student_Wellbeing_App.core.repositories.WellbeingRepository.get_db_pool') as mock_connect:
             mock_conn = Mock()
             mock_cursor = Mock()
             
@@ -30,15 +32,20 @@ class TestWellbeingRepository:
             # Setup lastrowid default
             mock_cursor.lastrowid = 1
             
-            yield mock_conn, mock_cursor
+            # Aggregate maintenance is covered by the real-DB tests below
+            with patch.object(WellbeingRepository, "_agg_remove", return_value=set()), \
+                    patch.object(WellbeingRepository, "_agg_add"), \
+                    patch.object(WellbeingRepository, "_agg_refresh"):
+                yield mock_conn, mock_cursor
 
     def test_upsert_existing_record_updates(self, mock_db):
         """
-        Verify upsert performs an UPDATE when a record exists for student+week.
+        Verify upsert is a single ON CONFLICT statement that updates the
+        existing student+week record and returns its id.
         """
         mock_conn, mock_cursor = mock_db
         
-        # Mock finding an existing record (ID = 50)
+        # RETURNING hands back the existing record (ID = 50)
         mock_cursor.fetchone.return_value = (50,)
         
         repo = WellbeingRepository()
@@ -56,33 +63,28 @@ class TestWellbeingRepository:
         # Assertions
         assert result_id == 50
         
-        # Verify SELECT check was called
-        select_call = mock_cursor.execute.call_args_list[0]
-        assert "SELECT record_id" in select_call[0][0]
-        assert select_call[0][1] == ("S123", date(2025, 1, 1))
+        # One statement for the write itself, no SELECT first
+        writes = [c[0] for c in mock_cursor.execute.call_args_list if "wellbeing_record" in c[0][0]]
+        assert len(writes) == 1
+        sql, params = writes[0]
         
-        # Verify UPDATE was called (not INSERT)
-        update_call = mock_cursor.execute.call_args_list[1]
-        sql = update_call[0][0]
-        params = update_call[0][1]
-        
-        assert "UPDATE wellbeing_record" in sql
-        assert "INSERT" not in sql
-        assert params == (4, 6.5, 50) # stress, sleep, existing_id
+        assert "INSERT INTO wellbeing_record" in sql
+        assert "ON CONFLICT(student_id, week_start) DO UPDATE" in sql
+        assert "RETURNING record_id" in sql
+        assert "SELECT" not in sql
+        assert params == ("S123", date(2025, 1, 1), 4, 6.5, "survey")
         
         mock_conn.commit.assert_called_once()
         mock_conn.close.assert_called_once()
 
     def test_upsert_new_record_inserts(self, mock_db):
         """
-        Verify upsert performs an INSERT when no record exists for student+week.
+        Verify upsert returns the id of a newly inserted record.
         """
         mock_conn, mock_cursor = mock_db
         
-        # Mock NOT finding a record
-        mock_cursor.fetchone.return_value = None
-        # Mock the new ID generated by DB
-        mock_cursor.lastrowid = 101
+        # RETURNING hands back the new ID generated by DB
+        mock_cursor.fetchone.return_value = (101,)
         
         repo = WellbeingRepository()
         record = WellbeingRecord(
@@ -99,14 +101,11 @@ class TestWellbeingRepository:
         # Assertions
         assert result_id == 101
         
-        # Verify INSERT was called
-        # Call 0 is SELECT, Call 1 is INSERT
-        insert_call = mock_cursor.execute.call_args_list[1]
-        sql = insert_call[0][0]
-        params = insert_call[0][1]
+        sql, params = mock_cursor.execute.call_args_list[-1][0]
         
         assert "INSERT INTO wellbeing_record" in sql
         assert params == ("S123", date(2025, 1, 1), 2, 8.0, "manual")
+        WellbeingRepository._agg_add.assert_called_once_with(mock_cursor, "w.record_id = ?", (101,))
         
         mock_conn.commit.assert_called_once()
 
@@ -130,35 +129,35 @@ class TestWellbeingRepository:
 
     def test_update_by_id(self, mock_db):
         """Verify direct update by ID works correctly."""
-        mock_conn, _ = mock_db
+        mock_conn, mock_cursor = mock_db
         
         repo = WellbeingRepository()
         repo.update_by_id(record_id=99, stress=5, sleep=4.5)
         
-        # update_by_id calls conn.execute directly, not cursor.execute
-        mock_conn.execute.assert_called_once()
-        call_args = mock_conn.execute.call_args
-        
-        sql = call_args[0][0]
-        params = call_args[0][1]
+        # BEGIN IMMEDIATE, then the UPDATE itself
+        sql, params = mock_cursor.execute.call_args_list[-1][0]
+        assert mock_cursor.execute.call_args_list[0][0][0] == "BEGIN IMMEDIATE"
         
         assert "UPDATE wellbeing_record" in sql
         assert params == (5, 4.5, 99)
+        WellbeingRepository._agg_remove.assert_called_once_with(mock_cursor, "w.record_id = ?", (99,))
+        WellbeingRepository._agg_add.assert_called_once_with(mock_cursor, "w.record_id = ?", (99,))
         mock_conn.commit.assert_called_once()
         mock_conn.close.assert_called_once()
 
     def test_delete_by_id(self, mock_db):
         """Verify deletion by ID."""
-        mock_conn, _ = mock_db
+        mock_conn, mock_cursor = mock_db
         
         repo = WellbeingRepository()
         repo.delete_by_id(record_id=77)
         
-        mock_conn.execute.assert_called_once()
-        call_args = mock_conn.execute.call_args
+        sql, params = mock_cursor.execute.call_args_list[-1][0]
         
-        assert "DELETE FROM wellbeing_record" in call_args[0][0]
-        assert call_args[0][1] == (77,)
+        assert "DELETE FROM wellbeing_record" in sql
+        assert params == (77,)
+        WellbeingRepository._agg_remove.assert_called_once_with(mock_cursor, "w.record_id = ?", (77,))
+        WellbeingRepository._agg_refresh.assert_called_once()
         mock_conn.commit.assert_called_once()
         mock_conn.close.assert_called_once()
 
@@ -195,3 +194,122 @@ class TestWellbeingRepository:
             ("S100",)
         )
         assert "ORDER BY week_start DESC" in mock_cursor.execute.call_args[0][0]
+
+
+@pytest.fixture
+def file_repo(migrated_db):
+    """WellbeingRepository on a migrated temp database with six students over three cohorts."""
+    con = db_conn.get_db_connection()
+    for i, year in enumerate((2023, 2024, 2024, 2025, 2025, 2025), 1):
+        con.execute("INSERT INTO student(student_id, first_name, lastname, email, password, year) "
+                    "VALUES (?, 'A', 'B', ?, 'pass', ?)", (f"S{i:03d}", f"s{i}@example.com", year))
+    con.commit()
+    con.close()
+
+    return WellbeingRepository()
+
+
+class TestWeeklyAggregateMaintenance:
+    """Runs the real upsert/update/delete paths against a migrated temp database."""
+
+    @pytest.fixture
+    def repo(self, file_repo):
+        return file_repo
+
+    def test_random_writes_keep_aggregate_consistent(self, repo):
+        rnd = random.Random(7)
+        weeks = [date(2025, 1, 6) + timedelta(weeks=w) for w in range(4)]
+        students = [f"S{i:03d}" for i in range(1, 7)]
+        ids = []
+        for step in range(300):
+            op = rnd.random()
+            if op < 0.6 or not ids:
+                ids.append(repo.upsert(WellbeingRecord(
+                    None, rnd.choice(students), rnd.choice(weeks), rnd.randint(1, 5),
+                    round(rnd.uniform(3, 10), 1), "survey")))
+            elif op < 0.8:
+                repo.update_by_id(rnd.choice(ids), rnd.randint(1, 5), round(rnd.uniform(3, 10), 1))
+            else:
+                rid = ids.pop(rnd.randrange(len(ids)))
+                if rid not in ids:
+                    repo.delete_by_id(rid)
+            if step % 50 == 0:
+                assert repo.check_weekly_agg() == []
+        assert repo.check_weekly_agg() == []
+
+    def test_weekly_trend_matches_raw_averages(self, repo):
+        week = date(2025, 1, 6)
+        repo.upsert(WellbeingRecord(None, "S001", week, 2, 8.0, "survey"))
+        repo.upsert(WellbeingRecord(None, "S004", week, 4, 6.0, "survey"))
+        repo.upsert(WellbeingRecord(None, "S004", week + timedelta(weeks=1), 5, 5.0, "survey"))
+
+        assert repo.get_weekly_trend() == [(str(week), 3.0, 7.0), (str(week + timedelta(weeks=1)), 5.0, 5.0)]
+
+    def test_last_record_removes_group(self, repo):
+        rid = repo.upsert(WellbeingRecord(None, "S001", date(2025, 1, 6), 3, 7.0, "survey"))
+        repo.delete_by_id(rid)
+        assert repo.get_weekly_trend() == []
+        assert repo.check_weekly_agg() == []
+
+    def test_rebuild_repairs_drift(self, repo):
+        repo.upsert(WellbeingRecord(None, "S002", date(2025, 1, 6), 3, 7.0, "survey"))
+        con = db_conn.get_db_connection()
+        con.execute("UPDATE wellbeing_weekly_agg SET stress_sum = 99")
+        con.commit()
+        con.close()
+
+        assert len(repo.check_weekly_agg()) == 1
+        assert repo.rebuild_weekly_agg() == 1
+        assert repo.check_weekly_agg() == []
+
+
+class TestCohortStats:
+    """Grouped per-cohort query against a migrated temp database."""
+
+    def test_matches_per_student_totals(self, file_repo):
+        week = date(2025, 1, 6)
+        for sid, w, stress, sleep in [
+            ("S001", 0, 5, 5.0), ("S001", 1, 2, 8.0),
+            ("S002", 0, 4, 6.0), ("S003", 0, 1, 9.0),
+            ("S004", 0, 3, 7.0), ("S004", 2, 5, 4.0),
+        ]:
+            file_repo.upsert(WellbeingRecord(None, sid, week + timedelta(weeks=w), stress, sleep, "survey"))
+
+        rows = file_repo.cohort_stats(threshold=4)
+        # S005/S006 have no records and are not counted
+        assert rows == [
+            (2023, 1, 2, 3.5, 6.5, 1, 1),
+            (2024, 2, 2, 2.5, 7.5, 1, 1),
+            (2025, 1, 2, 4.0, 5.5, 1, 1),
+        ]
+
+    def test_date_window_is_inclusive(self, file_repo):
+        week = date(2025, 1, 6)
+        for w in range(4):
+            file_repo.upsert(WellbeingRecord(None, "S002", week + timedelta(weeks=w), 1 + w, 7.0, "survey"))
+
+        rows = file_repo.cohort_stats(4, since=week + timedelta(weeks=1), until=week + timedelta(weeks=2))
+        assert rows == [(2024, 1, 2, 2.5, 7.0, 0, 0)]
+        assert file_repo.cohort_stats(4, since=week + timedelta(weeks=9)) == []
+
+
+class TestSignalStats:
+    """Single-pass per-student stress/sleep signals against a migrated temp database."""
+
+    def test_matches_per_student_queries(self, file_repo):
+        rnd = random.Random(3)
+        week = date(2025, 1, 6)
+        for sid in ("S001", "S002", "S004", "S006"):
+            for w in rnd.sample(range(12), rnd.randint(1, 9)):
+                file_repo.upsert(WellbeingRecord(None, sid, week + timedelta(weeks=w),
+                                                 rnd.randint(1, 5), round(rnd.uniform(3, 9), 1), "survey"))
+
+        rows = {r[0]: r[1:] for r in file_repo.signal_stats(threshold=4, recent_window=3)}
+        assert set(rows) == {"S001", "S002", "S004", "S006"}
+        for sid, (records, high_stress, recent, avg_sleep) in rows.items():
+            history = file_repo.get_by_student(sid)  # newest first
+            latest = history[:3]
+            assert records == len(history)
+            assert high_stress == sum(r.stress_level >= 4 for r in history)
+            assert recent == len(latest)
+            assert avg_sleep == pytest.approx(sum(r.sleep_hours for r in latest) / len(latest))
@@ -203,3 +203,39 @@ def test_high_stress_weeks_filters_on_threshold(service, repo):
     high_weeks_strict = service.high_stress_weeks("STU0001", threshold=5)
     assert len(high_weeks_strict) == 1
     assert high_weeks_strict[0].stress_level == 5
+
+
+def test_cohort_overview_shapes_repo_rows():
+    from unittest.mock import Mock
+
+    repo = Mock()
+    repo.cohort_stats.return_value = [
+        (2024, 3, 10, 3.2, 6.9, 4, 2),
+        (2025, 1, 1, None, None, None, None),
+    ]
+    service = WellbeingService(repo=repo)
+
+    overview = service.cohort_overview(threshold=5, since=date(2025, 1, 1))
+    repo.cohort_stats.assert_called_once_with(5, date(2025, 1, 1), None)
+    assert overview[2024] == {
+        "total_students": 3, "total_records": 10, "avg_stress": 3.2, "avg_sleep": 6.9,
+        "high_stress_records": 4, "high_stress_students": 2,
+    }
+    assert overview[2025]["avg_stress"] == 0.0
+    assert overview[2025]["high_stress_students"] == 0
+
+
+def test_scan_wellbeing_signals_keys_by_student():
+    from unittest.mock import Mock
+
+    repo = Mock()
+    repo.signal_stats.return_value = [("S1", 6, 2, 5, 5.4), ("S2", 1, None, 1, 8.0)]
+    service = WellbeingService(repo=repo)
+
+    signals = service.scan_wellbeing_signals(threshold=4, recent_window=5)
+    repo.signal_stats.assert_called_once_with(4, 5)
+    assert signals["S1"] == {"records": 6, "high_stress_weeks": 2, "recent_records": 5, "recent_avg_sleep": 5.4}
+    assert signals["S2"]["high_stress_weeks"] == 0
+
+    with pytest.raises(ValueError):
+        service.scan_wellbeing_signals(recent_window=0)
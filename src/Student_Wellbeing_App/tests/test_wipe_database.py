@@ -63,3 +63,18 @@ def test_wipe_database_deletes_file(tmp_path):
     out = proc.stdout + proc.stderr
     assert "SQLite database file deleted" in out
     assert not db_file.exists()
+
+
+def test_wipe_database_moves_audit_archive_aside(tmp_path):
+    """The archive of the wiped database must not be picked up by the next one."""
+    script_in_tmp = tmp_path / "WipeDatabase.py"
+    shutil.copy(_get_script_path(), script_in_tmp)
+    sqlite3.connect(tmp_path / "student_wellbeing_db.sqlite3").close()
+    (tmp_path / "audit_archive").mkdir()
+    (tmp_path / "audit_archive" / "manifest.json").write_text("{}")
+
+    subprocess.run([sys.executable, str(script_in_tmp)], cwd=str(tmp_path), capture_output=True, text=True)
+
+    assert not (tmp_path / "audit_archive").exists()
+    moved = [p for p in tmp_path.iterdir() if p.name.startswith("audit_archive-")]
+    assert len(moved) == 1 and (moved[0] / "manifest.json").exists()